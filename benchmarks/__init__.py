@@ -0,0 +1,3 @@
+"""
+Skrip benchmark; jalankan dari root proyek, misalnya python -m benchmarks.firebase_manager.
+"""
@@ -0,0 +1,209 @@
+"""
+Benchmark FirebaseManager terhadap server RTDB tiruan.
+
+Untuk setiap kombinasi ukuran (jumlah token x jumlah user, chat tetap),
+server tiruan diisi data sintetis lalu setiap operasi dijalankan beberapa
+kali. Dicatat persentil latensi, jumlah request dan byte body yang lewat
+per panggilan. Hasil disimpan sebagai JSON agar bisa dibandingkan antar versi:
+
+    python -m benchmarks.firebase_manager --tokens 1000,10000 --users 10,500
+    python -m benchmarks.firebase_manager --compare benchmarks/results/firebase_manager-abc123.json
+
+--latency menambah jeda per request (misalnya 0.08 untuk jaringan seluler),
+--replica menjalankan manager dengan replika SQLite lokal.
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# token_store pulls in kivy, which would otherwise parse the benchmark's own
+# command line arguments and reject them
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from benchmarks.harness import summarize, run_meta, save_results, default_output, compare, Timer
+from transport.fake_rtdb import FakeRTDBServer
+
+OPERATIONS = (
+    'add_token', 'add_bulk_tokens', 'take_tokens', 'ban_tokens', 'check_token_owner',
+    'get_all_stats', 'get_chat_messages', 'get_all_users',
+)
+
+
+def make_token(rng):
+    """Random token that passes FirebaseManager.is_valid_token"""
+    user_part = ''.join(rng.choice('0123456789abcdef') for _ in range(32))
+    left = base64.b64encode(bytes(rng.getrandbits(8) for _ in range(24))).decode().rstrip('=')
+    right = base64.b64encode(bytes(rng.getrandbits(8) for _ in range(32))).decode()
+    return f"u{user_part}:{left}..{right}"
+
+
+def seed_data(token_count, user_count, chat_count, seed=1):
+    """Synthetic database tree shaped like the production one"""
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1)
+    users = {}
+    for i in range(user_count):
+        users[f"user{i:03d}"] = {
+            'created': started.isoformat(), 'token_count': 0, 'total_value': 0,
+            'last_login': '', 'online': False, 'last_seen': '', 'role': 'user',
+            'added_by': 'admin', 'password': '',
+            'wa': '08123', 'rekening': '123', 'tgl_lahir': '01/01/1990', 'tempat_tinggal': 'Jakarta'
+        }
+    names = list(users)
+
+    tokens = {}
+    for i in range(token_count):
+        owner = names[i % len(names)] if names else 'admin'
+        status = 'available' if i % 4 else 'taken'
+        tokens[f"-T{i:08d}"] = {
+            'token': make_token(rng), 'user': owner,
+            'timestamp': (started + timedelta(seconds=i)).isoformat(),
+            'price': 1500, 'status': status, 'added_by': owner
+        }
+        if owner in users:
+            users[owner]['token_count'] += 1
+            users[owner]['total_value'] += 1500
+
+    chat = {}
+    for i in range(chat_count):
+        chat[f"-C{i:08d}"] = {
+            'user': names[i % len(names)] if names else 'admin',
+            'message': f"pesan {i}", 'type': 'user',
+            'timestamp': (started + timedelta(seconds=i)).isoformat()
+        }
+
+    return {
+        'settings': {'price_per_token': 1500, 'admin_password': ''},
+        'users': users, 'tokens': tokens, 'chat_messages': chat, 'activity_logs': {}
+    }
+
+
+def operation_calls(manager, data, rng):
+    """name -> callable doing one call of that operation"""
+    names = list(data['users'])
+    existing = [t['token'] for t in data['tokens'].values()]
+
+    def add_token():
+        return manager.add_token(make_token(rng), rng.choice(names), 'admin')
+
+    def add_bulk_tokens():
+        tokens = '\n'.join(make_token(rng) for _ in range(10))
+        return manager.add_bulk_tokens(tokens, rng.choice(names), 'admin')
+
+    def take_tokens():
+        return manager.take_tokens(5, 'admin')
+
+    def ban_tokens():
+        return manager.ban_tokens(rng.choice(existing), 'admin')
+
+    def check_token_owner():
+        return manager.check_token_owner(rng.choice(existing))
+
+    return {
+        'add_token': add_token,
+        'add_bulk_tokens': add_bulk_tokens,
+        'take_tokens': take_tokens,
+        'ban_tokens': ban_tokens,
+        'check_token_owner': check_token_owner,
+        'get_all_stats': manager.get_all_stats,
+        'get_chat_messages': manager.get_chat_messages,
+        'get_all_users': manager.get_all_users,
+    }
+
+
+def bench_scenario(args, token_count, user_count):
+    from token_store.manager import FirebaseManager
+
+    data = seed_data(token_count, user_count, args.chat)
+    results = []
+    with FakeRTDBServer(data, latency=args.latency) as server:
+        manager = FirebaseManager(connect=False, replica=args.replica, database_url=server.url)
+        # Build token_index/user_index as connecting would
+        manager.check_firebase_data()
+        if args.replica:
+            manager.replica_sync.sync_once()
+        rng = random.Random(2)
+        calls = operation_calls(manager, data, rng)
+
+        for name in args.ops:
+            samples = []
+            requests = 0
+            bytes_in = 0
+            bytes_out = 0
+            for _ in range(args.runs):
+                server.db.reset_traffic()
+                # The manager prints on every call; keep the report readable
+                with contextlib.redirect_stdout(io.StringIO()), Timer(samples):
+                    calls[name]()
+                if args.replica:
+                    manager.replica_sync.sync_once()
+                traffic = server.db.traffic()
+                requests += sum(traffic['requests'].values())
+                bytes_in += traffic['bytes_in']
+                bytes_out += traffic['bytes_out']
+
+            result = {
+                'tokens': token_count, 'users': user_count, 'chat': args.chat, 'op': name,
+                'requests_per_call': round(requests / args.runs, 2),
+                'bytes_sent_per_call': bytes_in // args.runs,
+                'bytes_received_per_call': bytes_out // args.runs,
+            }
+            result.update(summarize(samples))
+            results.append(result)
+            print(f"{token_count:>7} tok {user_count:>4} usr  {name:<18} "
+                  f"p50 {result['p50_ms']:9.2f} ms  p99 {result['p99_ms']:9.2f} ms  "
+                  f"{result['requests_per_call']:6.1f} req  {result['bytes_received_per_call'] / 1024:10.1f} KiB")
+
+        if manager.replica:
+            manager.replica_sync.stop()
+            manager.replica.close()
+    return results
+
+
+def int_list(text):
+    return [int(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int_list, default=[1000, 10000, 100000])
+    parser.add_argument('--users', type=int_list, default=[10, 100, 500])
+    parser.add_argument('--chat', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--ops', type=lambda s: s.split(','), default=list(OPERATIONS))
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--replica', action='store_true', help='use the local SQLite replica')
+    parser.add_argument('--out', help='results JSON (default benchmarks/results/firebase_manager-<rev>.json)')
+    parser.add_argument('--compare', help='earlier results JSON to compare p50 against')
+    args = parser.parse_args()
+
+    unknown = set(args.ops) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    out = os.path.abspath(args.out or default_output('firebase_manager'))
+    results = []
+    # The manager writes its seed marker and replica next to the working directory
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for token_count in args.tokens:
+                for user_count in args.users:
+                    results.extend(bench_scenario(args, token_count, user_count))
+        finally:
+            os.chdir(cwd)
+
+    save_results(out, run_meta('firebase_manager', args), results)
+    if args.compare:
+        compare(args.compare, results, ('tokens', 'users', 'op'), 'p50_ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Alat bersama untuk skrip benchmark: persentil, metadata run, simpan dan
+bandingkan hasil JSON antar versi.
+"""
+
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(seconds):
+    """Latency summary in milliseconds"""
+    return {
+        'runs': len(seconds),
+        'mean_ms': round(sum(seconds) / len(seconds) * 1000, 3) if seconds else 0.0,
+        'p50_ms': round(percentile(seconds, 50) * 1000, 3),
+        'p90_ms': round(percentile(seconds, 90) * 1000, 3),
+        'p99_ms': round(percentile(seconds, 99) * 1000, 3),
+        'max_ms': round(max(seconds) * 1000, 3) if seconds else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_meta(name, args):
+    return {
+        'benchmark': name,
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'args': vars(args),
+    }
+
+
+def save_results(path, meta, results):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"Hasil disimpan: {path}")
+
+
+def default_output(name):
+    return os.path.join(RESULTS_DIR, f"{name}-{git_revision()}.json")
+
+
+def compare(path, results, key_fields, metric):
+    """Print metric changes against an earlier results file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    before = {tuple(r.get(k) for k in key_fields): r for r in old['results']}
+    print(f"\nDibandingkan dengan {old['meta'].get('revision')} ({path}):")
+    for result in results:
+        key = tuple(result.get(k) for k in key_fields)
+        if key not in before or not before[key].get(metric):
+            continue
+        was, now = before[key][metric], result[metric]
+        change = (now - was) / was * 100
+        label = ' '.join(str(k) for k in key)
+        print(f"  {label:<40} {metric} {was:>10.3f} -> {now:>10.3f}  ({change:+.1f}%)")
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """Run the block with path as the current directory"""
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(cwd)
+
+
+class Timer:
+    """Context manager that records elapsed seconds into a list"""
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.samples.append(time.perf_counter() - self.started)
@@ -0,0 +1,103 @@
+"""
+Benchmark waktu impor saat startup.
+
+Setiap skenario dijalankan di interpreter Python baru sehingga cache modul
+tidak ikut terukur:
+
+    kasir   main + layar kasir (jalur offline)
+    online  main + layar login dan admin (menarik requests dan token_store)
+    semua   main + semua paket layar, setara main.py lama yang monolitik
+
+Dengan --baseline-rev, 'import main' juga diukur pada revisi git lama
+(misalnya sebelum main.py dipecah) dan dibandingkan dengan skenario 'kasir':
+
+    python benchmarks/import_time.py --runs 7 --baseline-rev HEAD~1
+
+Di Android tidak ada interpreter terpisah; lihat 'Laporan startup' di logcat
+(adb logcat | grep -A 30 "Laporan startup"). Baris 'impor main' dan
+'layar <nama>' di sana memuat waktu impor modul yang sama.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'kasir': ['main', 'screens.kasir'],
+    'online': ['main', 'screens.auth', 'screens.admin'],
+    'semua': ['main', 'screens.auth', 'screens.admin', 'screens.user', 'screens.users', 'screens.chat', 'screens.kasir'],
+}
+
+# Imports the given modules and prints the seconds it took
+PROBE = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "for name in sys.argv[1:]:\n"
+    "    __import__(name)\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def time_import(modules, cwd):
+    """Seconds needed to import modules in a fresh interpreter"""
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE] + modules,
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure(modules, cwd, runs):
+    # First run only warms the .pyc cache
+    time_import(modules, cwd)
+    return [time_import(modules, cwd) for _ in range(runs)]
+
+
+def checkout(rev):
+    """Extract a git revision into a temporary directory"""
+    folder = tempfile.mkdtemp(prefix='import_time_')
+    archive = subprocess.run(['git', 'archive', rev], cwd=ROOT, capture_output=True, check=True).stdout
+    tar_path = os.path.join(folder, 'src.tar')
+    with open(tar_path, 'wb') as f:
+        f.write(archive)
+    with tarfile.open(tar_path) as tar:
+        tar.extractall(folder)
+    os.remove(tar_path)
+    return folder
+
+
+def report(name, samples):
+    print(f'{name:<20} median {statistics.median(samples) * 1000:8.1f} ms   '
+          f'min {min(samples) * 1000:8.1f} ms   ({len(samples)} runs)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--baseline-rev', help='git revision to compare against (whole app import)')
+    args = parser.parse_args()
+
+    results = {}
+    for name, modules in SCENARIOS.items():
+        results[name] = measure(modules, ROOT, args.runs)
+        report(name, results[name])
+
+    if args.baseline_rev:
+        folder = checkout(args.baseline_rev)
+        baseline = measure(['main'], folder, args.runs)
+        report(f'main @ {args.baseline_rev}', baseline)
+        saved = statistics.median(baseline) - statistics.median(results['kasir'])
+        print(f'kasir start vs baseline: {saved * 1000:+.1f} ms saved')
+
+
+if __name__ == '__main__':
+    main()
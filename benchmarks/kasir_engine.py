@@ -0,0 +1,302 @@
+"""
+Benchmark mesin kasir tanpa UI (tidak membuka jendela Kivy).
+
+Menjalankan jalur data kasir.py lewat kasir_core: checkout sampai tersimpan,
+penyimpanan transaksi dengan riwayat 10 ribu sampai 1 juta penjualan di arsip,
+laporan harian, simpan/muat produk dan tambah/hapus pengeluaran. Untuk setiap
+skenario dicatat operasi per detik, persentil latensi dan puncak memori
+(tracemalloc) satu operasi. Data sintetis memakai seed tetap dan semua file
+ditulis di folder sementara:
+
+    python -m benchmarks.kasir_engine
+    python -m benchmarks.kasir_engine --history 10000,100000,1000000 --skus 50,500,5000
+    python -m benchmarks.kasir_engine --compare benchmarks/results/kasir_engine-abc123.json
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, date, timedelta
+
+from benchmarks.harness import (summarize, run_meta, save_results, default_output, compare, Timer,
+                                working_directory)
+from kasir_core import storage
+from kasir_core.analytics import SalesAnalytics
+from kasir_core.archive import archive_path, write_archive
+from kasir_core.cart import Cart
+from kasir_core.catalog import ProductCatalog
+from kasir_core.models import KasirProduct, KasirCartItem, KasirExpense
+from kasir_core.report import format_daily_report
+from kasir_core.rollup import SalesRollupStore, ROLLUP_FILE, TRANSACTION_FILE
+from kasir_core.tills import format_receipt_number
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SCENARIOS = ('checkout', 'persistence', 'daily_report', 'products', 'expenses')
+
+
+def format_currency(amount):
+    return f"Rp {amount:,.0f}".replace(',', '.')
+
+
+def make_catalog(count, seed=1):
+    rng = random.Random(seed)
+    return ProductCatalog(
+        KasirProduct(i, f"Produk {i:05d}", rng.randrange(10, 200) * 1000, rng.randrange(1, 500) * 1000)
+        for i in range(1, count + 1)
+    )
+
+
+def make_cart(products, rng, lines):
+    cart = Cart()
+    for product in rng.sample(products, lines):
+        cart.add(KasirCartItem(product, rng.randrange(1, 40) * 250))
+    return cart
+
+
+def make_receipts(products, count, day, rng, counter=1, lines=3):
+    """count receipts spread over the opening hours of one day"""
+    opened = datetime.combine(day, datetime.min.time()) + timedelta(hours=7)
+    step = max(1, 12 * 3600 // max(count, 1))
+    receipts = []
+    for i in range(count):
+        cart = make_cart(products, rng, lines)
+        receipts.append(storage.make_receipt(
+            cart, format_receipt_number(counter + i, 'K1'), 'kasir', 'Toko Bench',
+            payment=cart.total, now=opened + timedelta(seconds=i * step)
+        ))
+    return receipts
+
+
+def seed_history(sales, per_day, products, rng):
+    """Closed days in the columnar archive, ending yesterday"""
+    days = max(1, -(-sales // per_day))
+    counter = 1
+    for offset in range(days, 0, -1):
+        day = date.today() - timedelta(days=offset)
+        count = min(per_day, sales - counter + 1)
+        write_archive(archive_path(day.strftime('%Y-%m-%d')), day.strftime('%Y-%m-%d'),
+                      make_receipts(products, count, day, rng, counter))
+        counter += count
+    return counter
+
+
+def peak_kib(call):
+    """Peak Python heap allocated while running call once"""
+    tracemalloc.start()
+    try:
+        call()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, size, runs, call, setup=None):
+    """Time runs calls (setup is not timed), then one more call under tracemalloc"""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):
+            if setup:
+                setup()
+            with Timer(samples):
+                call()
+        if setup:
+            setup()
+        peak = peak_kib(call)
+
+    total = sum(samples)
+    result = {'bench': name, 'size': size, 'ops_per_sec': round(runs / total, 1) if total else 0.0, 'peak_kib': peak}
+    result.update(summarize(samples))
+    print(f"{name:<22} {size:>8}  {result['ops_per_sec']:10.1f} ops/s  "
+          f"p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  peak {peak:10.1f} KiB")
+    return result
+
+
+def reset_rollups():
+    if os.path.exists(ROLLUP_FILE):
+        os.remove(ROLLUP_FILE)
+
+
+def reset_workdir():
+    for path in (TRANSACTION_FILE, ROLLUP_FILE, storage.PRODUCT_FILE, storage.COUNTER_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def bench_checkout(args):
+    """Payment to saved state, as KasirApp.checkout does it"""
+    reset_workdir()
+    products = make_catalog(args.catalog)
+    items = list(products)
+    rollups = SalesRollupStore()
+    rng = random.Random(3)
+    state = {'counter': 1, 'cart': None}
+
+    def fill_cart():
+        state['cart'] = make_cart(items, rng, args.lines)
+
+    def checkout():
+        cart = state['cart']
+        receipt = storage.make_receipt(cart, format_receipt_number(state['counter'], 'K1'),
+                                       'kasir', 'Toko Bench', payment=cart.total)
+        storage.append_transaction(receipt)
+        rollups.record_receipt(receipt)
+        for item in cart:
+            products.change_stock(item.product.id, -item.weight_g)
+        cart.clear()
+        state['counter'] += 1
+        storage.save_counter(state['counter'])
+        storage.save_products(products)
+
+    return [measure('checkout', args.catalog, args.runs, checkout, setup=fill_cart)]
+
+
+def bench_persistence(args):
+    """Saving one sale, rebuilding rollups and a 30 day query on top of archived history"""
+    results = []
+    products = list(make_catalog(args.catalog))
+    for sales in args.history:
+        with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+            rng = random.Random(4)
+            counter = seed_history(sales, args.per_day, products, rng)
+            today = make_receipts(products, args.journal, date.today(), rng, counter)
+            storage.write_json(TRANSACTION_FILE, today)
+            receipts = iter(make_receipts(products, args.runs + 1, date.today(), rng, counter + args.journal))
+
+            results.append(measure('append_transaction', sales, args.runs,
+                                   lambda: storage.append_transaction(next(receipts))))
+
+            # Without a rollup file the store rebuilds itself from archives and journal
+            results.append(measure('rollup_rebuild', sales, args.slow_runs, SalesRollupStore,
+                                   setup=reset_rollups))
+
+            end = date.today()
+            start = end - timedelta(days=29)
+
+            def range_report():
+                analytics = SalesAnalytics()
+                analytics.range_totals(start, end)
+                analytics.product_breakdown(start, end)
+                analytics.hour_histogram(start, end)
+            results.append(measure('range_report_30d', sales, args.slow_runs, range_report))
+    return results
+
+
+def bench_daily_report(args):
+    """ReportsScreen.generate_daily_report without the widgets"""
+    reset_workdir()
+    products = list(make_catalog(args.catalog))
+    rng = random.Random(5)
+    rollups = SalesRollupStore()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for receipt in make_receipts(products, args.journal, date.today(), rng):
+            rollups.record_receipt(receipt)
+        now = datetime.now()
+        expenses = [KasirExpense(i, f"Biaya {i}", rng.randrange(1, 100) * 1000, now)
+                    for i in range(1, args.expenses + 1)]
+        for expense in expenses:
+            rollups.record_expense(expense.date_time, expense.amount, expense.name)
+
+    def report():
+        rollup = rollups.get_day(date.today())
+        format_daily_report(rollup, expenses, 'Toko Bench', 'kasir', format_currency)
+
+    return [measure('daily_report', args.journal, args.runs, report)]
+
+
+def bench_products(args):
+    results = []
+    for count in args.skus:
+        reset_workdir()
+        products = make_catalog(count)
+        results.append(measure('products_save', count, args.runs, lambda: storage.save_products(products)))
+        results.append(measure('products_load', count, args.runs, lambda: storage.load_products()))
+    return results
+
+
+def bench_expenses(args):
+    """Add then delete expenses, saving the day file and rollups each time"""
+    reset_workdir()
+    rollups = SalesRollupStore()
+    rng = random.Random(6)
+    expenses = [KasirExpense(i, f"Biaya {i}", rng.randrange(1, 100) * 1000, datetime.now())
+                for i in range(1, args.expenses + 1)]
+    storage.save_expenses(expenses)
+    state = {'next_id': len(expenses) + 1}
+
+    def add():
+        expense = KasirExpense(state['next_id'], 'Plastik', rng.randrange(1, 100) * 1000, datetime.now())
+        state['next_id'] += 1
+        expenses.append(expense)
+        storage.save_expenses(expenses)
+        rollups.record_expense(expense.date_time, expense.amount, expense.name)
+
+    def delete():
+        expense = expenses.pop()
+        storage.save_expenses(expenses)
+        rollups.remove_expense(expense.date_time, expense.amount, expense.name)
+
+    return [
+        measure('expense_add', args.expenses, args.runs, add),
+        measure('expense_delete', args.expenses, args.runs, delete),
+    ]
+
+
+BENCHES = {
+    'checkout': bench_checkout,
+    'persistence': bench_persistence,
+    'daily_report': bench_daily_report,
+    'products': bench_products,
+    'expenses': bench_expenses,
+}
+
+
+def int_list(text):
+    return [int(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', type=lambda s: s.split(','), default=list(SCENARIOS))
+    parser.add_argument('--history', type=int_list, default=[10000, 100000],
+                        help='archived sales before today (up to 1000000)')
+    parser.add_argument('--per-day', type=int, default=500, help='archived sales per day')
+    parser.add_argument('--journal', type=int, default=200, help="sales already in today's journal")
+    parser.add_argument('--skus', type=int_list, default=[50, 500, 5000])
+    parser.add_argument('--catalog', type=int, default=50, help='products in the checkout catalog')
+    parser.add_argument('--lines', type=int, default=3, help='cart lines per checkout')
+    parser.add_argument('--expenses', type=int, default=20, help='expenses already recorded today')
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--slow-runs', type=int, default=3, help='runs for the history-sized operations')
+    parser.add_argument('--out', help='results JSON (default benchmarks/results/kasir_engine-<rev>.json)')
+    parser.add_argument('--compare', help='earlier results JSON to compare p50 against')
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    out = os.path.abspath(args.out or default_output('kasir_engine'))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+        for name in args.scenarios:
+            results.extend(BENCHES[name](args))
+
+    meta = run_meta('kasir_engine', args)
+    if resource is not None:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        meta['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    save_results(out, meta, results)
+    if args.compare:
+        compare(args.compare, results, ('bench', 'size'), 'p50_ms')
+
+
+if __name__ == '__main__':
+    main()
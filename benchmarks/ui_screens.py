@@ -0,0 +1,318 @@
+"""
+Benchmark pembangunan ulang layar berat dengan jendela Kivy headless.
+
+Layar dibuat dengan data sintetis (seed tetap), ditempel ke jendela, lalu
+setiap fungsi refresh dipanggil berulang kali. Per refresh dicatat waktu
+build (panggilan refresh itu sendiri), waktu frame berikutnya (layout dan
+gambar lewat EventLoop.idle) dan jumlah widget di layar:
+
+    python -m benchmarks.ui_screens
+    python -m benchmarks.ui_screens --products 50,500,5000 --messages 50,500
+    python -m benchmarks.ui_screens --compare benchmarks/results/ui_screens-abc123.json
+
+Secara default Kivy memakai backend GL tiruan (KIVY_GL_BACKEND=mock) dan
+driver video SDL offscreen sehingga bisa jalan di CI tanpa layar. Untuk angka
+yang mendekati GPU sungguhan, jalankan di bawah Xvfb dengan
+KIVY_GL_BACKEND=gl dan SDL_VIDEODRIVER=x11.
+"""
+
+import os
+
+# Must be set before kivy is imported
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_FILELOG', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from kivy.config import Config
+
+# Frames are timed back to back; the default 60 fps cap would sleep in Clock.tick
+Config.set('graphics', 'maxfps', '0')
+
+from kivy.base import EventLoop
+
+from benchmarks.harness import summarize, run_meta, save_results, default_output, compare, Timer
+from kasir_core.cart import Cart
+from kasir_core.catalog import ProductCatalog
+from kasir_core.models import KasirProduct, KasirCartItem
+
+SCENARIOS = ('products', 'cart', 'messages', 'users', 'expenses')
+
+
+class BenchAppState:
+    """The MyApp attributes the kasir screens read through app_ref"""
+    def __init__(self):
+        self.products = ProductCatalog()
+        self.cart = Cart()
+        self.expenses = []
+
+    def format_currency(self, amount):
+        try:
+            return f"Rp {amount:,.0f}".replace(',', '.')
+        except Exception:
+            return "Rp 0"
+
+
+def make_products(count, rng):
+    return ProductCatalog(
+        KasirProduct(i, f"Produk {i:05d}", rng.randrange(10, 200) * 1000, rng.randrange(0, 500) * 1000)
+        for i in range(1, count + 1)
+    )
+
+
+def make_messages(count, rng, start=0):
+    started = datetime(2024, 1, 1, 8)
+    words = ['stok', 'token', 'hari', 'ini', 'sudah', 'masuk', 'tolong', 'cek', 'terima', 'kasih']
+    return [{
+        'key': f"-M{start + i:08d}",
+        'user': f"user{rng.randrange(20):02d}",
+        'message': ' '.join(rng.choice(words) for _ in range(rng.randrange(3, 60))),
+        'type': 'system' if i % 25 == 0 else 'user',
+        'timestamp': (started + timedelta(seconds=30 * (start + i))).isoformat()
+    } for i in range(count)]
+
+
+def make_users(count, rng):
+    return [{
+        'username': f"user{i:04d}",
+        'is_online': rng.random() < 0.2,
+        'token_count': rng.randrange(0, 5000),
+        'total_value': rng.randrange(0, 5000) * 1500,
+        'banned_count': rng.randrange(0, 20),
+        'created': '2024-01-01T00:00:00'
+    } for i in range(count)]
+
+
+def make_expenses(count, rng):
+    started = datetime(2024, 1, 1, 8)
+    return [{
+        'id': i,
+        'name': f"Biaya {i}",
+        'amount': rng.randrange(1, 100) * 1000,
+        'note': '',
+        'date': (started + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')
+    } for i in range(1, count + 1)]
+
+
+def widget_count(widget):
+    return sum(1 for _ in widget.walk(restrict=True))
+
+
+def next_frame():
+    """Run one frame (clock, layout, draw) and return its duration"""
+    started = time.perf_counter()
+    EventLoop.idle()
+    return time.perf_counter() - started
+
+
+def measure(screen, name, size, runs, frames, refresh, setup=None):
+    """Time refresh(), then the frames after it; setup() runs untimed before each refresh"""
+    build, first_frame, settle = [], [], []
+    for _ in range(runs):
+        if setup:
+            setup()
+            for _ in range(frames):
+                next_frame()
+        with Timer(build):
+            refresh()
+        first_frame.append(next_frame())
+        settle.append(sum(next_frame() for _ in range(frames - 1)) + first_frame[-1])
+
+    result = {'screen': name, 'size': size, 'widgets': widget_count(screen)}
+    for label, samples in (('build', build), ('frame', first_frame), ('settle', settle)):
+        result.update({f"{label}_{key}": value for key, value in summarize(samples).items() if key != 'runs'})
+    result['runs'] = runs
+    print(f"{name:<20} {size:>6}  {result['widgets']:6d} widgets  build p50 {result['build_p50_ms']:9.3f} ms  "
+          f"frame p50 {result['frame_p50_ms']:9.3f} ms  settle p90 {result['settle_p90_ms']:9.3f} ms")
+    return result
+
+
+def attach(screen):
+    """Put a screen on the window with its final size, outside any ScreenManager"""
+    window = EventLoop.window
+    screen.size_hint = (None, None)
+    screen.size = window.size
+    window.add_widget(screen)
+    for _ in range(3):
+        next_frame()
+    return screen
+
+
+def detach(screen):
+    EventLoop.window.remove_widget(screen)
+
+
+def bench_products(args):
+    from screens.kasir import KasirMainScreen
+
+    results = []
+    for count in args.products:
+        app = BenchAppState()
+        app.products = make_products(count, random.Random(1))
+        screen = attach(KasirMainScreen(name='kasir_main'))
+        screen.app_ref = app
+        results.append(measure(screen, 'products', count, args.runs, args.frames, screen.update_products_display))
+
+        # A stock change after checkout only refreshes that product's row
+        products = list(app.products)
+        rng = random.Random(2)
+        results.append(measure(screen, 'products_stock', count, args.runs, args.frames,
+                               lambda: app.products.change_stock(rng.choice(products).id, -250)))
+        detach(screen)
+    return results
+
+
+def bench_cart(args):
+    from screens.kasir import KasirMainScreen
+
+    results = []
+    for count in args.cart:
+        rng = random.Random(3)
+        app = BenchAppState()
+        app.products = make_products(max(count, 10), rng)
+        products = list(app.products)
+        for product in rng.sample(products, count):
+            app.cart.add(KasirCartItem(product, rng.randrange(1, 40) * 250))
+        screen = attach(KasirMainScreen(name='kasir_main'))
+        screen.app_ref = app
+        results.append(measure(screen, 'cart', count, args.runs, args.frames, screen.update_cart_display))
+
+        # Adding one line goes through the cart event, not a rebuild
+        def add_one():
+            app.cart.add(KasirCartItem(rng.choice(products), 1000))
+
+        def drop_last():
+            items = list(app.cart)
+            if len(items) > count:
+                app.cart.remove(items[-1])
+        results.append(measure(screen, 'cart_add', count, args.runs, args.frames, add_one, setup=drop_last))
+        detach(screen)
+    return results
+
+
+def bench_messages(args):
+    from screens.chat import ChatScreen
+
+    results = []
+    for count in args.messages:
+        rng = random.Random(4)
+        messages = make_messages(count, rng)
+        screen = attach(ChatScreen(name='chat'))
+        screen.set_username('user00')
+
+        def reset():
+            screen.chat_scroll.data = []
+            screen.message_keys = set()
+            screen.message_heights = {}
+        results.append(measure(screen, 'messages', count, args.runs, args.frames,
+                               lambda: screen.update_messages_ui(messages), setup=reset))
+
+        # Polling again with one new message appends a single row
+        state = {'next': count}
+
+        def poll():
+            state['next'] += 1
+            screen.update_messages_ui(messages + make_messages(1, rng, state['next']))
+        results.append(measure(screen, 'messages_poll', count, args.runs, args.frames, poll))
+        detach(screen)
+    return results
+
+
+def bench_users(args):
+    from screens.users import UsersScreen
+
+    results = []
+    for count in args.users:
+        rng = random.Random(5)
+        users = make_users(count, rng)
+        screen = attach(UsersScreen(name='users'))
+
+        def reset():
+            screen.users = {}
+            screen.user_rows = {}
+            screen.user_order = []
+            screen.users_rv.data = []
+        results.append(measure(screen, 'users', count, args.runs, args.frames,
+                               lambda: screen.update_users_ui(users), setup=reset))
+
+        # A reload where one user's token count changed
+        def reload_one():
+            changed = [dict(user) for user in users]
+            changed[rng.randrange(count)]['token_count'] += 1
+            screen.update_users_ui(changed)
+        results.append(measure(screen, 'users_reload', count, args.runs, args.frames, reload_one))
+        detach(screen)
+    return results
+
+
+def bench_expenses(args):
+    from screens.kasir import KasirExpensesScreen
+
+    results = []
+    for count in args.expenses:
+        app = BenchAppState()
+        app.expenses = make_expenses(count, random.Random(6))
+        screen = attach(KasirExpensesScreen(name='kasir_expenses'))
+        screen.app_ref = app
+        results.append(measure(screen, 'expenses', count, args.runs, args.frames, screen.refresh_expenses))
+        detach(screen)
+    return results
+
+
+BENCHES = {
+    'products': bench_products,
+    'cart': bench_cart,
+    'messages': bench_messages,
+    'users': bench_users,
+    'expenses': bench_expenses,
+}
+
+
+def int_list(text):
+    return [int(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', type=lambda s: s.split(','), default=list(SCENARIOS))
+    parser.add_argument('--products', type=int_list, default=[50, 500, 5000])
+    parser.add_argument('--cart', type=int_list, default=[5, 20, 100])
+    parser.add_argument('--messages', type=int_list, default=[50, 500])
+    parser.add_argument('--users', type=int_list, default=[10, 100, 500])
+    parser.add_argument('--expenses', type=int_list, default=[10, 50, 200])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--frames', type=int, default=3, help='frames counted after each refresh (at least 1)')
+    parser.add_argument('--out', help='results JSON (default benchmarks/results/ui_screens-<rev>.json)')
+    parser.add_argument('--compare', help='earlier results JSON to compare build p50 against')
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.frames = max(1, args.frames)
+
+    EventLoop.ensure_window()
+    # Phone-sized portrait window, as in kasir.py
+    EventLoop.window.size = (360, 640)
+
+    out = os.path.abspath(args.out or default_output('ui_screens'))
+    results = []
+    for name in args.scenarios:
+        results.extend(BENCHES[name](args))
+
+    meta = run_meta('ui_screens', args)
+    meta['gl_backend'] = os.environ.get('KIVY_GL_BACKEND')
+    meta['window'] = list(EventLoop.window.size)
+    save_results(out, meta, results)
+    if args.compare:
+        compare(args.compare, results, ('screen', 'size'), 'build_p50_ms')
+
+
+if __name__ == '__main__':
+    main()
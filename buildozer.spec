@@ -15,11 +15,14 @@ source.dir = .
 # (list) Source files to include (let empty to include all the files)
 source.include_exts = py,png,jpg,kv,atlas,json,ttf
 
+# (list) Directories to exclude from the APK
+source.exclude_dirs = benchmarks
+
 # (str) Application versioning
 version = 1.0
 
 # (list) Application requirements
-requirements = python3,kivy==2.0.0,requests,pillow,urllib3,certifi,android
+requirements = python3,kivy==2.0.0,requests,pillow,urllib3,certifi,android,sqlite3
 
 # (str) Orientation
 orientation = portrait
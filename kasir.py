@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from datetime import datetime, date
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
@@ -7,31 +8,56 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
+from kivy.uix.checkbox import CheckBox
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recyclegridlayout import RecycleGridLayout
+from kivy.properties import StringProperty, ListProperty, BooleanProperty
 from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.graphics import Color, Rectangle, RoundedRectangle, Line
 from kivy.core.window import Window
+from kasir_core.rollup import SalesRollupStore
+from kasir_core.archive import compact_closed_days
+from kasir_core.sync import SalesSync
+from kasir_core.tills import load_till_code, cloud_sync_enabled, multi_till_enabled, receipt_prefix, format_receipt_number, ConsolidatedReport
+from kasir_core.catalog import ProductCatalog
+from kasir_core.cart import Cart
+from kasir_core import storage
+from kasir_core.report import format_daily_report
+from screens.profiler import install_profiler
+from kasir_core.money import (to_rupiah, to_grams, grams_to_kg, line_total,
+                              parse_rupiah, parse_weight, format_kg)
 
 # Set window size for mobile (portrait mode)
 Window.size = (360, 640)
 
 class Product:
-    def __init__(self, id, name, price_per_kg, stock_kg=100):
+    def __init__(self, id, name, price_per_kg, stock_g=100000, plu=None):
         self.id = id
         self.name = name
-        self.price_per_kg = price_per_kg
-        self.stock_kg = stock_kg
+        self.price_per_kg = to_rupiah(price_per_kg)
+        self.stock_g = stock_g
+        self.plu = plu
+    
+    @property
+    def stock_kg(self):
+        return grams_to_kg(self.stock_g)
 
 class CartItem:
-    def __init__(self, product, weight_kg=1):
+    def __init__(self, product, weight_g=1000):
         self.product = product
-        self.weight_kg = weight_kg
+        self.weight_g = weight_g
+    
+    @property
+    def weight_kg(self):
+        return grams_to_kg(self.weight_g)
     
     def get_total(self):
-        return self.product.price_per_kg * self.weight_kg
+        return line_total(self.product.price_per_kg, self.weight_g)
 
 class Expense:
     def __init__(self, id, name, amount, date_time):
@@ -45,7 +71,7 @@ class UserSetupPopup(Popup):
         super().__init__(**kwargs)
         self.app_ref = app_ref
         self.title = 'Setup Awal'
-        self.size_hint = (0.9, 0.7)
+        self.size_hint = (0.9, 0.8)
         self.auto_dismiss = False
         
         layout = BoxLayout(orientation='vertical', spacing=dp(20), padding=dp(20))
@@ -103,6 +129,16 @@ class UserSetupPopup(Popup):
         )
         layout.add_widget(self.shop_input)
         
+        # Receipt numbers get this till's code only when the shop opts in
+        self.multi_till_check = self.add_option(
+            layout, f'Beberapa HP kasir (struk berawalan {app_ref.till_code})', multi_till_enabled()
+        )
+        
+        # Sales leave the device only after the shop turns this on
+        self.cloud_sync_check = self.add_option(
+            layout, 'Sinkron penjualan ke cloud (Firebase)', cloud_sync_enabled()
+        )
+        
         # Save button
         save_btn = Button(
             text='SIMPAN & MULAI',
@@ -117,6 +153,23 @@ class UserSetupPopup(Popup):
         
         self.content = layout
     
+    def add_option(self, layout, text, active):
+        """Add a checkbox row and return the checkbox"""
+        row = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(40), spacing=dp(10))
+        check = CheckBox(active=active, size_hint_x=None, width=dp(40), color=(0.2, 0.4, 0.8, 1))
+        row.add_widget(check)
+        label = Label(
+            text=text,
+            font_size=dp(13),
+            color=(0.2, 0.2, 0.2, 1),
+            halign='left',
+            valign='middle'
+        )
+        label.bind(size=lambda instance, value: setattr(instance, 'text_size', value))
+        row.add_widget(label)
+        layout.add_widget(row)
+        return check
+    
     def save_user_info(self, instance):
         username = self.name_input.text.strip()
         shop_name = self.shop_input.text.strip()
@@ -125,11 +178,22 @@ class UserSetupPopup(Popup):
             self.app_ref.show_popup("Error", "Nama pengguna tidak boleh kosong!")
             return
         
-        user_data = {
+        user_data = {}
+        try:
+            if os.path.exists('user_config.json'):
+                with open('user_config.json', 'r', encoding='utf-8') as f:
+                    user_data = json.load(f)
+        except Exception:
+            user_data = {}
+        
+        # Keep settings this popup does not show
+        user_data.update({
             'username': username,
             'shop_name': shop_name if shop_name else 'Toko Ayam Potong',
+            'multi_till': self.multi_till_check.active,
+            'cloud_sync': self.cloud_sync_check.active,
             'setup_date': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-        }
+        })
         
         try:
             with open('user_config.json', 'w', encoding='utf-8') as f:
@@ -137,6 +201,8 @@ class UserSetupPopup(Popup):
             
             self.app_ref.username = username
             self.app_ref.shop_name = user_data['shop_name']
+            self.app_ref.receipt_prefix = receipt_prefix()
+            self.app_ref.apply_cloud_sync(user_data['cloud_sync'])
             
             main_screen = self.app_ref.root.get_screen('main')
             main_screen.update_header()
@@ -249,16 +315,17 @@ class AddExpensePopup(Popup):
             return
         
         try:
-            amount = int(amount_text)
+            amount = parse_rupiah(amount_text)
             if amount <= 0:
                 self.app_ref.show_popup("Error", "Jumlah pengeluaran harus lebih dari 0!")
                 return
             
-            expense_id = len(self.app_ref.daily_expenses) + 1
-            expense = Expense(expense_id, name, amount, datetime.now())
+            now = datetime.now()
+            expense = Expense(storage.new_expense_id(now), name, amount, now)
             self.app_ref.daily_expenses.append(expense)
             
             self.app_ref.save_daily_expenses()
+            self.app_ref.rollups.record_expense(expense.date_time, amount, name)
             
             try:
                 expenses_screen = self.app_ref.root.get_screen('expenses')
@@ -272,23 +339,28 @@ class AddExpensePopup(Popup):
         except ValueError:
             self.app_ref.show_popup("Error", "Masukkan jumlah yang valid!")
 
-class ProductCard(BoxLayout):
-    def __init__(self, product, main_screen, **kwargs):
+class ProductCard(RecycleDataViewBehavior, BoxLayout):
+    """Recycled product card, filled from MainScreen.product_row()"""
+    product_id = StringProperty('')
+    product_name = StringProperty('')
+    price_text = StringProperty('')
+    stock_text = StringProperty('')
+    stock_color = ListProperty([0.1, 0.7, 0.1, 1])
+    in_stock = BooleanProperty(True)
+    
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.product = product
-        self.main_screen = main_screen
+        self.main_screen = None
         self.orientation = 'vertical'
-        self.size_hint_y = None
-        self.height = dp(130)
         self.spacing = dp(3)
         self.padding = dp(5)
         
         # Simple card design
         with self.canvas.before:
             Color(1, 1, 1, 1)
-            RoundedRectangle(size=self.size, pos=self.pos, radius=[dp(10)])
+            self.bg_rect = RoundedRectangle(size=self.size, pos=self.pos, radius=[dp(10)])
             Color(0.8, 0.8, 0.8, 1)
-            Line(
+            self.border_line = Line(
                 rounded_rectangle=(self.x, self.y, self.width, self.height, dp(10)),
                 width=1
             )
@@ -297,7 +369,6 @@ class ProductCard(BoxLayout):
         
         # Product name
         name_label = Label(
-            text=product.name,
             size_hint_y=None,
             height=dp(22),
             color=(0.1, 0.1, 0.1, 1),
@@ -308,7 +379,6 @@ class ProductCard(BoxLayout):
         
         # Price
         price_label = Label(
-            text=f'{self.main_screen.app_ref.format_currency(product.price_per_kg)}/kg',
             size_hint_y=None,
             height=dp(20),
             color=(0.1, 0.6, 0.1, 1),
@@ -317,13 +387,9 @@ class ProductCard(BoxLayout):
         )
         
         # Stock
-        stock_color = (0.1, 0.7, 0.1, 1) if product.stock_kg > 5 else (0.9, 0.6, 0.1, 1) if product.stock_kg > 0 else (0.9, 0.1, 0.1, 1)
-        
         stock_label = Label(
-            text=f'Stok: {product.stock_kg} kg',
             size_hint_y=None,
             height=dp(18),
-            color=stock_color,
             font_size=dp(9),
             bold=True
         )
@@ -332,9 +398,6 @@ class ProductCard(BoxLayout):
         buttons_layout = BoxLayout(size_hint_y=None, height=dp(45), spacing=dp(3))
         
         self.add_btn = Button(
-            text='+ TAMBAH' if product.stock_kg > 0 else 'HABIS',
-            disabled=product.stock_kg <= 0,
-            background_color=(0.1, 0.7, 0.3, 1) if product.stock_kg > 0 else (0.6, 0.6, 0.6, 1),
             font_size=dp(9),
             bold=True,
             size_hint_x=0.7
@@ -356,26 +419,48 @@ class ProductCard(BoxLayout):
         self.add_widget(price_label)
         self.add_widget(stock_label)
         self.add_widget(buttons_layout)
+        
+        self.bind(
+            product_name=name_label.setter('text'),
+            price_text=price_label.setter('text'),
+            stock_text=stock_label.setter('text'),
+            stock_color=stock_label.setter('color'),
+            in_stock=self.update_add_button
+        )
+        self.update_add_button(self, self.in_stock)
+    
+    @property
+    def product(self):
+        return self.main_screen.app_ref.products.get(self.product_id)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.main_screen = rv.main_screen
+        return super().refresh_view_attrs(rv, index, data)
+    
+    def update_add_button(self, instance, in_stock):
+        self.add_btn.text = '+ TAMBAH' if in_stock else 'HABIS'
+        self.add_btn.disabled = not in_stock
+        self.add_btn.background_color = (0.1, 0.7, 0.3, 1) if in_stock else (0.6, 0.6, 0.6, 1)
     
     def update_rect(self, instance, value):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(1, 1, 1, 1)
-            RoundedRectangle(size=self.size, pos=self.pos, radius=[dp(10)])
-            Color(0.8, 0.8, 0.8, 1)
-            Line(
-                rounded_rectangle=(self.x, self.y, self.width, self.height, dp(10)),
-                width=1
-            )
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+        self.border_line.rounded_rectangle = (self.x, self.y, self.width, self.height, dp(10))
     
     def show_weight_input(self, instance):
-        WeightInputPopup(self.product, self.main_screen).open()
+        product = self.product
+        if product is not None:
+            WeightInputPopup(product, self.main_screen).open()
     
     def confirm_delete(self, instance):
+        product = self.product
+        if product is None:
+            return
+        
         popup_layout = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
         
         message = Label(
-            text=f'Yakin ingin menghapus produk:\n"{self.product.name}"?',
+            text=f'Yakin ingin menghapus produk:\n"{product.name}"?',
             size_hint_y=None,
             height=dp(60),
             font_size=dp(14),
@@ -412,16 +497,15 @@ class ProductCard(BoxLayout):
         )
         
         def delete_product(btn):
-            self.main_screen.app_ref.products.remove(self.product)
-            cart_items_to_remove = [item for item in self.main_screen.app_ref.cart if item.product.id == self.product.id]
+            main_screen = self.main_screen
+            main_screen.app_ref.products.remove(product)
+            cart_items_to_remove = [item for item in main_screen.app_ref.cart if item.product.id == product.id]
             for item in cart_items_to_remove:
-                self.main_screen.app_ref.cart.remove(item)
+                main_screen.app_ref.cart.remove(item)
             
-            self.main_screen.app_ref.save_products()
-            self.main_screen.refresh_products()
-            self.main_screen.refresh_cart()
+            main_screen.app_ref.save_products()
             
-            self.main_screen.app_ref.show_popup("Sukses", f'Produk "{self.product.name}" berhasil dihapus!')
+            main_screen.app_ref.show_popup("Sukses", f'Produk "{product.name}" berhasil dihapus!')
             confirm_popup.dismiss()
         
         yes_btn.bind(on_press=delete_product)
@@ -441,7 +525,7 @@ class WeightInputPopup(Popup):
         
         # Product info
         info_label = Label(
-            text=f'{product.name}\nHarga: {main_screen.app_ref.format_currency(product.price_per_kg)}/kg\nStok: {product.stock_kg} kg',
+            text=f'{product.name}\nHarga: {main_screen.app_ref.format_currency(product.price_per_kg)}/kg\nStok: {format_kg(product.stock_g)} kg',
             size_hint_y=None,
             height=dp(70),
             font_size=dp(14),
@@ -529,46 +613,34 @@ class WeightInputPopup(Popup):
     
     def update_total(self, instance, text):
         try:
-            weight = float(text) if text else 0
-            total = self.product.price_per_kg * weight
+            weight_g = parse_weight(text) if text else 0
+            total = line_total(self.product.price_per_kg, weight_g)
             self.total_label.text = f'Total: {self.main_screen.app_ref.format_currency(total)}'
         except:
             self.total_label.text = 'Total: Rp 0'
     
     def add_to_cart(self, instance):
         try:
-            weight = float(self.weight_input.text)
+            weight_g = parse_weight(self.weight_input.text)
             
-            if weight <= 0:
+            if weight_g <= 0:
                 self.main_screen.app_ref.show_popup("Error", "Berat harus lebih dari 0!")
                 return
             
-            if weight > self.product.stock_kg:
-                self.main_screen.app_ref.show_popup("Error", f"Stok tidak mencukupi!\nStok tersedia: {self.product.stock_kg} kg")
+            if weight_g > self.product.stock_g:
+                self.main_screen.app_ref.show_popup("Error", f"Stok tidak mencukupi!\nStok tersedia: {format_kg(self.product.stock_g)} kg")
                 return
             
-            # Check if product already in cart
-            existing_item = None
-            for cart_item in self.main_screen.app_ref.cart:
-                if cart_item.product.id == self.product.id:
-                    existing_item = cart_item
-                    break
-            
+            # Check if product already in cart; the cart view follows the cart events
+            cart = self.main_screen.app_ref.cart
+            existing_item = cart.find(self.product)
             if existing_item:
-                if existing_item.weight_kg + weight > self.product.stock_kg + existing_item.weight_kg:
-                    self.main_screen.app_ref.show_popup("Error", "Stok tidak mencukupi!")
-                    return
-                existing_item.weight_kg += weight
+                cart.update(existing_item, existing_item.weight_g + weight_g)
             else:
-                cart_item = CartItem(self.product, weight)
-                self.main_screen.app_ref.cart.append(cart_item)
-            
-            # Update stock
-            self.product.stock_kg -= weight
+                cart.add(CartItem(self.product, weight_g))
             
-            # Refresh displays
-            self.main_screen.refresh_cart()
-            self.main_screen.refresh_products()
+            # Update stock (the product grid follows the catalog)
+            self.main_screen.app_ref.products.change_stock(self.product.id, -weight_g)
             self.dismiss()
             
         except ValueError:
@@ -626,7 +698,7 @@ class CartItemWidget(BoxLayout):
         
         # Weight info
         self.weight_label = Label(
-            text=f'{cart_item.weight_kg} kg × {self.main_screen.app_ref.format_currency(cart_item.product.price_per_kg)}/kg',
+            text=f'{format_kg(cart_item.weight_g)} kg × {self.main_screen.app_ref.format_currency(cart_item.product.price_per_kg)}/kg',
             color=(0.4, 0.4, 0.4, 1),
             font_size=dp(8),
             size_hint_y=None,
@@ -647,6 +719,12 @@ class CartItemWidget(BoxLayout):
         self.add_widget(self.weight_label)
         self.add_widget(self.total_label)
     
+    def refresh(self):
+        """Update the labels after the item weight changed"""
+        app = self.main_screen.app_ref
+        self.weight_label.text = f'{format_kg(self.cart_item.weight_g)} kg × {app.format_currency(self.cart_item.product.price_per_kg)}/kg'
+        self.total_label.text = app.format_currency(self.cart_item.get_total())
+    
     def update_rect(self, instance, value):
         self.canvas.before.clear()
         with self.canvas.before:
@@ -749,6 +827,27 @@ class AddProductPopup(Popup):
         )
         layout.add_widget(self.stock_input)
         
+        # PLU / short code
+        plu_label = Label(
+            text='Kode PLU (opsional):',
+            size_hint_y=None,
+            height=dp(25),
+            font_size=dp(13),
+            bold=True,
+            color=(0.2, 0.2, 0.2, 1),
+            halign='left'
+        )
+        layout.add_widget(plu_label)
+        
+        self.plu_input = TextInput(
+            multiline=False,
+            size_hint_y=None,
+            height=dp(45),
+            hint_text='Kode singkat untuk input cepat, contoh: 12',
+            font_size=dp(14)
+        )
+        layout.add_widget(self.plu_input)
+        
         # Action buttons
         buttons_layout = BoxLayout(size_hint_y=None, height=dp(50), spacing=dp(15))
         
@@ -789,8 +888,8 @@ class AddProductPopup(Popup):
             return
         
         try:
-            price = int(price_text)
-            stock = float(stock_text) if stock_text else 10
+            price = parse_rupiah(price_text)
+            stock = parse_weight(stock_text) if stock_text else 10000
             
             if price <= 0:
                 self.main_screen.app_ref.show_popup("Error", "Harga harus lebih dari 0!")
@@ -800,14 +899,16 @@ class AddProductPopup(Popup):
                 self.main_screen.app_ref.show_popup("Error", "Stok harus lebih dari 0!")
                 return
             
-            max_id = max([p.id for p in self.main_screen.app_ref.products]) if self.main_screen.app_ref.products else 0
-            new_id = max_id + 1
+            products = self.main_screen.app_ref.products
+            plu = self.plu_input.text.strip() or None
+            if plu and products.get_by_plu(plu):
+                self.main_screen.app_ref.show_popup("Error", f"Kode PLU {plu} sudah dipakai!")
+                return
             
-            new_product = Product(new_id, name, price, stock)
-            self.main_screen.app_ref.products.append(new_product)
+            new_product = Product(products.next_id(), name, price, stock, plu)
+            products.add(new_product)
             
             self.main_screen.app_ref.save_products()
-            self.main_screen.refresh_products()
             
             self.main_screen.app_ref.show_popup("Sukses", f"Produk '{name}' berhasil ditambahkan!")
             self.dismiss()
@@ -932,7 +1033,7 @@ class PaymentPopup(Popup):
     
     def calculate_change(self, instance, text):
         try:
-            payment = int(text) if text else 0
+            payment = parse_rupiah(text) if text else 0
             change = payment - self.total_amount
             
             if payment >= self.total_amount:
@@ -950,7 +1051,7 @@ class PaymentPopup(Popup):
     
     def process_payment(self, instance):
         try:
-            payment = int(self.payment_input.text)
+            payment = parse_rupiah(self.payment_input.text)
             change = payment - self.total_amount
             
             self.main_screen.app_ref.last_payment = payment
@@ -1044,17 +1145,33 @@ class MainScreen(Screen):
         add_product_btn.bind(on_press=self.show_add_product_popup)
         products_section.add_widget(add_product_btn)
         
-        # Products grid
-        products_scroll = ScrollView()
-        self.products_grid = GridLayout(
+        # Search by name or PLU
+        self.search_input = TextInput(
+            multiline=False,
+            size_hint_y=None,
+            height=dp(36),
+            hint_text='Cari produk / kode PLU',
+            font_size=dp(12)
+        )
+        self.search_input.bind(text=lambda instance, text: self.refresh_products())
+        self.search_input.bind(on_text_validate=self.select_by_plu)
+        products_section.add_widget(self.search_input)
+        
+        # Products grid: recycled cards bound to the catalog
+        self.products_rv = RecycleView()
+        self.products_rv.main_screen = self
+        self.products_grid = RecycleGridLayout(
             cols=1, 
             spacing=dp(5), 
             size_hint_y=None,
-            padding=dp(5)
+            padding=dp(5),
+            default_size=(None, dp(130)),
+            default_size_hint=(1, None)
         )
         self.products_grid.bind(minimum_height=self.products_grid.setter('height'))
-        products_scroll.add_widget(self.products_grid)
-        products_section.add_widget(products_scroll)
+        self.products_rv.add_widget(self.products_grid)
+        self.products_rv.viewclass = ProductCard
+        products_section.add_widget(self.products_rv)
         
         content.add_widget(products_section)
         
@@ -1226,22 +1343,83 @@ class MainScreen(Screen):
     def load_products(self, dt=None):
         if self.app_ref:
             self.refresh_products()
+            self.refresh_cart()
     
     def refresh_products(self):
-        self.products_grid.clear_widgets()
-        
+        """Rebuild the grid data; card widgets are recycled, not recreated"""
         if not self.app_ref:
+            self.products_rv.data = []
             return
         
-        for product in self.app_ref.products:
-            product_widget = ProductCard(product, self)
-            self.products_grid.add_widget(product_widget)
+        self.bind_catalog()
+        products = self.app_ref.products.search(self.search_input.text)
+        self.product_rows = {product.id: index for index, product in enumerate(products)}
+        self.products_rv.data = [self.product_row(product) for product in products]
+    
+    def product_row(self, product):
+        """RecycleView data for one ProductCard"""
+        stock_color = (0.1, 0.7, 0.1, 1) if product.stock_g > 5000 else (0.9, 0.6, 0.1, 1) if product.stock_g > 0 else (0.9, 0.1, 0.1, 1)
+        return {
+            'product_id': product.id,
+            'product_name': product.name,
+            'price_text': f'{self.app_ref.format_currency(product.price_per_kg)}/kg',
+            'stock_text': f'Stok: {format_kg(product.stock_g)} kg',
+            'stock_color': stock_color,
+            'in_stock': product.stock_g > 0
+        }
+    
+    def bind_catalog(self):
+        """Follow add/update/remove events of the app's catalog"""
+        catalog = self.app_ref.products
+        bound = getattr(self, 'bound_catalog', None)
+        if bound is catalog:
+            return
+        if bound is not None:
+            bound.unbind(self.on_catalog_change)
+        catalog.bind(self.on_catalog_change)
+        self.bound_catalog = catalog
+    
+    def on_catalog_change(self, event, product):
+        index = getattr(self, 'product_rows', {}).get(product.id)
+        if event == 'update' and index is not None:
+            # Only this product's card is refreshed
+            self.products_rv.data[index] = self.product_row(product)
+        else:
+            self.refresh_products()
+    
+    def select_by_plu(self, instance):
+        """Enter on the search box opens the weight input of a PLU match"""
+        product = self.app_ref.products.get_by_plu(instance.text) if self.app_ref else None
+        if product is None:
+            return
+        instance.text = ''
+        if product.stock_g > 0:
+            WeightInputPopup(product, self).open()
     
     def refresh_cart(self):
+        """Rebuild the whole cart view and follow the cart's events from now on"""
         self.cart_list.clear_widgets()
+        self.cart_widgets = {}
         
-        if not self.app_ref or not self.app_ref.cart:
-            empty_label = Label(
+        if not self.app_ref:
+            self.cart_list.add_widget(self.empty_cart_label())
+            return
+        
+        cart = self.app_ref.cart
+        bound = getattr(self, 'bound_cart', None)
+        if bound is not cart:
+            if bound is not None:
+                bound.unbind(self.on_cart_change)
+            cart.bind(self.on_cart_change)
+            self.bound_cart = cart
+        
+        for cart_item in cart:
+            self.on_cart_change('add', cart_item)
+        self.update_cart_summary()
+    
+    def empty_cart_label(self):
+        if getattr(self, 'empty_label', None) is None:
+            self.empty_label = Label(
                 text='Keranjang kosong\n\nTambahkan produk',
                 color=(0.6, 0.6, 0.6, 1),
                 font_size=dp(11),
@@ -1249,39 +1427,53 @@ class MainScreen(Screen):
                 size_hint_y=None,
                 height=dp(60)
             )
-            self.cart_list.add_widget(empty_label)
-        else:
-            for cart_item in self.app_ref.cart:
-                item_widget = CartItemWidget(cart_item, self)
-                self.cart_list.add_widget(item_widget)
-        
-        if self.app_ref:
-            total = self.app_ref.get_cart_total()
-            self.total_label.text = f'TOTAL: {self.app_ref.format_currency(total)}'
-            
-            total_weight = sum(item.weight_kg for item in self.app_ref.cart)
-            total_items = len(self.app_ref.cart)
-            self.cart_title.text = f'KERANJANG ({total_items} item, {total_weight} kg)'
-            
-            self.checkout_btn.disabled = len(self.app_ref.cart) == 0
+        return self.empty_label
+    
+    def on_cart_change(self, event, cart_item):
+        """Apply one cart change to the view instead of rebuilding it"""
+        if event == 'add':
+            if self.empty_cart_label().parent is self.cart_list:
+                self.cart_list.remove_widget(self.empty_label)
+            item_widget = CartItemWidget(cart_item, self)
+            self.cart_widgets[id(cart_item)] = item_widget
+            # BoxLayout lists children last-first, index 0 appends at the bottom
+            self.cart_list.add_widget(item_widget, index=0)
+        elif event == 'update':
+            item_widget = self.cart_widgets.get(id(cart_item))
+            if item_widget is not None:
+                item_widget.refresh()
+        elif event == 'remove':
+            item_widget = self.cart_widgets.pop(id(cart_item), None)
+            if item_widget is not None:
+                self.cart_list.remove_widget(item_widget)
+        elif event == 'clear':
+            self.cart_list.clear_widgets()
+            self.cart_widgets = {}
+        self.update_cart_summary()
+    
+    def update_cart_summary(self):
+        """Totals come from the cart's running sums"""
+        cart = self.app_ref.cart
+        if not cart and self.empty_cart_label().parent is None:
+            self.cart_list.add_widget(self.empty_label)
+        
+        self.total_label.text = f'TOTAL: {self.app_ref.format_currency(cart.total)}'
+        self.cart_title.text = f'KERANJANG ({cart.count} item, {format_kg(cart.weight_g)} kg)'
+        self.checkout_btn.disabled = not cart
     
     def remove_cart_item(self, cart_item):
         if self.app_ref:
-            cart_item.product.stock_kg += cart_item.weight_kg
+            self.app_ref.products.change_stock(cart_item.product.id, cart_item.weight_g)
             self.app_ref.cart.remove(cart_item)
-            self.refresh_cart()
-            self.refresh_products()
     
     def clear_cart(self, instance):
         if not self.app_ref or not self.app_ref.cart:
             return
         
         for cart_item in self.app_ref.cart:
-            cart_item.product.stock_kg += cart_item.weight_kg
+            self.app_ref.products.change_stock(cart_item.product.id, cart_item.weight_g)
         
-        self.app_ref.cart = []
-        self.refresh_cart()
-        self.refresh_products()
+        self.app_ref.cart.clear()
 
 class ExpensesScreen(Screen):
     def __init__(self, **kwargs):
@@ -1570,6 +1762,14 @@ class ReportsScreen(Screen):
         )
         history_btn.bind(on_press=self.show_report_history)
         
+        consolidated_btn = Button(
+            text='LAPORAN\nGABUNGAN',
+            background_color=(0.2, 0.4, 0.8, 1),
+            font_size=dp(12),
+            bold=True
+        )
+        consolidated_btn.bind(on_press=self.show_consolidated_report)
+        
         back_btn = Button(
             text='KEMBALI',
             background_color=(0.5, 0.5, 0.5, 1),
@@ -1581,6 +1781,7 @@ class ReportsScreen(Screen):
         
         actions_layout.add_widget(generate_btn)
         actions_layout.add_widget(history_btn)
+        actions_layout.add_widget(consolidated_btn)
         actions_layout.add_widget(back_btn)
         main_layout.add_widget(actions_layout)
         
@@ -1601,7 +1802,7 @@ class ReportsScreen(Screen):
         
         # Report text with black text on white background
         self.report_content = Label(
-            text='Klik "BUAT LAPORAN HARI INI" untuk melihat ringkasan\n\nLaporan akan menampilkan:\n\n• Total Pendapatan\n• Total Pengeluaran\n• Keuntungan Bersih\n• Detail Transaksi\n• Detail Pengeluaran\n\nSemua data tersimpan otomatis',
+            text='Klik "BUAT LAPORAN HARI INI" untuk melihat ringkasan\n\nLaporan akan menampilkan:\n\n• Total Pendapatan\n• Total Pengeluaran\n• Keuntungan Bersih\n• Penjualan per Produk & per Jam\n• Detail Pengeluaran\n\nSemua data tersimpan otomatis',
             color=(0, 0, 0, 1),  # Black text
             font_size=dp(16),
             bold=True,
@@ -1632,7 +1833,7 @@ class ReportsScreen(Screen):
     
     def reset_report_content(self):
         """Reset report content when navigating"""
-        self.report_content.text = 'Klik "BUAT LAPORAN HARI INI" untuk melihat ringkasan\n\nLaporan akan menampilkan:\n\n• Total Pendapatan\n• Total Pengeluaran\n• Keuntungan Bersih\n• Detail Transaksi\n• Detail Pengeluaran\n\nSemua data tersimpan otomatis'
+        self.report_content.text = 'Klik "BUAT LAPORAN HARI INI" untuk melihat ringkasan\n\nLaporan akan menampilkan:\n\n• Total Pendapatan\n• Total Pengeluaran\n• Keuntungan Bersih\n• Penjualan per Produk & per Jam\n• Detail Pengeluaran\n\nSemua data tersimpan otomatis'
     
     def go_back(self, instance):
         self.reset_report_content()
@@ -1646,82 +1847,15 @@ class ReportsScreen(Screen):
         today = date.today()
         today_str = today.strftime('%d/%m/%Y')
         
-        # Get today's transactions
-        today_transactions = []
-        try:
-            if os.path.exists('transactions/transactions.json'):
-                with open('transactions/transactions.json', 'r', encoding='utf-8') as f:
-                    all_transactions = json.load(f)
-                    today_transactions = [t for t in all_transactions if t['date'] == today_str]
-        except:
-            pass
+        # Today's totals come from the rollups, no transaction scan needed
+        rollup = self.app_ref.rollups.get_day(today)
         
         # Get today's expenses
         today_expenses = [exp for exp in self.app_ref.daily_expenses if exp.date_time.date() == today]
+        net_profit = rollup['gross'] - rollup['expenses']
         
-        # Calculate totals
-        total_income = sum(t['subtotal'] for t in today_transactions)
-        total_expenses = sum(exp.amount for exp in today_expenses)
-        net_profit = total_income - total_expenses
-        
-        # Generate report
-        report_lines = []
-        report_lines.append("=" * 40)
-        report_lines.append(f"         LAPORAN HARIAN")
-        report_lines.append(f"           {today_str}")
-        report_lines.append(f"       {self.app_ref.shop_name}")
-        report_lines.append(f"      Kasir: {self.app_ref.username}")
-        report_lines.append("=" * 40)
-        report_lines.append("")
-        report_lines.append("RINGKASAN PENJUALAN:")
-        report_lines.append("-" * 40)
-        report_lines.append(f"Jumlah Transaksi    : {len(today_transactions)}")
-        report_lines.append(f"Total Pendapatan    : {self.app_ref.format_currency(total_income)}")
-        report_lines.append("")
-        
-        if today_transactions:
-            report_lines.append("DETAIL TRANSAKSI:")
-            report_lines.append("-" * 40)
-            for i, trans in enumerate(today_transactions, 1):
-                report_lines.append(f"{i:2d}. {trans['receipt_number']} - {trans['time']}")
-                report_lines.append(f"    Total: {self.app_ref.format_currency(trans['subtotal'])}")
-                if i < len(today_transactions):
-                    report_lines.append("")
-        else:
-            report_lines.append("DETAIL TRANSAKSI:")
-            report_lines.append("-" * 40)
-            report_lines.append("Belum ada transaksi hari ini")
-        
-        report_lines.append("")
-        report_lines.append("PENGELUARAN HARI INI:")
-        report_lines.append("-" * 40)
-        
-        if today_expenses:
-            for i, exp in enumerate(today_expenses, 1):
-                time_str = exp.date_time.strftime('%H:%M')
-                report_lines.append(f"{i:2d}. {time_str} - {exp.name}")
-                report_lines.append(f"    {self.app_ref.format_currency(exp.amount)}")
-                if i < len(today_expenses):
-                    report_lines.append("")
-        else:
-            report_lines.append("Belum ada pengeluaran hari ini")
-        
-        report_lines.append("")
-        report_lines.append("-" * 40)
-        report_lines.append(f"TOTAL PENGELUARAN   : {self.app_ref.format_currency(total_expenses)}")
-        report_lines.append("")
-        report_lines.append("=" * 40)
-        report_lines.append("KEUNTUNGAN BERSIH:")
-        if net_profit >= 0:
-            report_lines.append(f"+ {self.app_ref.format_currency(net_profit)}")
-        else:
-            report_lines.append(f"- {self.app_ref.format_currency(abs(net_profit))}")
-        report_lines.append("=" * 40)
-        report_lines.append("")
-        report_lines.append(f"Laporan dibuat: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        report_lines.append(f"Oleh: {self.app_ref.username}")
-        
-        report_text = "\n".join(report_lines)
+        report_text = format_daily_report(rollup, today_expenses, self.app_ref.shop_name,
+                                          self.app_ref.username, self.app_ref.format_currency)
         self.report_content.text = report_text
         
         # Auto save report
@@ -1734,9 +1868,40 @@ class ReportsScreen(Screen):
         profit_text = "PROFIT" if net_profit >= 0 else "LOSS"
         self.app_ref.show_popup("Laporan Berhasil", f"Laporan harian berhasil dibuat!\n\n{profit_text}: {self.app_ref.format_currency(abs(net_profit))}\n\nPengeluaran harian telah di-reset")
     
+    def show_consolidated_report(self, instance):
+        """Today's report for all tills: this one plus the others from Firebase"""
+        if not self.app_ref:
+            return
+        
+        app = self.app_ref
+        today = date.today()
+        app.consolidated.set_till_day(app.till_code, today, app.rollups.get_day(today))
+        self.report_content.text = app.consolidated.format_day(today, app.format_currency)
+        
+        if not app.sales_sync:
+            return
+        
+        self.report_content.text += '\n\nMengambil data kasir lain...'
+        
+        def pull_in_background():
+            try:
+                app.consolidated.pull_cloud(app.sales_sync.transport, today, skip=(app.till_code,))
+            except Exception as e:
+                print(f"Error pulling consolidated report: {e}")
+            Clock.schedule_once(
+                lambda dt: setattr(self.report_content, 'text', app.consolidated.format_day(today, app.format_currency)), 0
+            )
+        
+        threading.Thread(target=pull_in_background, daemon=True).start()
+    
     def reset_daily_expenses(self):
-        """Reset daily expenses after generating report"""
+        """Reset daily expenses after generating report
+        
+        The day's expense totals in the rollups go too, so the next report
+        does not show a total for expenses that are no longer listed.
+        """
         self.app_ref.daily_expenses = []
+        self.app_ref.rollups.clear_expenses(date.today())
         self.app_ref.save_daily_expenses()
         
         try:
@@ -2026,7 +2191,7 @@ class ReceiptScreen(Screen):
         
         for name, weight, price_per_kg, total in receipt_data['items']:
             name_part = name[:15].ljust(15)
-            weight_part = f"{weight} kg".rjust(8)
+            weight_part = f"{format_kg(to_grams(weight))} kg".rjust(8)
             total_part = f"{total:,}".rjust(12)
             receipt_lines.append(f"{name_part} {weight_part} {total_part}")
         
@@ -2074,9 +2239,6 @@ class ReceiptScreen(Screen):
     
     def new_transaction(self, instance):
         self.manager.current = 'main'
-        main_screen = self.manager.get_screen('main')
-        main_screen.refresh_cart()
-        main_screen.refresh_products()
 
 class KasirApp(App):
     def build(self):
@@ -2084,14 +2246,27 @@ class KasirApp(App):
         
         # Load user config
         self.username, self.shop_name = self.load_user_config()
+        # The till code names this device in the cloud; receipt numbers
+        # only carry it once multi-till is turned on
+        self.till_code = load_till_code()
+        self.receipt_prefix = receipt_prefix()
         
         self.products = self.load_products()
-        self.cart = []
+        self.cart = Cart()
         self.daily_expenses = self.load_daily_expenses()
         self.transaction_counter = self.load_transaction_counter()
         self.last_payment = 0
         self.last_change = 0
         
+        # Closed days move from transactions.json into the columnar archive
+        compact_closed_days()
+        self.rollups = SalesRollupStore()
+        self.consolidated = ConsolidatedReport()
+        self.sales_sync = self.start_sales_sync()
+        
+        # Frame-time and stall profiler, only with KASIR_PROFILE=1
+        self.profiler = install_profiler(self, 'profiler')
+        
         sm = ScreenManager()
         
         main_screen = MainScreen(name='main')
@@ -2128,49 +2303,61 @@ class KasirApp(App):
             pass
         return '', 'Toko Ayam Potong'
     
+    def start_sales_sync(self):
+        """Upload sales to Firebase in the background once cloud_sync is on"""
+        try:
+            if not cloud_sync_enabled():
+                return None
+            from transport.firebase import FirebaseTransport
+        except ImportError:
+            print("Sinkron kasir nonaktif: modul requests tidak tersedia")
+            return None
+        except Exception as e:
+            print(f"Error starting kasir sync: {e}")
+            return None
+        
+        sales_sync = SalesSync(FirebaseTransport(connect=False), till_id=self.till_code)
+        sales_sync.set_info(self.username, self.shop_name)
+        sales_sync.set_rollups(self.rollups.days)
+        sales_sync.set_stock(self.products)
+        sales_sync.start()
+        return sales_sync
+    
+    def apply_cloud_sync(self, enabled):
+        """Start or stop the sync worker after the setting changed"""
+        if enabled and not self.sales_sync:
+            self.sales_sync = self.start_sales_sync()
+        elif not enabled and self.sales_sync:
+            self.sales_sync.stop()
+            self.sales_sync = None
+    
+    def kick_sales_sync(self):
+        """Hand the sync worker fresh rollups and wake it on the next frame
+        
+        The worker thread never touches self.rollups; the copy is taken here
+        on the UI thread, after the caller has finished updating them.
+        """
+        if self.sales_sync:
+            Clock.schedule_once(lambda dt: self._kick_sales_sync(), 0)
+    
+    def _kick_sales_sync(self):
+        self.sales_sync.set_info(self.username, self.shop_name)
+        self.sales_sync.set_rollups(self.rollups.days)
+        self.sales_sync.kick()
+    
     def load_daily_expenses(self):
         """Load daily expenses"""
         try:
-            today = date.today().strftime('%Y-%m-%d')
-            filename = f'expenses/expenses_{today}.json'
-            
-            if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    expenses = []
-                    for item in data:
-                        expense_date = datetime.strptime(item['date_time'], '%Y-%m-%d %H:%M:%S')
-                        expenses.append(Expense(
-                            item['id'], item['name'], item['amount'], expense_date
-                        ))
-                    return expenses
-        except:
-            pass
+            return storage.load_expenses(expense_class=Expense)
+        except Exception as e:
+            print(f"Error loading expenses: {e}")
         return []
     
     def save_daily_expenses(self):
         """Save daily expenses"""
         try:
-            if not os.path.exists('expenses'):
-                os.makedirs('expenses')
-            
-            today = date.today().strftime('%Y-%m-%d')
-            filename = f'expenses/expenses_{today}.json'
-            
-            data = []
-            today_expenses = [exp for exp in self.daily_expenses if exp.date_time.date() == date.today()]
-            
-            for expense in today_expenses:
-                data.append({
-                    'id': expense.id,
-                    'name': expense.name,
-                    'amount': expense.amount,
-                    'date_time': expense.date_time.strftime('%Y-%m-%d %H:%M:%S')
-                })
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                
+            storage.save_expenses(self.daily_expenses)
+            self.kick_sales_sync()
         except Exception as e:
             print(f"Error saving expenses: {e}")
     
@@ -2179,57 +2366,39 @@ class KasirApp(App):
     
     def load_products(self):
         try:
-            if os.path.exists('products.json'):
-                with open('products.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    products = []
-                    for item in data:
-                        products.append(Product(
-                            item['id'], item['name'], item['price_per_kg'], 
-                            item['stock_kg']
-                        ))
-                    return products
-        except:
-            pass
-        
-        return [
-            Product(1, "Sayap Ayam", 35000, 15.0),
-            Product(2, "Ceker Ayam", 25000, 10.0),
-            Product(3, "Ati Ampela", 30000, 8.0),
-            Product(4, "Dada Ayam", 45000, 12.0),
-            Product(5, "Paha Ayam", 40000, 20.0),
-            Product(6, "Leher Ayam", 20000, 5.0),
-        ]
+            products = storage.load_products(product_class=Product)
+            if products is not None:
+                return products
+        except Exception as e:
+            print(f"Error loading products: {e}")
+        
+        return ProductCatalog([
+            Product(1, "Sayap Ayam", 35000, 15000),
+            Product(2, "Ceker Ayam", 25000, 10000),
+            Product(3, "Ati Ampela", 30000, 8000),
+            Product(4, "Dada Ayam", 45000, 12000),
+            Product(5, "Paha Ayam", 40000, 20000),
+            Product(6, "Leher Ayam", 20000, 5000),
+        ])
     
     def save_products(self):
         try:
-            data = []
-            for product in self.products:
-                data.append({
-                    'id': product.id,
-                    'name': product.name,
-                    'price_per_kg': product.price_per_kg,
-                    'stock_kg': product.stock_kg
-                })
-            with open('products.json', 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            storage.save_products(self.products)
+            if self.sales_sync:
+                self.sales_sync.set_stock(self.products)
         except Exception as e:
             print(f"Error saving products: {e}")
     
     def load_transaction_counter(self):
         try:
-            if os.path.exists('counter.json'):
-                with open('counter.json', 'r') as f:
-                    data = json.load(f)
-                    return data.get('counter', 1)
-        except:
-            pass
+            return storage.load_counter()
+        except Exception as e:
+            print(f"Error loading counter: {e}")
         return 1
     
     def save_transaction_counter(self):
         try:
-            with open('counter.json', 'w') as f:
-                json.dump({'counter': self.transaction_counter}, f)
+            storage.save_counter(self.transaction_counter)
         except Exception as e:
             print(f"Error saving counter: {e}")
     
@@ -2240,10 +2409,7 @@ class KasirApp(App):
             return "Rp 0"
     
     def get_cart_total(self):
-        try:
-            return sum(item.get_total() for item in self.cart)
-        except:
-            return 0
+        return self.cart.total
     
     def checkout(self):
         try:
@@ -2253,12 +2419,14 @@ class KasirApp(App):
             
             receipt_data = self.generate_receipt()
             self.save_transaction(receipt_data)
+            self.rollups.record_receipt(receipt_data)
             
-            self.cart = []
+            self.cart.clear()
             
             self.transaction_counter += 1
             self.save_transaction_counter()
             self.save_products()
+            self.kick_sales_sync()
             
             receipt_screen = self.root.get_screen('receipt')
             receipt_screen.show_receipt(receipt_data)
@@ -2270,26 +2438,12 @@ class KasirApp(App):
     
     def generate_receipt(self):
         try:
-            now = datetime.now()
-            receipt_number = f"TRX{self.transaction_counter:06d}"
-            
-            subtotal = self.get_cart_total()
-            
-            receipt_data = {
-                'receipt_number': receipt_number,
-                'date': now.strftime('%d/%m/%Y'),
-                'time': now.strftime('%H:%M:%S'),
-                'username': self.username,
-                'shop_name': self.shop_name,
-                'items': [(item.product.name, item.weight_kg, item.product.price_per_kg, item.get_total()) 
-                         for item in self.cart],
-                'subtotal': subtotal,
-                'payment': getattr(self, 'last_payment', 0),
-                'change': getattr(self, 'last_change', 0)
-            }
-            
-            return receipt_data
-            
+            receipt_number = format_receipt_number(self.transaction_counter, self.receipt_prefix)
+            return storage.make_receipt(
+                self.cart, receipt_number, self.username, self.shop_name,
+                payment=getattr(self, 'last_payment', 0),
+                change=getattr(self, 'last_change', 0)
+            )
         except Exception as e:
             print(f"Error generating receipt: {e}")
             return {}
@@ -2297,23 +2451,8 @@ class KasirApp(App):
     def save_transaction(self, receipt_data):
         """Auto save transaction"""
         try:
-            if not os.path.exists('transactions'):
-                os.makedirs('transactions')
-            
-            transactions = []
-            transaction_file = 'transactions/transactions.json'
-            
-            if os.path.exists(transaction_file):
-                with open(transaction_file, 'r', encoding='utf-8') as f:
-                    transactions = json.load(f)
-            
-            transactions.append(receipt_data)
-            
-            with open(transaction_file, 'w', encoding='utf-8') as f:
-                json.dump(transactions, f, ensure_ascii=False, indent=2)
-            
+            storage.append_transaction(receipt_data)
             print(f"Transaksi tersimpan: {receipt_data['receipt_number']}")
-            
         except Exception as e:
             print(f"Error saving transaction: {e}")
     
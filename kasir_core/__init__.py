@@ -0,0 +1,3 @@
+"""
+Inti kasir tanpa UI: uang, katalog, keranjang, rollup, arsip dan analitik.
+"""
@@ -0,0 +1,330 @@
+"""
+Analitik penjualan lintas tanggal dari jurnal transaksi.
+
+Arsip hari yang sudah ditutup (kasir_core.archive) dan jurnal hari berjalan dimuat
+sekali ke kolom bertipe (satu array per field, nama produk di-intern), lalu
+setiap query memotong rentang hari dengan bisect dan hanya menjumlahkan
+kolom yang dibutuhkan. NumPy dipakai jika tersedia; tanpa NumPy
+perhitungan tetap berjalan di atas modul array bawaan. NumPy baru diimpor
+saat query pertama, bukan saat modul ini dimuat.
+"""
+
+import bisect
+import json
+import os
+from array import array
+from datetime import date, datetime, timedelta
+
+from kasir_core.archive import ARCHIVE_DIR, ArchiveReader, archive_path, archived_days
+from kasir_core.money import to_rupiah, to_grams
+from kasir_core.rollup import TRANSACTION_FILE, receipt_time
+
+_numpy = None
+
+
+def get_numpy():
+    """Import NumPy on first use; returns None if it is not installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def to_ordinal(value):
+    """Return the day ordinal of a date or datetime"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+class TransactionColumns:
+    """Columnar copy of the transaction journal, sorted by day"""
+    def __init__(self):
+        # One row per transaction
+        self.day = array('l')
+        self.hour = array('b')
+        self.subtotal = array('q')
+
+        # One row per sold item
+        self.item_day = array('l')
+        self.item_product = array('l')
+        self.item_grams = array('q')
+        self.item_revenue = array('q')
+
+        self.product_names = []
+        self.product_index = {}
+        self.last_time = None
+
+    def __len__(self):
+        return len(self.day)
+
+    def intern(self, name):
+        """Return the integer id of a product name"""
+        index = self.product_index.get(name)
+        if index is None:
+            index = len(self.product_names)
+            self.product_index[name] = index
+            self.product_names.append(name)
+        return index
+
+    def append(self, when, receipt_data):
+        """Append one transaction; returns False if its day is before the last one
+
+        Queries only bisect on the day, so rows of one day may come in any
+        order (late entries of an archived day follow the archive).
+        """
+        if self.last_time is not None and when.date() < self.last_time.date():
+            return False
+        if self.last_time is None or when > self.last_time:
+            self.last_time = when
+
+        ordinal = when.toordinal()
+        self.day.append(ordinal)
+        self.hour.append(when.hour)
+        self.subtotal.append(to_rupiah(receipt_data.get('subtotal', 0)))
+
+        for item in receipt_data.get('items', []):
+            self.item_day.append(ordinal)
+            self.item_product.append(self.intern(item[0]))
+            self.item_grams.append(to_grams(item[1]))
+            self.item_revenue.append(to_rupiah(item[3]))
+        return True
+
+    def extend_archive(self, reader):
+        """Append a whole archived day, reading only the needed columns"""
+        day = datetime.strptime(reader.day, '%Y-%m-%d')
+        ordinal = day.toordinal()
+        if self.last_time is not None and day < self.last_time.replace(hour=0, minute=0, second=0, microsecond=0):
+            return False
+
+        times = reader.column('time')
+        subtotal = reader.column('subtotal')
+        products = reader.column('item_product')
+        grams = reader.column('item_grams')
+        totals = reader.column('item_total')
+        try:
+            self.day.extend([ordinal] * reader.rows)
+            self.hour.extend(seconds // 3600 for seconds in times)
+            self.subtotal.extend(subtotal)
+
+            names = {}
+            for string_id in products:
+                if string_id not in names:
+                    names[string_id] = self.intern(reader.strings[string_id])
+            self.item_day.extend([ordinal] * reader.item_rows)
+            self.item_product.extend(names[string_id] for string_id in products)
+            self.item_grams.extend(grams)
+            self.item_revenue.extend(totals)
+
+            if reader.rows:
+                last = times[reader.rows - 1]
+                last_time = day.replace(hour=last // 3600, minute=last // 60 % 60, second=last % 60)
+                if self.last_time is None or last_time > self.last_time:
+                    self.last_time = last_time
+        finally:
+            for view in (times, subtotal, products, grams, totals):
+                if isinstance(view, memoryview):
+                    view.release()
+        return True
+
+    def rows(self, day_column, start, end):
+        """Return the (lo, hi) row range of the days start..end"""
+        lo = bisect.bisect_left(day_column, to_ordinal(start))
+        hi = bisect.bisect_right(day_column, to_ordinal(end))
+        return lo, hi
+
+
+def column_sum(column, lo, hi):
+    """Sum a slice of a typed column"""
+    if hi <= lo:
+        return 0
+    numpy = get_numpy()
+    if numpy is not None:
+        return numpy.frombuffer(column, dtype=column.typecode)[lo:hi].sum().item()
+    return sum(column[lo:hi])
+
+
+def grouped_sum(keys, values, lo, hi, size, offset=0):
+    """Sum values[lo:hi] into `size` buckets by keys[lo:hi] - offset
+
+    values=None counts rows instead of summing.
+    """
+    if hi <= lo:
+        return [0] * size
+    numpy = get_numpy()
+    if numpy is not None:
+        key_view = numpy.frombuffer(keys, dtype=keys.typecode)[lo:hi] - offset
+        if values is None:
+            return numpy.bincount(key_view, minlength=size).tolist()
+        # bincount with weights sums in float64; add.at keeps exact integers
+        result = numpy.zeros(size, dtype=numpy.int64)
+        numpy.add.at(result, key_view, numpy.frombuffer(values, dtype=values.typecode)[lo:hi].astype(numpy.int64))
+        return result.tolist()
+
+    result = [0] * size
+    if values is None:
+        for key in keys[lo:hi]:
+            result[key - offset] += 1
+    else:
+        for key, value in zip(keys[lo:hi], values[lo:hi]):
+            result[key - offset] += value
+    return result
+
+
+class SalesAnalytics:
+    """Date-range queries over the transaction journal"""
+    def __init__(self, transaction_file=TRANSACTION_FILE, rollups=None, archive_folder=ARCHIVE_DIR):
+        self.transaction_file = transaction_file
+        self.archive_folder = archive_folder
+        self.rollups = rollups
+        self.columns = None
+        self._mtime = None
+        self._archived = None
+
+    def _journal_mtime(self):
+        try:
+            return os.path.getmtime(self.transaction_file)
+        except OSError:
+            return None
+
+    def load(self):
+        """Load archives and journal into columns (only when they changed)"""
+        mtime = self._journal_mtime()
+        days = archived_days(self.archive_folder)
+        if self.columns is not None and mtime == self._mtime and days == self._archived:
+            return self.columns
+
+        journal = {}
+        skipped = 0
+        try:
+            if mtime is not None:
+                with open(self.transaction_file, 'r', encoding='utf-8') as f:
+                    transactions = json.load(f)
+                for trans in transactions:
+                    when = receipt_time(trans)
+                    if when is None:
+                        skipped += 1
+                        continue
+                    journal.setdefault(when.strftime('%Y-%m-%d'), []).append((when, trans))
+        except Exception as e:
+            print(f"Error loading transactions for analytics: {e}")
+
+        # Archive and journal day by day, so journal rows of a day older than
+        # the newest archive (a failed compaction, late entries) are kept
+        columns = TransactionColumns()
+        archived = set(days)
+        for day in sorted(archived | set(journal)):
+            known = set()
+            if day in archived:
+                try:
+                    with ArchiveReader(archive_path(day, self.archive_folder)) as reader:
+                        columns.extend_archive(reader)
+                        known = reader.receipt_numbers()
+                except Exception as e:
+                    print(f"Error loading archive {day} for analytics: {e}")
+            # Receipts also in the archive were left over by an interrupted compaction
+            timed = sorted((entry for entry in journal.get(day, ()) if entry[1].get('receipt_number') not in known),
+                           key=lambda entry: entry[0])
+            for when, trans in timed:
+                if not columns.append(when, trans):
+                    skipped += 1
+        if skipped:
+            print(f"Analitik: {skipped} transaksi tanpa tanggal yang valid dilewati")
+
+        self.columns = columns
+        self._mtime = mtime
+        self._archived = days
+        return columns
+
+    def add_receipt(self, receipt_data):
+        """Append a freshly saved receipt without reloading the journal"""
+        if self.columns is None:
+            return
+        when = receipt_time(receipt_data)
+        if when is None or not self.columns.append(when, receipt_data):
+            # Out of order (clock changed): rebuild from disk next time
+            self.columns = None
+            return
+        self._mtime = self._journal_mtime()
+
+    def _expenses(self, start, end):
+        if self.rollups is None:
+            return {'expenses': 0, 'expense_categories': {}}
+        return self.rollups.get_range(start, end)
+
+    def range_totals(self, start, end):
+        """Totals for the days start..end (inclusive)"""
+        columns = self.load()
+        lo, hi = columns.rows(columns.day, start, end)
+        item_lo, item_hi = columns.rows(columns.item_day, start, end)
+
+        gross = column_sum(columns.subtotal, lo, hi)
+        expenses = self._expenses(start, end)['expenses']
+        return {
+            'transactions': hi - lo,
+            'gross': gross,
+            'grams': column_sum(columns.item_grams, item_lo, item_hi),
+            'expenses': expenses,
+            'profit': gross - expenses
+        }
+
+    def product_breakdown(self, start, end):
+        """Revenue and grams sold per product, best sellers first"""
+        columns = self.load()
+        lo, hi = columns.rows(columns.item_day, start, end)
+        size = len(columns.product_names)
+        revenue = grouped_sum(columns.item_product, columns.item_revenue, lo, hi, size)
+        grams = grouped_sum(columns.item_product, columns.item_grams, lo, hi, size)
+
+        products = []
+        for index, name in enumerate(columns.product_names):
+            if grams[index] or revenue[index]:
+                products.append({'name': name, 'revenue': int(revenue[index]), 'grams': int(grams[index])})
+        products.sort(key=lambda p: -p['revenue'])
+        return products
+
+    def hour_histogram(self, start, end):
+        """Transaction count and revenue for each hour of the day (24 rows)"""
+        columns = self.load()
+        lo, hi = columns.rows(columns.day, start, end)
+        counts = grouped_sum(columns.hour, None, lo, hi, 24)
+        revenue = grouped_sum(columns.hour, columns.subtotal, lo, hi, 24)
+        return [{'hour': hour, 'transactions': int(counts[hour]), 'gross': int(revenue[hour])} for hour in range(24)]
+
+    def expense_categories(self, start, end):
+        """Expenses per category, largest first"""
+        categories = self._expenses(start, end)['expense_categories']
+        return sorted(categories.items(), key=lambda x: -x[1])
+
+    def daily_profit(self, start, end):
+        """Sales, expenses and profit for every day start..end"""
+        columns = self.load()
+        first, last = to_ordinal(start), to_ordinal(end)
+        size = max(0, last - first + 1)
+        lo, hi = columns.rows(columns.day, start, end)
+        sales = grouped_sum(columns.day, columns.subtotal, lo, hi, size, offset=first)
+
+        days = []
+        for offset in range(size):
+            current = date.fromordinal(first + offset)
+            expenses = 0
+            if self.rollups is not None:
+                expenses = self.rollups.get_day(current)['expenses']
+            days.append({
+                'date': current,
+                'sales': int(sales[offset]),
+                'expenses': expenses,
+                'profit': int(sales[offset]) - expenses
+            })
+        return days
+
+    def rolling_profit(self, end, window):
+        """Profit summed over the `window` days ending at `end`"""
+        if isinstance(end, datetime):
+            end = end.date()
+        start = end - timedelta(days=window - 1)
+        return self.range_totals(start, end)['profit']
@@ -0,0 +1,292 @@
+"""
+Arsip kolom untuk hari yang sudah ditutup.
+
+Transaksi hari-hari sebelumnya dipindahkan dari transactions.json ke satu file
+biner per hari (archive/YYYY-MM-DD.kcol): satu array bertipe per field, nama
+produk dan teks lain di-intern ke tabel string, uang dalam rupiah bulat dan
+berat dalam gram bulat. Pembaca memakai mmap sehingga query hanya menyentuh
+kolom yang dibutuhkan.
+
+Format file:
+    b'KCOL' | versi (uint16) | panjang header (uint32) | header JSON
+    lalu data kolom, masing-masing dimulai di offset kelipatan 8 byte.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+from kasir_core.money import to_rupiah, to_grams, grams_to_kg
+from kasir_core.rollup import TRANSACTION_FILE, receipt_time
+
+ARCHIVE_DIR = 'archive'
+MAGIC = b'KCOL'
+VERSION = 1
+PREFIX = struct.Struct('<4sHI')
+
+# Column name -> typecode. 'i' is int32 and 'q' is int64 on all supported platforms.
+TRANSACTION_COLUMNS = (
+    ('time', 'i'),          # seconds since midnight
+    ('receipt', 'i'),       # string table index
+    ('username', 'i'),      # string table index
+    ('shop', 'i'),          # string table index (missing in older files)
+    ('subtotal', 'q'),      # rupiah
+    ('payment', 'q'),       # rupiah
+    ('change', 'q'),        # rupiah
+    ('item_start', 'i'),
+    ('item_count', 'i'),
+)
+ITEM_COLUMNS = (
+    ('item_product', 'i'),  # string table index
+    ('item_grams', 'i'),
+    ('item_price', 'q'),    # rupiah per kg
+    ('item_total', 'q'),    # rupiah
+)
+
+
+def archive_path(day, folder=ARCHIVE_DIR):
+    """Return the archive file of a YYYY-MM-DD day"""
+    return os.path.join(folder, f"{day}.kcol")
+
+
+def archived_days(folder=ARCHIVE_DIR):
+    """List archived days (YYYY-MM-DD), oldest first"""
+    if not os.path.exists(folder):
+        return []
+    return sorted(name[:-5] for name in os.listdir(folder) if name.endswith('.kcol'))
+
+
+class StringTable:
+    """Interns strings to integer ids"""
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def intern(self, text):
+        text = str(text or '')
+        position = self.index.get(text)
+        if position is None:
+            position = len(self.strings)
+            self.index[text] = position
+            self.strings.append(text)
+        return position
+
+
+def write_archive(path, day, transactions):
+    """Write the transactions of one day as a columnar archive"""
+    strings = StringTable()
+    data = {name: array(code) for name, code in TRANSACTION_COLUMNS + ITEM_COLUMNS}
+
+    timed = sorted(((receipt_time(t), t) for t in transactions), key=lambda x: x[0])
+    for when, trans in timed:
+        items = trans.get('items', [])
+
+        data['time'].append(when.hour * 3600 + when.minute * 60 + when.second)
+        data['receipt'].append(strings.intern(trans.get('receipt_number', '')))
+        data['username'].append(strings.intern(trans.get('username', '')))
+        data['shop'].append(strings.intern(trans.get('shop_name', '')))
+        data['subtotal'].append(to_rupiah(trans.get('subtotal', 0)))
+        data['payment'].append(to_rupiah(trans.get('payment', 0)))
+        data['change'].append(to_rupiah(trans.get('change', 0)))
+        data['item_start'].append(len(data['item_product']))
+        data['item_count'].append(len(items))
+
+        for item in items:
+            data['item_product'].append(strings.intern(item[0]))
+            data['item_grams'].append(to_grams(item[1]))
+            data['item_price'].append(to_rupiah(item[2]))
+            data['item_total'].append(to_rupiah(item[3]))
+
+    columns = {}
+    offset = 0
+    for name, code in TRANSACTION_COLUMNS + ITEM_COLUMNS:
+        size = len(data[name]) * data[name].itemsize
+        columns[name] = [code, offset, len(data[name])]
+        offset += (size + 7) // 8 * 8
+
+    header = json.dumps({
+        'day': day,
+        'rows': len(data['time']),
+        'item_rows': len(data['item_product']),
+        'strings': strings.strings,
+        'columns': columns
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(PREFIX.size + len(header)) % 8)
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    tmp_name = f"{path}.tmp"
+    with open(tmp_name, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, code in TRANSACTION_COLUMNS + ITEM_COLUMNS:
+            column = data[name]
+            if sys.byteorder != 'little':
+                column.byteswap()
+            raw = column.tobytes()
+            f.write(raw)
+            f.write(b'\0' * (-len(raw) % 8))
+    os.replace(tmp_name, path)
+
+
+class ArchiveReader:
+    """Memory-mapped reader for one .kcol file"""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_len = PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Bukan file arsip kasir: {path}")
+
+        self.header = json.loads(bytes(self._map[PREFIX.size:PREFIX.size + header_len]))
+        self.data_offset = PREFIX.size + header_len
+        self.day = self.header['day']
+        self.rows = self.header['rows']
+        self.item_rows = self.header['item_rows']
+        self.strings = self.header['strings']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        try:
+            self._map.close()
+        except (BufferError, AttributeError):
+            # A column view is still alive; the map closes when it is released
+            pass
+        self._file.close()
+
+    def column(self, name):
+        """Return a column as a typed view (zero-copy on little-endian)"""
+        code, offset, count = self.header['columns'][name]
+        start = self.data_offset + offset
+        size = count * array(code).itemsize
+        if sys.byteorder != 'little':
+            values = array(code, self._map[start:start + size])
+            values.byteswap()
+            return values
+        return memoryview(self._map)[start:start + size].cast(code)
+
+    def receipt_numbers(self):
+        """Set of the receipt numbers in this archive"""
+        column = self.column('receipt')
+        try:
+            return {self.strings[index] for index in column}
+        finally:
+            if isinstance(column, memoryview):
+                column.release()
+
+    def receipts(self):
+        """Rebuild the receipts in transactions.json format"""
+        date_text = datetime.strptime(self.day, '%Y-%m-%d').strftime('%d/%m/%Y')
+        # Files written before the shop column kept one list of shop names
+        shop_names = self.header.get('shop_names') or ['']
+        columns = {name: self.column(name) for name, _ in TRANSACTION_COLUMNS + ITEM_COLUMNS
+                   if name in self.header['columns']}
+        shops = columns.get('shop')
+        strings = self.strings
+
+        result = []
+        for row in range(self.rows):
+            seconds = columns['time'][row]
+            start = columns['item_start'][row]
+            items = []
+            for i in range(start, start + columns['item_count'][row]):
+                items.append((
+                    strings[columns['item_product'][i]],
+                    grams_to_kg(columns['item_grams'][i]),
+                    columns['item_price'][i],
+                    columns['item_total'][i]
+                ))
+            result.append({
+                'receipt_number': strings[columns['receipt'][row]],
+                'date': date_text,
+                'time': f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+                'username': strings[columns['username'][row]],
+                'shop_name': strings[shops[row]] if shops is not None else shop_names[0],
+                'items': items,
+                'subtotal': columns['subtotal'][row],
+                'payment': columns['payment'][row],
+                'change': columns['change'][row]
+            })
+
+        for column in columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        return result
+
+
+def iter_archived_receipts(folder=ARCHIVE_DIR):
+    """Yield every archived receipt, oldest day first"""
+    for day in archived_days(folder):
+        try:
+            with ArchiveReader(archive_path(day, folder)) as reader:
+                for receipt in reader.receipts():
+                    yield receipt
+        except Exception as e:
+            print(f"Error reading archive {day}: {e}")
+
+
+def compact_closed_days(transaction_file=TRANSACTION_FILE, folder=ARCHIVE_DIR, today=None):
+    """Move every day before today from the JSON journal into archives
+
+    Returns the number of archived days.
+    """
+    if not os.path.exists(transaction_file):
+        return 0
+
+    today_key = (today or datetime.now().date()).strftime('%Y-%m-%d')
+    try:
+        with open(transaction_file, 'r', encoding='utf-8') as f:
+            transactions = json.load(f)
+
+        closed = {}
+        remaining = []
+        for trans in transactions:
+            when = receipt_time(trans)
+            key = when.strftime('%Y-%m-%d') if when else None
+            if key is None or key >= today_key:
+                remaining.append(trans)
+            else:
+                closed.setdefault(key, []).append(trans)
+
+        if not closed:
+            return 0
+
+        for day, day_transactions in closed.items():
+            path = archive_path(day, folder)
+            if os.path.exists(path):
+                # Late entry for an archived day: merge in the receipts the
+                # archive does not hold yet (a crash between writing the
+                # archive and the journal leaves them in both)
+                with ArchiveReader(path) as reader:
+                    archived = reader.receipts()
+                known = {trans.get('receipt_number') for trans in archived}
+                late = [trans for trans in day_transactions if trans.get('receipt_number') not in known]
+                if not late:
+                    continue
+                day_transactions = archived + late
+            write_archive(path, day, day_transactions)
+
+        tmp_name = f"{transaction_file}.tmp"
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            json.dump(remaining, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, transaction_file)
+
+        print(f"Arsip: {len(closed)} hari dipadatkan")
+        return len(closed)
+    except Exception as e:
+        print(f"Error compacting transactions: {e}")
+        return 0
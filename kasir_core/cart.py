@@ -0,0 +1,89 @@
+"""
+Keranjang kasir dengan total berjalan.
+
+Cart menyimpan item keranjang dan menjaga total rupiah, total gram dan jumlah
+item setiap kali item ditambah, diubah atau dihapus, sehingga tampilan tidak
+perlu menjumlah ulang seluruh keranjang. Tampilan bisa bind() ke keranjang
+untuk menerima event 'add', 'update', 'remove' dan 'clear' lalu hanya
+mengubah widget yang terkena.
+"""
+
+
+class Cart:
+    """Cart items with running totals and change events"""
+    def __init__(self):
+        self._items = []
+        self._listeners = []
+        self.total = 0
+        self.weight_g = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __bool__(self):
+        return bool(self._items)
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def bind(self, callback):
+        """Call callback(event, item) on 'add', 'update', 'remove' and 'clear'"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unbind(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, item):
+        for callback in list(self._listeners):
+            try:
+                callback(event, item)
+            except Exception as e:
+                print(f"Error in cart listener: {e}")
+
+    def find(self, product):
+        """Return the cart item of a product (matched by id), or None"""
+        for item in self._items:
+            if item.product.id == product.id:
+                return item
+        return None
+
+    def add(self, item):
+        """Append a cart item"""
+        self._items.append(item)
+        self.total += item.get_total()
+        self.weight_g += item.weight_g
+        self._notify('add', item)
+        return item
+
+    def update(self, item, weight_g):
+        """Change the weight of an item already in the cart"""
+        self.total -= item.get_total()
+        self.weight_g -= item.weight_g
+        item.weight_g = weight_g
+        self.total += item.get_total()
+        self.weight_g += item.weight_g
+        self._notify('update', item)
+        return item
+
+    def remove(self, item):
+        """Remove an item; does nothing if it is not in the cart"""
+        if item not in self._items:
+            return None
+        self._items.remove(item)
+        self.total -= item.get_total()
+        self.weight_g -= item.weight_g
+        self._notify('remove', item)
+        return item
+
+    def clear(self):
+        """Empty the cart with a single 'clear' event"""
+        self._items = []
+        self.total = 0
+        self.weight_g = 0
+        self._notify('clear', None)
@@ -0,0 +1,211 @@
+"""
+Katalog produk kasir dengan indeks.
+
+ProductCatalog menggantikan list produk biasa: lookup id dan PLU lewat dict,
+serta indeks nama (prefix kata dan trigram) yang diperbarui setiap kali
+produk ditambah, diubah atau dihapus, sehingga pencarian tidak perlu
+memindai semua produk. Tampilan bisa bind() ke katalog untuk menerima event
+'add', 'update' dan 'remove' per produk.
+"""
+
+
+def normalize_id(value):
+    """Normalize a product id: 1, '1' and ' 001 ' all become '1'"""
+    text = str(value).strip()
+    if text.isdigit():
+        return str(int(text))
+    return text
+
+
+def normalize_text(text):
+    """Lowercase text with collapsed whitespace, used for search"""
+    return ' '.join(str(text or '').lower().split())
+
+
+def trigrams(text):
+    """All 3-character substrings of a normalized text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProductCatalog:
+    """Products by id, with PLU lookup and an incremental name index"""
+    def __init__(self, products=()):
+        self._by_id = {}
+        self._by_plu = {}
+        self._order = {}
+        self._sequence = 0
+
+        # word prefix -> ids, trigram -> ids, id -> what was indexed
+        self._prefixes = {}
+        self._trigrams = {}
+        self._indexed = {}
+        self._listeners = []
+
+        for product in products:
+            self.add(product)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, product_id):
+        return normalize_id(product_id) in self._by_id
+
+    def bind(self, callback):
+        """Call callback(event, product) on 'add', 'update' and 'remove'"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unbind(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, product):
+        for callback in list(self._listeners):
+            try:
+                callback(event, product)
+            except Exception as e:
+                print(f"Error in catalog listener: {e}")
+
+    def get(self, product_id):
+        """Return the product with this id, or None"""
+        return self._by_id.get(normalize_id(product_id))
+
+    def get_by_plu(self, plu):
+        """Return the product with this PLU/short code, or None"""
+        return self._by_plu.get(normalize_id(plu))
+
+    def next_id(self):
+        """Next free numeric id"""
+        numeric = [int(key) for key in self._by_id if key.isdigit()]
+        return str(max(numeric) + 1 if numeric else 1)
+
+    def add(self, product):
+        """Add a product; its id (and PLU) are normalized in place"""
+        product.id = normalize_id(product.id)
+        if product.id in self._by_id:
+            raise ValueError(f"ID produk sudah ada: {product.id}")
+
+        plu = getattr(product, 'plu', None)
+        if plu:
+            product.plu = normalize_id(plu)
+            if product.plu in self._by_plu:
+                raise ValueError(f"Kode PLU sudah dipakai: {product.plu}")
+            self._by_plu[product.plu] = product
+
+        self._by_id[product.id] = product
+        self._order[product.id] = self._sequence
+        self._sequence += 1
+        self._index(product)
+        self._notify('add', product)
+        return product
+
+    def update(self, product_id, **changes):
+        """Change fields of a product (name, price_per_kg, stock_g, plu) and reindex"""
+        product = self.get(product_id)
+        if product is None:
+            raise KeyError(product_id)
+
+        if 'plu' in changes:
+            plu = changes.pop('plu')
+            plu = normalize_id(plu) if plu else None
+            other = self._by_plu.get(plu) if plu else None
+            if other is not None and other is not product:
+                raise ValueError(f"Kode PLU sudah dipakai: {plu}")
+            # An empty PLU clears the code and its index entry
+            if getattr(product, 'plu', None) and self._by_plu.get(product.plu) is product:
+                del self._by_plu[product.plu]
+            product.plu = plu
+            if plu:
+                self._by_plu[plu] = product
+
+        for field, value in changes.items():
+            setattr(product, field, value)
+
+        if 'name' in changes:
+            self._unindex(product.id)
+            self._index(product)
+        self._notify('update', product)
+        return product
+
+    def change_stock(self, product_id, delta_g):
+        """Add (or with a negative delta, take) grams of stock"""
+        product = self.get(product_id)
+        if product is None:
+            raise KeyError(product_id)
+        return self.update(product.id, stock_g=product.stock_g + delta_g)
+
+    def remove(self, product_or_id):
+        """Remove a product (given as object or id) and return it"""
+        key = normalize_id(getattr(product_or_id, 'id', product_or_id))
+        product = self._by_id.pop(key, None)
+        if product is None:
+            return None
+
+        self._order.pop(key, None)
+        if getattr(product, 'plu', None):
+            self._by_plu.pop(product.plu, None)
+        self._unindex(key)
+        self._notify('remove', product)
+        return product
+
+    def _index(self, product):
+        name = normalize_text(product.name)
+        prefixes = set()
+        for word in name.split():
+            for end in range(1, len(word) + 1):
+                prefixes.add(word[:end])
+        grams = trigrams(name)
+
+        for prefix in prefixes:
+            self._prefixes.setdefault(prefix, set()).add(product.id)
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(product.id)
+        self._indexed[product.id] = (name, prefixes, grams)
+
+    def _unindex(self, product_id):
+        name, prefixes, grams = self._indexed.pop(product_id, ('', (), ()))
+        for index, keys in ((self._prefixes, prefixes), (self._trigrams, grams)):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(product_id)
+                    if not ids:
+                        del index[key]
+
+    def _match_term(self, term):
+        """Ids whose name contains the term (or starts a word with it, if short)"""
+        if len(term) < 3:
+            return set(self._prefixes.get(term, ()))
+
+        candidates = None
+        for gram in trigrams(term):
+            ids = self._trigrams.get(gram, set())
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        return {key for key in candidates if term in self._indexed[key][0]}
+
+    def search(self, query):
+        """Products matching every word of the query, in catalog order
+
+        An exact PLU match is returned first.
+        """
+        query = normalize_text(query)
+        if not query:
+            return list(self._by_id.values())
+
+        matches = None
+        for term in query.split():
+            ids = self._match_term(term)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                break
+
+        result = [self._by_id[key] for key in sorted(matches or (), key=self._order.get)]
+        plu_product = self.get_by_plu(query)
+        if plu_product is not None:
+            result = [plu_product] + [p for p in result if p is not plu_product]
+        return result
@@ -0,0 +1,39 @@
+"""
+Model data kasir yang dipakai layar kasir di main.py.
+"""
+
+from kasir_core.money import to_rupiah, grams_to_kg, line_total
+
+
+class KasirProduct:
+    def __init__(self, id, name, price_per_kg, stock_g=100000, plu=None):
+        self.id = id
+        self.name = name
+        self.price_per_kg = to_rupiah(price_per_kg)
+        self.stock_g = stock_g
+        self.plu = plu
+    
+    @property
+    def stock_kg(self):
+        return grams_to_kg(self.stock_g)
+
+
+class KasirCartItem:
+    def __init__(self, product, weight_g=1000):
+        self.product = product
+        self.weight_g = weight_g
+    
+    @property
+    def weight_kg(self):
+        return grams_to_kg(self.weight_g)
+    
+    def get_total(self):
+        return line_total(self.product.price_per_kg, self.weight_g)
+
+
+class KasirExpense:
+    def __init__(self, id, name, amount, date_time):
+        self.id = id
+        self.name = name
+        self.amount = amount
+        self.date_time = date_time
@@ -0,0 +1,80 @@
+"""
+Uang dan berat kasir dalam bilangan bulat.
+
+Semua harga dan total disimpan sebagai rupiah bulat (int) dan semua berat
+sebagai gram bulat (int). Pembulatan hanya terjadi di satu tempat, yaitu
+total per baris keranjang (line_total), sehingga penjumlahan dan
+perbandingan total harian selalu tepat.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+GRAMS_PER_KG = 1000
+
+
+def _decimal(value):
+    """Convert a number or numeric text to Decimal"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        # repr() is the shortest round-trip form, so 0.1 stays 0.1
+        value = repr(value)
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Bukan angka: {value!r}")
+
+
+def to_rupiah(value):
+    """Whole rupiah from a number or numeric text (half up)"""
+    if isinstance(value, int):
+        return value
+    return int(_decimal(value).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_grams(kg):
+    """Whole grams from kilograms given as number or text (half up)"""
+    return int((_decimal(kg) * GRAMS_PER_KG).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def grams_to_kg(grams):
+    """Kilograms as float, for display and legacy fields only"""
+    return grams / GRAMS_PER_KG
+
+
+def line_total(price_per_kg, grams):
+    """Rupiah total of one cart line, rounded half up to whole rupiah
+
+    This is the only place where a weight times a price gets rounded.
+    """
+    return (2 * price_per_kg * grams + GRAMS_PER_KG) // (2 * GRAMS_PER_KG)
+
+
+def parse_rupiah(text):
+    """Parse user input such as '15000', '15.000', 'Rp 15.000' or '15000,5'"""
+    cleaned = str(text).replace('Rp', '').replace(' ', '').strip()
+    if re.fullmatch(r'\d{1,3}(\.\d{3})+', cleaned):
+        # Indonesian thousands separators
+        cleaned = cleaned.replace('.', '')
+    cleaned = cleaned.replace(',', '.')
+    if not re.fullmatch(r'\d+(\.\d+)?', cleaned):
+        raise ValueError(f"Jumlah tidak valid: {text!r}")
+    return to_rupiah(cleaned)
+
+
+def parse_weight(text):
+    """Parse a weight in kg typed by the user ('1.5' or '1,5') into grams"""
+    cleaned = str(text).replace(' ', '').replace(',', '.').strip()
+    if not re.fullmatch(r'\d+(\.\d+)?|\.\d+', cleaned):
+        raise ValueError(f"Berat tidak valid: {text!r}")
+    return to_grams(cleaned)
+
+
+def format_kg(grams):
+    """Weight in kg without trailing zeros, e.g. 1500 -> '1.5'"""
+    kg = Decimal(grams) / GRAMS_PER_KG
+    text = format(kg, 'f')
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text
@@ -0,0 +1,81 @@
+"""
+Teks laporan harian kasir.
+
+Dibangun dari rollup hari itu (SalesRollupStore.get_day) dan daftar
+pengeluaran, tanpa membaca jurnal transaksi.
+"""
+
+from datetime import datetime
+
+from kasir_core.money import format_kg
+
+
+def format_daily_report(rollup, expenses, shop_name, username, format_currency, now=None):
+    """Text of the daily report for the day of `now` (default: now)"""
+    now = now or datetime.now()
+    total_income = rollup['gross']
+    total_expenses = rollup['expenses']
+    net_profit = total_income - total_expenses
+
+    report_lines = []
+    report_lines.append("=" * 40)
+    report_lines.append("         LAPORAN HARIAN")
+    report_lines.append(f"           {now.strftime('%d/%m/%Y')}")
+    report_lines.append(f"       {shop_name}")
+    report_lines.append(f"      Kasir: {username}")
+    report_lines.append("=" * 40)
+    report_lines.append("")
+    report_lines.append("RINGKASAN PENJUALAN:")
+    report_lines.append("-" * 40)
+    report_lines.append(f"Jumlah Transaksi    : {rollup['transactions']}")
+    report_lines.append(f"Total Pendapatan    : {format_currency(total_income)}")
+    report_lines.append(f"Total Terjual       : {format_kg(sum(rollup['grams'].values()))} kg")
+    report_lines.append("")
+
+    report_lines.append("PENJUALAN PER PRODUK:")
+    report_lines.append("-" * 40)
+    if rollup['grams']:
+        for name, grams in sorted(rollup['grams'].items(), key=lambda x: -x[1]):
+            report_lines.append(f"{name[:24]:<24}: {format_kg(grams)} kg")
+    else:
+        report_lines.append("Belum ada transaksi hari ini")
+
+    if rollup['hours']:
+        report_lines.append("")
+        report_lines.append("PENJUALAN PER JAM:")
+        report_lines.append("-" * 40)
+        for hour in sorted(rollup['hours']):
+            bucket = rollup['hours'][hour]
+            if bucket['transactions']:
+                report_lines.append(f"{hour}:00  {bucket['transactions']:3d} trx  {format_currency(bucket['gross'])}")
+
+    report_lines.append("")
+    report_lines.append("PENGELUARAN HARI INI:")
+    report_lines.append("-" * 40)
+
+    if expenses:
+        for i, exp in enumerate(expenses, 1):
+            time_str = exp.date_time.strftime('%H:%M')
+            report_lines.append(f"{i:2d}. {time_str} - {exp.name}")
+            report_lines.append(f"    {format_currency(exp.amount)}")
+            if i < len(expenses):
+                report_lines.append("")
+    else:
+        report_lines.append("Belum ada pengeluaran hari ini")
+
+    report_lines.append("")
+    report_lines.append("-" * 40)
+    report_lines.append(f"TOTAL PENGELUARAN   : {format_currency(total_expenses)}")
+    report_lines.append("")
+    report_lines.append("=" * 40)
+    report_lines.append("KEUNTUNGAN BERSIH:")
+    if net_profit >= 0:
+        report_lines.append(f"+ {format_currency(net_profit)}")
+    else:
+        report_lines.append(f"- {format_currency(abs(net_profit))}")
+    report_lines.append("=" * 40)
+    report_lines.append("")
+    report_lines.append(f"Laporan dibuat: {now.strftime('%d/%m/%Y %H:%M:%S')}")
+    report_lines.append(f"Oleh: {username}")
+
+    return "\n".join(report_lines)
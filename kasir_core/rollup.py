@@ -0,0 +1,272 @@
+"""
+Rollup penjualan harian untuk laporan kasir.
+
+Setiap checkout dan pengeluaran langsung ditambahkan ke ringkasan per hari
+(dan per jam di dalam hari itu), sehingga laporan cukup membaca satu entri
+per hari tanpa memindai seluruh transactions/transactions.json.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from kasir_core.money import to_rupiah, to_grams
+
+ROLLUP_FILE = 'rollups/daily_rollups.json'
+TRANSACTION_FILE = 'transactions/transactions.json'
+
+
+def empty_bucket():
+    """Create an empty rollup bucket"""
+    return {
+        'transactions': 0,
+        'gross': 0,
+        'grams': {},
+        'expenses': 0
+    }
+
+
+def day_key(value):
+    """Return the YYYY-MM-DD key for a date or datetime"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.strftime('%Y-%m-%d')
+
+
+def expense_category(name):
+    """Normalize an expense name into its category key"""
+    category = ' '.join(str(name or '').lower().split())
+    return category or 'lain-lain'
+
+
+def upgrade_bucket(bucket):
+    """Convert a bucket saved with float kg and rupiah to integers"""
+    if 'kg' in bucket:
+        bucket['grams'] = {name: to_grams(kg) for name, kg in bucket.pop('kg').items()}
+    bucket['gross'] = to_rupiah(bucket['gross'])
+    bucket['expenses'] = to_rupiah(bucket['expenses'])
+    if 'expense_categories' in bucket:
+        bucket['expense_categories'] = {name: to_rupiah(amount) for name, amount in bucket['expense_categories'].items()}
+
+
+def receipt_items(receipt_data):
+    """Return (product_name, grams) pairs of a saved receipt"""
+    return [(item[0], to_grams(item[1])) for item in receipt_data.get('items', [])]
+
+
+def receipt_time(receipt_data):
+    """Parse the date and time of a saved receipt"""
+    try:
+        return datetime.strptime(f"{receipt_data['date']} {receipt_data['time']}", '%d/%m/%Y %H:%M:%S')
+    except (KeyError, ValueError):
+        return None
+
+
+class SalesRollupStore:
+    """Per-day and per-hour sales totals, updated at checkout"""
+    def __init__(self, filename=ROLLUP_FILE, transaction_file=TRANSACTION_FILE):
+        self.filename = filename
+        self.transaction_file = transaction_file
+        self.days = {}
+        self.load()
+
+    def load(self):
+        """Load rollups, building them once from the journal if missing"""
+        try:
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.days = json.load(f)
+                for day in self.days.values():
+                    upgrade_bucket(day)
+                    for hour in day.get('hours', {}).values():
+                        upgrade_bucket(hour)
+                return
+        except Exception as e:
+            print(f"Error loading rollups: {e}")
+
+        self.days = {}
+        if any(os.path.exists(path) for path in (self.transaction_file, 'archive', 'expenses')):
+            self.rebuild_from_transactions()
+
+    def save(self):
+        """Save rollups to disk"""
+        try:
+            folder = os.path.dirname(self.filename)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+
+            tmp_name = f"{self.filename}.tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(self.days, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_name, self.filename)
+        except Exception as e:
+            print(f"Error saving rollups: {e}")
+
+    def _buckets(self, when):
+        """Return the day bucket and hour bucket for a timestamp"""
+        day = self.days.setdefault(day_key(when), empty_bucket())
+        hours = day.setdefault('hours', {})
+        hour = hours.setdefault(f"{when.hour:02d}", empty_bucket())
+        return day, hour
+
+    def _add_sale(self, when, total, items):
+        for bucket in self._buckets(when):
+            bucket['transactions'] += 1
+            bucket['gross'] += total
+            for name, grams in items:
+                bucket['grams'][name] = bucket['grams'].get(name, 0) + grams
+
+    def record_sale(self, when, total, items):
+        """Add one checkout to the rollups
+
+        total is in rupiah, items is an iterable of (product_name, grams) pairs.
+        """
+        self._add_sale(when, total, items)
+        self.save()
+
+    def record_receipt(self, receipt_data):
+        """Add a saved receipt (transactions.json format) to the rollups"""
+        when = receipt_time(receipt_data)
+        if when is None:
+            return
+        self.record_sale(when, to_rupiah(receipt_data.get('subtotal', 0)), receipt_items(receipt_data))
+
+    def _add_expense(self, when, amount, name):
+        amount = to_rupiah(amount)
+        day, hour = self._buckets(when)
+        for bucket in (day, hour):
+            bucket['expenses'] += amount
+
+        categories = day.setdefault('expense_categories', {})
+        category = expense_category(name)
+        categories[category] = categories.get(category, 0) + amount
+
+    def record_expense(self, when, amount, name=''):
+        """Add an expense to the rollups"""
+        self._add_expense(when, amount, name)
+        self.save()
+
+    def remove_expense(self, when, amount, name=''):
+        """Take a deleted expense back out of the rollups"""
+        amount = to_rupiah(amount)
+        day, hour = self._buckets(when)
+        for bucket in (day, hour):
+            bucket['expenses'] = max(0, bucket['expenses'] - amount)
+
+        categories = day.setdefault('expense_categories', {})
+        category = expense_category(name)
+        if category in categories:
+            categories[category] = max(0, categories[category] - amount)
+            if not categories[category]:
+                del categories[category]
+        self.save()
+
+    def clear_expenses(self, day):
+        """Zero the expenses of one day, keeping its sales"""
+        entry = self.days.get(day_key(day))
+        if not entry:
+            return
+        entry['expenses'] = 0
+        entry.pop('expense_categories', None)
+        for hour in entry.get('hours', {}).values():
+            hour['expenses'] = 0
+        self.save()
+
+    def reset_day(self, day):
+        """Clear all totals for one day"""
+        self.days.pop(day_key(day), None)
+        self.save()
+
+    def get_day(self, day):
+        """Return the rollup of a single day (with its hour buckets)"""
+        entry = self.days.get(day_key(day))
+        if not entry:
+            result = empty_bucket()
+            result['expense_categories'] = {}
+            result['hours'] = {}
+            return result
+
+        result = empty_bucket()
+        result['transactions'] = entry['transactions']
+        result['gross'] = entry['gross']
+        result['grams'] = dict(entry['grams'])
+        result['expenses'] = entry['expenses']
+        result['expense_categories'] = dict(entry.get('expense_categories', {}))
+        result['hours'] = {hour: dict(bucket, grams=dict(bucket['grams'])) for hour, bucket in entry.get('hours', {}).items()}
+        return result
+
+    def get_range(self, start, end):
+        """Sum the rollups from start to end (inclusive), one lookup per day"""
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+
+        total = empty_bucket()
+        total['expense_categories'] = {}
+        total['days'] = 0
+        current = start
+        while current <= end:
+            entry = self.days.get(day_key(current))
+            if entry:
+                total['days'] += 1
+                total['transactions'] += entry['transactions']
+                total['gross'] += entry['gross']
+                total['expenses'] += entry['expenses']
+                for name, grams in entry['grams'].items():
+                    total['grams'][name] = total['grams'].get(name, 0) + grams
+                for category, amount in entry.get('expense_categories', {}).items():
+                    total['expense_categories'][category] = total['expense_categories'].get(category, 0) + amount
+            current += timedelta(days=1)
+        return total
+
+    def rebuild_from_transactions(self):
+        """Rebuild rollups from the archives, transaction journal and expense files
+
+        Only used when no rollup file exists yet (first start after upgrade).
+        """
+        from kasir_core.archive import archived_days, iter_archived_receipts
+
+        try:
+            transactions = list(iter_archived_receipts())
+            if os.path.exists(self.transaction_file):
+                archived = set(archived_days())
+                with open(self.transaction_file, 'r', encoding='utf-8') as f:
+                    for trans in json.load(f):
+                        when = receipt_time(trans)
+                        if when is not None and day_key(when) not in archived:
+                            transactions.append(trans)
+
+            for trans in transactions:
+                when = receipt_time(trans)
+                if when is None:
+                    continue
+                self._add_sale(when, to_rupiah(trans.get('subtotal', 0)), receipt_items(trans))
+
+            expenses = self.rebuild_expenses()
+            self.save()
+            print(f"Rollup dibangun dari {len(transactions)} transaksi dan {expenses} pengeluaran")
+        except Exception as e:
+            print(f"Error rebuilding rollups: {e}")
+
+    def rebuild_expenses(self):
+        """Add every expense saved in expenses/expenses_<day>.json; returns the count"""
+        from kasir_core.storage import EXPENSE_DIR
+
+        if not os.path.isdir(EXPENSE_DIR):
+            return 0
+        count = 0
+        for filename in sorted(os.listdir(EXPENSE_DIR)):
+            if not (filename.startswith('expenses_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(EXPENSE_DIR, filename), 'r', encoding='utf-8') as f:
+                    items = [(datetime.strptime(item['date_time'], '%Y-%m-%d %H:%M:%S'), item['amount'], item.get('name', ''))
+                             for item in json.load(f)]
+            except Exception as e:
+                print(f"Error reading expenses {filename}: {e}")
+                continue
+            for when, amount, name in items:
+                self._add_expense(when, amount, name)
+            count += len(items)
+        return count
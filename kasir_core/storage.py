@@ -0,0 +1,142 @@
+"""
+Penyimpanan file kasir offline.
+
+Jurnal transaksi, produk, penghitung struk dan pengeluaran harian disimpan
+sebagai JSON di folder kerja. Semua tulisan atomik (file .tmp lalu
+os.replace) karena thread sinkronisasi bisa membaca file yang sama. Fungsi di
+sini tidak bergantung pada Kivy sehingga juga dipakai benchmark tanpa UI.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime, date
+
+from kasir_core.catalog import ProductCatalog
+from kasir_core.models import KasirProduct, KasirExpense
+from kasir_core.money import to_grams
+from kasir_core.rollup import TRANSACTION_FILE
+
+PRODUCT_FILE = 'products.json'
+COUNTER_FILE = 'counter.json'
+EXPENSE_DIR = 'expenses'
+
+
+def write_json(path, data, indent=2):
+    """Write JSON atomically"""
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    tmp_name = f"{path}.tmp"
+    with open(tmp_name, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_name, path)
+
+
+def make_receipt(cart, receipt_number, username, shop_name, payment=0, change=0, now=None):
+    """Receipt of the current cart in transactions.json format"""
+    now = now or datetime.now()
+    return {
+        'receipt_number': receipt_number,
+        'date': now.strftime('%d/%m/%Y'),
+        'time': now.strftime('%H:%M:%S'),
+        'username': username,
+        'shop_name': shop_name,
+        'items': [(item.product.name, item.weight_kg, item.product.price_per_kg, item.get_total())
+                  for item in cart],
+        'subtotal': cart.total,
+        'payment': payment,
+        'change': change
+    }
+
+
+def append_transaction(receipt_data, transaction_file=TRANSACTION_FILE):
+    """Append one receipt to the journal of open days"""
+    transactions = []
+    if os.path.exists(transaction_file):
+        with open(transaction_file, 'r', encoding='utf-8') as f:
+            transactions = json.load(f)
+    transactions.append(receipt_data)
+    write_json(transaction_file, transactions)
+
+
+def load_products(filename=PRODUCT_FILE, product_class=KasirProduct):
+    """Load the catalog, or None if there is no product file yet"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    products = ProductCatalog()
+    for item in data:
+        stock_g = item['stock_g'] if 'stock_g' in item else to_grams(item['stock_kg'])
+        try:
+            products.add(product_class(
+                item['id'], item['name'], item['price_per_kg'], stock_g, item.get('plu')
+            ))
+        except ValueError as e:
+            print(f"Produk dilewati: {e}")
+    return products
+
+
+def save_products(products, filename=PRODUCT_FILE):
+    data = []
+    for product in products:
+        item = {
+            'id': product.id,
+            'name': product.name,
+            'price_per_kg': product.price_per_kg,
+            'stock_g': product.stock_g
+        }
+        if product.plu:
+            item['plu'] = product.plu
+        data.append(item)
+    write_json(filename, data)
+
+
+def load_counter(filename=COUNTER_FILE):
+    if os.path.exists(filename):
+        with open(filename, 'r') as f:
+            return json.load(f).get('counter', 1)
+    return 1
+
+
+def save_counter(counter, filename=COUNTER_FILE):
+    write_json(filename, {'counter': counter}, indent=None)
+
+
+def new_expense_id(now=None):
+    """Id for a new expense: epoch milliseconds plus a random suffix
+
+    Unlike a position in the day's list it is never handed out twice, even
+    after the day's expenses are reset.
+    """
+    return f"{int((now or datetime.now()).timestamp() * 1000)}-{uuid.uuid4().hex[:6]}"
+
+
+def expense_file(day=None, folder=EXPENSE_DIR):
+    day = day or date.today()
+    return os.path.join(folder, f"expenses_{day.strftime('%Y-%m-%d')}.json")
+
+
+def load_expenses(day=None, folder=EXPENSE_DIR, expense_class=KasirExpense):
+    """Expenses saved for one day (today by default)"""
+    filename = expense_file(day, folder)
+    if not os.path.exists(filename):
+        return []
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [expense_class(item['id'], item['name'], item['amount'],
+                          datetime.strptime(item['date_time'], '%Y-%m-%d %H:%M:%S'))
+            for item in data]
+
+
+def save_expenses(expenses, day=None, folder=EXPENSE_DIR):
+    """Save the expenses of one day (today by default)"""
+    day = day or date.today()
+    data = [{
+        'id': expense.id,
+        'name': expense.name,
+        'amount': expense.amount,
+        'date_time': expense.date_time.strftime('%Y-%m-%d %H:%M:%S')
+    } for expense in expenses if expense.date_time.date() == day]
+    write_json(expense_file(day, folder), data)
@@ -0,0 +1,401 @@
+"""
+Sinkronisasi penjualan kasir offline ke Firebase.
+
+Transaksi (transactions.json dan arsip), pengeluaran harian, pergerakan stok
+dari penjualan, rollup harian till dan snapshot stok diunggah per batch ke
+kasir/<till_id> dengan satu PATCH multi-path. Setiap record memakai key tetap
+(waktu+nomor struk, hari+id pengeluaran) sehingga batch yang terkirim ulang
+tidak membuat duplikat, juga setelah penghitung struk di-reset.
+cloud_sync.json mencatat key struk dan id pengeluaran yang sudah terkirim
+per hari, jadi setiap putaran hanya membaca dan mengirim yang baru.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+
+from kasir_core.archive import ARCHIVE_DIR, archive_path, archived_days, ArchiveReader
+from kasir_core.money import to_rupiah, to_grams
+from kasir_core.rollup import TRANSACTION_FILE, receipt_time
+from kasir_core.storage import EXPENSE_DIR
+
+SYNC_STATE_FILE = 'cloud_sync.json'
+CLOUD_ROOT = 'kasir'
+BATCH_SIZE = 100
+SYNC_INTERVAL = 60
+
+# Characters Firebase does not allow in keys
+INVALID_KEY_CHARS = re.compile(r'[.$#\[\]/]')
+
+
+def receipt_sequence(receipt_number):
+    """Number part of a receipt number (TRX000042 -> 42), or None"""
+    match = re.search(r'(\d+)$', str(receipt_number or ''))
+    return int(match.group(1)) if match else None
+
+
+def cloud_key(text):
+    return INVALID_KEY_CHARS.sub('_', str(text))
+
+
+def receipt_record(receipt):
+    """Receipt in the uploaded shape: integer rupiah and grams"""
+    when = receipt_time(receipt)
+    return {
+        'receipt_number': receipt.get('receipt_number', ''),
+        'time': when.isoformat() if when else '',
+        'username': receipt.get('username', ''),
+        'items': [
+            {'product': item[0], 'grams': to_grams(item[1]), 'price_per_kg': to_rupiah(item[2]), 'total': to_rupiah(item[3])}
+            for item in receipt.get('items', [])
+        ],
+        'subtotal': to_rupiah(receipt.get('subtotal', 0)),
+        'payment': to_rupiah(receipt.get('payment', 0)),
+        'change': to_rupiah(receipt.get('change', 0))
+    }
+
+
+def bucket_digest(bucket):
+    """Short fingerprint of a rollup bucket, to tell whether it changed"""
+    return hashlib.sha1(json.dumps(bucket, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def receipt_key(receipt):
+    """Cloud key of a receipt: day, time and receipt number
+
+    Receipt numbers repeat once the counter is reset, so they are only
+    unique together with the moment the receipt was made.
+    """
+    when = receipt_time(receipt)
+    moment = when.strftime('%Y-%m-%d_%H%M%S') if when else 'undated'
+    return f"{moment}_{cloud_key(receipt.get('receipt_number', ''))}"
+
+
+def stock_moves(receipt):
+    """Stock movements caused by one receipt, keyed by receipt and line"""
+    when = receipt_time(receipt)
+    key = receipt_key(receipt)
+    moves = {}
+    for line, item in enumerate(receipt.get('items', [])):
+        moves[f"{key}_{line}"] = {
+            'product': item[0],
+            'grams': -to_grams(item[1]),
+            'reason': 'sale',
+            'receipt_number': receipt.get('receipt_number', ''),
+            'time': when.isoformat() if when else ''
+        }
+    return moves
+
+
+class SalesSync:
+    """Uploads new kasir records to Firebase in idempotent batches
+
+    transport is anything with update_data(path, data) -> bool, normally a
+    transport.firebase.FirebaseTransport. Runs in a background thread so
+    checkout only calls set_rollups() and kick().
+    """
+    def __init__(self, transport, till_id=None, state_file=SYNC_STATE_FILE,
+                 transaction_file=TRANSACTION_FILE, archive_dir=ARCHIVE_DIR, expense_dir=EXPENSE_DIR,
+                 interval=SYNC_INTERVAL):
+        self.transport = transport
+        self.rollup_days = None
+        self.state_file = state_file
+        self.transaction_file = transaction_file
+        self.archive_dir = archive_dir
+        self.expense_dir = expense_dir
+        self.interval = interval
+        self.info = {}
+        self.stock = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+        self.last_error = None
+        self.state = self.load_state()
+        if till_id:
+            self.state['till_id'] = till_id
+
+    def load_state(self):
+        state = {}
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+        except Exception as e:
+            print(f"Error loading sync state: {e}")
+        state.setdefault('till_id', f"till-{uuid.uuid4().hex[:8]}")
+        state.setdefault('receipt_day', '')
+        state.setdefault('receipt_sent', {})
+        state.setdefault('expense_day', '')
+        state.setdefault('expense_sent', {})
+        state.setdefault('days_sent', {})
+        # Older state kept a (day, id) high-water mark; ids were 1..n then
+        legacy_id = state.pop('expense_id', 0)
+        if legacy_id and state['expense_day']:
+            state['expense_sent'].setdefault(state['expense_day'], [str(i) for i in range(1, legacy_id + 1)])
+        # Older state kept the number of the last receipt sent; those receipts
+        # went up under the bare receipt number
+        legacy_seq = state.pop('receipt_seq', 0)
+        if legacy_seq and state['receipt_day']:
+            sent = {
+                receipt_key(receipt) for day, receipt in self.read_receipts(state['receipt_day'])
+                if day == state['receipt_day'] and (receipt_sequence(receipt.get('receipt_number')) or 0) <= legacy_seq
+            }
+            state['receipt_sent'].setdefault(state['receipt_day'], sorted(sent))
+        return state
+
+    def save_state(self):
+        try:
+            tmp_name = f"{self.state_file}.tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_name, self.state_file)
+        except Exception as e:
+            print(f"Error saving sync state: {e}")
+
+    @property
+    def till_path(self):
+        return f"{CLOUD_ROOT}/{self.state['till_id']}"
+
+    def set_info(self, username, shop_name):
+        self.info = {'username': username, 'shop_name': shop_name}
+
+    def set_rollups(self, days):
+        """Copy of the rollup day buckets uploaded with the next batches
+
+        Call on the UI thread, which owns the rollup store; the worker only
+        reads this copy. Days before both high-water marks have nothing left
+        to upload and are not copied.
+        """
+        since = min(self.state['receipt_day'], self.state['expense_day'])
+        self.rollup_days = {day: copy.deepcopy(bucket) for day, bucket in days.items() if day >= since}
+
+    def set_stock(self, products):
+        """Snapshot of the current stock, uploaded with the next batch"""
+        self.stock = {
+            str(p.id): {'name': p.name, 'stock_g': p.stock_g, 'price_per_kg': to_rupiah(p.price_per_kg)}
+            for p in products
+        }
+
+    # Reading new records
+
+    def read_receipts(self, since_day):
+        """(day, receipt) pairs of the archives and journal from since_day on"""
+        receipts = []
+        for day in archived_days(self.archive_dir):
+            if day < since_day:
+                continue
+            try:
+                with ArchiveReader(archive_path(day, self.archive_dir)) as reader:
+                    receipts.extend((day, receipt) for receipt in reader.receipts())
+            except Exception as e:
+                print(f"Error reading archive {day}: {e}")
+        if os.path.exists(self.transaction_file):
+            with open(self.transaction_file, 'r', encoding='utf-8') as f:
+                for receipt in json.load(f):
+                    when = receipt_time(receipt)
+                    if when is None:
+                        continue
+                    day = when.strftime('%Y-%m-%d')
+                    if day >= since_day:
+                        receipts.append((day, receipt))
+        return receipts
+
+    def new_receipts(self):
+        """(day, receipt) pairs not sent yet, oldest first
+
+        Days before receipt_day are complete; for the rest the keys of the
+        receipts already sent are kept, since numbers restart when the
+        counter is reset.
+        """
+        receipts = []
+        for day, receipt in self.read_receipts(self.state['receipt_day']):
+            sent = self.state['receipt_sent'].get(day, ())
+            if receipt_key(receipt) not in sent:
+                receipts.append((day, receipt))
+        receipts.sort(key=lambda entry: receipt_key(entry[1]))
+        return receipts
+
+    def new_expenses(self):
+        """(day, expense) pairs not sent yet, oldest day first
+
+        Days before expense_day are complete; for the rest the ids already
+        sent are kept, since ids are not ordered.
+        """
+        if not os.path.exists(self.expense_dir):
+            return []
+        since_day = self.state['expense_day']
+        result = []
+        for name in sorted(os.listdir(self.expense_dir)):
+            if not (name.startswith('expenses_') and name.endswith('.json')):
+                continue
+            day = name[len('expenses_'):-len('.json')]
+            if day < since_day:
+                continue
+            with open(os.path.join(self.expense_dir, name), 'r', encoding='utf-8') as f:
+                expenses = json.load(f)
+            sent = set(self.state['expense_sent'].get(day, ()))
+            for expense in expenses:
+                if str(expense.get('id', '')) not in sent:
+                    result.append((day, expense))
+        return result
+
+    # Uploading
+
+    def sync_once(self):
+        """Upload everything above the high-water marks; returns records sent"""
+        with self.lock:
+            sent = 0
+            # Records written after this point are from today or later
+            started_day = datetime.now().strftime('%Y-%m-%d')
+            receipts = self.new_receipts()
+            for start in range(0, len(receipts), BATCH_SIZE):
+                batch = receipts[start:start + BATCH_SIZE]
+                update = {}
+                for day, receipt in batch:
+                    update[f"receipts/{receipt_key(receipt)}"] = receipt_record(receipt)
+                    for key, move in stock_moves(receipt).items():
+                        update[f"stock_moves/{key}"] = move
+                if not self.upload(update):
+                    return sent
+                sent_keys = self.state['receipt_sent']
+                for day, receipt in batch:
+                    sent_keys.setdefault(day, []).append(receipt_key(receipt))
+                # Receipts are only added for today, so older days are done
+                last_day = batch[-1][0]
+                self.state['receipt_day'] = last_day
+                for day in [day for day in sent_keys if day < last_day]:
+                    del sent_keys[day]
+                self.save_state()
+                sent += len(batch)
+
+            expenses = self.new_expenses()
+            for start in range(0, len(expenses), BATCH_SIZE):
+                batch = expenses[start:start + BATCH_SIZE]
+                update = {}
+                for day, expense in batch:
+                    update[f"expenses/{day}_{cloud_key(expense.get('id', ''))}"] = {
+                        'name': expense.get('name', ''),
+                        'amount': to_rupiah(expense.get('amount', 0)),
+                        'date_time': expense.get('date_time', '')
+                    }
+                if not self.upload(update):
+                    return sent
+                sent_ids = self.state['expense_sent']
+                for day, expense in batch:
+                    sent_ids.setdefault(day, []).append(str(expense.get('id', '')))
+                # Expenses are only added for today, so older days are done
+                last_day = batch[-1][0]
+                self.state['expense_day'] = last_day
+                for day in [day for day in sent_ids if day < last_day]:
+                    del sent_ids[day]
+                self.save_state()
+                sent += len(batch)
+
+            if not self.upload_day_rollups():
+                return sent
+            self.advance_days(started_day)
+
+            stock = self.stock
+            if stock is not None:
+                if not self.upload({'stock': stock}):
+                    return sent
+                # A newer snapshot may have been set while uploading
+                if self.stock is stock:
+                    self.stock = None
+            return sent
+
+    def advance_days(self, day):
+        """Move both day marks up to day once everything before it is sent
+
+        Keeps new_receipts from reading old archives and set_rollups from
+        copying old days when a till has no receipts or no expenses yet.
+        """
+        if self.state['receipt_day'] >= day and self.state['expense_day'] >= day:
+            return
+        self.state['receipt_day'] = max(self.state['receipt_day'], day)
+        self.state['expense_day'] = max(self.state['expense_day'], day)
+        for sent in (self.state['receipt_sent'], self.state['expense_sent'], self.state['days_sent']):
+            for old_day in [old_day for old_day in sent if old_day < day]:
+                del sent[old_day]
+        self.save_state()
+
+    def upload_day_rollups(self):
+        """Upload this till's rollup of every day that changed since it was last sent
+
+        The buckets feed the consolidated reports, so a day goes up again
+        after any change, also one without a new record (a deleted
+        expense, an expense reset); a day gone from the rollups is
+        removed. Returns False if the upload failed.
+        """
+        rollup_days = self.rollup_days
+        if rollup_days is None:
+            return True
+        sent = self.state['days_sent']
+        since = min(self.state['receipt_day'], self.state['expense_day'])
+        update = {}
+        digests = {}
+        for day, bucket in rollup_days.items():
+            digest = bucket_digest(bucket)
+            if sent.get(day) != digest:
+                update[f"days/{day}"] = bucket
+                digests[day] = digest
+        for day in sent:
+            if day >= since and day not in rollup_days:
+                update[f"days/{day}"] = None
+                digests[day] = None
+        if not update:
+            return True
+        if not self.upload(update):
+            return False
+        for day, digest in digests.items():
+            if digest is None:
+                sent.pop(day, None)
+            else:
+                sent[day] = digest
+        self.save_state()
+        return True
+
+    def upload(self, update):
+        """PATCH one batch under this till; metadata rides along"""
+        update = dict(update)
+        update['info'] = dict(self.info, last_sync=datetime.now().isoformat())
+        if self.transport.update_data(self.till_path, update):
+            self.last_error = None
+            return True
+        self.last_error = 'upload failed'
+        return False
+
+    # Background thread
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+
+    def kick(self):
+        """Upload soon; safe to call from the UI thread"""
+        self.wake.set()
+
+    def _run(self):
+        while self.running:
+            try:
+                sent = self.sync_once()
+                if sent:
+                    print(f"Sinkron kasir: {sent} record terkirim")
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Error syncing kasir data: {e}")
+            self.wake.wait(self.interval)
+            self.wake.clear()
@@ -0,0 +1,220 @@
+"""
+Laporan gabungan untuk beberapa HP kasir (till) dalam satu toko.
+
+Setiap till punya kode sendiri di till.json (file milik perangkat, tidak
+ikut user_config.json atau git). Setelah multi_till diaktifkan di
+user_config.json kode itu menjadi awalan nomor struk, misalnya
+K1-TRX000042, sehingga nomor struk unik di seluruh toko; toko dengan satu
+kasir tetap memakai TRX000042. Penjualan baru diunggah ke Firebase setelah
+cloud_sync diaktifkan (default mati).
+
+ConsolidatedReport menyimpan satu bucket rollup per till per hari dan jumlah
+gabungannya; menambah atau mengganti satu hari dari satu till hanya
+mengurangi bucket lama dan menambahkan bucket baru ke total gabungan.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+from kasir_core.money import format_kg
+from kasir_core.rollup import empty_bucket, day_key
+from kasir_core.storage import write_json
+from kasir_core.sync import CLOUD_ROOT
+
+CONFIG_FILE = 'user_config.json'
+TILL_FILE = 'till.json'
+CONSOLIDATED_FILE = 'rollups/consolidated.json'
+
+
+def read_config(config_file=CONFIG_FILE):
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading {config_file}: {e}")
+    return {}
+
+
+def load_till_code(till_file=TILL_FILE, config_file=CONFIG_FILE):
+    """Return this device's till code, creating and saving one if missing
+
+    Builds that kept the code in user_config.json have it moved to till_file.
+    """
+    code = str(read_config(till_file).get('till_code') or '').strip()
+    if code:
+        return code
+
+    config = read_config(config_file)
+    legacy = 'till_code' in config
+    code = str(config.pop('till_code', '') or '').strip() or f"K{uuid.uuid4().hex[:4].upper()}"
+    try:
+        write_json(till_file, {'till_code': code})
+        if legacy:
+            write_json(config_file, config)
+    except Exception as e:
+        print(f"Error saving till code: {e}")
+    return code
+
+
+def multi_till_enabled(config_file=CONFIG_FILE):
+    """True once the shop has turned on multi_till in user_config.json"""
+    return bool(read_config(config_file).get('multi_till', False))
+
+
+def cloud_sync_enabled(config_file=CONFIG_FILE):
+    """True once the shop has turned on cloud_sync in user_config.json"""
+    return bool(read_config(config_file).get('cloud_sync', False))
+
+
+def receipt_prefix(config_file=CONFIG_FILE, till_file=TILL_FILE):
+    """Receipt number prefix: the till code with multi_till on, else ''"""
+    if not multi_till_enabled(config_file):
+        return ''
+    return load_till_code(till_file, config_file)
+
+
+def format_receipt_number(counter, till_code=''):
+    """Receipt number with the till prefix: K1-TRX000042"""
+    number = f"TRX{counter:06d}"
+    return f"{till_code}-{number}" if till_code else number
+
+
+def merge_bucket(target, bucket, sign=1):
+    """Add (sign=1) or subtract (sign=-1) a rollup bucket into target"""
+    for field in ('transactions', 'gross', 'expenses'):
+        target[field] = target.get(field, 0) + sign * bucket.get(field, 0)
+    for field in ('grams', 'expense_categories'):
+        totals = target.setdefault(field, {})
+        for name, value in bucket.get(field, {}).items():
+            totals[name] = totals.get(name, 0) + sign * value
+            if not totals[name]:
+                del totals[name]
+    hours = target.setdefault('hours', {})
+    for hour, hour_bucket in bucket.get('hours', {}).items():
+        merged = hours.setdefault(hour, empty_bucket())
+        merge_bucket(merged, hour_bucket, sign)
+        merged.pop('hours', None)
+        if not merged['transactions'] and not merged['gross'] and not merged['expenses']:
+            del hours[hour]
+
+
+def cloud_bucket(bucket):
+    """Normalize a bucket read back from Firebase (hours may come back as a list)"""
+    bucket = dict(empty_bucket(), **(bucket or {}))
+    hours = bucket.get('hours') or {}
+    if isinstance(hours, list):
+        hours = {f"{hour:02d}": value for hour, value in enumerate(hours) if value}
+    bucket['hours'] = {hour: dict(empty_bucket(), **value) for hour, value in hours.items()}
+    return bucket
+
+
+class ConsolidatedReport:
+    """Per-till daily rollups and their shop-wide sum"""
+    def __init__(self, filename=CONSOLIDATED_FILE):
+        self.filename = filename
+        self.days = {}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.days = json.load(f)
+        except Exception as e:
+            print(f"Error loading consolidated report: {e}")
+            self.days = {}
+
+    def save(self):
+        try:
+            folder = os.path.dirname(self.filename)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+
+            tmp_name = f"{self.filename}.tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(self.days, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_name, self.filename)
+        except Exception as e:
+            print(f"Error saving consolidated report: {e}")
+
+    def set_till_day(self, till, day, bucket, save=True):
+        """Replace one till's bucket for a day; returns True if it changed"""
+        day = day if isinstance(day, str) else day_key(day)
+        entry = self.days.setdefault(day, {'combined': empty_bucket(), 'tills': {}})
+        old = entry['tills'].get(till)
+        if old == bucket:
+            return False
+        if old:
+            merge_bucket(entry['combined'], old, -1)
+        merge_bucket(entry['combined'], bucket)
+        entry['tills'][till] = json.loads(json.dumps(bucket))
+        if save:
+            self.save()
+        return True
+
+    def pull_cloud(self, transport, day, skip=()):
+        """Fetch every till's bucket for one day from kasir/<till>/days/<day>
+
+        Tills in skip (usually this device) are left alone. Returns the
+        number of tills whose bucket changed.
+        """
+        day = day if isinstance(day, str) else day_key(day)
+        tills = transport.request('GET', CLOUD_ROOT, params={'shallow': 'true'}) or {}
+        changed = 0
+        for till in sorted(tills):
+            if till in skip:
+                continue
+            bucket = transport.get_data(f"{CLOUD_ROOT}/{till}/days/{day}")
+            if bucket and self.set_till_day(till, day, cloud_bucket(bucket), save=False):
+                changed += 1
+        if changed:
+            self.save()
+        return changed
+
+    def get_day(self, day):
+        """Return (combined bucket, {till: bucket}) for a day"""
+        day = day if isinstance(day, str) else day_key(day)
+        entry = self.days.get(day)
+        if not entry:
+            combined = empty_bucket()
+            combined['hours'] = {}
+            return combined, {}
+        return json.loads(json.dumps(entry['combined'])), json.loads(json.dumps(entry['tills']))
+
+    def format_day(self, day, format_currency, names=None):
+        """Text report of one day: shop totals then a line per till"""
+        combined, tills = self.get_day(day)
+        names = names or {}
+        day = day if isinstance(day, str) else day_key(day)
+        date_text = datetime.strptime(day, '%Y-%m-%d').strftime('%d/%m/%Y')
+
+        lines = []
+        lines.append("=" * 40)
+        lines.append("       LAPORAN GABUNGAN KASIR")
+        lines.append(f"           {date_text}")
+        lines.append("=" * 40)
+        lines.append(f"Jumlah Kasir        : {len(tills)}")
+        lines.append(f"Jumlah Transaksi    : {combined['transactions']}")
+        lines.append(f"Total Pendapatan    : {format_currency(combined['gross'])}")
+        lines.append(f"Total Pengeluaran   : {format_currency(combined['expenses'])}")
+        lines.append(f"Keuntungan Bersih   : {format_currency(combined['gross'] - combined['expenses'])}")
+        lines.append("")
+        lines.append("PER KASIR:")
+        lines.append("-" * 40)
+        if tills:
+            for till, bucket in sorted(tills.items(), key=lambda x: -x[1]['gross']):
+                label = names.get(till, till)
+                lines.append(f"{label[:20]:<20}: {bucket['transactions']:3d} trx")
+                lines.append(f"    {format_currency(bucket['gross'])}  (keluar {format_currency(bucket['expenses'])})")
+        else:
+            lines.append("Belum ada data kasir untuk hari ini")
+        lines.append("")
+        lines.append("PENJUALAN PER PRODUK:")
+        lines.append("-" * 40)
+        for name, grams in sorted(combined['grams'].items(), key=lambda x: -x[1]):
+            lines.append(f"{name[:24]:<24}: {format_kg(grams)} kg")
+        lines.append("=" * 40)
+        return "\n".join(lines)
@@ -0,0 +1,6 @@
+"""
+Layar aplikasi, dikelompokkan per fitur.
+
+Modul di paket ini diimpor saat layarnya pertama kali dibuka (lihat
+screens.registry), jadi __init__ ini sengaja tidak mengimpor apa pun.
+"""
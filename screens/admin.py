@@ -0,0 +1,1210 @@
+"""
+Layar admin: dashboard, pengguna baru, token, ban, pengaturan dan log aktivitas.
+"""
+
+import re
+from datetime import datetime
+import threading
+
+from kivy.app import App
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.popup import Popup
+from kivy.clock import Clock
+from kivy.core.clipboard import Clipboard
+
+from screens.common import apply_emoji_font, show_connection_state
+from token_store.session import SessionManager
+from transport.tracing import tracer
+
+
+class AdminDashboardScreen(Screen):
+    """Admin dashboard - Indonesian language"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        self.username = username
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.1)
+        header.add_widget(Label(
+            text='DASHBOARD ADMIN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        logout_btn = Button(
+            text='Keluar',
+            size_hint_x=0.3,
+            background_color=(1, 0.3, 0.3, 1)
+        )
+        logout_btn.bind(on_press=self.logout)
+        header.add_widget(logout_btn)
+        
+        layout.add_widget(header)
+        
+        # Online users notification
+        self.online_label = Label(
+            text='Memuat pengguna online...',
+            size_hint_y=0.08,
+            font_size='12sp',
+            color=(0.2, 0.8, 0.2, 1)
+        )
+        layout.add_widget(self.online_label)
+        
+        # Stats panel
+        self.stats_layout = GridLayout(
+            cols=2,
+            size_hint_y=0.25,
+            padding=10,
+            spacing=5
+        )
+        layout.add_widget(self.stats_layout)
+        
+        # Menu buttons (admin functions only)
+        menu_layout = GridLayout(
+            cols=2,
+            size_hint_y=0.4,
+            padding=10,
+            spacing=10
+        )
+        
+        buttons = [
+            ('Tambah User', self.go_to_add_user, (0.2, 0.8, 0.2, 1)),
+            ('Ambil Token', self.go_to_take_tokens, (1, 0.6, 0.2, 1)),
+            ('Ban Token', self.go_to_ban_token, (1, 0.2, 0.2, 1)),
+            ('Cek Token', self.go_to_check_token, (0.8, 0.2, 0.2, 1)),
+            ('Lihat User', self.go_to_users, (0.2, 0.6, 1, 1)),
+            ('Grup Chat', self.go_to_chat, (0.8, 0.2, 0.8, 1)),
+            ('Pengaturan', self.go_to_settings, (0.6, 0.6, 0.6, 1)),
+            ('Log Aktivitas', self.go_to_activity, (0.6, 0.2, 0.8, 1)),
+            ('Metrik Jaringan', self.go_to_metrics, (0.2, 0.7, 0.7, 1))
+        ]
+
+        
+        for text, callback, color in buttons:
+            btn = Button(
+                text=text,
+                font_size='14sp',
+                bold=True,
+                background_color=color
+            )
+            btn.bind(on_press=callback)
+            menu_layout.add_widget(btn)
+        
+        layout.add_widget(menu_layout)
+        
+        # Status info
+        self.status_label = Label(
+            text='Admin: Kelola pengguna, ambil token, monitor sistem',
+            size_hint_y=0.17,
+            font_size='12sp',
+            color=(0.5, 0.5, 0.5, 1)
+        )
+        layout.add_widget(self.status_label)
+        
+        self.add_widget(layout)
+
+    def go_to_ban_token(self, instance):
+        self.manager.current = 'ban_token'
+
+
+    def update_stats(self):
+        if not self.firebase_manager:
+            return
+        
+        def update_in_background():
+            stats = self.firebase_manager.get_all_stats()
+            online_users = self.firebase_manager.get_online_users()
+            Clock.schedule_once(lambda dt: self._update_stats_ui(stats, online_users), 0)
+        
+        threading.Thread(target=update_in_background, daemon=True).start()
+    
+    def _update_stats_ui(self, stats, online_users):
+        show_connection_state(self.status_label, self.firebase_manager, 'Admin: Kelola pengguna, ambil token, monitor sistem')
+        self.stats_layout.clear_widgets()
+        
+        # Update online users notification
+        if online_users:
+            online_text = f"Online: {', '.join(online_users)}"
+        else:
+            online_text = "Tidak ada pengguna online"
+        self.online_label.text = online_text
+        # self.online_label.font_name = 'EmojiFont'
+        
+        stats_items = [
+            ('Total Token:', f"{stats.get('total_tokens', 0):,}"),
+            ('Tersedia:', f"{stats.get('available_tokens', 0):,}"),
+            ('Diambil:', f"{stats.get('taken_tokens', 0):,}"),
+            ('Total User:', f"{stats.get('total_users', 0)}"),
+            ('User Online:', f"{stats.get('online_users', 0)}"),
+            ('Harga/Token:', f"Rp {stats.get('price_per_token', 1500):,}")
+        ]
+        
+        for label, value in stats_items:
+            self.stats_layout.add_widget(Label(
+                text=label,
+                font_size='11sp',
+                bold=True
+            ))
+            self.stats_layout.add_widget(Label(
+                text=value,
+                font_size='11sp',
+                color=(0.2, 0.6, 1, 1)
+            ))
+    
+    def on_enter(self):
+        Clock.schedule_once(lambda dt: self.update_stats(), 0.1)
+        # Auto-refresh stats every 15 seconds
+        Clock.schedule_interval(lambda dt: self.update_stats(), 15)
+    
+    def on_leave(self):
+        Clock.unschedule(self.update_stats)
+    
+    def logout(self, instance):
+        if self.firebase_manager and self.username:
+            self.firebase_manager.logout(self.username)
+        
+        # Clear session
+        SessionManager().clear_session()
+        
+        self.manager.current = 'login'
+    
+    def go_to_add_user(self, instance):
+        self.manager.current = 'add_user'
+    
+    def go_to_take_tokens(self, instance):
+        self.manager.current = 'take_tokens'
+    
+    def go_to_users(self, instance):
+        self.manager.current = 'users'
+    
+    def go_to_chat(self, instance):
+        self.manager.current = 'chat'
+    
+    def go_to_settings(self, instance):
+        self.manager.current = 'settings'
+    
+    def go_to_activity(self, instance):
+        self.manager.current = 'activity'
+    
+    def go_to_check_token(self, instance):
+        self.manager.current = 'check_token'
+    
+    def go_to_metrics(self, instance):
+        self.manager.current = 'metrics'
+
+
+class AddUserScreen(Screen):
+    """Screen for adding new users (admin only) - Indonesian"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.15)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'admin_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='TAMBAH USER BARU',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Instructions
+        instructions = Label(
+            text='Masukkan username untuk user baru.\nUser akan dapat login dan menambahkan token.',
+            font_size='14sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=0.15
+        )
+        layout.add_widget(instructions)
+        
+        # Username input
+        self.username_input = TextInput(
+            hint_text='Masukkan username baru (huruf, angka, underscore saja)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.username_input)
+        
+        # Password input
+        self.password_input = TextInput(
+            hint_text='Masukkan password untuk user (opsional)',
+            password=True,
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.password_input)
+        
+        # Add user button
+        add_btn = Button(
+            text='TAMBAH USER',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.12
+        )
+        add_btn.bind(on_press=self.add_user)
+        layout.add_widget(add_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.2
+        )
+        layout.add_widget(self.status_label)
+        
+        # Recent users list
+        recent_label = Label(
+            text='User yang Baru Ditambahkan:',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=0.08
+        )
+        layout.add_widget(recent_label)
+        
+        self.recent_users_scroll = ScrollView(size_hint_y=0.2)
+        self.recent_users_layout = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.recent_users_layout.bind(minimum_height=self.recent_users_layout.setter('height'))
+        self.recent_users_scroll.add_widget(self.recent_users_layout)
+        layout.add_widget(self.recent_users_scroll)
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_recent_users()
+    
+    def load_recent_users(self):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            users = self.firebase_manager.get_all_users()
+            # Sort by creation date, newest first
+            users.sort(key=lambda x: x.get('created', ''), reverse=True)
+            recent_users = users[:5]  # Show last 5 users
+            Clock.schedule_once(lambda dt: self.update_recent_users_ui(recent_users), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_recent_users_ui(self, users):
+        self.recent_users_layout.clear_widgets()
+        
+        if users:
+            for user in users:
+                user_info = f"{user['username']} - {user.get('token_count', 0)} token - {user.get('created', '')[:10]}"
+                user_label = Label(
+                    text=user_info,
+                    size_hint_y=None,
+                    height=30,
+                    font_size='12sp'
+                )
+                self.recent_users_layout.add_widget(user_label)
+        else:
+            self.recent_users_layout.add_widget(Label(
+                text='Tidak ada user ditemukan',
+                size_hint_y=None,
+                height=30
+            ))
+    
+    @tracer.traced_action('admin.add_user')
+    def add_user(self, instance):
+        username = self.username_input.text.strip()
+        password = self.password_input.text.strip()
+        
+        if not username:
+            self.status_label.text = 'Silakan masukkan username'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        # Validate username
+        if not re.match(r'^[a-zA-Z0-9_]+$', username):
+            self.status_label.text = 'Username hanya boleh berisi huruf, angka, dan underscore'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        if len(username) < 3:
+            self.status_label.text = 'Username minimal 3 karakter'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        if not password:
+            self.status_label.text = 'Silakan masukkan password untuk user'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        if len(password) < 6:
+            self.status_label.text = '✗ Password minimal 6 karakter'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Menambahkan user...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def add_user_in_background():
+            success, message = self.firebase_manager.add_user(username, App.get_running_app().current_user, password)
+            Clock.schedule_once(tracer.wrap(lambda dt: self.handle_add_result(success, message), 'handle_add_result'), 0)
+        
+        threading.Thread(target=tracer.wrap(add_user_in_background), daemon=True).start()
+    
+    def handle_add_result(self, success, message):
+        self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
+        
+        if success:
+            self.username_input.text = ''
+            self.password_input.text = ''
+            self.load_recent_users()
+
+
+class TakeTokensScreen(Screen):
+    """Screen for taking tokens (admin only) - Indonesian with bulk copy"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.taken_tokens_list = []
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'admin_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='AMBIL TOKEN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Available tokens info
+        self.available_label = Label(
+            text='Memuat token yang tersedia...',
+            font_size='14sp',
+            color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.available_label)
+        
+        # Count input
+        self.count_input = TextInput(
+            hint_text='Masukkan jumlah token yang akan diambil',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1,
+            input_filter='int'
+        )
+        layout.add_widget(self.count_input)
+        
+        # Take tokens button
+        take_btn = Button(
+            text='AMBIL TOKEN',
+            font_size='18sp',
+            bold=True,
+            background_color=(1, 0.6, 0.2, 1),
+            size_hint_y=0.12
+        )
+        take_btn.bind(on_press=self.take_tokens)
+        layout.add_widget(take_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        layout.add_widget(self.status_label)
+        
+        # Copy all tokens button
+        self.copy_all_btn = Button(
+            text='📋 SALIN SEMUA TOKEN',
+            font_size='16sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.1,
+            opacity=0
+        )
+        self.copy_all_btn.bind(on_press=self.copy_all_tokens)
+        layout.add_widget(self.copy_all_btn)
+        
+        # Taken tokens display
+        taken_label = Label(
+            text='Token yang Diambil:',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=0.08
+        )
+        layout.add_widget(taken_label)
+        
+        self.taken_tokens_scroll = ScrollView(size_hint_y=0.23)
+        self.taken_tokens_layout = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.taken_tokens_layout.bind(minimum_height=self.taken_tokens_layout.setter('height'))
+        self.taken_tokens_scroll.add_widget(self.taken_tokens_layout)
+        layout.add_widget(self.taken_tokens_scroll)
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_available_count()
+    
+    def load_available_count(self):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            count = self.firebase_manager.get_available_tokens_count()
+            Clock.schedule_once(lambda dt: self.update_available_ui(count), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_available_ui(self, count):
+        self.available_label.text = f'Token Tersedia: {count:,}'
+        apply_emoji_font(self.available_label)
+    
+    @tracer.traced_action('admin.take_tokens')
+    def take_tokens(self, instance):
+        count_text = self.count_input.text.strip()
+        
+        if not count_text or not count_text.isdigit():
+            self.status_label.text = 'Silakan masukkan angka yang valid'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        count = int(count_text)
+        if count <= 0:
+            self.status_label.text = 'Harga harus lebih besar dari 0'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = f'Mengambil {count} token...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def take_tokens_in_background():
+            result = self.firebase_manager.take_tokens(count, App.get_running_app().current_user)
+            Clock.schedule_once(tracer.wrap(lambda dt: self.handle_take_result(result), 'handle_take_result'), 0)
+        
+        threading.Thread(target=tracer.wrap(take_tokens_in_background), daemon=True).start()
+    
+    def handle_take_result(self, result):
+        if result and result.get('success'):
+            tokens = result.get('tokens', [])
+            count = result.get('count', 0)
+            
+            # Store tokens for bulk copy
+            self.taken_tokens_list = tokens
+            
+            self.status_label.text = f'✅Berhasil mengambil {count} token!'
+            self.status_label.color = (0.2, 0.8, 0.2, 1)
+            
+            # Show copy all button
+            self.copy_all_btn.opacity = 1
+            
+            # Display taken tokens (preview only)
+            self.taken_tokens_layout.clear_widgets()
+            for i, token in enumerate(tokens, 1):
+                token_preview = Label(
+                    text=f'{i}. {token[:15]}...{token[-10:]}',
+                    size_hint_y=None,
+                    height=30,
+                    font_size='12sp',
+                    color=(0.8, 0.8, 0.8, 1)
+                )
+                self.taken_tokens_layout.add_widget(token_preview)
+            
+            # Clear input and refresh available count
+            self.count_input.text = ''
+            self.load_available_count()
+        else:
+            self.status_label.text = '✗ Gagal mengambil token (tidak cukup tersedia?)'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+    
+    def copy_all_tokens(self, instance):
+        """Copy all taken tokens to clipboard at once"""
+        if not self.taken_tokens_list:
+            self.status_label.text = '✗ Tidak ada token untuk disalin'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        try:
+            # Join all tokens with newline
+            all_tokens_text = '\n'.join(self.taken_tokens_list)
+            Clipboard.copy(all_tokens_text)
+            
+            self.status_label.text = f'✅{len(self.taken_tokens_list)} token berhasil disalin ke clipboard!'
+            self.status_label.color = (0.2, 0.8, 0.2, 1)
+            
+            # Hide copy button after successful copy
+            self.copy_all_btn.opacity = 0
+            
+        except Exception as e:
+            self.status_label.text = '✗ Gagal menyalin token'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+
+
+class CheckTokenScreen(Screen):
+    """Screen for checking token ownership (admin only)"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'admin_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='CEK PEMILIK TOKEN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Instructions
+        instructions = Label(
+            text='Masukkan token untuk mengetahui siapa pemiliknya dan status token tersebut.',
+            font_size='14sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=0.1
+        )
+        layout.add_widget(instructions)
+        
+        # Token input
+        self.token_input = TextInput(
+            hint_text='Tempel token yang ingin dicek di sini',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.12
+        )
+        layout.add_widget(self.token_input)
+        
+        # Check button
+        check_btn = Button(
+            text='CEK TOKEN',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.6, 1, 1),
+            size_hint_y=0.1
+        )
+        check_btn.bind(on_press=self.check_token)
+        layout.add_widget(check_btn)
+        
+        # Result display
+        self.result_scroll = ScrollView(size_hint_y=0.46)
+        self.result_layout = BoxLayout(orientation='vertical', size_hint_y=None, padding=10, spacing=10)
+        self.result_layout.bind(minimum_height=self.result_layout.setter('height'))
+        self.result_scroll.add_widget(self.result_layout)
+        layout.add_widget(self.result_scroll)
+        
+        self.add_widget(layout)
+    
+    @tracer.traced_action('admin.check_token')
+    def check_token(self, instance):
+        token_to_check = self.token_input.text.strip()
+        
+        if not token_to_check:
+            self.show_result('✗ Silakan masukkan token', (1, 0.2, 0.2, 1))
+            return
+        
+        self.show_result('Mencari token...', (0.2, 0.6, 1, 1))
+        
+        def check_in_background():
+            result, message = self.firebase_manager.check_token_owner(token_to_check)
+            Clock.schedule_once(tracer.wrap(lambda dt: self.handle_check_result(result, message), 'handle_check_result'), 0)
+        
+        threading.Thread(target=tracer.wrap(check_in_background), daemon=True).start()
+    
+    def handle_check_result(self, result, message):
+        self.result_layout.clear_widgets()
+        
+        if result:
+            # Token found - show detailed info
+            info_text = f"""TOKEN DITEMUKAN
+
+Pemilik: {result['owner']}
+Status: {result['status']}
+Ditambahkan: {result['timestamp']}
+Harga: Rp {result['price']:,}
+ID Token: {result['token_id']}"""
+            
+            self.result_layout.add_widget(Label(
+                text=info_text,
+                font_size='14sp',
+                color=(0.2, 0.8, 0.2, 1),
+                size_hint_y=None,
+                height=200,
+                halign='left'
+            ))
+            
+            # Add action buttons if needed
+            if result['status'] == 'available':
+                action_btn = Button(
+                    text='Tandai sebagai Bermasalah',
+                    font_size='14sp',
+                    background_color=(1, 0.6, 0.2, 1),
+                    size_hint_y=None,
+                    height=40
+                )
+                # You can add functionality here
+                self.result_layout.add_widget(action_btn)
+                
+        else:
+            # Token not found
+            self.result_layout.add_widget(Label(
+                text=f'✗ {message}',
+                font_size='14sp',
+                color=(1, 0.2, 0.2, 1),
+                size_hint_y=None,
+                height=50
+            ))
+    
+    def show_result(self, text, color):
+        self.result_layout.clear_widgets()
+        self.result_layout.add_widget(Label(
+            text=text,
+            font_size='14sp',
+            color=color,
+            size_hint_y=None,
+            height=50
+        ))
+
+
+class BanTokenScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali', 
+            size_hint_x=0.3, 
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'admin_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='BAN TOKEN RUSAK', 
+            font_size='20sp', 
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        instructions = Label(
+            text='Masukkan token rusak untuk dihapus (satu per baris).\nPenghasilan pemilik akan dikurangi otomatis.\nToken bancet akan ditambahkan ke statistik user.',
+            font_size='14sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=0.15
+        )
+        layout.add_widget(instructions)
+        
+        self.tokens_input = TextInput(
+            hint_text='Tempel token rusak di sini (satu per baris)',
+            multiline=True,
+            font_size='14sp',
+            size_hint_y=0.3
+        )
+        layout.add_widget(self.tokens_input)
+        
+        ban_btn = Button(
+            text='BAN TOKEN',
+            font_size='18sp',
+            bold=True,
+            background_color=(1, 0.2, 0.2, 1),
+            size_hint_y=0.12
+        )
+        ban_btn.bind(on_press=self.ban_tokens)
+        layout.add_widget(ban_btn)
+        
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.31
+        )
+        layout.add_widget(self.status_label)
+        
+        self.add_widget(layout)
+    
+    @tracer.traced_action('admin.ban_tokens')
+    def ban_tokens(self, instance):
+        tokens_text = self.tokens_input.text.strip()
+        
+        if not tokens_text:
+            self.status_label.text = '✗ Silakan masukkan token yang akan diban'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Memban token...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def bg():
+            success, message, details = self.firebase_manager.ban_tokens(tokens_text, App.get_running_app().current_user)
+            Clock.schedule_once(tracer.wrap(lambda dt: self.handle_ban_result(success, message, details), 'handle_ban_result'), 0)
+        
+        threading.Thread(target=tracer.wrap(bg, 'ban_tokens_in_background'), daemon=True).start()
+    
+    def handle_ban_result(self, success, message, details):
+        if details:
+            result_text = (
+                f"{message}\n\n"
+                f"Berhasil diban: {details.get('success', 0)}\n"
+                f"Tidak ditemukan: {details.get('not_found', 0)}\n"
+                f"User terdampak: {details.get('affected_users', 0)}\n"
+                f"Total kerugian: Rp {details.get('total_loss', 0):,}\n\n"
+                f"Notifikasi telah dikirim ke chat untuk memberitahu user yang terdampak"
+            )
+            self.status_label.text = result_text
+        else:
+            self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
+        
+        if success:
+            self.tokens_input.text = ''
+
+
+class SettingsScreen(Screen):
+    """Screen for admin settings - Indonesian with reset data feature"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'admin_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='PENGATURAN ADMIN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Current settings display
+        self.current_settings_label = Label(
+            text='Memuat pengaturan saat ini...',
+            font_size='14sp',
+            color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.current_settings_label)
+        
+        # Price per token setting
+        price_layout = BoxLayout(size_hint_y=0.12, spacing=10)
+        price_layout.add_widget(Label(
+            text='Harga Token (Rp):',
+            font_size='16sp',
+            size_hint_x=0.4
+        ))
+        
+        self.price_input = TextInput(
+            hint_text='Masukkan harga baru per token',
+            multiline=False,
+            font_size='16sp',
+            input_filter='int'
+        )
+        price_layout.add_widget(self.price_input)
+        
+        layout.add_widget(price_layout)
+        
+        # Admin password setting
+        password_layout = BoxLayout(size_hint_y=0.12, spacing=10)
+        password_layout.add_widget(Label(
+            text='Password Admin:',
+            font_size='16sp',
+            size_hint_x=0.4
+        ))
+        
+        self.password_input = TextInput(
+            hint_text='Masukkan password admin baru',
+            multiline=False,
+            password=True,
+            font_size='16sp'
+        )
+        password_layout.add_widget(self.password_input)
+        
+        layout.add_widget(password_layout)
+        
+        # Update buttons
+        button_layout = BoxLayout(size_hint_y=0.12, spacing=10)
+        
+        update_price_btn = Button(
+            text='Perbarui Harga',
+            font_size='16sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1)
+        )
+        update_price_btn.bind(on_press=self.update_price)
+        button_layout.add_widget(update_price_btn)
+        
+        update_password_btn = Button(
+            text='Perbarui Password',
+            font_size='16sp',
+            bold=True,
+            background_color=(1, 0.6, 0.2, 1)
+        )
+        update_password_btn.bind(on_press=self.update_password)
+        button_layout.add_widget(update_password_btn)
+        
+        layout.add_widget(button_layout)
+        
+        # Reset data button
+        reset_btn = Button(
+            text='RESET DATA PENGHASILAN USER',
+            font_size='16sp',
+            bold=True,
+            background_color=(1, 0.2, 0.2, 1),
+            # font_name='EmojiFont',
+            size_hint_y=0.12
+        )
+        reset_btn.bind(on_press=self.reset_user_data)
+        layout.add_widget(reset_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        layout.add_widget(self.status_label)
+        
+        # Warning text
+        warning_text = """⚠️ PERINGATAN:
+• Mengubah harga token hanya berlaku untuk token baru
+• Mengubah password admin memerlukan restart
+• Reset data akan menghapus penghasilan semua user!
+• Pastikan ingat password baru!"""
+        
+        warning_label = Label(
+            text=warning_text,
+            font_size='12sp',
+            color=(1, 0.6, 0.2, 1),
+            size_hint_y=0.27
+        )
+        layout.add_widget(warning_label)
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_current_settings()
+    
+    def load_current_settings(self):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            settings = self.firebase_manager.get_data("settings")
+            Clock.schedule_once(lambda dt: self.update_current_settings_ui(settings), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_current_settings_ui(self, settings):
+        if settings:
+            price = settings.get('price_per_token', 1500)
+            self.current_settings_label.text = f'Harga Token Saat Ini: Rp {price:,}'
+            apply_emoji_font(self.current_settings_label)
+            self.price_input.hint_text = f'Saat ini: Rp {price:,}'
+        else:
+            self.current_settings_label.text = 'Tidak dapat memuat pengaturan saat ini'
+    
+    def update_price(self, instance):
+        new_price = self.price_input.text.strip()
+        
+        if not new_price or not new_price.isdigit():
+            self.status_label.text = 'Silakan masukkan harga yang valid'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        price = int(new_price)
+        if price < 100:
+            self.status_label.text = 'Harga minimal Rp 100'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Memperbarui harga...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def update_in_background():
+            success, message = self.firebase_manager.update_settings({'price_per_token': price})
+            Clock.schedule_once(lambda dt: self.handle_update_result(success, message), 0)
+        
+        threading.Thread(target=update_in_background, daemon=True).start()
+    
+    def update_password(self, instance):
+        new_password = self.password_input.text.strip()
+        
+        if not new_password:
+            self.status_label.text = '✗ Silakan masukkan password baru'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        if len(new_password) < 6:
+            self.status_label.text = '✗ Password minimal 6 karakter'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Memperbarui password...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def update_in_background():
+            success, message = self.firebase_manager.update_settings({'admin_password': new_password})
+            Clock.schedule_once(lambda dt: self.handle_update_result(success, message), 0)
+        
+        threading.Thread(target=update_in_background, daemon=True).start()
+    
+    def reset_user_data(self, instance):
+        """Reset all user earnings and token counts"""
+        # Show confirmation popup
+        content = BoxLayout(orientation='vertical', spacing=10)
+        content.add_widget(Label(
+            text='PERINGATAN!\n\nIni akan menghapus semua penghasilan dan jumlah token user.\nToken yang tersimpan di database tidak akan dihapus.\n\nApakah Anda yakin?',
+            font_size='14sp'
+        ))
+        
+        button_layout = BoxLayout(spacing=10, size_hint_y=0.3)
+        
+        confirm_btn = Button(
+            text='YA, RESET',
+            background_color=(1, 0.2, 0.2, 1)
+        )
+        cancel_btn = Button(
+            text='BATAL',
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        
+        button_layout.add_widget(cancel_btn)
+        button_layout.add_widget(confirm_btn)
+        content.add_widget(button_layout)
+        
+        popup = Popup(
+            title='Konfirmasi Reset Data',
+            content=content,
+            size_hint=(0.8, 0.6)
+        )
+        
+        def confirm_reset(instance):
+            popup.dismiss()
+            self.perform_reset()
+        
+        def cancel_reset(instance):
+            popup.dismiss()
+        
+        confirm_btn.bind(on_press=confirm_reset)
+        cancel_btn.bind(on_press=cancel_reset)
+        
+        popup.open()
+    
+    def perform_reset(self):
+        """Actually perform the reset"""
+        self.status_label.text = 'Mereset data user...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def reset_in_background():
+            success, message = self.firebase_manager.reset_user_data(App.get_running_app().current_user)
+            Clock.schedule_once(lambda dt: self.handle_update_result(success, message), 0)
+        
+        threading.Thread(target=reset_in_background, daemon=True).start()
+    
+    def handle_update_result(self, success, message):
+        self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
+        
+        if success:
+            self.price_input.text = ''
+            self.password_input.text = ''
+            self.load_current_settings()
+
+
+class ActivityLogScreen(Screen):
+    """Screen for viewing activity logs - Indonesian"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali ',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='LOG AKTIVITAS',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Activity logs display
+        self.logs_scroll = ScrollView(size_hint_y=0.8)
+        self.logs_layout = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.logs_layout.bind(minimum_height=self.logs_layout.setter('height'))
+        self.logs_scroll.add_widget(self.logs_layout)
+        layout.add_widget(self.logs_scroll)
+        
+        # Load logs button
+        load_btn = Button(
+            text='Muat Log',
+            font_size='16sp',
+            background_color=(0.2, 0.6, 1, 1),
+            size_hint_y=0.1,
+            # font_name='EmojiFont'
+        )
+        load_btn.bind(on_press=self.load_logs)
+        layout.add_widget(load_btn)
+        
+        self.add_widget(layout)
+    
+    def go_back(self, instance):
+        app = App.get_running_app()
+        if hasattr(app, 'user_type') and app.user_type == 'admin':
+            self.manager.current = 'admin_dashboard'
+        else:
+            self.manager.current = 'user_dashboard'
+    
+    def load_logs(self, instance):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            logs = self.firebase_manager.get_activity_logs(50)
+            Clock.schedule_once(lambda dt: self.update_logs_ui(logs), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_logs_ui(self, logs):
+        self.logs_layout.clear_widgets()
+        
+        if logs:
+            for log in logs:
+                log_widget = self.create_log_widget(log)
+                self.logs_layout.add_widget(log_widget)
+        else:
+            self.logs_layout.add_widget(Label(
+                text='Tidak ada log aktivitas ditemukan.',
+                size_hint_y=None,
+                height=50
+            ))
+    
+    def create_log_widget(self, log):
+        # Log container
+        log_container = BoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            height=60,
+            padding=10,
+            spacing=5
+        )
+        
+        # Log details
+        user_label = Label(
+            text=f"{log['user']} - {log['action']}",
+            font_size='14sp',
+            bold=True,
+            color=(0.2, 0.6, 1, 1)
+        )
+        
+        timestamp = log.get('timestamp', '')
+        log_time = datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M') if timestamp else 'Waktu tidak diketahui'
+        
+        time_label = Label(
+            text=f"Waktu: {log_time}",
+            font_size='12sp',
+            color=(0.6, 0.6, 0.6, 1)
+        )
+        
+        log_container.add_widget(user_label)
+        log_container.add_widget(time_label)
+        
+        return log_container
@@ -0,0 +1,557 @@
+"""
+Layar pemilihan mode dan login.
+"""
+
+import threading
+
+from kivy.graphics import Color, Rectangle
+from kivy.app import App
+from kivy.metrics import dp
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.popup import Popup
+from kivy.clock import Clock
+
+from screens.common import sound_manager
+from token_store.session import SessionManager
+from token_store.manager import FirebaseManager
+from transport.firebase import FirebaseUnavailable
+
+
+# Category Selection Screen
+class CategorySelectionScreen(Screen):
+    """Screen to select between Online Token Manager or Offline Kasir"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.build_ui()
+    
+    def build_ui(self):
+        # Main layout with proper background
+        main_layout = BoxLayout(orientation='vertical')
+        
+        # Set background color
+        with main_layout.canvas.before:
+            Color(0.95, 0.95, 0.95, 1)  # Light gray background
+            self.bg_rect = Rectangle(size=main_layout.size, pos=main_layout.pos)
+            main_layout.bind(size=self._update_bg, pos=self._update_bg)
+        
+        # Content layout with responsive padding
+        layout = BoxLayout(orientation='vertical', padding=[10, 20, 10, 20], spacing=20)
+        
+        # App Title with responsive sizing
+        title = Label(
+            text='KATEGORI',
+            font_size='24sp',
+            bold=True,
+            color=(0.2, 0.2, 0.2, 1),
+            size_hint_y=None,
+            height='60dp',
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        layout.add_widget(title)
+        
+        # Simple buttons container with responsive spacing
+        buttons_container = BoxLayout(orientation='vertical', spacing='15dp')
+        
+        # Token Manager Button with responsive sizing
+        token_btn = Button(
+            text='🪙  TOKEN MANAGER\nManajemen token online',
+            font_size='14sp',
+            bold=True,
+            background_color=(0.2, 0.6, 0.8, 1),
+            size_hint_y=None,
+            height='70dp',
+            halign='center',
+            valign='middle'
+        )
+        token_btn.bind(texture_size=token_btn.setter('text_size'))
+        token_btn.bind(on_press=self.go_to_online_mode)
+        buttons_container.add_widget(token_btn)
+        
+        # Kasir Button with responsive sizing
+        kasir_btn = Button(
+            text='🏪  KASIR\nSistem kasir offline',
+            font_size='14sp',
+            bold=True,
+            background_color=(0.8, 0.4, 0.2, 1),
+            size_hint_y=None,
+            height='70dp',
+            halign='center',
+            valign='middle'
+        )
+        kasir_btn.bind(texture_size=kasir_btn.setter('text_size'))
+        kasir_btn.bind(on_press=self.go_to_offline_mode)
+        buttons_container.add_widget(kasir_btn)
+        
+        layout.add_widget(buttons_container)
+        
+        # Footer with responsive sizing
+        footer = Label(
+            text='Pilih sesuai kebutuhan bisnis Anda',
+            font_size='10sp',
+            color=(0.6, 0.6, 0.6, 1),
+            size_hint_y=None,
+            height='30dp',
+            text_size=(None, None),
+            halign='center'
+        )
+        layout.add_widget(footer)
+        
+        main_layout.add_widget(layout)
+        self.add_widget(main_layout)
+    
+    
+    def _update_bg(self, instance, value):
+        self.bg_rect.size = instance.size
+        self.bg_rect.pos = instance.pos
+    
+    def go_to_online_mode(self, instance):
+        app = App.get_running_app()
+        app.app_mode = 'online'
+        sound_manager.success_feedback()
+        self.manager.current = 'login'
+    
+    def go_to_offline_mode(self, instance):
+        app = App.get_running_app()
+        app.app_mode = 'offline'
+        sound_manager.success_feedback()
+        self.manager.current = 'kasir_main'
+
+
+class LoginScreen(Screen):
+    """Login screen with session management - Fixed keyboard overlap"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.session_manager = SessionManager()
+        self.keyboard_height = 0
+        self.selected_user_type = 'user'  # Initialize selected_user_type
+        self.build_ui()
+    
+    def on_input_focus(self, instance, focus):
+        # Handle input focus for keyboard visibility
+        if focus:
+            Clock.schedule_once(lambda dt: self.adjust_for_keyboard(), 0.2)
+    
+    def on_keyboard(self, window, key, *args):
+        # Handle keyboard show/hide for better input visibility
+        if hasattr(self, 'message_input') and self.message_input.focus:
+            # Adjust scroll when input is focused
+            Clock.schedule_once(lambda dt: self.adjust_for_keyboard(), 0.1)
+        return False
+    
+    def adjust_for_keyboard(self):
+        # Scroll to bottom when keyboard appears
+        if hasattr(self, 'chat_scroll'):
+            self.chat_scroll.scroll_y = 0
+
+    def _on_keyboard_height(self, window, height):
+        self.keyboard_height = height
+        self.adjust_for_keyboard()
+
+    def build_ui(self):
+        # Main layout with ScrollView to avoid keyboard overlap
+        self.scroll = ScrollView(size_hint=(1, 1))
+        main_layout = BoxLayout(orientation='vertical', padding=10, spacing=10, size_hint_y=None)
+        main_layout.bind(minimum_height=main_layout.setter('height'))
+        main_layout.height = 640
+        main_layout.add_widget(Label(size_hint_y=0.1))
+        content_layout = BoxLayout(orientation='vertical', spacing=dp(15), size_hint_y=None)
+        content_layout.height = dp(480)
+        # Title
+        title = Label(
+            text='MANAJEMEN TOKEN\nFIREBASE ONLINE',
+            font_size='22sp',
+            bold=True,
+            color=(0.2, 0.6, 1, 1),
+            size_hint_y=0.15
+        )
+        content_layout.add_widget(title)
+        
+        # Connection status
+        self.connection_label = Label(
+            text='Menghubungkan ke Firebase...',
+            font_size='14sp',
+            color=(0.8, 0.8, 0.2, 1),
+            size_hint_y=0.08
+        )
+        content_layout.add_widget(self.connection_label)
+        
+        # User type selection
+        content_layout.add_widget(Label(
+            text='Pilih Tipe Login:',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=0.08
+        ))
+        
+        type_layout = BoxLayout(size_hint_y=0.08, spacing=10)
+        self.admin_btn = Button(
+            text='Admin',
+            background_color=(1, 0.6, 0.2, 1)
+        )
+        self.user_btn = Button(
+            text='User',
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        
+        self.admin_btn.bind(on_press=lambda x: self.select_user_type('admin'))
+        self.user_btn.bind(on_press=lambda x: self.select_user_type('user'))
+        
+        type_layout.add_widget(self.admin_btn)
+        type_layout.add_widget(self.user_btn)
+        content_layout.add_widget(type_layout)
+        
+        # Username input
+        self.username_input = TextInput(
+            hint_text='Masukkan username Anda (harus terdaftar oleh admin)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.08,
+            opacity=0.5
+        )
+        content_layout.add_widget(self.username_input)
+        #self.username_input.bind(focus=self.on_input_focus)
+        
+        # Password input
+        self.password_input = TextInput(
+            hint_text='Masukkan password (admin2024 untuk admin)',
+            password=True,
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.08
+        )
+        
+        #self.password_input.bind(focus=self.on_input_focus)
+        content_layout.add_widget(self.password_input)
+        
+        # Login button
+        login_btn = Button(
+            text='MASUK',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.08
+        )
+        login_btn.bind(on_press=self.login)
+        content_layout.add_widget(login_btn)
+        
+        # Clear session button
+        clear_session_btn = Button(
+            text='Hapus Login Tersimpan',
+            font_size='14sp',
+            background_color=(0.8, 0.8, 0.2, 1),
+            size_hint_y=0.06
+        )
+        clear_session_btn.bind(on_press=self.clear_session)
+        content_layout.add_widget(clear_session_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='User harus didaftarkan oleh admin terlebih dahulu',
+            font_size='12sp',
+            color=(0.5, 0.5, 0.5, 1),
+            size_hint_y=0.1
+        )
+        content_layout.add_widget(self.status_label)
+        
+        main_layout.add_widget(content_layout)
+        
+        # Bottom spacer
+        main_layout.add_widget(Label(size_hint_y=0.1))
+        
+        self.scroll.add_widget(main_layout)
+        self.add_widget(self.scroll)
+        # Inisialisasi Firebase sesuai main.txt
+        Clock.schedule_once(self.init_firebase, 0.5)
+
+    def on_input_focus(self, instance, value):
+        if value:
+            Clock.schedule_once(lambda dt: self.adjust_for_keyboard(), 0.1)
+
+    def adjust_for_keyboard(self):
+        if self.keyboard_height > 0:
+            self.scroll.scroll_y = 1
+        else:
+            self.scroll.scroll_y = 0
+    
+    def init_firebase(self, dt):
+        """Create the Firebase manager; it connects in the background"""
+        try:
+            self.firebase_manager = FirebaseManager()
+            self.status_label.text = 'Menghubungkan ke Firebase...'
+            self.status_label.color = (0.2, 0.6, 1, 1)
+            self.firebase_manager.on_ready(
+                lambda manager: Clock.schedule_once(lambda dt: self.on_firebase_ready(manager), 0)
+            )
+        except Exception as e:
+            self.connection_label.text = f'Error Firebase: {str(e)}'
+            self.connection_label.color = (1, 0.2, 0.2, 1)
+            sound_manager.error_feedback()  # Error feedback for exception
+    
+    def on_firebase_ready(self, manager):
+        """Update the login screen once connecting has finished"""
+        if manager is not self.firebase_manager:
+            return
+        try:
+            if self.firebase_manager.db:
+                self.status_label.text = 'Firebase terhubung'
+                self.status_label.color = (0.2, 0.8, 0.2, 1)
+                sound_manager.success_feedback()  # Success feedback for connection
+                
+                # Check for saved session and auto-login
+                Clock.schedule_once(self.check_auto_login, 1)
+            elif self.firebase_manager.is_usable():
+                # Offline, but the local replica can serve the app
+                self.status_label.text = 'Mode offline - memakai data lokal'
+                self.status_label.color = (1, 0.6, 0.2, 1)
+                Clock.schedule_once(self.check_auto_login, 1)
+            else:
+                self.status_label.text = ''
+                self.connection_label.text = 'Koneksi Firebase gagal. Periksa internet atau konfigurasi.'
+                self.connection_label.color = (1, 0.2, 0.2, 1)
+                sound_manager.error_feedback()  # Error feedback for connection failure
+        except Exception as e:
+            self.connection_label.text = f'Error Firebase: {str(e)}'
+            self.connection_label.color = (1, 0.2, 0.2, 1)
+            sound_manager.error_feedback()  # Error feedback for exception
+    
+    def check_auto_login(self, dt):
+        """Check for saved session and auto-login"""
+        saved_session = self.session_manager.load_session()
+        if saved_session:
+            username = saved_session['username']
+            user_type = saved_session['user_type']
+            
+            self.status_label.text = f'Auto-login sebagai {username}...'
+            self.status_label.color = (0.2, 0.6, 1, 1)
+            
+            # Set online status
+            if user_type == 'admin':
+                self.firebase_manager.set_online('admin')
+            else:
+                # Check if user still exists; while offline the account
+                # cannot be checked, so the saved session is kept
+                try:
+                    user_exists = self.firebase_manager.exists(f"users/{username}", strict=True)
+                except FirebaseUnavailable:
+                    user_exists = True
+                if user_exists:
+                    self.firebase_manager.set_online(username)
+                else:
+                    # User was deleted, clear session
+                    self.session_manager.clear_session()
+                    self.status_label.text = 'Akun user dihapus. Silakan login ulang.'
+                    self.status_label.color = (1, 0.2, 0.2, 1)
+                    return
+            
+            # Pass to other screens
+            app = App.get_running_app()
+            app.current_user = username
+            app.user_type = user_type
+            
+            app.root.set_session(self.firebase_manager, username)
+            
+            # Navigate to appropriate dashboard
+            if user_type == 'admin':
+                self.manager.current = 'admin_dashboard'
+            else:
+                self.manager.current = 'user_dashboard'
+    
+    def select_user_type(self, user_type):
+        self.selected_user_type = user_type
+        if user_type == 'admin':
+            self.admin_btn.background_color = (1, 0.6, 0.2, 1)
+            self.user_btn.background_color = (0.6, 0.6, 0.6, 1)
+            self.username_input.opacity = 0.5
+            self.username_input.hint_text = 'Login admin (username tidak diperlukan)'
+            self.password_input.hint_text = 'Masukkan password admin (default: admin2024)'
+        else:
+            self.admin_btn.background_color = (0.6, 0.6, 0.6, 1)
+            self.user_btn.background_color = (0.2, 0.6, 1, 1)
+            self.username_input.opacity = 1
+            self.username_input.hint_text = 'Masukkan username Anda (harus terdaftar oleh admin)'
+            self.password_input.hint_text = 'Masukkan password Anda'
+    
+    def login(self, instance):
+        if self.firebase_manager and self.firebase_manager.state == 'connecting':
+            self.status_label.text = 'Masih menghubungkan ke Firebase...'
+            self.status_label.color = (0.2, 0.6, 1, 1)
+            return
+        if not self.firebase_manager or not self.firebase_manager.is_usable():
+            self.status_label.text = 'Firebase tidak terhubung'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            sound_manager.error_feedback()  # Error feedback for connection issue
+            return
+        
+        username = self.username_input.text.strip()
+        password = self.password_input.text.strip()
+        
+        if self.selected_user_type == 'user' and not username:
+            self.show_popup('Error', 'Silakan masukkan username untuk login user')
+            sound_manager.error_feedback()  # Error feedback for validation
+            return
+        
+        if not password:
+            self.show_popup('Error', 'Silakan masukkan password')
+            sound_manager.error_feedback()  # Error feedback for validation
+            return
+        
+        self.status_label.text = 'Mencoba login...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        success, message = self.firebase_manager.login(
+            username if self.selected_user_type == 'user' else 'admin',
+            password,
+            self.selected_user_type
+        )
+        
+        if success:
+            current_username = username if self.selected_user_type == 'user' else 'admin'
+            
+            # Success feedback for login
+            sound_manager.success_feedback()
+            
+            # Check if user info is required
+            if message == "Login berhasil - info required":
+                self.show_user_info_popup(current_username)
+                return
+            
+            # Normal login flow
+            self.session_manager.save_session(current_username, self.selected_user_type)
+            
+            app = App.get_running_app()
+            app.current_user = current_username
+            app.user_type = self.selected_user_type
+            
+            app.root.set_session(self.firebase_manager, app.current_user)
+            
+            if self.selected_user_type == 'admin':
+                self.manager.current = 'admin_dashboard'
+            else:
+                self.manager.current = 'user_dashboard'
+        else:
+            self.status_label.text = f'{message}'
+            sound_manager.error_feedback()  # Error feedback for failed login
+            self.status_label.color = (1, 0.2, 0.2, 1)
+    def show_user_info_popup(self, username):
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        content.add_widget(Label(
+            text='LENGKAPI INFO PRIBADI\nWajib diisi untuk melanjutkan',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=0.2
+        ))
+        
+        wa_input = TextInput(
+            hint_text='Nomor WhatsApp (contoh: 081234567890)',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        content.add_widget(wa_input)
+        
+        rekening_input = TextInput(
+            hint_text='Nomor Rekening Bank (contoh: BCA 1234567890)',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        content.add_widget(rekening_input)
+        
+        tgl_lahir_input = TextInput(
+            hint_text='Tanggal Lahir (contoh: 15/08/1990)',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        content.add_widget(tgl_lahir_input)
+        
+        tempat_tinggal_input = TextInput(
+            hint_text='Tempat Tinggal (contoh: Jakarta Selatan)',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        content.add_widget(tempat_tinggal_input)
+        
+        button_layout = BoxLayout(size_hint_y=0.2, spacing=10)
+        
+        save_btn = Button(
+            text='SIMPAN & LANJUTKAN',
+            font_size='14sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1)
+        )
+        
+        button_layout.add_widget(save_btn)
+        content.add_widget(button_layout)
+        
+        popup = Popup(
+            title='Info Pribadi Diperlukan',
+            content=content,
+            size_hint=(0.9, 0.8),
+            auto_dismiss=False
+        )
+        
+        def save_info(instance):
+            wa = wa_input.text.strip()
+            rekening = rekening_input.text.strip()
+            tgl_lahir = tgl_lahir_input.text.strip()
+            tempat_tinggal = tempat_tinggal_input.text.strip()
+            
+            if not wa or not rekening or not tgl_lahir or not tempat_tinggal:
+                self.show_popup('Error', 'Semua kolom harus diisi!')
+                return
+            
+            def bg_save():
+                success, message = self.firebase_manager.update_user_info(username, wa, rekening, tgl_lahir, tempat_tinggal)
+                Clock.schedule_once(lambda dt: self.handle_info_save_result(success, message, popup, username), 0)
+            
+            threading.Thread(target=bg_save, daemon=True).start()
+        
+        save_btn.bind(on_press=save_info)
+        popup.open()
+    def handle_info_save_result(self, success, message, popup, username):
+        if success:
+            popup.dismiss()
+            
+            # Continue with normal login flow
+            self.session_manager.save_session(username, self.selected_user_type)
+            
+            app = App.get_running_app()
+            app.current_user = username
+            app.user_type = self.selected_user_type
+            
+            app.root.set_session(self.firebase_manager, app.current_user)
+            
+            self.manager.current = 'user_dashboard'
+        else:
+            self.show_popup('Error', f'Gagal menyimpan info: {message}')
+
+    def clear_session(self, instance):
+        """Clear saved session"""
+        if self.session_manager.clear_session():
+            self.status_label.text = 'Login tersimpan dihapus'
+            self.status_label.color = (0.2, 0.8, 0.2, 1)
+        else:
+            self.status_label.text = 'Gagal menghapus sesi'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+        
+        Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', 'User harus didaftarkan oleh admin terlebih dahulu'), 3)
+        Clock.schedule_once(lambda dt: setattr(self.status_label, 'color', (0.5, 0.5, 0.5, 1)), 3)
+    
+    def show_popup(self, title, message):
+        popup = Popup(
+            title=title,
+            content=Label(text=message),
+            size_hint=(0.8, 0.3)
+        )
+        popup.open()
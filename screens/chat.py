@@ -0,0 +1,361 @@
+"""
+Grup chat.
+"""
+
+from datetime import datetime
+import threading
+
+from kivy.graphics import Color, RoundedRectangle
+from kivy.app import App
+from kivy.metrics import sp
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import StringProperty, ListProperty
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.core.window import Window
+from kivy.utils import platform
+from kivy.clock import Clock
+from kivy.core.text.markup import MarkupLabel
+
+from screens.common import apply_emoji_font
+
+
+class ChatMessageView(RecycleDataViewBehavior, BoxLayout):
+    """Recycled chat bubble, filled from ChatScreen.message_row()"""
+    header_text = StringProperty('')
+    content = StringProperty('')
+    alignment = StringProperty('left')
+    bubble_color = ListProperty([0.2, 0.6, 1, 0.9])
+    text_color = ListProperty([1, 1, 1, 1])
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'horizontal'
+        self.spacing = 5
+        self.padding = [5, 5, 5, 5]
+        
+        self.left_space = Label(size_hint_x=0)
+        self.right_space = Label(size_hint_x=0.25)
+        self.bubble = BoxLayout(orientation='vertical', size_hint_x=0.75, spacing=3, padding=[12, 8, 12, 8])
+        
+        with self.bubble.canvas.before:
+            self.bubble_color_instruction = Color(*self.bubble_color)
+            self.bubble_rect = RoundedRectangle(radius=[15, 15, 15, 15])
+        self.bubble.bind(size=self.update_bubble_rect, pos=self.update_bubble_rect)
+        
+        # Text sizes follow the bubble width; the row height comes from the cached measurement
+        header_label = Label(font_size='9sp', bold=True, size_hint_y=None, height=18, halign='left', valign='middle')
+        content_label = Label(font_size='11sp', halign='left', valign='top', markup=True)
+        self.bubble.bind(width=lambda instance, width: setattr(header_label, 'text_size', (max(0, width - 24), None)))
+        self.bubble.bind(width=lambda instance, width: setattr(content_label, 'text_size', (max(0, width - 24), None)))
+        self.bubble.add_widget(header_label)
+        self.bubble.add_widget(content_label)
+        
+        self.add_widget(self.left_space)
+        self.add_widget(self.bubble)
+        self.add_widget(self.right_space)
+        
+        self.bind(
+            header_text=header_label.setter('text'),
+            content=content_label.setter('text'),
+            text_color=header_label.setter('color'),
+            alignment=self.update_alignment
+        )
+        self.bind(text_color=content_label.setter('color'))
+        self.bind(bubble_color=lambda instance, value: setattr(self.bubble_color_instruction, 'rgba', value))
+    
+    def update_alignment(self, instance, alignment):
+        if alignment == 'right':
+            self.left_space.size_hint_x, self.bubble.size_hint_x, self.right_space.size_hint_x = 0.25, 0.75, 0
+        elif alignment == 'left':
+            self.left_space.size_hint_x, self.bubble.size_hint_x, self.right_space.size_hint_x = 0, 0.75, 0.25
+        else:
+            self.left_space.size_hint_x, self.bubble.size_hint_x, self.right_space.size_hint_x = 0.1, 0.8, 0.1
+    
+    def update_bubble_rect(self, instance, value):
+        self.bubble_rect.size = instance.size
+        self.bubble_rect.pos = instance.pos
+
+
+class ChatScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.message_heights = {}
+        self.measured_width = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        """Switch user; rows built for the previous one are dropped
+        
+        Each row's "Anda" label and alignment depend on the username, so
+        the messages are loaded again for the new user.
+        """
+        if username == self.username:
+            return
+        self.username = username
+        self.chat_scroll.data = []
+        self.chat_placeholder.height = 60
+        self.chat_placeholder.opacity = 1
+        if self.manager is not None and self.manager.current == self.name:
+            # Otherwise on_enter loads them
+            self.load_messages()
+    
+    def build_ui(self):
+        # Main layout - use normal BoxLayout without ScrollView wrapper
+        # Main container layout
+        layout = BoxLayout(orientation='vertical', padding=10, spacing=5)
+        
+        # Bind keyboard events for mobile keyboard handling
+        if platform == 'android':
+            Window.bind(on_keyboard=self.on_keyboard)
+            Window.softinput_mode = 'below_target'
+        
+        # Header - fixed at top
+        header = BoxLayout(size_hint_y=None, height=60, spacing=10)
+        back_btn = Button(text='Kembali', size_hint_x=0.3, background_color=(0.6,0.6,0.6,1))
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        header.add_widget(Label(text='GRUP CHAT', font_size='18sp', bold=True))
+        layout.add_widget(header)
+        
+        # Online users label
+        self.online_users_label = Label(text='Memuat pengguna online...', font_size='12sp', color=(0.2,0.8,0.2,1), size_hint_y=None, height=30)
+        layout.add_widget(self.online_users_label)
+        
+        # Placeholder, hidden as soon as there is a message
+        self.chat_placeholder = Label(text='Belum ada pesan. Jadilah yang pertama menyapa!', size_hint_y=None, height=60, color=(0.6,0.6,0.6,1), font_size='14sp')
+        layout.add_widget(self.chat_placeholder)
+        
+        # Chat area - recycled bubbles, row heights from message_heights
+        self.chat_scroll = RecycleView()
+        self.chat_layout = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            spacing=8,
+            padding=[10, 10, 10, 10],
+            default_size_hint=(1, None)
+        )
+        self.chat_layout.bind(minimum_height=self.chat_layout.setter('height'))
+        self.chat_scroll.add_widget(self.chat_layout)
+        self.chat_scroll.viewclass = ChatMessageView
+        self.chat_scroll.bind(width=self.on_chat_width)
+        layout.add_widget(self.chat_scroll)
+        
+        # Input layout - larger and fixed at bottom
+        self.input_container = BoxLayout(size_hint_y=None, height=120, spacing=10, padding=[10, 10, 10, 10])
+        input_layout = self.input_container
+        self.message_input = TextInput(
+            hint_text='Ketik pesan Anda di sini... (Enter untuk baris baru)', 
+            multiline=True, 
+            font_size='16sp',
+            size_hint_y=1
+        )
+        # Bind focus events for keyboard handling
+        self.message_input.bind(focus=self.on_input_focus)
+        input_layout.add_widget(self.message_input)
+        send_btn = Button(
+            text='Kirim', 
+            font_size='16sp', 
+            bold=True, 
+            background_color=(0.2,0.8,0.2,1), 
+            size_hint_x=0.25
+        )
+        send_btn.bind(on_press=self.send_message)
+        input_layout.add_widget(send_btn)
+        layout.add_widget(input_layout)
+        
+        # Add main layout directly to screen
+        self.add_widget(layout)
+    
+    def on_input_focus(self, instance, focus):
+        # Handle input focus for keyboard visibility
+        if focus:
+            Clock.schedule_once(lambda dt: self.adjust_for_keyboard(), 0.2)
+    
+    def on_keyboard(self, window, key, *args):
+        # Handle keyboard show/hide for better input visibility
+        if hasattr(self, 'message_input') and self.message_input.focus:
+            # Adjust scroll when input is focused
+            Clock.schedule_once(lambda dt: self.adjust_for_keyboard(), 0.1)
+        return False
+    
+    def adjust_for_keyboard(self):
+        # Scroll to bottom when keyboard appears
+        if hasattr(self, 'chat_scroll'):
+            self.chat_scroll.scroll_y = 0
+
+    def on_enter(self):
+        self.load_messages()
+        self.load_online_users()
+        Clock.schedule_interval(self.auto_refresh, 10)
+    
+    def on_leave(self):
+        Clock.unschedule(self.auto_refresh)
+    
+    def auto_refresh(self, dt):
+        self.load_messages()
+        self.load_online_users()
+    
+    def go_back(self, instance):
+        app = App.get_running_app()
+        if hasattr(app, 'user_type') and app.user_type == 'admin':
+            self.manager.current = 'admin_dashboard'
+        else:
+            self.manager.current = 'user_dashboard'
+    
+    def load_online_users(self):
+        if not self.firebase_manager:
+            return
+        def bg():
+            online_users = self.firebase_manager.get_online_users()
+            Clock.schedule_once(lambda dt: self.update_online_users_ui(online_users), 0)
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def update_online_users_ui(self, online_users):
+        if online_users:
+            self.online_users_label.text = f"Online: {', '.join(online_users)}"
+            apply_emoji_font(self.online_users_label)
+        else:
+            self.online_users_label.text = "Tidak ada pengguna online"
+            apply_emoji_font(self.online_users_label)
+    
+    def load_messages(self):
+        if not self.firebase_manager:
+            return
+        def bg():
+            messages = self.firebase_manager.get_chat_messages(50)
+            Clock.schedule_once(lambda dt: self.update_messages_ui(messages), 0)
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def update_messages_ui(self, messages):
+        """Show the fetched messages, building rows only for new ones
+        
+        Rows whose message is no longer in the fetched window (deleted, or
+        pushed out by newer messages) are removed. None means the fetch
+        failed and the rows on screen are kept.
+        """
+        if messages is None:
+            return
+        
+        shown = {row['key']: row for row in self.chat_scroll.data}
+        rows = []
+        added = False
+        for message in messages:
+            key = self.message_key(message)
+            row = shown.get(key)
+            if row is None:
+                row = self.message_row(message)
+                added = True
+            rows.append(row)
+        
+        keys = {row['key'] for row in rows}
+        removed = not keys.issuperset(shown)
+        for key in list(self.message_heights):
+            if key not in keys:
+                del self.message_heights[key]
+        
+        self.chat_placeholder.height = 0 if rows else 60
+        self.chat_placeholder.opacity = 0 if rows else 1
+        
+        if added or removed:
+            self.chat_scroll.data = rows
+        if added:
+            Clock.schedule_once(lambda dt: setattr(self.chat_scroll, 'scroll_y', 0), 0.2)
+    
+    def message_key(self, message):
+        """Firebase push key, or timestamp and user for older messages"""
+        return message.get('key') or f"{message.get('timestamp', '')}|{message.get('user', '')}"
+    
+    def message_row(self, message):
+        """RecycleView data for one ChatMessageView"""
+        user = message.get('user', 'Unknown')
+        msg_type = message.get('type', 'user')
+        content = message.get('message', '')
+        
+        try:
+            time_str = datetime.fromisoformat(message.get('timestamp', '')).strftime('%H:%M')
+        except (TypeError, ValueError):
+            time_str = ''
+        
+        if msg_type == 'system':
+            bubble_color = (0.9, 0.7, 0.2, 0.9)
+            text_color = (0.2, 0.2, 0.2, 1)
+            alignment = 'center'
+            user_display = f"Sistem {user}"
+        elif user == self.username:
+            bubble_color = (0.2, 0.8, 0.3, 0.9)
+            text_color = (1, 1, 1, 1)
+            alignment = 'right'
+            user_display = "Anda"
+        else:
+            bubble_color = (0.2, 0.6, 1, 0.9)
+            text_color = (1, 1, 1, 1)
+            alignment = 'left'
+            user_display = user
+        
+        key = self.message_key(message)
+        return {
+            'key': key,
+            'header_text': f"{user_display} • {time_str}",
+            'content': content,
+            'alignment': alignment,
+            'bubble_color': bubble_color,
+            'text_color': text_color,
+            'height': self.message_height(key, content, alignment)
+        }
+    
+    def message_height(self, key, content, alignment):
+        """Row height of a message, measured once per key and chat width"""
+        height = self.message_heights.get(key)
+        if height is not None:
+            return height
+        
+        # Bubble text width: row padding 10, bubble share of the rest, bubble padding 24
+        row_width = max(200, self.chat_scroll.width - 20)
+        share = 0.8 if alignment == 'center' else 0.75
+        text_width = max(100, (row_width - 10) * share - 24)
+        
+        label = MarkupLabel(text=content, font_size=sp(11), text_size=(text_width, None))
+        label.refresh()
+        text_height = label.texture.size[1] if label.texture else 0
+        
+        # Row padding 10, bubble padding 16, header 18, spacing 3
+        height = max(90, text_height + 10 + 16 + 18 + 3)
+        self.message_heights[key] = height
+        return height
+    
+    def on_chat_width(self, instance, width):
+        """Re-measure all rows once when the chat width really changes"""
+        if self.measured_width is not None and abs(width - self.measured_width) < 1:
+            return
+        self.measured_width = width
+        self.message_heights = {}
+        if self.chat_scroll.data:
+            self.chat_scroll.data = [
+                dict(row, height=self.message_height(row['key'], row['content'], row['alignment']))
+                for row in self.chat_scroll.data
+            ]
+    
+    def send_message(self, instance):
+        message = self.message_input.text.strip()
+        if not message or not self.username:
+            return
+        def bg():
+            success = self.firebase_manager.send_chat_message(self.username, message)
+            if success:
+                Clock.schedule_once(lambda dt: self.message_sent_success(), 0)
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def message_sent_success(self):
+        self.message_input.text = ''
+        Clock.schedule_once(lambda dt: self.load_messages(), 0.5)
@@ -0,0 +1,296 @@
+"""
+Bantuan UI bersama: suara dan getar, font emoji, popup error dan konfirmasi.
+"""
+
+import os
+import urllib.request
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+from kivy.utils import platform
+
+# Sound and vibration imports
+try:
+    from kivy.core.audio import SoundLoader
+except ImportError:
+    SoundLoader = None
+
+try:
+    if platform == 'android':
+        from jnius import autoclass
+        # Android vibration service
+        PythonActivity = autoclass('org.kivy.android.PythonActivity')
+        Context = autoclass('android.content.Context')
+        Vibrator = autoclass('android.os.Vibrator')
+    else:
+        PythonActivity = None
+        Context = None
+        Vibrator = None
+except ImportError:
+    PythonActivity = None
+    Context = None
+    Vibrator = None
+
+# Sound and Vibration Manager
+class SoundVibrationManager:
+    """Manages sound effects and vibration for the app"""
+    def __init__(self):
+        self.sounds = {}
+        self.vibrator = None
+        self.init_vibrator()
+        self.load_sounds()
+    
+    def init_vibrator(self):
+        """Initialize vibrator for Android"""
+        try:
+            if platform == 'android' and PythonActivity:
+                activity = PythonActivity.mActivity
+                self.vibrator = activity.getSystemService(Context.VIBRATOR_SERVICE)
+        except Exception as e:
+            print(f"[VIBRATION] Error initializing vibrator: {e}")
+            self.vibrator = None
+    
+    def load_sounds(self):
+        """Load sound effects"""
+        try:
+            if SoundLoader:
+                # Create simple beep sounds programmatically or use system sounds
+                # For now, we'll use system notification sounds
+                pass
+        except Exception as e:
+            print(f"[SOUND] Error loading sounds: {e}")
+    
+    def play_success_sound(self):
+        """Play success/connection sound"""
+        try:
+            if platform == 'android':
+                # Use system notification sound for success
+                from jnius import autoclass
+                RingtoneManager = autoclass('android.media.RingtoneManager')
+                Uri = autoclass('android.net.Uri')
+                
+                notification_uri = RingtoneManager.getDefaultUri(RingtoneManager.TYPE_NOTIFICATION)
+                ringtone = RingtoneManager.getRingtone(PythonActivity.mActivity, notification_uri)
+                if ringtone:
+                    ringtone.play()
+        except Exception as e:
+            print(f"[SOUND] Error playing success sound: {e}")
+    
+    def play_error_sound(self):
+        """Play error sound"""
+        try:
+            if platform == 'android':
+                # Use system alarm sound for errors
+                from jnius import autoclass
+                RingtoneManager = autoclass('android.media.RingtoneManager')
+                
+                alarm_uri = RingtoneManager.getDefaultUri(RingtoneManager.TYPE_ALARM)
+                ringtone = RingtoneManager.getRingtone(PythonActivity.mActivity, alarm_uri)
+                if ringtone:
+                    ringtone.play()
+        except Exception as e:
+            print(f"[SOUND] Error playing error sound: {e}")
+    
+    def vibrate_success(self):
+        """Short vibration for success"""
+        try:
+            if self.vibrator and platform == 'android':
+                # Short single vibration (100ms)
+                self.vibrator.vibrate(100)
+        except Exception as e:
+            print(f"[VIBRATION] Error in success vibration: {e}")
+    
+    def vibrate_error(self):
+        """Pattern vibration for errors"""
+        try:
+            if self.vibrator and platform == 'android':
+                # Error pattern: short-pause-short-pause-long (200ms-100ms-200ms-100ms-500ms)
+                pattern = [0, 200, 100, 200, 100, 500]
+                self.vibrator.vibrate(pattern, -1)  # -1 means don't repeat
+        except Exception as e:
+            print(f"[VIBRATION] Error in error vibration: {e}")
+    
+    def success_feedback(self):
+        """Combined success feedback (sound + vibration)"""
+        self.play_success_sound()
+        self.vibrate_success()
+    
+    def error_feedback(self):
+        """Combined error feedback (sound + vibration)"""
+        self.play_error_sound()
+        self.vibrate_error()
+
+# Global sound/vibration manager instance
+sound_manager = SoundVibrationManager()
+
+# Emoji font setup (disabled for development)
+def setup_emoji_font():
+    """Setup emoji font support for Kivy apps"""
+    try:
+        print("[EMOJI] Setting up emoji font...")
+        
+        # Create fonts directory
+        fonts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+        if not os.path.exists(fonts_dir):
+            os.makedirs(fonts_dir)
+            print(f"[EMOJI] Created fonts directory: {fonts_dir}")
+        
+        # Path for downloaded emoji font
+        emoji_font_path = os.path.join(fonts_dir, 'NotoEmoji-Regular.ttf')
+        
+        # Download emoji font if not exists
+        if not os.path.exists(emoji_font_path):
+            print("[EMOJI] Downloading Noto Emoji font...")
+            try:
+                # Use a working Noto Emoji font URL
+                font_url = "https://fonts.gstatic.com/s/notoemoji/v47/bMrnmSyK7YY-MEu6aWjPDs-ar6uWaGWuob-r0jwvS-FGJCMY.ttf"
+                urllib.request.urlretrieve(font_url, emoji_font_path)
+                print(f"[EMOJI] ✅ Font downloaded: {emoji_font_path}")
+            except Exception as e:
+                print(f"[EMOJI] ❌ Download failed: {e}")
+                return False
+        
+        # Register the emoji font
+        if os.path.exists(emoji_font_path):
+            try:
+                # LabelBase.register(name="EmojiFont", fn_regular=emoji_font_path)
+                print(f"[EMOJI] ✅ Registered: NotoEmoji-Regular.ttf")
+                return True
+            except Exception as e:
+                print(f"[EMOJI] ❌ Registration failed: {e}")
+                return False
+        
+        print("[EMOJI] ⚠️ Font file not found after download")
+        return False
+        
+    except Exception as e:
+        print(f"[EMOJI] ❌ Setup error: {e}")
+        return False
+
+# Initialize emoji font (disabled for development)
+EMOJI_FONT_AVAILABLE = False
+print(f"[EMOJI] Font disabled for development mode")
+
+# Helper function to create emoji-compatible labels
+def create_emoji_label(text, **kwargs):
+    """Create a label with emoji font support"""
+    # Use default font for development, emoji font only for build
+    return Label(text=text, **kwargs)
+
+
+# Helper function to create emoji-compatible buttons
+def create_emoji_button(text, **kwargs):
+    """Create a button with emoji font support"""
+    # Use default font for development, emoji font only for build
+    return Button(text=text, **kwargs)
+
+
+# Helper function to apply emoji font to existing widgets
+def apply_emoji_font(widget):
+    """Apply emoji font to existing widget if possible"""
+    # DISABLE emoji font application to prevent text boxes
+    # Font emoji hanya untuk build, tidak untuk development
+    pass
+
+
+def show_error_popup(message, title='Error'):
+    """Show a simple error popup"""
+    Popup(
+        title=title,
+        content=Label(text=message),
+        size_hint=(0.8, 0.3)
+    ).open()
+
+
+def show_connection_state(label, firebase_manager, online_text):
+    """Show online_text, or an offline notice while requests fail fast"""
+    if firebase_manager and firebase_manager.is_offline():
+        label.text = 'OFFLINE - server tidak terjangkau, data dari penyimpanan lokal'
+        label.color = (1, 0.6, 0.2, 1)
+    else:
+        label.text = online_text
+        label.color = (0.5, 0.5, 0.5, 1)
+
+
+class ConfirmationPopup(Popup):
+    """Generic confirmation popup with improved styling"""
+    def __init__(self, title_text, message, confirm_callback=None, **kwargs):
+        super().__init__(**kwargs)
+        self.confirm_callback = confirm_callback
+        self.title = title_text.upper()
+        self.title_size = '16sp'
+        self.title_color = (0.2, 0.6, 0.8, 1)
+        self.title_align = 'center'
+        self.size_hint = (0.85, 0.5)
+        self.background = 'atlas://data/images/defaulttheme/button_pressed'
+        self.separator_color = (0.8, 0.8, 0.8, 1)
+        self.auto_dismiss = False
+        self.build_content(message)
+    
+    def build_content(self, message):
+        # Main layout
+        layout = BoxLayout(orientation='vertical', padding='20dp', spacing='20dp')
+        
+        # Message with better styling
+        message_label = Label(
+            text=message,
+            text_size=(None, None),
+            halign='center',
+            valign='middle',
+            size_hint_y=0.7,
+            font_size='15sp',
+            color=(0.2, 0.2, 0.2, 1),
+            padding=('10dp', '10dp')
+        )
+        
+        # Buttons with better styling
+        btn_layout = BoxLayout(
+            size_hint_y=0.3, 
+            spacing='15dp',
+            padding=('10dp', 0, '10dp', 0)
+        )
+        
+        cancel_btn = Button(
+            text='BATAL',
+            background_color=(0.8, 0.2, 0.2, 1),
+            background_normal='',
+            color=(1, 1, 1, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.4
+        )
+        
+        confirm_btn = Button(
+            text='YA',
+            background_color=(0.2, 0.8, 0.2, 1),
+            background_normal='',
+            color=(1, 1, 1, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.6
+        )
+        
+        # Bind buttons
+        cancel_btn.bind(on_press=self.dismiss)
+        confirm_btn.bind(on_release=self.confirm)
+        
+        # Add buttons to layout
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(confirm_btn)
+        
+        # Add all widgets to main layout
+        layout.add_widget(message_label)
+        layout.add_widget(btn_layout)
+        
+        self.content = layout
+        
+        # Set focus to confirm button by default
+        confirm_btn.focus = True
+    
+    def confirm(self, instance):
+        sound_manager.success_feedback()
+        if self.confirm_callback:
+            self.confirm_callback()
+        self.dismiss()
@@ -0,0 +1,2864 @@
+"""
+Layar kasir offline: produk dan keranjang, pengeluaran, laporan dan struk.
+"""
+
+from datetime import datetime, timedelta
+import time
+
+from kivy.graphics import Color, RoundedRectangle, Rectangle, Line
+from kivy.app import App
+from kivy.metrics import dp
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import StringProperty, ListProperty, BooleanProperty
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.popup import Popup
+from kivy.core.window import Window
+from kivy.clock import Clock
+
+from kasir_core.money import line_total, parse_rupiah, parse_weight, format_kg
+from kasir_core.tills import format_receipt_number
+from screens.common import sound_manager, show_error_popup, ConfirmationPopup
+from kasir_core.models import KasirProduct, KasirCartItem
+
+
+# Kasir Main Screen
+class KasirProductCard(RecycleDataViewBehavior, BoxLayout):
+    """Recycled product row, filled from KasirMainScreen.product_row()"""
+    product_id = StringProperty('')
+    product_name = StringProperty('')
+    price_text = StringProperty('')
+    stock_text = StringProperty('')
+    stock_color = ListProperty([0.1, 0.7, 0.1, 1])
+    in_stock = BooleanProperty(True)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.screen = None
+        self.orientation = 'vertical'
+        self.spacing = 3
+        self.padding = 5
+        
+        # Product name
+        name_label = Label(
+            size_hint_y=None,
+            height=25,
+            font_size='12sp',
+            bold=True,
+            color=(0.1, 0.1, 0.1, 1)
+        )
+        
+        # Price
+        price_label = Label(
+            size_hint_y=None,
+            height=20,
+            font_size='10sp',
+            color=(0.1, 0.6, 0.1, 1)
+        )
+        
+        # Stock
+        stock_label = Label(
+            size_hint_y=None,
+            height=20,
+            font_size='10sp'
+        )
+        
+        # Buttons layout
+        buttons_layout = BoxLayout(size_hint_y=None, height=40, spacing=5)
+        
+        # Add to cart button
+        self.add_btn = Button(
+            text='Tambah',
+            size_hint_x=0.7,
+            background_color=(0.2, 0.6, 0.9, 1),
+            font_size='10sp'
+        )
+        self.add_btn.bind(on_press=lambda x: self.screen.show_weight_input(self.product))
+        
+        # Delete button
+        delete_btn = Button(
+            text='X',
+            background_color=(0.9, 0.2, 0.2, 1),
+            font_size='10sp',
+            size_hint_x=0.3
+        )
+        delete_btn.bind(on_press=lambda x: self.screen.show_delete_product_confirmation(self.product))
+        
+        buttons_layout.add_widget(self.add_btn)
+        buttons_layout.add_widget(delete_btn)
+        
+        self.add_widget(name_label)
+        self.add_widget(price_label)
+        self.add_widget(stock_label)
+        self.add_widget(buttons_layout)
+        
+        self.bind(
+            product_name=name_label.setter('text'),
+            price_text=price_label.setter('text'),
+            stock_text=stock_label.setter('text'),
+            stock_color=stock_label.setter('color'),
+            in_stock=lambda instance, value: setattr(self.add_btn, 'disabled', not value)
+        )
+    
+    @property
+    def product(self):
+        return self.screen.app_ref.products.get(self.product_id)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.screen = rv.screen
+        return super().refresh_view_attrs(rv, index, data)
+
+
+class KasirMainScreen(Screen):
+    """Main kasir screen with product management and cart"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app_ref = None
+        self.build_ui()
+    
+    def on_enter(self):
+        if not self.app_ref:
+            self.app_ref = App.get_running_app()
+            self.update_products_display()
+            self.update_cart_display()
+    
+    def update_cart_display(self):
+        """Rebuild the whole cart view and follow the cart's events from now on"""
+        if not self.app_ref:
+            return
+        
+        self.cart_layout.clear_widgets()
+        self.cart_widgets = {}
+        
+        cart = self.app_ref.cart
+        bound = getattr(self, 'bound_cart', None)
+        if bound is not cart:
+            if bound is not None:
+                bound.unbind(self.on_cart_change)
+            cart.bind(self.on_cart_change)
+            self.bound_cart = cart
+        
+        for cart_item in cart:
+            self.on_cart_change('add', cart_item)
+        self.update_cart_summary()
+    
+    def on_cart_change(self, event, cart_item):
+        """Apply one cart change to the view instead of rebuilding it"""
+        if event == 'add':
+            cart_widget = self.create_cart_widget(cart_item)
+            self.cart_widgets[id(cart_item)] = cart_widget
+            self.cart_layout.add_widget(cart_widget, index=0)
+        elif event == 'update':
+            cart_widget = self.cart_widgets.get(id(cart_item))
+            if cart_widget is not None:
+                cart_widget.weight_label.text = f"{format_kg(cart_item.weight_g)} kg"
+                cart_widget.total_label.text = self.app_ref.format_currency(cart_item.get_total())
+        elif event == 'remove':
+            cart_widget = self.cart_widgets.pop(id(cart_item), None)
+            if cart_widget is not None:
+                self.cart_layout.remove_widget(cart_widget)
+        elif event == 'clear':
+            self.cart_layout.clear_widgets()
+            self.cart_widgets = {}
+        self.update_cart_summary()
+    
+    def update_cart_summary(self):
+        """Totals come from the cart's running sums"""
+        cart = self.app_ref.cart
+        self.total_label.text = f'Total: {self.app_ref.format_currency(cart.total)}'
+        self.checkout_btn.disabled = not cart
+    
+    def update_products_display(self):
+        """Update products display; row widgets are recycled, not recreated"""
+        if not self.app_ref or not hasattr(self.app_ref, 'products'):
+            return
+        
+        self.bind_catalog()
+        products = self.app_ref.products.search(self.search_input.text)
+        self.product_rows = {product.id: index for index, product in enumerate(products)}
+        self.products_rv.data = [self.product_row(product) for product in products]
+    
+    def product_row(self, product):
+        """RecycleView data for one KasirProductCard"""
+        stock_color = (0.1, 0.7, 0.1, 1) if product.stock_g > 5000 else (0.9, 0.6, 0.1, 1) if product.stock_g > 0 else (0.9, 0.1, 0.1, 1)
+        return {
+            'product_id': product.id,
+            'product_name': product.name,
+            'price_text': f'{self.app_ref.format_currency(product.price_per_kg)}/kg',
+            'stock_text': f'Stok: {format_kg(product.stock_g)} kg',
+            'stock_color': stock_color,
+            'in_stock': product.stock_g > 0
+        }
+    
+    def bind_catalog(self):
+        """Follow add/update/remove events of the app's catalog"""
+        catalog = self.app_ref.products
+        bound = getattr(self, 'bound_catalog', None)
+        if bound is catalog:
+            return
+        if bound is not None:
+            bound.unbind(self.on_catalog_change)
+        catalog.bind(self.on_catalog_change)
+        self.bound_catalog = catalog
+    
+    def on_catalog_change(self, event, product):
+        index = getattr(self, 'product_rows', {}).get(product.id)
+        if event == 'update' and index is not None:
+            # Only this product's row is refreshed
+            self.products_rv.data[index] = self.product_row(product)
+        else:
+            self.update_products_display()
+    
+    def select_by_plu(self, instance):
+        """Enter on the search box opens the weight input of a PLU match"""
+        product = self.app_ref.products.get_by_plu(instance.text) if self.app_ref else None
+        if product is None:
+            return
+        instance.text = ''
+        self.show_weight_input(product)
+            
+    def show_weight_input(self, product):
+        """Show popup to input product weight"""
+        if not self.app_ref:
+            return
+            
+        # Create popup content
+        content = BoxLayout(orientation='vertical', spacing=15, padding=20)
+        
+        # Title
+        title_label = Label(
+            text=f'Masukkan Berat {product.name}',
+            font_size='18sp',
+            bold=True,
+            size_hint_y=None,
+            height=40
+        )
+        
+        # Weight input
+        weight_layout = BoxLayout(size_hint_y=None, height=60, spacing=10)
+        weight_label = Label(text='Berat (kg):', size_hint_x=0.4)
+        self.weight_input = TextInput(
+            text='1',
+            input_filter='float',
+            multiline=False,
+            size_hint_x=0.6,
+            font_size='16sp'
+        )
+        weight_layout.add_widget(weight_label)
+        weight_layout.add_widget(self.weight_input)
+        
+        # Price display
+        price_layout = BoxLayout(size_hint_y=None, height=40)
+        price_label = Label(text='Harga:', size_hint_x=0.4)
+        self.price_display = Label(
+            text='Rp 0',
+            size_hint_x=0.6,
+            font_size='16sp',
+            halign='right',
+            color=(0.2, 0.6, 0.2, 1)
+        )
+        price_layout.add_widget(price_label)
+        price_layout.add_widget(self.price_display)
+        
+        # Buttons
+        btn_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        cancel_btn = Button(text='BATAL')
+        add_btn = Button(
+            text='TAMBAH',
+            background_color=(0.2, 0.8, 0.2, 1),
+            disabled=True
+        )
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(add_btn)
+        
+        # Add all widgets to content
+        content.add_widget(title_label)
+        content.add_widget(weight_layout)
+        content.add_widget(price_layout)
+        content.add_widget(btn_layout)
+        
+        # Create and open popup
+        popup = Popup(
+            title='Input Berat Produk',
+            content=content,
+            size_hint=(0.9, 0.5)
+        )
+        
+        def update_price(instance, value):
+            try:
+                weight_g = parse_weight(self.weight_input.text) if self.weight_input.text else 0
+                if weight_g > 0:
+                    total = line_total(product.price_per_kg, weight_g)
+                    self.price_display.text = self.app_ref.format_currency(total)
+                    add_btn.disabled = False
+                else:
+                    self.price_display.text = 'Rp 0'
+                    add_btn.disabled = True
+            except ValueError:
+                self.price_display.text = 'Rp 0'
+                add_btn.disabled = True
+        
+        # Initialize price display
+        update_price(None, '1')
+        
+        # Bind events
+        self.weight_input.bind(text=update_price)
+        cancel_btn.bind(on_press=popup.dismiss)
+        add_btn.bind(
+            on_press=lambda x: self.add_to_cart_with_weight(product, self.weight_input.text, popup)
+        )
+        
+        popup.open()
+        
+    def add_to_cart_with_weight(self, product, weight_text, popup=None):
+        """Add product to cart with specified weight"""
+        if not self.app_ref:
+            return
+            
+        try:
+            # Validate weight input
+            if not weight_text or not weight_text.strip():
+                show_error_popup('Masukkan berat produk', title='Input Tidak Valid')
+                sound_manager.error_feedback()
+                return
+                
+            weight_g = parse_weight(weight_text)
+            if weight_g <= 0:
+                show_error_popup('Berat harus lebih dari 0', title='Input Tidak Valid')
+                sound_manager.error_feedback()
+                return
+            
+            # Stock is taken at checkout, so count what is already in the cart
+            in_cart = sum(item.weight_g for item in self.app_ref.cart if item.product is product)
+            if weight_g + in_cart > product.stock_g:
+                show_error_popup(f'Stok tidak cukup! Tersedia: {format_kg(product.stock_g - in_cart)} kg', title='Stok Tidak Cukup')
+                sound_manager.error_feedback()
+                return
+                
+            # Add to cart; the cart view follows the cart events
+            self.app_ref.cart.add(KasirCartItem(product, weight_g))
+            sound_manager.success_feedback()
+            
+        except ValueError:
+            show_error_popup('Masukkan berat yang valid (contoh: 0.5, 1, 1.5)', title='Input Tidak Valid')
+            sound_manager.error_feedback()
+            return
+            
+        if popup:
+            popup.dismiss()
+    
+    def show_payment(self, instance):
+        """Show payment popup"""
+        if not self.app_ref or not self.app_ref.cart:
+            return
+            
+        total = self.app_ref.cart.total
+        
+        # Create popup content
+        content = BoxLayout(orientation='vertical', spacing=15, padding=20)
+        
+        # Total amount
+        total_layout = BoxLayout(size_hint_y=None, height=40)
+        total_label = Label(
+            text='Total Pembayaran:',
+            size_hint_x=0.6,
+            font_size='16sp',
+            bold=True
+        )
+        total_amount = Label(
+            text=self.app_ref.format_currency(total),
+            size_hint_x=0.4,
+            font_size='18sp',
+            bold=True,
+            color=(0.2, 0.6, 0.2, 1),
+            halign='right'
+        )
+        total_layout.add_widget(total_label)
+        total_layout.add_widget(total_amount)
+        
+        # Payment input
+        payment_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        payment_label = Label(text='Jumlah Bayar:', size_hint_x=0.4)
+        payment_input = TextInput(
+            input_filter='float',
+            multiline=False,
+            size_hint_x=0.6,
+            font_size='16sp',
+            text=str(total)
+        )
+        payment_layout.add_widget(payment_label)
+        payment_layout.add_widget(payment_input)
+        
+        # Change display
+        change_layout = BoxLayout(size_hint_y=None, height=40, opacity=0)
+        change_label = Label(
+            text='Kembalian:',
+            size_hint_x=0.4,
+            font_size='16sp',
+            bold=True
+        )
+        change_amount = Label(
+            text='Rp 0',
+            size_hint_x=0.6,
+            font_size='16sp',
+            bold=True,
+            color=(0.2, 0.2, 0.8, 1),
+            halign='right'
+        )
+        change_layout.add_widget(change_label)
+        change_layout.add_widget(change_amount)
+        
+        # Buttons
+        btn_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        cancel_btn = Button(text='BATAL')
+        process_btn = Button(
+            text='PROSES',
+            background_color=(0.2, 0.8, 0.2, 1),
+            font_size='14sp',
+            disabled=True
+        )
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(process_btn)
+        
+        # Quick payment buttons
+        quick_payment_layout = BoxLayout(size_hint_y=None, height=40, spacing=5)
+        
+        def set_payment_amount(amount):
+            payment_input.text = str(amount)
+            update_change(None, None)
+        
+        # Tombol pembayaran cepat
+        pas_btn = Button(text='PAS', font_size='12sp', size_hint_x=0.25)
+        pas_btn.bind(on_press=lambda x: set_payment_amount(total))
+        
+        btn_50k = Button(text='50K', font_size='12sp', size_hint_x=0.25)
+        btn_50k.bind(on_press=lambda x: set_payment_amount(50000))
+        
+        btn_100k = Button(text='100K', font_size='12sp', size_hint_x=0.25)
+        btn_100k.bind(on_press=lambda x: set_payment_amount(100000))
+        
+        btn_200k = Button(text='200K', font_size='12sp', size_hint_x=0.25)
+        btn_200k.bind(on_press=lambda x: set_payment_amount(200000))
+        
+        quick_payment_layout.add_widget(pas_btn)
+        quick_payment_layout.add_widget(btn_50k)
+        quick_payment_layout.add_widget(btn_100k)
+        quick_payment_layout.add_widget(btn_200k)
+        
+        # Add all widgets to content
+        content.add_widget(total_layout)
+        content.add_widget(payment_layout)
+        content.add_widget(quick_payment_layout)
+        content.add_widget(change_layout)
+        content.add_widget(btn_layout)
+        
+        # Create and open popup
+        popup = Popup(
+            title='Pembayaran',
+            content=content,
+            size_hint=(0.9, 0.7)
+        )
+        
+        def update_change(instance, value):
+            try:
+                payment = parse_rupiah(payment_input.text) if payment_input.text else 0
+                change = payment - total
+                
+                if payment >= total:
+                    change_layout.opacity = 1
+                    change_amount.text = self.app_ref.format_currency(change)
+                    process_btn.disabled = False
+                    process_btn.background_color = (0.2, 0.8, 0.2, 1)  # Green
+                else:
+                    change_layout.opacity = 0.5
+                    change_amount.text = self.app_ref.format_currency(0)
+                    process_btn.disabled = True
+                    process_btn.background_color = (0.8, 0.2, 0.2, 1)  # Red
+                    
+            except ValueError:
+                change_layout.opacity = 0.5
+                process_btn.disabled = True
+        
+        def process_payment(instance):
+            try:
+                payment = parse_rupiah(payment_input.text) if payment_input.text else 0
+                change = payment - total
+                
+                if payment < total or payment <= 0:
+                    raise ValueError('Jumlah pembayaran tidak valid')
+                
+                # Process the payment
+                self.process_payment(payment, change)
+                sound_manager.success_feedback()
+                popup.dismiss()
+                
+            except ValueError as e:
+                show_error_popup(str(e), 'Pembayaran Gagal')
+                sound_manager.error_feedback()
+        
+        payment_input.bind(text=update_change)
+        process_btn.bind(on_release=process_payment)
+        cancel_btn.bind(on_release=popup.dismiss)
+        
+        popup.open()
+    
+    def show_add_product(self, instance):
+        """Show popup to add new product"""
+        content = BoxLayout(orientation='vertical', spacing=10, padding=20)
+        
+        # Product name input
+        name_layout = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        name_label = Label(text='Nama Produk:', size_hint_x=0.4)
+        name_input = TextInput(multiline=False, size_hint_x=0.6)
+        name_layout.add_widget(name_label)
+        name_layout.add_widget(name_input)
+        
+        # Price input
+        price_layout = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        price_label = Label(text='Harga per kg:', size_hint_x=0.4)
+        price_input = TextInput(input_filter='float', multiline=False, size_hint_x=0.6)
+        price_layout.add_widget(price_label)
+        price_layout.add_widget(price_input)
+        
+        # Stock input
+        stock_layout = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        stock_label = Label(text='Stok (kg):', size_hint_x=0.4)
+        stock_input = TextInput(input_filter='float', multiline=False, size_hint_x=0.6)
+        stock_layout.add_widget(stock_label)
+        stock_layout.add_widget(stock_input)
+        
+        # PLU / short code input
+        plu_layout = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        plu_label = Label(text='Kode PLU:', size_hint_x=0.4)
+        plu_input = TextInput(hint_text='opsional', multiline=False, size_hint_x=0.6)
+        plu_layout.add_widget(plu_label)
+        plu_layout.add_widget(plu_input)
+        
+        # Buttons
+        btn_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        cancel_btn = Button(text='BATAL')
+        save_btn = Button(text='SIMPAN', background_color=(0.2, 0.8, 0.2, 1))
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(save_btn)
+        
+        # Add all widgets to content
+        content.add_widget(name_layout)
+        content.add_widget(price_layout)
+        content.add_widget(stock_layout)
+        content.add_widget(plu_layout)
+        content.add_widget(btn_layout)
+        
+        # Create and open popup
+        popup = Popup(
+            title='Tambah Produk Baru',
+            content=content,
+            size_hint=(0.9, 0.6)
+        )
+        
+        def save_product(instance):
+            try:
+                name = name_input.text.strip()
+                price = parse_rupiah(price_input.text) if price_input.text else 0
+                stock = parse_weight(stock_input.text) if stock_input.text else 0
+                
+                if not name:
+                    raise ValueError('Nama produk tidak boleh kosong')
+                if price <= 0:
+                    raise ValueError('Harga harus lebih dari 0')
+                if stock < 0:
+                    raise ValueError('Stok tidak boleh negatif')
+                
+                plu = plu_input.text.strip() or None
+                if plu and self.app_ref.products.get_by_plu(plu):
+                    raise ValueError(f'Kode PLU {plu} sudah dipakai')
+                
+                # Add new product
+                new_product = KasirProduct(self.app_ref.products.next_id(), name, price, stock, plu)
+                
+                self.app_ref.products.add(new_product)
+                self.app_ref.save_kasir_products()
+                
+                sound_manager.success_feedback()
+                popup.dismiss()
+                
+            except ValueError as e:
+                show_error_popup(str(e), 'Kesalahan Input')
+                sound_manager.error_feedback()
+        
+        save_btn.bind(on_release=save_product)
+        cancel_btn.bind(on_release=popup.dismiss)
+        
+        popup.open()
+        self.update_header()
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=['5dp', '10dp', '5dp', '10dp'], spacing='8dp')
+        
+        # Header with responsive sizing
+        header = BoxLayout(size_hint_y=None, height='50dp')
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.25,
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'category'))
+        header.add_widget(back_btn)
+        
+        self.title_label = Label(
+            text='KASIR AYAM POTONG',
+            font_size='18sp',
+            bold=True,
+            text_size=(None, None),
+            halign='center',
+            valign='middle',
+            size_hint_y=None,
+            height='50dp'
+        )
+        header.add_widget(self.title_label)
+        layout.add_widget(header)
+        
+        # Navigation buttons with responsive sizing
+        nav_layout = BoxLayout(size_hint_y=None, height='50dp', spacing='5dp')
+        
+        expenses_btn = Button(
+            text='PENGELUARAN',
+            background_color=(0.8, 0.4, 0.2, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height='45dp'
+        )
+        expenses_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'kasir_expenses'))
+        
+        reports_btn = Button(
+            text='LAPORAN',
+            background_color=(0.2, 0.6, 0.8, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height='45dp'
+        )
+        reports_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'kasir_reports'))
+        
+        nav_layout.add_widget(expenses_btn)
+        nav_layout.add_widget(reports_btn)
+        layout.add_widget(nav_layout)
+        
+        # Content area with responsive layout
+        content = BoxLayout(orientation='horizontal', spacing='8dp')
+        
+        # Products section
+        products_section = BoxLayout(orientation='vertical', size_hint_x=0.6, spacing='3dp')
+        
+        # Add product button with responsive sizing
+        add_product_btn = Button(
+            text='+ TAMBAH PRODUK',
+            size_hint_y=None,
+            height='50dp',
+            background_color=(0.2, 0.8, 0.2, 1),
+            font_size='14sp',
+            bold=True
+        )
+        add_product_btn.bind(on_press=self.show_add_product)
+        products_section.add_widget(add_product_btn)
+        
+        # Search by name or PLU
+        self.search_input = TextInput(
+            hint_text='Cari produk / kode PLU',
+            multiline=False,
+            size_hint_y=None,
+            height='40dp',
+            font_size='12sp'
+        )
+        self.search_input.bind(text=lambda instance, text: self.update_products_display())
+        self.search_input.bind(on_text_validate=self.select_by_plu)
+        products_section.add_widget(self.search_input)
+        
+        # Products list: recycled rows bound to the catalog
+        self.products_rv = RecycleView()
+        self.products_rv.screen = self
+        self.products_layout = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            spacing='3dp',
+            default_size=(None, 120),
+            default_size_hint=(1, None)
+        )
+        self.products_layout.bind(minimum_height=self.products_layout.setter('height'))
+        self.products_rv.add_widget(self.products_layout)
+        # Set once the layout manager exists; RecycleView drops it before that
+        self.products_rv.viewclass = KasirProductCard
+        products_section.add_widget(self.products_rv)
+        
+        # Cart section
+        cart_section = BoxLayout(orientation='vertical', size_hint_x=0.4, spacing='3dp')
+        
+        cart_header = Label(
+            text='KERANJANG',
+            size_hint_y=None,
+            height='35dp',
+            font_size='16sp',
+            bold=True,
+            color=(0.2, 0.6, 0.8, 1),
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        cart_section.add_widget(cart_header)
+        
+        # Cart scroll
+        self.cart_scroll = ScrollView()
+        self.cart_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing=3)
+        self.cart_layout.bind(minimum_height=self.cart_layout.setter('height'))
+        self.cart_scroll.add_widget(self.cart_layout)
+        cart_section.add_widget(self.cart_scroll)
+        
+        # Cart total with responsive sizing
+        self.total_label = Label(
+            text='Total: Rp 0',
+            size_hint_y=None,
+            height='30dp',
+            font_size='14sp',
+            bold=True,
+            color=(0.1, 0.6, 0.1, 1),
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        cart_section.add_widget(self.total_label)
+        
+        # Checkout button with responsive sizing
+        self.checkout_btn = Button(
+            text='BAYAR',
+            size_hint_y=None,
+            height='40dp',
+            background_color=(0.1, 0.7, 0.3, 1),
+            font_size='14sp',
+            bold=True,
+            disabled=True
+        )
+        self.checkout_btn.bind(on_press=self.show_payment)
+        cart_section.add_widget(self.checkout_btn)
+        
+        content.add_widget(products_section)
+        content.add_widget(cart_section)
+        layout.add_widget(content)
+        
+        self.add_widget(layout)
+        self.update_products_display()
+    
+    def show_payment(self, instance):
+        """Show payment popup"""
+        if not self.app_ref or not self.app_ref.cart:
+            return
+            
+        total = self.app_ref.cart.total
+        
+        # Create popup content
+        content = BoxLayout(orientation='vertical', spacing=15, padding=20)
+        
+        # Total amount
+        total_layout = BoxLayout(size_hint_y=None, height=40)
+        total_label = Label(
+            text='Total Pembayaran:',
+            size_hint_x=0.6,
+            font_size='16sp',
+            bold=True
+        )
+        total_amount = Label(
+            text=self.app_ref.format_currency(total),
+            size_hint_x=0.4,
+            font_size='18sp',
+            bold=True,
+            color=(0.2, 0.6, 0.2, 1),
+            halign='right'
+        )
+        total_layout.add_widget(total_label)
+        total_layout.add_widget(total_amount)
+        
+        # Payment input
+        payment_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        payment_label = Label(text='Jumlah Bayar:', size_hint_x=0.4)
+        payment_input = TextInput(
+            input_filter='float',
+            multiline=False,
+            size_hint_x=0.6,
+            font_size='16sp',
+            text=str(total)
+        )
+        payment_layout.add_widget(payment_label)
+        payment_layout.add_widget(payment_input)
+        
+        # Change display
+        change_layout = BoxLayout(size_hint_y=None, height=40, opacity=0)
+        change_label = Label(
+            text='Kembalian:',
+            size_hint_x=0.4,
+            font_size='16sp',
+            bold=True
+        )
+        change_amount = Label(
+            text='Rp 0',
+            size_hint_x=0.6,
+            font_size='16sp',
+            bold=True,
+            color=(0.2, 0.2, 0.8, 1),
+            halign='right'
+        )
+        change_layout.add_widget(change_label)
+        change_layout.add_widget(change_amount)
+        
+        # Buttons
+        btn_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        cancel_btn = Button(text='BATAL')
+        process_btn = Button(
+            text='PROSES',
+            background_color=(0.2, 0.8, 0.2, 1),
+            font_size='14sp',
+            disabled=True
+        )
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(process_btn)
+        
+        # Quick payment buttons
+        quick_payment_layout = BoxLayout(size_hint_y=None, height=40, spacing=5)
+        
+        def set_payment_amount(amount):
+            payment_input.text = str(amount)
+            update_change(None, None)
+        
+        # Tombol pembayaran cepat
+        pas_btn = Button(text='PAS', font_size='12sp', size_hint_x=0.25)
+        pas_btn.bind(on_press=lambda x: set_payment_amount(total))
+        
+        btn_50k = Button(text='50K', font_size='12sp', size_hint_x=0.25)
+        btn_50k.bind(on_press=lambda x: set_payment_amount(50000))
+        
+        btn_100k = Button(text='100K', font_size='12sp', size_hint_x=0.25)
+        btn_100k.bind(on_press=lambda x: set_payment_amount(100000))
+        
+        btn_200k = Button(text='200K', font_size='12sp', size_hint_x=0.25)
+        btn_200k.bind(on_press=lambda x: set_payment_amount(200000))
+        
+        quick_payment_layout.add_widget(pas_btn)
+        quick_payment_layout.add_widget(btn_50k)
+        quick_payment_layout.add_widget(btn_100k)
+        quick_payment_layout.add_widget(btn_200k)
+        
+        # Add all widgets to content
+        content.add_widget(total_layout)
+        content.add_widget(payment_layout)
+        content.add_widget(quick_payment_layout)
+        content.add_widget(change_layout)
+        content.add_widget(btn_layout)
+        
+        # Create and open popup
+        popup = Popup(
+            title='Pembayaran',
+            content=content,
+            size_hint=(0.9, 0.7)
+        )
+        
+        def update_change(instance, value):
+            try:
+                payment = parse_rupiah(payment_input.text) if payment_input.text else 0
+                change = payment - total
+                
+                if payment >= total:
+                    change_layout.opacity = 1
+                    change_amount.text = self.app_ref.format_currency(change)
+                    process_btn.disabled = False
+                    process_btn.background_color = (0.2, 0.8, 0.2, 1)  # Green
+                else:
+                    change_layout.opacity = 0.5
+                    change_amount.text = self.app_ref.format_currency(0)
+                    process_btn.disabled = True
+                    process_btn.background_color = (0.8, 0.2, 0.2, 1)  # Red
+                    
+            except ValueError:
+                change_layout.opacity = 0.5
+                process_btn.disabled = True
+        
+        def process_payment(instance):
+            try:
+                payment = parse_rupiah(payment_input.text) if payment_input.text else 0
+                change = payment - total
+                
+                if payment < total or payment <= 0:
+                    raise ValueError('Jumlah pembayaran tidak valid')
+                
+                # Process the payment
+                self.process_payment(payment, change)
+                sound_manager.success_feedback()
+                popup.dismiss()
+                
+            except ValueError as e:
+                show_error_popup(str(e), 'Pembayaran Gagal')
+                sound_manager.error_feedback()
+        
+        payment_input.bind(text=update_change)
+        process_btn.bind(on_release=process_payment)
+        cancel_btn.bind(on_release=popup.dismiss)
+        
+        popup.open()
+    
+    def refresh_cart(self):
+        """Legacy method - redirects to update_cart_display"""
+        self.update_cart_display()
+    
+    def create_cart_widget(self, cart_item):
+        widget = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height='70dp',
+            spacing='15dp',
+            padding=('15dp', '8dp', '15dp', '8dp')
+        )
+        
+        # Product info layout - lebih terstruktur
+        info_layout = BoxLayout(orientation='vertical', size_hint_x=0.65, spacing='2dp')
+        
+        # Nama produk
+        name_label = Label(
+            text=cart_item.product.name,
+            font_size='12sp',
+            bold=True,
+            size_hint_y=None,
+            height='20dp',
+            text_size=(dp(180), None),
+            halign='left',
+            valign='middle',
+            color=(0.1, 0.1, 0.1, 1),
+            shorten=True,
+            shorten_from='right'
+        )
+        
+        # Detail berat dan harga per kg
+        detail_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height='20dp', spacing='10dp')
+        
+        weight_label = Label(
+            text=f"{format_kg(cart_item.weight_g)} kg",
+            font_size='11sp',
+            size_hint_x=None,
+            width='60dp',
+            color=(0.3, 0.3, 0.3, 1),
+            halign='left'
+        )
+        
+        price_per_kg_label = Label(
+            text=f"@ {self.app_ref.format_currency(cart_item.product.price_per_kg)}/kg",
+            font_size='11sp',
+            color=(0.5, 0.5, 0.5, 1),
+            halign='left'
+        )
+        
+        detail_layout.add_widget(weight_label)
+        detail_layout.add_widget(price_per_kg_label)
+        
+        info_layout.add_widget(name_label)
+        info_layout.add_widget(detail_layout)
+        
+        # Total price - lebih prominent
+        total_label = Label(
+            text=self.app_ref.format_currency(cart_item.get_total()),
+            font_size='13sp',
+            bold=True,
+            size_hint_x=0.35,
+            text_size=(dp(90), None),
+            halign='right',
+            valign='middle',
+            color=(0.1, 0.6, 0.1, 1),
+            shorten=True
+        )
+        
+        widget.add_widget(info_layout)
+        widget.add_widget(total_label)
+        
+        # Kept for in-place updates from on_cart_change
+        widget.weight_label = weight_label
+        widget.total_label = total_label
+        return widget
+        
+    def show_delete_product_confirmation(self, product):
+        """Show confirmation popup before deleting product"""
+        popup = ConfirmationPopup(
+            "Hapus Produk",
+            f"Yakin ingin menghapus produk {product.name}?",
+            confirm_callback=lambda: self.confirm_delete_product(product)
+        )
+        popup.open()
+    
+    def confirm_delete_product(self, product):
+        """Delete product from inventory"""
+        self.app_ref.products.remove(product)
+        for cart_item in [item for item in self.app_ref.cart if item.product is product]:
+            self.app_ref.cart.remove(cart_item)
+        self.app_ref.save_kasir_products()
+        self.app_ref.show_popup('Berhasil', f'Produk "{product.name}" berhasil dihapus!')
+    
+    def process_payment(self, payment_amount, change_amount):
+        """Process payment and generate receipt"""
+        from datetime import datetime
+        
+        now = datetime.now()
+        
+        # Create receipt data
+        receipt_data = {
+            'transaction_id': self.app_ref.transaction_counter,
+            'date_time': now.strftime('%d/%m/%Y %H:%M'),
+            'items': [],
+            'total': self.app_ref.get_cart_total(),
+            'payment': payment_amount,
+            'change': change_amount
+        }
+            
+        # Add cart items to receipt
+        for cart_item in self.app_ref.cart:
+            receipt_data['items'].append({
+                'name': cart_item.product.name,
+                'weight': cart_item.weight_kg,
+                'price_per_kg': cart_item.product.price_per_kg,
+                'total': cart_item.get_total()
+            })
+        
+        # Journal, rollups and analytics share the kasir.py transaction format
+        transaction = {
+            'receipt_number': format_receipt_number(self.app_ref.transaction_counter, self.app_ref.receipt_prefix),
+            'date': now.strftime('%d/%m/%Y'),
+            'time': now.strftime('%H:%M:%S'),
+            'username': self.app_ref.username,
+            'shop_name': self.app_ref.shop_name,
+            'items': [(item['name'], item['weight'], item['price_per_kg'], item['total'])
+                      for item in receipt_data['items']],
+            'subtotal': receipt_data['total'],
+            'payment': payment_amount,
+            'change': change_amount
+        }
+        self.app_ref.save_kasir_transaction(transaction)
+        self.app_ref.rollups.record_receipt(transaction)
+        self.app_ref.analytics.add_receipt(transaction)
+        self.app_ref.transaction_counter += 1
+        
+        # Take the sold weight out of stock; only those rows are redrawn
+        for cart_item in self.app_ref.cart:
+            if cart_item.product.id in self.app_ref.products:
+                self.app_ref.products.change_stock(cart_item.product.id, -cart_item.weight_g)
+        
+        # Clear cart
+        self.app_ref.cart.clear()
+        
+        # Save data
+        self.app_ref.save_kasir_products()
+        self.app_ref.save_kasir_expenses()
+        self.app_ref.save_transaction_counter()
+        
+        # Show receipt
+        receipt_screen = self.manager.get_screen('kasir_receipt')
+        receipt_screen.set_receipt_data(receipt_data)
+        self.manager.current = 'kasir_receipt'
+
+
+# Kasir Expenses Screen
+class KasirExpensesScreen(Screen):
+    """Screen for managing expenses"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app_ref = None
+        self.build_ui()
+    
+    def on_enter(self):
+        self.app_ref = App.get_running_app()
+        self.refresh_expenses()
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=['5dp', '10dp', '5dp', '10dp'], spacing='8dp')
+        
+        # Header with responsive sizing
+        header = BoxLayout(size_hint_y=None, height='50dp')
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.25,
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'kasir_main'))
+        header.add_widget(back_btn)
+        
+        title_label = Label(
+            text='PENGELUARAN',
+            font_size='18sp',
+            bold=True,
+            text_size=(None, None),
+            halign='center',
+            valign='middle',
+            size_hint_y=None,
+            height='50dp'
+        )
+        header.add_widget(title_label)
+        layout.add_widget(header)
+        
+        # Add expense button
+        add_expense_btn = Button(
+            text='+ TAMBAH PENGELUARAN',
+            size_hint_y=None,
+            height='50dp',
+            background_color=(0.2, 0.8, 0.2, 1),
+            font_size='14sp',
+            bold=True,
+            padding=('10dp', '5dp')
+        )
+        add_expense_btn.bind(on_press=self.show_add_expense)
+        layout.add_widget(add_expense_btn)
+        
+        # Expenses list
+        self.expenses_scroll = ScrollView(bar_width='6dp', bar_color=(0.5, 0.5, 0.5, 0.5))
+        self.expenses_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing='8dp', padding='5dp')
+        self.expenses_layout.bind(minimum_height=self.expenses_layout.setter('height'))
+        self.expenses_scroll.add_widget(self.expenses_layout)
+        layout.add_widget(self.expenses_scroll)
+        
+        # Total expenses with better styling
+        total_container = BoxLayout(size_hint_y=None, height='60dp', padding=('10dp', '5dp'))
+        
+        # Create canvas for background
+        with total_container.canvas.before:
+            self.rect_color = Color(0.9, 0.9, 0.9, 1)
+            self.rect = Rectangle(pos=total_container.pos, size=total_container.size)
+        
+        # Bind update method
+        def update_rect(instance, value):
+            self.rect.pos = instance.pos
+            self.rect.size = instance.size
+            
+        total_container.bind(pos=update_rect, size=update_rect)
+        
+        total_text = Label(
+            text='Total Pengeluaran:',
+            size_hint_x=0.6,
+            font_size='16sp',
+            bold=True,
+            color=(0.2, 0.2, 0.2, 1),
+            text_size=(None, None),
+            halign='left',
+            valign='middle'
+        )
+        
+        self.total_label = Label(
+            text='Rp 0',
+            size_hint_x=0.4,
+            font_size='18sp',
+            bold=True,
+            color=(0.8, 0.2, 0.2, 1),
+            text_size=(None, None),
+            halign='right',
+            valign='middle'
+        )
+        
+        total_container.add_widget(total_text)
+        total_container.add_widget(self.total_label)
+        
+        layout.add_widget(total_container)
+        
+        self.add_widget(layout)
+    
+    def refresh_expenses(self):
+        if not self.app_ref:
+            return
+        
+        self.expenses_layout.clear_widgets()
+        total = 0
+        
+        for expense in self.app_ref.expenses:
+            expense_widget = self.create_expense_widget(expense)
+            self.expenses_layout.add_widget(expense_widget)
+            total += expense['amount']
+        
+        self.total_label.text = f'Total Pengeluaran: {self.app_ref.format_currency(total)}'
+    
+    def create_expense_widget(self, expense):
+        # Create main widget with card-like appearance
+        widget = BoxLayout(
+            orientation='horizontal', 
+            size_hint_y=None, 
+            height='90dp',  # Increased height for better touch
+            spacing='15dp', 
+            padding=('20dp', '15dp', '20dp', '15dp')  # More padding for better spacing
+        )
+        
+        # Add card background
+        with widget.canvas.before:
+            # Background color
+            widget.bg_color = Color(1, 1, 1, 1)  # White background
+            widget.rect = RoundedRectangle(
+                pos=widget.pos,
+                size=widget.size,
+                radius=[10, 10, 10, 10]
+            )
+            # Border color
+            widget.border_color = Color(0.9, 0.9, 0.9, 1)
+            widget.border = Line(
+                rounded_rectangle=(
+                    widget.x, 
+                    widget.y, 
+                    widget.width, 
+                    widget.height, 
+                    10
+                ),
+                width=1.5
+            )
+        
+        # Update function for position/size changes
+        def update_expense_rect(instance, value):
+            instance.rect.pos = instance.pos
+            instance.rect.size = instance.size
+            instance.border.rounded_rectangle = (
+                instance.x, instance.y, instance.width, instance.height, 10
+            )
+        
+        # Bind the update function
+        widget.bind(pos=update_expense_rect, size=update_expense_rect)
+        
+        # Expense info with better layout
+        info_layout = BoxLayout(
+            orientation='vertical', 
+            size_hint_x=0.6,  # More space for text
+            spacing='4dp'  # Slightly more spacing between lines
+        )
+        
+        name_label = Label(
+            text=expense['name'],
+            font_size='16sp',  # Larger font for better readability
+            bold=True,
+            size_hint_y=None,
+            height='32dp',  # More height for the name
+            text_size=(Window.width * 0.4, None),  # Limit width to prevent overflow
+            halign='left',
+            valign='middle',
+            color=(0.2, 0.2, 0.2, 1),  # Darker text for better contrast
+            shorten=True,
+            shorten_from='right'
+        )
+        
+        date_label = Label(
+            text=expense.get('date', 'No date'),
+            font_size='12sp',
+            size_hint_y=None,
+            height='25dp',
+            color=(0.5, 0.5, 0.5, 1),
+            text_size=(None, None),
+            halign='left',
+            valign='top'
+        )
+        
+        info_layout.add_widget(name_label)
+        info_layout.add_widget(date_label)
+        
+        # Amount with better styling
+        amount_label = Label(
+            text=self.app_ref.format_currency(expense['amount']),
+            font_size='16sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.8, 0.2, 0.2, 1),  # More vibrant red for better visibility
+            text_size=(Window.width * 0.25, None),  # Set width to 25% of window width
+            halign='right',
+            valign='middle',
+            size_hint_y=None,
+            height='60dp'
+        )
+        
+        # Delete button with better styling
+        delete_btn = Button(
+            text='HAPUS',
+            size_hint_x=0.2,
+            size_hint_y=None,
+            height='40dp',
+            background_color=(0.9, 0.2, 0.2, 1),
+            background_normal='',
+            background_down='atlas://data/images/defaulttheme/button_pressed',
+            font_size='12sp',
+            bold=True,
+            color=(1, 1, 1, 1),  # White text
+            padding=('5dp', '2dp'),
+            pos_hint={'center_y': 0.5}
+        )
+        delete_btn.bind(on_press=lambda x, exp=expense: self.delete_expense(exp))
+        
+        # Add all widgets to the main layout
+        widget.add_widget(info_layout)
+        widget.add_widget(amount_label)
+        widget.add_widget(delete_btn)
+        
+        # Add shadow effect
+        with widget.canvas.after:
+            widget.shadow_color = Color(0, 0, 0, 0.1)
+            widget.shadow = RoundedRectangle(
+                pos=(widget.x + 2, widget.y - 2),
+                size=widget.size,
+                radius=[10, 10, 10, 10]
+            )
+        
+        # Update function for shadow
+        def update_shadow(instance, value):
+            if hasattr(instance, 'shadow'):
+                instance.shadow.pos = (instance.x + 2, instance.y - 2)
+                instance.shadow.size = instance.size
+        
+        # Bind shadow update
+        widget.bind(pos=update_shadow, size=update_shadow)
+        
+        return widget
+        
+    def show_add_expense(self, instance):
+        popup = AddExpensePopup(callback=self.add_new_expense)
+        popup.open()
+    
+    def show_weight_input(self, product):
+        """Tampilkan popup untuk memasukkan berat produk - menggunakan pola yang sama dengan kasir.py"""
+        if not product:
+            show_error_popup('Produk tidak valid')
+            return
+            
+        try:
+            # Dapatkan detail produk dengan aman
+            if hasattr(product, 'get') and callable(getattr(product, 'get')):
+                product_name = product.get('name', 'Produk')
+                price_per_kg = float(product.get('price_per_kg', 0))
+            else:
+                product_name = getattr(product, 'name', 'Produk')
+                price_per_kg = float(getattr(product, 'price_per_kg', 0))
+            
+            # Create popup dengan pola yang sama persis dengan kasir.py WeightInputPopup
+            popup = Popup(
+                title=f'Input Berat - {product_name}',
+                size_hint=(0.9, 0.7),
+                auto_dismiss=False
+            )
+            
+            layout = BoxLayout(orientation='vertical', spacing=dp(20), padding=dp(20))
+            
+            # Product info
+            info_label = Label(
+                text=f'{product_name}\nHarga: {self.app_ref.format_currency(price_per_kg)}/kg',
+                size_hint_y=None,
+                height=dp(70),
+                font_size=dp(14),
+                bold=True,
+                halign='center',
+                color=(0.2, 0.6, 0.2, 1)
+            )
+            layout.add_widget(info_label)
+            
+            # Weight input dengan keypad numerik virtual
+            weight_label = Label(
+                text='Masukkan Berat:',
+                size_hint_y=None,
+                height=dp(30),
+                font_size=dp(14),
+                bold=True,
+                color=(0.2, 0.2, 0.2, 1),
+                halign='center'
+            )
+            layout.add_widget(weight_label)
+            
+            # Display untuk menampilkan angka yang diinput
+            weight_display_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=dp(10))
+            
+            weight_display = Label(
+                text='1',
+                font_size=dp(20),
+                size_hint_x=0.8,
+                bold=True,
+                color=(0.1, 0.1, 0.1, 1),
+                halign='center'
+            )
+            
+            # Add background to display
+            with weight_display.canvas.before:
+                Color(0.95, 0.95, 0.95, 1)
+                weight_display.bg = RoundedRectangle(size=weight_display.size, pos=weight_display.pos, radius=[5])
+            weight_display.bind(size=lambda instance, value: setattr(instance.bg, 'size', value))
+            weight_display.bind(pos=lambda instance, value: setattr(instance.bg, 'pos', value))
+            
+            kg_label = Label(
+                text='KG',
+                size_hint_x=0.2,
+                font_size=dp(14),
+                bold=True,
+                color=(0.4, 0.4, 0.4, 1)
+            )
+            
+            weight_display_layout.add_widget(weight_display)
+            weight_display_layout.add_widget(kg_label)
+            layout.add_widget(weight_display_layout)
+            
+            # Keypad numerik
+            keypad_layout = GridLayout(cols=3, spacing=dp(5), size_hint_y=None, height=dp(180))
+            
+            current_value = ['1']
+            
+            def update_display():
+                value_str = ''.join(current_value)
+                weight_display.text = value_str
+                try:
+                    weight = float(value_str) if value_str else 0
+                    total = price_per_kg * weight
+                    total_label.text = f'Total: {self.app_ref.format_currency(total)}'
+                except:
+                    total_label.text = 'Total: Rp 0'
+            
+            def add_digit(digit):
+                if digit == '.' and '.' in current_value:
+                    return
+                if len(''.join(current_value)) < 6:  # Limit input length
+                    current_value.append(digit)
+                    update_display()
+            
+            def clear_input():
+                current_value.clear()
+                current_value.extend(['0'])
+                update_display()
+            
+            def backspace():
+                if len(current_value) > 1:
+                    current_value.pop()
+                else:
+                    current_value[0] = '0'
+                update_display()
+            
+            # Tombol angka 1-9
+            for i in range(1, 10):
+                btn = Button(
+                    text=str(i),
+                    font_size=dp(18),
+                    bold=True,
+                    background_color=(0.9, 0.9, 0.9, 1),
+                    color=(0, 0, 0, 1)
+                )
+                btn.bind(on_press=lambda x, digit=str(i): add_digit(digit))
+                keypad_layout.add_widget(btn)
+            
+            # Tombol titik desimal
+            dot_btn = Button(
+                text='.',
+                font_size=dp(18),
+                bold=True,
+                background_color=(0.9, 0.9, 0.9, 1),
+                color=(0, 0, 0, 1)
+            )
+            dot_btn.bind(on_press=lambda x: add_digit('.'))
+            keypad_layout.add_widget(dot_btn)
+            
+            # Tombol 0
+            zero_btn = Button(
+                text='0',
+                font_size=dp(18),
+                bold=True,
+                background_color=(0.9, 0.9, 0.9, 1),
+                color=(0, 0, 0, 1)
+            )
+            zero_btn.bind(on_press=lambda x: add_digit('0'))
+            keypad_layout.add_widget(zero_btn)
+            
+            # Tombol backspace
+            back_btn = Button(
+                text='←',
+                font_size=dp(18),
+                bold=True,
+                background_color=(0.8, 0.6, 0.6, 1),
+                color=(1, 1, 1, 1)
+            )
+            back_btn.bind(on_press=lambda x: backspace())
+            keypad_layout.add_widget(back_btn)
+            
+            layout.add_widget(keypad_layout)
+            
+            # Quick preset buttons
+            preset_layout = BoxLayout(spacing=dp(5), size_hint_y=None, height=dp(40))
+            presets = ['0.5', '1.0', '2.0', '5.0']
+            
+            for preset in presets:
+                btn = Button(
+                    text=f'{preset} kg',
+                    font_size=dp(12),
+                    background_color=(0.7, 0.8, 0.9, 1),
+                    color=(0, 0, 0, 1)
+                )
+                def set_preset(preset_val):
+                    current_value.clear()
+                    current_value.extend(list(preset_val))
+                    update_display()
+                btn.bind(on_press=lambda x, p=preset: set_preset(p))
+                preset_layout.add_widget(btn)
+            
+            layout.add_widget(preset_layout)
+            
+            # Total preview
+            total_label = Label(
+                text='Total: Rp 0',
+                size_hint_y=None,
+                height=dp(40),
+                font_size=dp(16),
+                bold=True,
+                color=(0.1, 0.6, 0.1, 1),
+                halign='center'
+            )
+            layout.add_widget(total_label)
+            
+            # Initialize display
+            update_display()
+            
+            # Action buttons - sama dengan kasir.py
+            buttons_layout = BoxLayout(spacing=dp(15), size_hint_y=None, height=dp(50))
+            
+            add_btn = Button(
+                text='TAMBAH KE KERANJANG',
+                background_color=(0.1, 0.7, 0.3, 1),
+                font_size=dp(13),
+                bold=True
+            )
+            
+            cancel_btn = Button(
+                text='BATAL',
+                background_color=(0.9, 0.2, 0.2, 1),
+                font_size=dp(13),
+                bold=True,
+                size_hint_x=0.4
+            )
+            
+            # Bind button actions
+            add_btn.bind(on_press=lambda x: self.add_to_cart_with_weight(product, weight_display.text, popup))
+            cancel_btn.bind(on_press=lambda x: popup.dismiss())
+            
+            buttons_layout.add_widget(add_btn)
+            buttons_layout.add_widget(cancel_btn)
+            layout.add_widget(buttons_layout)
+            
+            popup.content = layout
+            popup.open()
+            
+        except Exception as e:
+            show_error_popup(f'Terjadi kesalahan: {str(e)}')
+            print(f'Error in show_weight_input: {str(e)}')
+    
+    def update_weight_display_bg(self, instance):
+        """Update background for weight display"""
+        try:
+            instance.canvas.before.clear()
+            with instance.canvas.before:
+                Color(0.9, 0.9, 0.9, 1)
+                Rectangle(pos=instance.pos, size=instance.size)
+        except:
+            pass
+        
+    def add_to_cart_with_weight(self, product, weight_text, popup):
+        """Tambah produk ke keranjang dengan berat yang ditentukan"""
+        try:
+            # Validasi input berat
+            weight = float(weight_text)
+            if weight <= 0:
+                raise ValueError('Berat harus lebih dari 0')
+            
+            # Dapatkan detail produk (mendukung dict dan objek)
+            if hasattr(product, 'get') and callable(getattr(product, 'get')):
+                # Jika product adalah dictionary
+                product_id = product.get('id')
+                product_name = product.get('name', 'Produk')
+                price_per_kg = float(product.get('price_per_kg', 0))
+                stock_kg = float(product.get('stock_kg', 0))
+            else:
+                # Jika product adalah objek KasirProduct
+                product_id = getattr(product, 'id', 0)
+                product_name = getattr(product, 'name', 'Produk')
+                price_per_kg = float(getattr(product, 'price_per_kg', 0))
+                stock_kg = float(getattr(product, 'stock_kg', 0))
+            
+            # Hitung total harga
+            total_price = price_per_kg * weight
+            
+            # Buat cart item
+            cart_item = {
+                'id': product_id,
+                'name': product_name,
+                'price_per_kg': price_per_kg,
+                'weight': weight,
+                'total_price': total_price,
+                'stock_kg': stock_kg
+            }
+            
+            # Inisialisasi keranjang jika belum ada
+            if not hasattr(self, 'app_ref') or not hasattr(self.app_ref, 'cart'):
+                if hasattr(self, 'app_ref'):
+                    self.app_ref.cart = []
+                else:
+                    show_error_popup('Terjadi kesalahan: Aplikasi tidak terinisialisasi dengan benar')
+                    return
+            
+            # Tambahkan ke keranjang
+            self.app_ref.cart.append(cart_item)
+            
+            # Perbarui tampilan keranjang
+            if hasattr(self, 'update_cart_display'):
+                self.update_cart_display()
+            
+            # Beri umpan balik sukses
+            if hasattr(sound_manager, 'success_feedback'):
+                sound_manager.success_feedback()
+            
+            # Tampilkan notifikasi sukses
+            Clock.schedule_once(lambda dt: show_popup(
+                'Berhasil', 
+                f'{product_name} ({weight} kg) berhasil ditambahkan ke keranjang',
+                auto_dismiss=True
+            ), 0.1)
+            
+        except ValueError as e:
+            # Tampilkan pesan error yang lebih spesifik
+            error_msg = str(e) if str(e) else 'Masukkan berat yang valid (contoh: 0.5, 1, 1.5)'
+            show_error_popup(error_msg, title='Input Tidak Valid')
+            if hasattr(sound_manager, 'error_feedback'):
+                sound_manager.error_feedback()
+        except Exception as e:
+            # Tangani error tak terduga
+            show_error_popup(f'Terjadi kesalahan: {str(e)}', title='Error')
+            if hasattr(sound_manager, 'error_feedback'):
+                sound_manager.error_feedback()
+        finally:
+            # Selalu tutup popup jika ada
+            if popup and hasattr(popup, 'dismiss'):
+                popup.dismiss()
+    
+    def delete_expense(self, expense):
+        popup = ConfirmationPopup(
+            "Hapus Pengeluaran",
+            f"Yakin ingin menghapus pengeluaran {expense['name']}?",
+            confirm_callback=lambda: self.confirm_delete_expense(expense)
+        )
+        popup.open()
+
+    def add_new_expense(self, name, amount, note=''):
+        if not self.app_ref:
+            return
+
+        # Convert to string first to handle both string and numeric inputs
+        name = str(name) if name is not None else ""
+        amount = str(amount) if amount is not None else ""
+        note = str(note) if note is not None else ""
+        
+        # Handle case where instance is passed as the first argument (from button press)
+        if hasattr(name, 'text'):  # If name is actually the instance
+            instance = name
+            name = amount  # Shift parameters
+            amount = note
+            note = ''
+
+        # Validasi input
+        if not name.strip():
+            show_error_popup('Nama pengeluaran tidak boleh kosong', title='Kesalahan Input')
+            sound_manager.error_feedback()
+            return
+            
+        if not amount.strip():
+            show_error_popup('Jumlah pengeluaran tidak boleh kosong', title='Kesalahan Input')
+            sound_manager.error_feedback()
+            return
+
+        try:
+            # Jumlah disimpan sebagai rupiah bulat
+            try:
+                amount_rupiah = parse_rupiah(amount)
+            except ValueError:
+                raise ValueError('Format jumlah tidak valid. Gunakan angka (contoh: 10000 atau 10.000)')
+            
+            if amount_rupiah <= 0:
+                raise ValueError('Jumlah harus lebih dari 0')
+
+            # Add to app's expenses list
+            expense = {
+                'id': str(int(time.time())),
+                'name': name.strip(),
+                'amount': amount_rupiah,
+                'note': note.strip(),
+                'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            self.app_ref.expenses.append(expense)
+
+            # Save to database
+            self.app_ref.save_kasir_expenses()
+            self.app_ref.rollups.record_expense(datetime.now(), amount_rupiah, expense['name'])
+
+            # Refresh the display
+            self.refresh_expenses()
+
+            # Play success sound
+            sound_manager.success_feedback()
+
+        except ValueError as e:
+            # Show error popup if amount is invalid
+            error_msg = str(e) if str(e) else 'Terjadi kesalahan saat memproses input'
+            show_error_popup(error_msg, title='Kesalahan Input')
+            sound_manager.error_feedback()
+
+    def confirm_delete_expense(self, expense):
+        """Delete expense"""
+        self.app_ref.expenses.remove(expense)
+        self.app_ref.save_kasir_expenses()
+        
+        if isinstance(expense, dict):
+            name, amount, date_text = expense['name'], expense['amount'], expense.get('date', '')
+        else:
+            name, amount, date_text = expense.name, expense.amount, expense.date_time
+        try:
+            expense_time = datetime.strptime(date_text, '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            expense_time = datetime.now()
+        self.app_ref.rollups.remove_expense(expense_time, amount, name)
+        self.refresh_expenses()
+
+
+# Kasir Reports Screen
+class KasirReportsScreen(Screen):
+    """Screen for viewing sales reports"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app_ref = None
+        self.build_ui()
+    
+    def on_enter(self):
+        self.app_ref = App.get_running_app()
+        self.refresh_reports()
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=['5dp', '10dp', '5dp', '10dp'], spacing='8dp')
+        
+        # Header with responsive sizing
+        header = BoxLayout(size_hint_y=None, height='50dp')
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.25,
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'kasir_main'))
+        header.add_widget(back_btn)
+        
+        title_label = Label(
+            text='LAPORAN PENJUALAN',
+            font_size='18sp',
+            bold=True,
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        header.add_widget(title_label)
+        layout.add_widget(header)
+        
+        # Summary cards with responsive sizing
+        summary_scroll = ScrollView()
+        summary_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing='5dp')
+        summary_layout.bind(minimum_height=summary_layout.setter('height'))
+        
+        # Sales card with responsive sizing
+        sales_card = BoxLayout(orientation='horizontal', size_hint_y=None, height='80dp', padding=['15dp', '10dp', '15dp', '10dp'], spacing='12dp')
+        sales_info = BoxLayout(orientation='vertical', size_hint_x=0.7)
+        sales_title = Label(
+            text='PENJUALAN HARI INI',
+            font_size='12sp',
+            bold=True,
+            size_hint_y=None,
+            height='30dp',
+            color=(0.1, 0.6, 0.1, 1),
+            text_size=(None, None),
+            halign='left',
+            valign='middle'
+        )
+        sales_subtitle = Label(
+            text='Total penjualan hari ini',
+            font_size='9sp',
+            size_hint_y=None,
+            height='25dp',
+            color=(0.5, 0.5, 0.5, 1),
+            text_size=(None, None),
+            halign='left',
+            valign='middle'
+        )
+        sales_info.add_widget(sales_title)
+        sales_info.add_widget(sales_subtitle)
+        
+        self.sales_amount = Label(
+            text='Rp 0',
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.1, 0.6, 0.1, 1),
+            text_size=(None, None),
+            halign='right',
+            valign='middle'
+        )
+        sales_card.add_widget(sales_info)
+        sales_card.add_widget(self.sales_amount)
+        
+        # Expenses card
+        expenses_card = BoxLayout(orientation='horizontal', size_hint_y=None, height=80, padding=15, spacing=12)
+        expenses_info = BoxLayout(orientation='vertical', size_hint_x=0.7)
+        expenses_title = Label(
+            text='PENGELUARAN HARI INI',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height=25,
+            color=(0.8, 0.4, 0.2, 1),
+            text_size=(None, None),
+            halign='left'
+        )
+        expenses_subtitle = Label(
+            text='Total pengeluaran hari ini',
+            font_size='10sp',
+            size_hint_y=None,
+            height=20,
+            color=(0.5, 0.5, 0.5, 1),
+            text_size=(None, None),
+            halign='left'
+        )
+        expenses_info.add_widget(expenses_title)
+        expenses_info.add_widget(expenses_subtitle)
+        
+        self.expenses_amount = Label(
+            text='Rp 0',
+            font_size='18sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.8, 0.4, 0.2, 1),
+            text_size=(None, None),
+            halign='right'
+        )
+        expenses_card.add_widget(expenses_info)
+        expenses_card.add_widget(self.expenses_amount)
+        
+        # Profit card
+        profit_card = BoxLayout(orientation='horizontal', size_hint_y=None, height=80, padding=15, spacing=12)
+        profit_info = BoxLayout(orientation='vertical', size_hint_x=0.7)
+        profit_title = Label(
+            text='KEUNTUNGAN HARI INI',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height=25,
+            color=(0.2, 0.6, 0.8, 1),
+            text_size=(None, None),
+            halign='left'
+        )
+        profit_subtitle = Label(
+            text='Penjualan - Pengeluaran',
+            font_size='10sp',
+            size_hint_y=None,
+            height=20,
+            color=(0.5, 0.5, 0.5, 1),
+            text_size=(None, None),
+            halign='left'
+        )
+        profit_info.add_widget(profit_title)
+        profit_info.add_widget(profit_subtitle)
+        
+        self.profit_amount = Label(
+            text='Rp 0',
+            font_size='18sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.2, 0.6, 0.8, 1),
+            text_size=(None, None),
+            halign='right'
+        )
+        profit_card.add_widget(profit_info)
+        profit_card.add_widget(self.profit_amount)
+        
+        summary_layout.add_widget(sales_card)
+        summary_layout.add_widget(expenses_card)
+        summary_layout.add_widget(profit_card)
+        
+        # Transaction counter with better spacing
+        counter_container = BoxLayout(orientation='horizontal', size_hint_y=None, height=60, padding=15)
+        counter_label_text = Label(
+            text='Nomor Transaksi Selanjutnya:',
+            font_size='12sp',
+            size_hint_x=0.7,
+            text_size=(None, None),
+            halign='left',
+            color=(0.4, 0.4, 0.4, 1)
+        )
+        self.counter_label = Label(
+            text='#1',
+            font_size='16sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.2, 0.6, 0.8, 1),
+            text_size=(None, None),
+            halign='right'
+        )
+        counter_container.add_widget(counter_label_text)
+        counter_container.add_widget(self.counter_label)
+        summary_layout.add_widget(counter_container)
+        
+        # Range picker for multi-day analytics
+        range_title = Label(
+            text='ANALISIS PERIODE',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height='30dp',
+            color=(0.2, 0.6, 0.8, 1)
+        )
+        summary_layout.add_widget(range_title)
+        
+        preset_row = BoxLayout(size_hint_y=None, height='40dp', spacing='5dp', padding=['10dp', 0, '10dp', 0])
+        for text, days in (('Hari Ini', 1), ('7 Hari', 7), ('30 Hari', 30), ('1 Tahun', 365)):
+            preset_btn = Button(
+                text=text,
+                font_size='11sp',
+                background_color=(0.2, 0.6, 0.8, 1)
+            )
+            preset_btn.bind(on_press=lambda x, d=days: self.select_last_days(d))
+            preset_row.add_widget(preset_btn)
+        summary_layout.add_widget(preset_row)
+        
+        custom_row = BoxLayout(size_hint_y=None, height='40dp', spacing='5dp', padding=['10dp', 0, '10dp', 0])
+        self.range_start_input = TextInput(
+            hint_text='Dari (dd/mm/yyyy)',
+            multiline=False,
+            font_size='11sp'
+        )
+        self.range_end_input = TextInput(
+            hint_text='Sampai (dd/mm/yyyy)',
+            multiline=False,
+            font_size='11sp'
+        )
+        show_range_btn = Button(
+            text='Tampilkan',
+            size_hint_x=0.3,
+            font_size='11sp',
+            background_color=(0.1, 0.6, 0.1, 1)
+        )
+        show_range_btn.bind(on_press=self.show_custom_range)
+        custom_row.add_widget(self.range_start_input)
+        custom_row.add_widget(self.range_end_input)
+        custom_row.add_widget(show_range_btn)
+        summary_layout.add_widget(custom_row)
+        
+        self.range_result = Label(
+            text='Pilih periode untuk melihat analisis',
+            font_size='11sp',
+            size_hint_y=None,
+            color=(0.3, 0.3, 0.3, 1),
+            halign='left',
+            valign='top',
+            padding=(dp(15), dp(10))
+        )
+        self.range_result.bind(
+            width=lambda instance, width: setattr(instance, 'text_size', (width, None)),
+            texture_size=lambda instance, size: setattr(instance, 'height', size[1])
+        )
+        summary_layout.add_widget(self.range_result)
+        
+        # Reset button with better spacing
+        reset_container = BoxLayout(size_hint_y=None, height=80, padding=15)
+        reset_btn = Button(
+            text='RESET PENGELUARAN',
+            background_color=(0.9, 0.2, 0.2, 1),
+            font_size='14sp',
+            bold=True
+        )
+        reset_btn.bind(on_press=self.show_reset_confirmation)
+        reset_container.add_widget(reset_btn)
+        summary_layout.add_widget(reset_container)
+        
+        # Add to scroll and main layout
+        summary_scroll.add_widget(summary_layout)
+        layout.add_widget(summary_scroll)
+        
+        self.add_widget(layout)
+    
+    def refresh_reports(self):
+        if not self.app_ref:
+            return
+        
+        # Today's totals straight from the rollups
+        today = self.app_ref.rollups.get_day(datetime.now())
+        total_sales = today['gross']
+        total_expenses = today['expenses']
+        profit = total_sales - total_expenses
+        
+        self.sales_amount.text = self.app_ref.format_currency(total_sales)
+        self.expenses_amount.text = self.app_ref.format_currency(total_expenses)
+        self.profit_amount.text = self.app_ref.format_currency(profit)
+        self.counter_label.text = f'#{self.app_ref.transaction_counter}'
+    
+    def select_last_days(self, days):
+        """Show analytics for the last `days` days including today"""
+        end = datetime.now().date()
+        start = end - timedelta(days=days - 1)
+        self.range_start_input.text = start.strftime('%d/%m/%Y')
+        self.range_end_input.text = end.strftime('%d/%m/%Y')
+        self.show_range(start, end)
+    
+    def show_custom_range(self, instance):
+        """Show analytics for the dates typed in the range inputs"""
+        try:
+            start = datetime.strptime(self.range_start_input.text.strip(), '%d/%m/%Y').date()
+            end = datetime.strptime(self.range_end_input.text.strip(), '%d/%m/%Y').date()
+        except ValueError:
+            self.app_ref.show_popup('Error', 'Format tanggal harus dd/mm/yyyy')
+            return
+        
+        if end < start:
+            start, end = end, start
+        self.show_range(start, end)
+    
+    def show_range(self, start, end):
+        """Render range totals, products, hours, expenses and rolling profit"""
+        if not self.app_ref:
+            return
+        
+        analytics = self.app_ref.analytics
+        fmt = self.app_ref.format_currency
+        totals = analytics.range_totals(start, end)
+        
+        lines = [
+            f"Periode: {start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}",
+            f"Transaksi: {totals['transactions']}",
+            f"Penjualan: {fmt(totals['gross'])}",
+            f"Terjual: {format_kg(totals['grams'])} kg",
+            f"Pengeluaran: {fmt(totals['expenses'])}",
+            f"Keuntungan: {fmt(totals['profit'])}",
+            "",
+            f"Keuntungan 7 hari: {fmt(analytics.rolling_profit(end, 7))}",
+            f"Keuntungan 30 hari: {fmt(analytics.rolling_profit(end, 30))}",
+        ]
+        
+        products = analytics.product_breakdown(start, end)
+        if products:
+            lines.append("")
+            lines.append("[b]Per Produk[/b]")
+            for product in products[:10]:
+                lines.append(f"{product['name']}: {format_kg(product['grams'])} kg - {fmt(product['revenue'])}")
+        
+        hours = [h for h in analytics.hour_histogram(start, end) if h['transactions']]
+        if hours:
+            busiest = max(h['transactions'] for h in hours)
+            lines.append("")
+            lines.append("[b]Per Jam[/b]")
+            for h in hours:
+                bar = '|' * max(1, round(h['transactions'] * 20 / busiest))
+                lines.append(f"{h['hour']:02d}:00 {bar} {h['transactions']}")
+        
+        categories = analytics.expense_categories(start, end)
+        if categories:
+            lines.append("")
+            lines.append("[b]Kategori Pengeluaran[/b]")
+            for category, amount in categories:
+                lines.append(f"{category}: {fmt(amount)}")
+        
+        self.range_result.markup = True
+        self.range_result.text = "\n".join(lines)
+    
+    def show_reset_confirmation(self, instance):
+        popup = ConfirmationPopup(
+            "Reset Pengeluaran",
+            "Yakin ingin mereset data pengeluaran?\nSemua pengeluaran akan dihapus.\nData penjualan tetap tersimpan.",
+            confirm_callback=self.reset_daily_reports
+        )
+        popup.open()
+    
+    def reset_daily_reports(self):
+        """Reset the expenses
+        
+        Sales stay: the range and product reports read them from the
+        journal and archive, so clearing them only from the rollups would
+        make the daily and range reports disagree. The transaction counter
+        keeps running: receipt numbers must stay unique for this till
+        across days and resets.
+        """
+        days = set()
+        for expense in self.app_ref.expenses:
+            try:
+                days.add(datetime.strptime(expense.get('date', ''), '%Y-%m-%d %H:%M:%S').date())
+            except (TypeError, ValueError):
+                pass
+        for day in days:
+            self.app_ref.rollups.clear_expenses(day)
+        self.app_ref.expenses.clear()
+        
+        # Save data
+        self.app_ref.save_kasir_expenses()
+        
+        # Refresh display
+        self.refresh_reports()
+
+
+# Kasir Receipt Screen
+class KasirReceiptScreen(Screen):
+    """Screen for displaying receipt"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app_ref = None
+        self.receipt_data = None
+        self.build_ui()
+    
+    def on_enter(self):
+        self.app_ref = App.get_running_app()
+        if self.receipt_data:
+            self.display_receipt()
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=['5dp', '10dp', '5dp', '10dp'], spacing='8dp')
+        
+        # Header with responsive sizing
+        header = BoxLayout(size_hint_y=None, height='50dp')
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.25,
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'kasir_main'))
+        header.add_widget(back_btn)
+        
+        title_label = Label(
+            text='STRUK PEMBAYARAN',
+            font_size='16sp',
+            bold=True,
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        header.add_widget(title_label)
+        layout.add_widget(header)
+        
+        # Receipt content with responsive sizing
+        self.receipt_scroll = ScrollView()
+        self.receipt_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing='3dp', padding=['8dp', '5dp', '8dp', '5dp'])
+        self.receipt_layout.bind(minimum_height=self.receipt_layout.setter('height'))
+        self.receipt_scroll.add_widget(self.receipt_layout)
+        layout.add_widget(self.receipt_scroll)
+        
+        # Print button with responsive sizing
+        print_btn = Button(
+            text='CETAK STRUK',
+            size_hint_y=None,
+            height='40dp',
+            background_color=(0.2, 0.6, 0.8, 1),
+            font_size='12sp',
+            bold=True
+        )
+        print_btn.bind(on_press=self.print_receipt)
+        layout.add_widget(print_btn)
+        
+        self.add_widget(layout)
+    
+    def set_receipt_data(self, receipt_data):
+        """Set receipt data to display"""
+        self.receipt_data = receipt_data
+        if self.app_ref:
+            self.display_receipt()
+    
+    def display_receipt(self):
+        if not self.receipt_data:
+            return
+        
+        self.receipt_layout.clear_widgets()
+        
+        # Shop header
+        shop_label = Label(
+            text=self.app_ref.shop_name,
+            font_size='16sp',
+            bold=True,
+            size_hint_y=None,
+            height=30
+        )
+        self.receipt_layout.add_widget(shop_label)
+        
+        # Transaction info
+        trans_info = Label(
+            text=f"Transaksi #{self.receipt_data['transaction_id']}\n{self.receipt_data['date_time']}",
+            font_size='12sp',
+            size_hint_y=None,
+            height=40,
+            color=(0.4, 0.4, 0.4, 1)
+        )
+        self.receipt_layout.add_widget(trans_info)
+        
+        # Separator
+        separator1 = Label(
+            text='-' * 40,
+            font_size='10sp',
+            size_hint_y=None,
+            height=20
+        )
+        self.receipt_layout.add_widget(separator1)
+        
+        # Items
+        for item in self.receipt_data['items']:
+            item_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=30)
+            
+            item_info = Label(
+                text=f"{item['name']}\n{item['weight']} kg × {self.app_ref.format_currency(item['price_per_kg'])}/kg",
+                font_size='10sp',
+                size_hint_x=0.7,
+                text_size=(None, None),
+                halign='left'
+            )
+            
+            item_total = Label(
+                text=self.app_ref.format_currency(item['total']),
+                font_size='10sp',
+                size_hint_x=0.3,
+                text_size=(None, None),
+                halign='right'
+            )
+            
+            item_layout.add_widget(item_info)
+            item_layout.add_widget(item_total)
+            self.receipt_layout.add_widget(item_layout)
+        
+        # Separator
+        separator2 = Label(
+            text='-' * 40,
+            font_size='10sp',
+            size_hint_y=None,
+            height=20
+        )
+        self.receipt_layout.add_widget(separator2)
+        
+        # Total
+        total_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        total_label = Label(
+            text='TOTAL:',
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.7
+        )
+        total_amount = Label(
+            text=self.app_ref.format_currency(self.receipt_data['total']),
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.1, 0.6, 0.1, 1)
+        )
+        total_layout.add_widget(total_label)
+        total_layout.add_widget(total_amount)
+        self.receipt_layout.add_widget(total_layout)
+        
+        # Payment info
+        payment_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=30)
+        payment_label = Label(
+            text='Bayar:',
+            font_size='12sp',
+            size_hint_x=0.7
+        )
+        payment_amount = Label(
+            text=self.app_ref.format_currency(self.receipt_data['payment']),
+            font_size='12sp',
+            size_hint_x=0.3
+        )
+        payment_layout.add_widget(payment_label)
+        payment_layout.add_widget(payment_amount)
+        self.receipt_layout.add_widget(payment_layout)
+        
+        # Change
+        change_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=30)
+        change_label = Label(
+            text='Kembalian:',
+            font_size='12sp',
+            size_hint_x=0.7
+        )
+        change_amount = Label(
+            text=self.app_ref.format_currency(self.receipt_data['change']),
+            font_size='12sp',
+            size_hint_x=0.3,
+            color=(0.2, 0.6, 0.8, 1)
+        )
+        change_layout.add_widget(change_label)
+        change_layout.add_widget(change_amount)
+        self.receipt_layout.add_widget(change_layout)
+        
+        # Thank you message
+        thanks_label = Label(
+            text='\nTerima kasih atas kunjungan Anda!',
+            font_size='12sp',
+            size_hint_y=None,
+            height=40,
+            italic=True
+        )
+        self.receipt_layout.add_widget(thanks_label)
+    
+    def print_receipt(self, instance):
+        # Placeholder for print functionality
+        self.app_ref.show_popup("Info", "Fitur cetak struk akan segera ditambahkan")
+
+
+# Kasir Popup Classes
+class AddProductPopup(Popup):
+    """Popup for adding new products"""
+    def __init__(self, callback=None, **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+        self.title = 'Tambah Produk Baru'
+        self.size_hint = (0.9, 0.7)
+        self.build_content()
+    
+    def build_content(self):
+        layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        # Product name
+        name_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        name_layout.add_widget(Label(text='Nama Produk:', size_hint_x=0.3, font_size='12sp'))
+        self.name_input = TextInput(
+            multiline=False,
+            size_hint_x=0.7,
+            font_size='12sp'
+        )
+        name_layout.add_widget(self.name_input)
+        layout.add_widget(name_layout)
+        
+        # Price per kg
+        price_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        price_layout.add_widget(Label(text='Harga/kg:', size_hint_x=0.3, font_size='12sp'))
+        self.price_input = TextInput(
+            multiline=False,
+            size_hint_x=0.7,
+            input_filter='int',
+            font_size='12sp'
+        )
+        price_layout.add_widget(self.price_input)
+        layout.add_widget(price_layout)
+        
+        # Stock
+        stock_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        stock_layout.add_widget(Label(text='Stok (kg):', size_hint_x=0.3, font_size='12sp'))
+        self.stock_input = TextInput(
+            multiline=False,
+            size_hint_x=0.7,
+            input_filter='float',
+            text='100',
+            font_size='12sp'
+        )
+        stock_layout.add_widget(self.stock_input)
+        layout.add_widget(stock_layout)
+        
+        # Buttons
+        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        
+        cancel_btn = Button(
+            text='Batal',
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        cancel_btn.bind(on_press=self.dismiss)
+        
+        save_btn = Button(
+            text='Simpan',
+            background_color=(0.2, 0.8, 0.2, 1),
+            font_size='12sp'
+        )
+        save_btn.bind(on_press=self.save_product)
+        
+        buttons_layout.add_widget(cancel_btn)
+        buttons_layout.add_widget(save_btn)
+        layout.add_widget(buttons_layout)
+        
+        self.content = layout
+    
+    def save_product(self, instance):
+        name = self.name_input.text.strip()
+        price_text = self.price_input.text.strip()
+        stock_text = self.stock_input.text.strip()
+        
+        if not name:
+            sound_manager.error_feedback()
+            return
+        
+        try:
+            price = int(price_text)
+            stock = float(stock_text)
+            
+            if price <= 0 or stock < 0:
+                sound_manager.error_feedback()
+                return
+            
+            if self.callback:
+                self.callback(name, price, stock)
+            
+            sound_manager.success_feedback()
+            self.dismiss()
+            
+        except ValueError:
+            sound_manager.error_feedback()
+
+
+class WeightInputPopup(Popup):
+    """Popup for inputting product weight"""
+    def __init__(self, product, callback=None, **kwargs):
+        super().__init__(**kwargs)
+        self.product = product
+        self.callback = callback
+        self.title = f'Input Berat - {product.name}'
+        self.size_hint = (0.8, 0.5)
+        self.build_content()
+    
+    def build_content(self):
+        layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        # Product info
+        info_label = Label(
+            text=f'{self.product.name}\n{App.get_running_app().format_currency(self.product.price_per_kg)}/kg\nStok: {self.product.stock_kg} kg',
+            font_size='12sp',
+            size_hint_y=None,
+            height=60,
+            color=(0.4, 0.4, 0.4, 1)
+        )
+        layout.add_widget(info_label)
+        
+        # Weight input
+        weight_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        weight_layout.add_widget(Label(text='Berat (kg):', size_hint_x=0.4, font_size='12sp'))
+        self.weight_input = TextInput(
+            multiline=False,
+            size_hint_x=0.6,
+            input_filter='float',
+            text='1',
+            font_size='12sp'
+        )
+        weight_layout.add_widget(self.weight_input)
+        layout.add_widget(weight_layout)
+        
+        # Total preview
+        self.total_label = Label(
+            text='Total: Rp 0',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height=30,
+            color=(0.1, 0.6, 0.1, 1)
+        )
+        layout.add_widget(self.total_label)
+        
+        # Update total when weight changes
+        self.weight_input.bind(text=self.update_total)
+        self.update_total()
+        
+        # Buttons
+        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        
+        cancel_btn = Button(
+            text='Batal',
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        cancel_btn.bind(on_press=self.dismiss)
+        
+        add_btn = Button(
+            text='Tambah ke Keranjang',
+            background_color=(0.1, 0.7, 0.3, 1),
+            font_size='12sp'
+        )
+        add_btn.bind(on_press=self.add_to_cart)
+        
+        buttons_layout.add_widget(cancel_btn)
+        buttons_layout.add_widget(add_btn)
+        layout.add_widget(buttons_layout)
+        
+        self.content = layout
+    
+    def update_total(self, instance=None, text=None):
+        try:
+            weight = float(self.weight_input.text or '0')
+            total = weight * self.product.price_per_kg
+            self.total_label.text = f'Total: {App.get_running_app().format_currency(total)}'
+        except ValueError:
+            self.total_label.text = 'Total: Rp 0'
+    
+    def add_to_cart(self, instance):
+        try:
+            weight = float(self.weight_input.text or '0')
+            
+            if weight <= 0:
+                sound_manager.error_feedback()
+                return
+            
+            if weight > self.product.stock_kg:
+                sound_manager.error_feedback()
+                return
+            
+            if self.callback:
+                self.callback(self.product, weight)
+            
+            sound_manager.success_feedback()
+            self.dismiss()
+            
+        except ValueError:
+            sound_manager.error_feedback()
+
+
+class PaymentPopup(Popup):
+    """Popup for payment processing"""
+    def __init__(self, total_amount, cart_items, callback=None, **kwargs):
+        super().__init__(**kwargs)
+        self.total_amount = total_amount
+        self.cart_items = cart_items
+        self.callback = callback
+        self.title = 'Pembayaran'
+        self.size_hint = (0.9, 0.8)
+        self.build_content()
+    
+    def build_content(self):
+        layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        # Order summary
+        summary_label = Label(
+            text='RINGKASAN PESANAN',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height=30,
+            color=(0.2, 0.6, 0.8, 1)
+        )
+        layout.add_widget(summary_label)
+        
+        # Items list
+        items_scroll = ScrollView(size_hint_y=0.4)
+        items_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing=3)
+        items_layout.bind(minimum_height=items_layout.setter('height'))
+        
+        for item in self.cart_items:
+            item_widget = BoxLayout(orientation='horizontal', size_hint_y=None, height=25)
+            
+            item_info = Label(
+                text=f'{item.product.name} - {item.weight_kg} kg',
+                font_size='10sp',
+                size_hint_x=0.7,
+                text_size=(None, None),
+                halign='left'
+            )
+            
+            item_total = Label(
+                text=App.get_running_app().format_currency(item.get_total()),
+                font_size='10sp',
+                size_hint_x=0.3,
+                text_size=(None, None),
+                halign='right'
+            )
+            
+            item_widget.add_widget(item_info)
+            item_widget.add_widget(item_total)
+            items_layout.add_widget(item_widget)
+        
+        items_scroll.add_widget(items_layout)
+        layout.add_widget(items_scroll)
+        
+        # Total
+        total_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        total_layout.add_widget(Label(text='TOTAL:', font_size='16sp', bold=True, size_hint_x=0.7))
+        total_layout.add_widget(Label(
+            text=App.get_running_app().format_currency(self.total_amount),
+            font_size='16sp',
+            bold=True,
+            size_hint_x=0.3,
+            color=(0.1, 0.6, 0.1, 1)
+        ))
+        layout.add_widget(total_layout)
+        
+        # Payment input
+        payment_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        payment_layout.add_widget(Label(text='Bayar:', size_hint_x=0.3, font_size='12sp'))
+        self.payment_input = TextInput(
+            multiline=False,
+            size_hint_x=0.7,
+            input_filter='int',
+            font_size='12sp'
+        )
+        payment_layout.add_widget(self.payment_input)
+        layout.add_widget(payment_layout)
+        
+        # Change preview
+        self.change_label = Label(
+            text='Kembalian: Rp 0',
+            font_size='14sp',
+            bold=True,
+            size_hint_y=None,
+            height=30,
+            color=(0.2, 0.6, 0.8, 1)
+        )
+        layout.add_widget(self.change_label)
+        
+        # Update change when payment changes
+        self.payment_input.bind(text=self.update_change)
+        
+        # Quick payment buttons
+        quick_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40, spacing=5)
+        
+        amounts = [50000, 100000, 200000]
+        for amount in amounts:
+            btn = Button(
+                text=f'{amount//1000}k',
+                background_color=(0.2, 0.6, 0.8, 1),
+                font_size='10sp'
+            )
+            btn.bind(on_press=lambda x, amt=amount: setattr(self.payment_input, 'text', str(amt)))
+            quick_layout.add_widget(btn)
+        
+        exact_btn = Button(
+            text='Pas',
+            background_color=(0.8, 0.6, 0.2, 1),
+            font_size='10sp'
+        )
+        exact_btn.bind(on_press=lambda x: setattr(self.payment_input, 'text', str(int(self.total_amount))))
+        quick_layout.add_widget(exact_btn)
+        
+        layout.add_widget(quick_layout)
+        
+        # Buttons
+        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        
+        cancel_btn = Button(
+            text='Batal',
+            background_color=(0.6, 0.6, 0.6, 1),
+            font_size='12sp'
+        )
+        cancel_btn.bind(on_press=self.dismiss)
+        
+        process_btn = Button(
+            text='Proses Pembayaran',
+            background_color=(0.1, 0.7, 0.3, 1),
+            font_size='12sp'
+        )
+        process_btn.bind(on_press=self.process_payment)
+        
+        buttons_layout.add_widget(cancel_btn)
+        buttons_layout.add_widget(process_btn)
+        layout.add_widget(buttons_layout)
+        
+        self.content = layout
+    
+    def update_change(self, instance=None, text=None):
+        try:
+            payment = int(self.payment_input.text or '0')
+            change = payment - self.total_amount
+            
+            if change >= 0:
+                self.change_label.text = f'Kembalian: {App.get_running_app().format_currency(change)}'
+                self.change_label.color = (0.2, 0.6, 0.8, 1)
+            else:
+                self.change_label.text = f'Kurang: {App.get_running_app().format_currency(abs(change))}'
+                self.change_label.color = (0.9, 0.2, 0.2, 1)
+        except ValueError:
+            self.change_label.text = 'Kembalian: Rp 0'
+            self.change_label.color = (0.2, 0.6, 0.8, 1)
+    
+    def process_payment(self, instance):
+        try:
+            payment = int(self.payment_input.text or '0')
+            
+            if payment < self.total_amount:
+                sound_manager.error_feedback()
+                return
+            
+            change = payment - self.total_amount
+            
+            if self.callback:
+                self.callback(payment, change)
+            
+            sound_manager.success_feedback()
+            self.dismiss()
+            
+        except ValueError:
+            sound_manager.error_feedback()
+
+
+class AddExpensePopup(Popup):
+    """Popup for adding expenses"""
+    def __init__(self, callback, **kwargs):
+        super(AddExpensePopup, self).__init__(**kwargs)
+        self.title = 'TAMBAH PENGELUARAN BARU'
+        self.title_size = '16sp'
+        self.title_color = (0.2, 0.6, 0.8, 1)
+        self.title_align = 'center'
+        self.size_hint = (0.9, 0.7)
+        self.background = 'atlas://data/images/defaulttheme/button_pressed'
+        self.separator_color = (0.8, 0.8, 0.8, 1)
+        self.callback = callback
+        
+        # Main layout with better spacing
+        layout = BoxLayout(orientation='vertical', padding='15dp', spacing='15dp')
+        
+        # Scroll view for the form
+        scroll = ScrollView(bar_width='6dp', bar_color=(0.5, 0.5, 0.5, 0.5))
+        form_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing='12dp')
+        form_layout.bind(minimum_height=form_layout.setter('height'))
+        
+        # Nama Pengeluaran with better styling
+        name_layout = BoxLayout(orientation='vertical', size_hint_y=None, height='90dp')
+        name_label = Label(
+            text='NAMA PENGELUARAN:', 
+            size_hint_y=None, 
+            height='30dp', 
+            font_size='14sp',
+            bold=True,
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        self.name_input = TextInput(
+            multiline=False, 
+            size_hint_y=None, 
+            height='50dp', 
+            font_size='16sp',
+            padding='10dp',
+            background_normal='atlas://data/images/defaulttheme/textinput',
+            background_active='atlas://data/images/defaulttheme/textinput_active',
+            foreground_color=(0.1, 0.1, 0.1, 1),
+            cursor_color=(0.2, 0.6, 0.8, 1),
+            cursor_width='2sp'
+        )
+        name_layout.add_widget(name_label)
+        name_layout.add_widget(self.name_input)
+        
+        # Jumlah with better styling
+        amount_layout = BoxLayout(orientation='vertical', size_hint_y=None, height='90dp')
+        amount_label = Label(
+            text='JUMLAH (Rp):', 
+            size_hint_y=None, 
+            height='30dp', 
+            font_size='14sp',
+            bold=True,
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        self.amount_input = TextInput(
+            multiline=False, 
+            size_hint_y=None, 
+            height='50dp', 
+            font_size='16sp',
+            input_type='number', 
+            input_filter='float',
+            padding='10dp',
+            background_normal='atlas://data/images/defaulttheme/textinput',
+            background_active='atlas://data/images/defaulttheme/textinput_active',
+            foreground_color=(0.1, 0.1, 0.1, 1),
+            cursor_color=(0.2, 0.6, 0.8, 1),
+            cursor_width='2sp',
+            halign='right'
+        )
+        amount_layout.add_widget(amount_label)
+        amount_layout.add_widget(self.amount_input)
+        
+        # Keterangan with better styling
+        note_layout = BoxLayout(orientation='vertical', size_hint_y=None, height='140dp')
+        note_label = Label(
+            text='KETERANGAN (OPSIONAL):', 
+            size_hint_y=None, 
+            height='30dp', 
+            font_size='14sp',
+            bold=True,
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        self.note_input = TextInput(
+            multiline=True, 
+            size_hint_y=None, 
+            height='100dp', 
+            font_size='14sp',
+            padding='10dp',
+            background_normal='atlas://data/images/defaulttheme/textinput',
+            background_active='atlas://data/images/defaulttheme/textinput_active',
+            foreground_color=(0.1, 0.1, 0.1, 1),
+            cursor_color=(0.2, 0.6, 0.8, 1),
+            cursor_width='2sp'
+        )
+        note_layout.add_widget(note_label)
+        note_layout.add_widget(self.note_input)
+        
+        # Add all input fields to form
+        form_layout.add_widget(name_layout)
+        form_layout.add_widget(amount_layout)
+        form_layout.add_widget(note_layout)
+        
+        # Add form to scroll view
+        scroll.add_widget(form_layout)
+        layout.add_widget(scroll)
+        
+        # Tombol with better styling
+        btn_layout = BoxLayout(size_hint_y=None, height='60dp', spacing='10dp', padding=('10dp', 0, '10dp', 0))
+        
+        cancel_btn = Button(
+            text='BATAL', 
+            background_color=(0.8, 0.2, 0.2, 1),
+            background_normal='',
+            color=(1, 1, 1, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.4
+        )
+        
+        submit_btn = Button(
+            text='SIMPAN', 
+            background_color=(0.2, 0.8, 0.2, 1),
+            background_normal='',
+            color=(1, 1, 1, 1),
+            font_size='14sp',
+            bold=True,
+            size_hint_x=0.6
+        )
+        
+        cancel_btn.bind(on_press=self.dismiss)
+        submit_btn.bind(on_press=self.submit)
+        
+        btn_layout.add_widget(cancel_btn)
+        btn_layout.add_widget(submit_btn)
+        
+        layout.add_widget(btn_layout)
+        self.content = layout
+        
+        # Set focus to name input when popup opens
+        self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
+        self._keyboard.bind(on_key_down=self._on_keyboard_down)
+        
+    def _keyboard_closed(self):
+        if hasattr(self, '_keyboard'):
+            self._keyboard.unbind(on_key_down=self._on_keyboard_down)
+            self._keyboard = None
+    
+    def _on_keyboard_down(self, keyboard, keycode, text, modifiers):
+        # Handle Enter key to move between fields or submit
+        if keycode[1] == 'enter' or keycode[1] == 'numpadenter':
+            if self.name_input.focus:
+                self.amount_input.focus = True
+            elif self.amount_input.focus:
+                self.note_input.focus = True
+            elif self.note_input.focus:
+                self.submit(None)
+            return True
+        return False
+        
+    def submit(self, instance):
+        name = self.name_input.text.strip()
+        amount = self.amount_input.text.strip()
+        note = self.note_input.text.strip()
+        
+        if not name or not amount:
+            show_error_popup('Nama dan jumlah harus diisi', title='Kesalahan Input')
+            return
+            
+        try:
+            amount = float(amount)
+            if amount <= 0:
+                raise ValueError('Jumlah harus lebih dari 0')
+                
+            self.callback(name, amount, note)
+            sound_manager.success_feedback()
+            self.dismiss()
+            
+        except ValueError:
+            show_error_popup('Jumlah harus berupa angka yang valid', title='Format Tidak Valid')
@@ -0,0 +1,128 @@
+"""
+Layar metrik jaringan untuk admin: ringkasan request Firebase per path.
+"""
+
+import os
+from datetime import datetime
+
+from kivy.app import App
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.clock import Clock
+
+from transport.metrics import metrics
+
+REFRESH_INTERVAL = 2
+
+
+def format_bytes(count):
+    if count >= 1024 * 1024:
+        return f"{count / (1024 * 1024):.1f} MB"
+    if count >= 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count} B"
+
+
+class MetricsScreen(Screen):
+    """Request counts, network time, bytes and cache hits per path"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh_event = None
+        self.build_ui()
+
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+
+        header = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        back_btn = Button(text='Kembali', size_hint_x=0.3, background_color=(0.6, 0.6, 0.6, 1))
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        header.add_widget(Label(text='METRIK JARINGAN', font_size='18sp', bold=True))
+        layout.add_widget(header)
+
+        self.totals_label = Label(text='', font_size='12sp', size_hint_y=None, height=40, color=(0.2, 0.8, 0.2, 1))
+        layout.add_widget(self.totals_label)
+
+        scroll = ScrollView()
+        self.table_label = Label(
+            text='', font_size='11sp', font_name='RobotoMono-Regular',
+            size_hint_y=None, halign='left', valign='top'
+        )
+        self.table_label.bind(
+            width=lambda instance, width: setattr(instance, 'text_size', (width, None)),
+            texture_size=lambda instance, size: setattr(instance, 'height', size[1])
+        )
+        scroll.add_widget(self.table_label)
+        layout.add_widget(scroll)
+
+        buttons = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        export_btn = Button(text='Ekspor JSON', background_color=(0.2, 0.6, 1, 1))
+        export_btn.bind(on_press=self.export)
+        reset_btn = Button(text='Reset', background_color=(1, 0.3, 0.3, 1))
+        reset_btn.bind(on_press=self.reset)
+        buttons.add_widget(export_btn)
+        buttons.add_widget(reset_btn)
+        layout.add_widget(buttons)
+
+        self.status_label = Label(text='', font_size='11sp', size_hint_y=None, height=30, color=(0.6, 0.6, 0.6, 1))
+        layout.add_widget(self.status_label)
+
+        self.add_widget(layout)
+
+    def on_enter(self):
+        self.refresh()
+        self.refresh_event = Clock.schedule_interval(lambda dt: self.refresh(), REFRESH_INTERVAL)
+
+    def on_leave(self):
+        if self.refresh_event is not None:
+            self.refresh_event.cancel()
+            self.refresh_event = None
+
+    def go_back(self, instance):
+        self.manager.current = 'admin_dashboard'
+
+    def refresh(self):
+        rows = metrics.summary()
+        calls = sum(row['calls'] for row in rows)
+        errors = sum(row['errors'] for row in rows)
+        total_ms = sum(row['total_ms'] for row in rows)
+        sent = sum(row['bytes'] for row in rows)
+        saved = sum(row['gzip_saved'] for row in rows)
+        self.totals_label.text = (
+            f"{calls} request | {errors} gagal | {total_ms / 1000:.1f} dtk jaringan | {format_bytes(sent)}"
+            f" | gzip hemat {format_bytes(saved)}"
+        )
+
+        lines = [f"{'PATH':<26}{'MTD':<6}{'N':>5}{'ERR':>5}{'DTK':>8}{'P90MS':>7}{'DATA':>9}{'CACHE':>8}"]
+        for row in rows:
+            cache = f"{row['cache_hits']}/{row['cache_hits'] + row['cache_misses']}" if row['cache_hits'] or row['cache_misses'] else '-'
+            lines.append(
+                f"{row['path'][:25]:<26}{row['method']:<6}{row['calls']:>5}{row['errors']:>5}"
+                f"{row['total_ms'] / 1000:>8.1f}{row['p90_ms']:>7.0f}{format_bytes(row['bytes']):>9}{cache:>8}"
+            )
+        if not rows:
+            lines.append('Belum ada request tercatat')
+        self.table_label.text = '\n'.join(lines)
+
+    def export_file(self):
+        try:
+            folder = os.path.join(App.get_running_app().user_data_dir, 'metrics')
+        except Exception:
+            folder = 'metrics'
+        return os.path.join(folder, f"metrics-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+    def export(self, instance):
+        try:
+            filename = metrics.export_json(self.export_file())
+            self.status_label.text = f"Tersimpan: {filename}"
+        except Exception as e:
+            print(f"Error exporting metrics: {e}")
+            self.status_label.text = f"Gagal ekspor: {e}"
+
+    def reset(self, instance):
+        metrics.reset()
+        self.status_label.text = 'Metrik direset'
+        self.refresh()
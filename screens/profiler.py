@@ -0,0 +1,203 @@
+"""
+Profiler waktu frame dan macet di thread UI (opsional).
+
+Aktif hanya dengan KASIR_PROFILE=1. Setiap frame Clock dicatat durasinya;
+frame yang lebih lama dari KASIR_STALL_MS (default 100 ms) dianggap macet.
+Thread pengawas mengambil stack Python thread UI saat macet masih berjalan,
+jadi log menunjukkan kode yang menahan frame (simpan JSON, bangun ulang
+widget, susun laporan, ...).
+
+Overlay kecil di pojok kanan atas menampilkan fps, p90 frame dan jumlah
+macet; ketuk overlay untuk menyimpan log ke profiler/profile-<waktu>.json.
+Log juga disimpan otomatis saat aplikasi ditutup.
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.uix.button import Button
+
+from kasir_core.storage import write_json
+
+STALL_MS = 100
+FRAME_HISTORY = 600
+STALL_HISTORY = 100
+STACK_DEPTH = 25
+OVERLAY_INTERVAL = 0.5
+
+
+def profiler_enabled():
+    return os.environ.get('KASIR_PROFILE', '') not in ('', '0')
+
+
+def stall_threshold_ms():
+    try:
+        return float(os.environ.get('KASIR_STALL_MS', STALL_MS))
+    except ValueError:
+        return STALL_MS
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class FrameProfiler:
+    """Frame durations from a per-frame Clock callback plus a stall watchdog"""
+    def __init__(self, threshold_ms=STALL_MS, folder='profiler'):
+        self.threshold = threshold_ms / 1000
+        self.folder = folder
+        self.frames = deque(maxlen=FRAME_HISTORY)
+        self.stalls = deque(maxlen=STALL_HISTORY)
+        self.stall_count = 0
+        self.lock = threading.Lock()
+        self.main_ident = threading.get_ident()
+        self.last_frame = None
+        self.pending = None
+        self.running = False
+        self.frame_event = None
+
+    def start(self):
+        """Hook Clock and start the watchdog; call from the UI thread"""
+        self.main_ident = threading.get_ident()
+        self.last_frame = time.perf_counter()
+        self.running = True
+        self.frame_event = Clock.schedule_interval(self.on_frame, 0)
+        threading.Thread(target=self.watch, name='stall-watchdog', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.frame_event is not None:
+            self.frame_event.cancel()
+            self.frame_event = None
+
+    def close(self):
+        """Stop and save the log once, however often on_stop fires"""
+        if self.running:
+            self.stop()
+            self.dump()
+
+    def on_frame(self, dt):
+        now = time.perf_counter()
+        with self.lock:
+            duration = now - self.last_frame
+            self.last_frame = now
+            pending, self.pending = self.pending, None
+            self.frames.append(duration)
+            if duration < self.threshold:
+                return
+            self.stall_count += 1
+            stall = {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'duration_ms': round(duration * 1000, 1),
+                'screen': current_screen(),
+                'stack': pending['stack'] if pending else None,
+                'samples': pending['samples'] if pending else 0,
+            }
+            self.stalls.append(stall)
+        print(f"Frame macet {stall['duration_ms']:.0f} ms di layar {stall['screen']}")
+
+    def watch(self):
+        """Sample the UI thread's stack while a frame runs past the threshold"""
+        interval = max(self.threshold / 4, 0.005)
+        while self.running:
+            time.sleep(interval)
+            with self.lock:
+                if time.perf_counter() - self.last_frame < self.threshold:
+                    continue
+                frame = sys._current_frames().get(self.main_ident)
+                if frame is None:
+                    continue
+                if self.pending is None:
+                    # The first sample is taken closest to where the frame got stuck
+                    stack = traceback.format_stack(frame)[-STACK_DEPTH:]
+                    self.pending = {'stack': [line.rstrip() for line in stack], 'samples': 0}
+                self.pending['samples'] += 1
+                del frame
+
+    def stats(self):
+        with self.lock:
+            frames = sorted(self.frames)
+            stall_count = self.stall_count
+        total = sum(frames)
+        return {
+            'frames': len(frames),
+            'fps': round(len(frames) / total, 1) if total else 0.0,
+            'p50_ms': round(percentile(frames, 0.5) * 1000, 1),
+            'p90_ms': round(percentile(frames, 0.9) * 1000, 1),
+            'p99_ms': round(percentile(frames, 0.99) * 1000, 1),
+            'max_ms': round(frames[-1] * 1000, 1) if frames else 0.0,
+            'stalls': stall_count,
+        }
+
+    def dump(self):
+        """Write frame stats and the recent stalls; returns the filename"""
+        with self.lock:
+            stalls = list(self.stalls)
+        filename = os.path.join(self.folder, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            write_json(filename, {
+                'taken': datetime.now().isoformat(timespec='seconds'),
+                'threshold_ms': round(self.threshold * 1000, 1),
+                'stats': self.stats(),
+                'stalls': stalls,
+            })
+            print(f"Log profiler tersimpan: {filename}")
+            return filename
+        except Exception as e:
+            print(f"Error saving profiler log: {e}")
+            return None
+
+
+class ProfilerOverlay(Button):
+    """fps, frame p90 and stall count on top of every screen; tap to dump"""
+    def __init__(self, profiler, **kwargs):
+        super().__init__(
+            font_size='10sp', size_hint=(None, None), size=(170, 24),
+            background_normal='', background_color=(0, 0, 0, 0.6), **kwargs
+        )
+        self.profiler = profiler
+        self.bind(on_press=lambda instance: self.dump())
+        Window.bind(size=lambda window, size: self.place())
+        self.place()
+        Clock.schedule_interval(lambda dt: self.refresh(), OVERLAY_INTERVAL)
+
+    def place(self):
+        self.pos = (Window.width - self.width, Window.height - self.height)
+
+    def refresh(self):
+        stats = self.profiler.stats()
+        self.text = f"{stats['fps']:.0f} fps  p90 {stats['p90_ms']:.0f} ms  macet {stats['stalls']}"
+        self.color = (1, 0.3, 0.3, 1) if stats['stalls'] else (0.6, 1, 0.6, 1)
+
+    def dump(self):
+        if self.profiler.dump():
+            self.text = 'Log tersimpan'
+
+
+def current_screen():
+    try:
+        return App.get_running_app().root.current
+    except Exception:
+        return None
+
+
+def install_profiler(app, folder):
+    """Start the profiler and overlay if KASIR_PROFILE is set, else return None"""
+    if not profiler_enabled():
+        return None
+    profiler = FrameProfiler(stall_threshold_ms(), folder).start()
+    # Added after build() so the overlay sits above the root widget
+    Clock.schedule_once(lambda dt: Window.add_widget(ProfilerOverlay(profiler)), 0)
+    app.bind(on_stop=lambda instance: profiler.close())
+    return profiler
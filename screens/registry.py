@@ -0,0 +1,133 @@
+"""
+Layar yang dibuat saat pertama kali dibutuhkan.
+
+LazyScreenManager menyimpan pabrik layar per nama dan baru membuat layarnya
+ketika layar itu dijadikan current (atau diminta lewat get_screen). Layar yang
+kemungkinan dibuka berikutnya bisa dibuat lebih awal di frame yang longgar,
+dan waktu startup dicatat per layar untuk laporan startup.
+
+Pabrik layar boleh berupa kelas atau string 'modul:Kelas'; modulnya baru
+diimpor saat layar itu pertama kali dibuat.
+"""
+
+import importlib
+import time
+
+from kivy.clock import Clock
+from kivy.uix.screenmanager import ScreenManager
+
+# Frame time (seconds) left over after which an idle frame may build a screen
+IDLE_FRAME_BUDGET = 1 / 60.0
+
+
+class StartupTimer:
+    """Named durations measured during startup"""
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name, seconds):
+        self.marks.append((name, seconds))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        """Text report: every mark plus total time since start"""
+        lines = ['Laporan startup:']
+        for name, seconds in self.marks:
+            lines.append(f'  {name:<24} {seconds * 1000:8.1f} ms')
+        lines.append(f'  {"total":<24} {self.elapsed() * 1000:8.1f} ms')
+        return '\n'.join(lines)
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds registered screens on first use"""
+    def __init__(self, timer=None, prewarm=True, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+        self.next_screens = {}
+        self.timer = timer or StartupTimer()
+        self.prewarm = prewarm
+        self.session = {}
+        self._prewarm_queue = []
+        self._prewarm_event = None
+
+    def register(self, name, factory, next_screens=()):
+        """Register a screen factory; next_screens are pre-warmed after it is shown
+
+        factory is a Screen class or a 'package.module:ClassName' string.
+        """
+        self.factories[name] = factory
+        if next_screens:
+            self.next_screens[name] = list(next_screens)
+
+    def is_built(self, name):
+        return any(screen.name == name for screen in self.screens)
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+    def build_screen(self, name):
+        """Create a registered screen now (no-op if it already exists)"""
+        if self.is_built(name):
+            return super().get_screen(name)
+
+        started = time.perf_counter()
+        factory = self.factories[name]
+        if isinstance(factory, str):
+            module_name, class_name = factory.split(':')
+            factory = getattr(importlib.import_module(module_name), class_name)
+            self.factories[name] = factory
+        screen = factory(name=name)
+        self.apply_session(screen)
+        self.add_widget(screen)
+        self.timer.mark(f'layar {name}', time.perf_counter() - started)
+        return screen
+
+    def get_screen(self, name):
+        if name in self.factories and not self.is_built(name):
+            return self.build_screen(name)
+        return super().get_screen(name)
+
+    def on_current(self, instance, value):
+        super().on_current(instance, value)
+        if self.prewarm and value in self.next_screens:
+            self.schedule_prewarm(self.next_screens[value])
+
+    def set_session(self, firebase_manager=None, username=None):
+        """Share the login session with built screens and remember it for later ones"""
+        if firebase_manager is not None:
+            self.session['firebase_manager'] = firebase_manager
+        if username is not None:
+            self.session['username'] = username
+        for screen in self.screens:
+            self.apply_session(screen)
+
+    def apply_session(self, screen):
+        if 'firebase_manager' in self.session and hasattr(screen, 'set_firebase'):
+            screen.set_firebase(self.session['firebase_manager'])
+        if 'username' in self.session and hasattr(screen, 'set_username'):
+            screen.set_username(self.session['username'])
+
+    def schedule_prewarm(self, names):
+        """Build the given screens later, one per idle frame"""
+        for name in names:
+            if name in self.factories and not self.is_built(name) and name not in self._prewarm_queue:
+                self._prewarm_queue.append(name)
+        if self._prewarm_queue and self._prewarm_event is None:
+            self._prewarm_event = Clock.schedule_interval(self._prewarm_step, 0)
+
+    def _prewarm_step(self, dt):
+        # A busy frame (slow previous frame or a running transition) skips this turn
+        if dt > IDLE_FRAME_BUDGET * 2 or self.transition.is_active:
+            return
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if not self.is_built(name):
+                self.build_screen(name)
+                break
+        if not self._prewarm_queue:
+            self._prewarm_event.cancel()
+            self._prewarm_event = None
+            return False
@@ -0,0 +1,730 @@
+"""
+Layar pengguna: dashboard, tambah token, pengaturan akun dan info pribadi.
+"""
+
+import threading
+
+from kivy.app import App
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.popup import Popup
+from kivy.clock import Clock
+
+from screens.common import apply_emoji_font, show_connection_state
+from token_store.session import SessionManager
+from transport.tracing import tracer
+
+
+class UserDashboardScreen(Screen):
+    """User dashboard with Indonesian language"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        self.username = username
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.1)
+        self.title_label = Label(
+            text='DASHBOARD USER',
+            font_size='20sp',
+            bold=True
+        )
+        header.add_widget(self.title_label)
+        
+        logout_btn = Button(
+            text='Keluar',
+            size_hint_x=0.3,
+            background_color=(1, 0.3, 0.3, 1)
+        )
+        logout_btn.bind(on_press=self.logout)
+        header.add_widget(logout_btn)
+        
+        layout.add_widget(header)
+        
+        # Online users notification
+        self.online_label = Label(
+            text='Memuat pengguna online...',
+            size_hint_y=0.08,
+            font_size='12sp',
+            color=(0.2, 0.8, 0.2, 1)
+        )
+        layout.add_widget(self.online_label)
+        
+        # Stats panel
+        self.stats_layout = GridLayout(
+            cols=2,
+            size_hint_y=0.25,
+            padding=10,
+            spacing=5
+        )
+        self.update_stats()
+        layout.add_widget(self.stats_layout)
+        
+        # Menu buttons (user functions only)
+        menu_layout = GridLayout(
+            cols=2,
+            size_hint_y=0.4,
+            padding=10,
+            spacing=10
+        )
+        
+        buttons = [
+            ('Tambah Token', self.go_to_add_token, (0.2, 0.8, 0.2, 1)),
+            ('Penghasilan Saya', self.show_earnings, (0.2, 0.8, 0.8, 1)),
+            ('Info Pribadi', self.go_to_user_info, (0.8, 0.6, 0.2, 1)),
+            ('Lihat User', self.go_to_users, (0.2, 0.6, 1, 1)),
+            ('Grup Chat', self.go_to_chat, (0.8, 0.2, 0.8, 1)),
+            ('Pengaturan', self.go_to_user_settings, (0.6, 0.6, 0.6, 1))
+        ]
+
+        for text, callback, color in buttons:
+            btn = Button(
+                text=text,
+                font_size='14sp',
+                bold=True,
+                background_color=color
+            )
+            btn.bind(on_press=callback)
+            menu_layout.add_widget(btn)
+        
+        layout.add_widget(menu_layout)
+        
+        # Status info
+        self.status_label = Label(
+            text='User: Tambahkan token untuk mendapatkan uang, chat dengan tim',
+            size_hint_y=0.17,
+            font_size='12sp',
+            color=(0.5, 0.5, 0.5, 1)
+        )
+        layout.add_widget(self.status_label)
+        
+        self.add_widget(layout)
+    
+    def update_stats(self):
+        if not self.firebase_manager or not self.username:
+            return
+        
+        def update_in_background():
+            user_stats = self.firebase_manager.get_user_stats(self.username)
+            all_stats = self.firebase_manager.get_all_stats()
+            online_users = self.firebase_manager.get_online_users()
+            Clock.schedule_once(lambda dt: self._update_stats_ui(user_stats, all_stats, online_users), 0)
+        
+        threading.Thread(target=update_in_background, daemon=True).start()
+    
+    def _update_stats_ui(self, user_stats, all_stats, online_users):
+        show_connection_state(self.status_label, self.firebase_manager, 'User: Tambahkan token untuk mendapatkan uang, chat dengan tim')
+        self.stats_layout.clear_widgets()
+        
+        if self.username:
+            self.title_label.text = f'Selamat datang, {self.username.upper()}'
+        
+        # Update online users notification
+        online_users_filtered = [u for u in online_users if u != self.username]
+        if online_users_filtered:
+            online_text = f"Online: {', '.join(online_users_filtered)}"
+        else:
+            online_text = "Tidak ada pengguna lain yang online"
+        self.online_label.text = online_text
+        # self.online_label.font_name = 'EmojiFont'
+        
+        # Show user-specific stats with bancet info
+        banned_count = user_stats.get('banned_count', 0)
+        stats_items = [
+            ('Token Anda:', f"{user_stats.get('token_count', 0):,}"),
+            ('Token Bancet:', f"Bancet: {banned_count:,}"),
+            ('Penghasilan Anda:', f"Rp {user_stats.get('total_value', 0):,}"),
+            ('Total Token Sistem:', f"{all_stats.get('total_tokens', 0):,}"),
+            ('Tersedia Sistem:', f"{all_stats.get('available_tokens', 0):,}"),
+            ('Harga Token:', f"Rp {all_stats.get('price_per_token', 1500):,}")
+        ]
+        
+        for label, value in stats_items:
+            label_widget = Label(
+                text=label,
+                font_size='11sp',
+                bold=True
+            )
+            
+            # Highlight bancet count if > 0
+            if 'Bancet' in label and banned_count > 0:
+                value_widget = Label(
+                    text=value,
+                    font_size='11sp',
+                    color=(1, 0.2, 0.2, 1)  # Red color for bancet
+                )
+            else:
+                value_widget = Label(
+                    text=value,
+                    font_size='11sp',
+                    color=(0.2, 0.6, 1, 1)
+                )
+            
+            self.stats_layout.add_widget(label_widget)
+            self.stats_layout.add_widget(value_widget)
+
+    def show_earnings(self, instance):
+        if not self.firebase_manager or not self.username:
+            return
+        
+        def get_earnings_in_background():
+            user_stats = self.firebase_manager.get_user_stats(self.username)
+            banned_count = user_stats.get('banned_count', 0)
+            earnings_text = f"Total Token: {user_stats.get('token_count', 0):,}\n"
+            earnings_text += f"Token Bancet: {banned_count:,}\n"
+            earnings_text += f"Total Nilai: Rp {user_stats.get('total_value', 0):,}\n"
+            
+            if user_stats.get('token_count', 0) > 0:
+                avg_per_token = user_stats.get('total_value', 0) // max(user_stats.get('token_count', 1), 1)
+                earnings_text += f"Rata-rata per Token: Rp {avg_per_token:,}\n"
+            
+            earnings_text += f"Akun Dibuat: {user_stats.get('created', 'Tidak diketahui')[:10]}\n"
+            earnings_text += f"Login Terakhir: {user_stats.get('last_login', 'Belum pernah')[:10]}\n\n"
+            
+            if banned_count > 0:
+                earnings_text += f"Catatan: {banned_count} token Anda pernah di-ban karena rusak/bermasalah"
+            
+            Clock.schedule_once(lambda dt: self.show_earnings_popup(earnings_text), 0)
+        
+        threading.Thread(target=get_earnings_in_background, daemon=True).start()
+
+    def show_earnings_popup(self, earnings_text):
+        # Create scrollable content for earnings
+        scroll = ScrollView()
+        content_label = Label(
+            text=earnings_text,
+            text_size=(None, None),
+            halign='left',
+            valign='top',
+            size_hint_y=None
+        )
+        content_label.bind(texture_size=content_label.setter('size'))
+        
+        def update_text_size(instance, *args):
+            if instance.parent and instance.parent.width > 40:
+                instance.text_size = (instance.parent.width - 40, None)
+        
+        content_label.bind(parent=update_text_size)
+        scroll.bind(size=lambda *args: update_text_size(content_label))
+        scroll.add_widget(content_label)
+        
+        popup = Popup(
+            title='Ringkasan Penghasilan Anda',
+            content=scroll,
+            size_hint=(0.9, 0.7)
+        )
+        popup.open()
+    
+    def show_help(self, instance):
+        help_text = """Cara menggunakan Token Manager:
+
+1. Tambah Token: Kirim token yang valid untuk mendapatkan uang
+2. Penghasilan Saya: Lihat total penghasilan Anda
+3. Lihat User: Lihat semua pengguna dan statistik mereka
+4. Grup Chat: Chat dengan pengguna lain
+5. Pengaturan: Ubah password Anda
+
+Format Token:
+- Harus dimulai dengan 'u' diikuti 32 karakter hex
+- Kemudian ':' dan data base64 encoded
+- Harus mengandung separator '..'
+- Minimal 50 karakter total
+
+Hubungi admin jika butuh bantuan!"""
+        
+        popup = Popup(
+            title='Bantuan & Instruksi',
+            content=Label(text=help_text),
+            size_hint=(0.9, 0.8)
+        )
+        popup.open()
+    
+    def on_enter(self):
+        Clock.schedule_once(lambda dt: self.update_stats(), 0.1)
+        # Auto-refresh stats every 15 seconds
+        Clock.schedule_interval(lambda dt: self.update_stats(), 15)
+    
+    def on_leave(self):
+        Clock.unschedule(self.update_stats)
+    
+    def logout(self, instance):
+        if self.firebase_manager and self.username:
+            self.firebase_manager.logout(self.username)
+        
+        # Clear session
+        SessionManager().clear_session()
+        
+        self.manager.current = 'login'
+    
+    def go_to_add_token(self, instance):
+        self.manager.current = 'add_token'
+    
+    def go_to_users(self, instance):
+        self.manager.current = 'users'
+    
+    def go_to_chat(self, instance):
+        self.manager.current = 'chat'
+    
+    def go_to_user_settings(self, instance):
+        self.manager.current = 'user_settings'
+    
+    def go_to_user_info(self, instance):
+        self.manager.current = 'user_info'
+
+
+class AddTokenScreen(Screen):
+    """Screen for adding tokens (users only) - Indonesian"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        self.username = username
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'user_dashboard'))
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='TAMBAH TOKEN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Current price info
+        self.price_label = Label(
+            text='Memuat harga saat ini...',
+            font_size='14sp',
+            color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.08
+        )
+        layout.add_widget(self.price_label)
+        
+        # Token input modes
+        mode_layout = BoxLayout(size_hint_y=0.1, spacing=10)
+        self.single_btn = Button(
+            text='Token Tunggal',
+            background_color=(0.2, 0.8, 0.2, 1)
+        )
+        self.bulk_btn = Button(
+            text='Token Massal',
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        
+        self.single_btn.bind(on_press=lambda x: self.select_mode('single'))
+        self.bulk_btn.bind(on_press=lambda x: self.select_mode('bulk'))
+        
+        mode_layout.add_widget(self.single_btn)
+        mode_layout.add_widget(self.bulk_btn)
+        layout.add_widget(mode_layout)
+        
+        # Token input
+        self.token_input = TextInput(
+            hint_text='Tempel token Anda di sini (harus dimulai dengan u dan format valid)',
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=0.12
+        )
+        layout.add_widget(self.token_input)
+        
+        # Add token button
+        add_btn = Button(
+            text='TAMBAH TOKEN',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.12
+        )
+        add_btn.bind(on_press=self.add_token)
+        layout.add_widget(add_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.15
+        )
+        layout.add_widget(self.status_label)
+        
+        # Token format help
+        help_text = """Persyaratan Format Token:
+• Harus dimulai dengan 'u' + 32 karakter hex
+• Diikuti ':' dan data base64
+
+• Harus mengandung separator '..'
+• Minimal 50 karakter total
+• Contoh: u1234567890abcdef...:data..more"""
+        
+        help_label = Label(
+            text=help_text,
+            font_size='11sp',
+            color=(0.6, 0.6, 0.6, 1),
+            size_hint_y=0.31
+        )
+        layout.add_widget(help_label)
+        
+        self.current_mode = 'single'
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_current_price()
+    
+    def load_current_price(self):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            settings = self.firebase_manager.get_data("settings")
+            price = settings.get('price_per_token', 1500) if settings else 1500
+            Clock.schedule_once(lambda dt: self.update_price_ui(price), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_price_ui(self, price):
+        self.price_label.text = f'Harga Saat Ini: Rp {price:,} per token'
+        apply_emoji_font(self.price_label)
+    
+    def select_mode(self, mode):
+        self.current_mode = mode
+        if mode == 'single':
+            self.single_btn.background_color = (0.2, 0.8, 0.2, 1)
+            self.bulk_btn.background_color = (0.6, 0.6, 0.6, 1)
+            self.token_input.multiline = False
+            self.token_input.hint_text = 'Tempel token Anda di sini (harus dimulai dengan u dan format valid)'
+        else:
+            self.single_btn.background_color = (0.6, 0.6, 0.6, 1)
+            self.bulk_btn.background_color = (0.2, 0.8, 0.2, 1)
+            self.token_input.multiline = True
+            self.token_input.hint_text = 'Tempel beberapa token di sini (satu per baris)'
+    
+    @tracer.traced_action('user.add_token')
+    def add_token(self, instance):
+        token_text = self.token_input.text.strip()
+        
+        if not token_text:
+            self.status_label.text = 'Silakan masukkan token'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Menambahkan token...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def add_token_in_background():
+            if self.current_mode == 'single':
+                success, message = self.firebase_manager.add_token(token_text, self.username, self.username)
+                Clock.schedule_once(tracer.wrap(lambda dt: self.handle_add_result(success, message, None), 'handle_add_result'), 0)
+            else:
+                success, message, details = self.firebase_manager.add_bulk_tokens(token_text, self.username, self.username)
+                Clock.schedule_once(tracer.wrap(lambda dt: self.handle_add_result(success, message, details), 'handle_add_result'), 0)
+        
+        threading.Thread(target=tracer.wrap(add_token_in_background), daemon=True).start()
+    
+    def handle_add_result(self, success, message, details):
+        if details:  # Bulk mode
+            result_text = f"{message}\n"
+            result_text += f"Berhasil: {details.get('success', 0)}\n"
+            result_text += f"Duplikat: {details.get('duplicates', 0)}\n"
+            result_text += f"Tidak Valid: {details.get('invalid', 0)}"
+            self.status_label.text = result_text
+        else:  # Single mode
+            self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
+        
+        if success:
+            self.token_input.text = ''
+
+
+class UserSettingsScreen(Screen):
+    """Screen for user settings - change password"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        self.username = username
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='PENGATURAN AKUN',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        # Current password input
+        self.current_password_input = TextInput(
+            hint_text='Masukkan password saat ini',
+            password=True,
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.current_password_input)
+        
+        # New password input
+        self.new_password_input = TextInput(
+            hint_text='Masukkan password baru',
+            password=True,
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.new_password_input)
+        
+        # Confirm new password input
+        self.confirm_password_input = TextInput(
+            hint_text='Konfirmasi password baru',
+            password=True,
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.confirm_password_input)
+        
+        # Update password button
+        update_btn = Button(
+            text='PERBARUI PASSWORD',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.12
+        )
+        update_btn.bind(on_press=self.update_password)
+        layout.add_widget(update_btn)
+        
+        # Status label
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.35
+        )
+        layout.add_widget(self.status_label)
+        
+        self.add_widget(layout)
+    
+    def go_back(self, instance):
+        app = App.get_running_app()
+        if hasattr(app, 'user_type') and app.user_type == 'admin':
+            self.manager.current = 'admin_dashboard'
+        else:
+            self.manager.current = 'user_dashboard'
+    
+    def update_password(self, instance):
+        current_password = self.current_password_input.text.strip()
+        new_password = self.new_password_input.text.strip()
+        confirm_password = self.confirm_password_input.text.strip()
+        
+        if not current_password or not new_password or not confirm_password:
+            self.status_label.text = '✗ Semua kolom harus diisi'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        if new_password != confirm_password:
+            self.status_label.text = '✗ Password baru tidak cocok'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Memperbarui password...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def update_in_background():
+            success, message = self.firebase_manager.update_user_password(self.username, new_password)
+            Clock.schedule_once(lambda dt: self.handle_update_result(success, message), 0)
+        
+        threading.Thread(target=update_in_background, daemon=True).start()
+    
+    def handle_update_result(self, success, message):
+        self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
+        
+        if success:
+            self.current_password_input.text = ''
+            self.new_password_input.text = ''
+            self.confirm_password_input.text = ''
+
+
+class UserInfoScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.username = None
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def set_username(self, username):
+        self.username = username
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali',
+            size_hint_x=0.3,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='INFO PRIBADI',
+            font_size='20sp',
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        self.wa_input = TextInput(
+            hint_text='Nomor WhatsApp (contoh: 081234567890)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.wa_input)
+        
+        self.rekening_input = TextInput(
+            hint_text='Nomor Rekening Bank (contoh: BCA 1234567890)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.rekening_input)
+        
+        self.tgl_lahir_input = TextInput(
+            hint_text='Tanggal Lahir (contoh: 15/08/1990)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.tgl_lahir_input)
+        
+        self.tempat_tinggal_input = TextInput(
+            hint_text='Tempat Tinggal (contoh: Jakarta Selatan)',
+            multiline=False,
+            font_size='16sp',
+            size_hint_y=0.1
+        )
+        layout.add_widget(self.tempat_tinggal_input)
+        
+        update_btn = Button(
+            text='PERBARUI INFO',
+            font_size='18sp',
+            bold=True,
+            background_color=(0.2, 0.8, 0.2, 1),
+            size_hint_y=0.12
+        )
+        update_btn.bind(on_press=self.update_info)
+        layout.add_widget(update_btn)
+        
+        self.status_label = Label(
+            text='',
+            font_size='14sp',
+            size_hint_y=0.35
+        )
+        layout.add_widget(self.status_label)
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_current_info()
+    
+    def load_current_info(self):
+        if not self.firebase_manager or not self.username:
+            return
+        
+        def bg():
+            user_data = self.firebase_manager.get_data(f"users/{self.username}")
+            Clock.schedule_once(lambda dt: self.update_info_ui(user_data), 0)
+        
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def update_info_ui(self, user_data):
+        if user_data:
+            self.wa_input.text = user_data.get('wa', '')
+            self.rekening_input.text = user_data.get('rekening', '')
+            self.tgl_lahir_input.text = user_data.get('tgl_lahir', '')
+            self.tempat_tinggal_input.text = user_data.get('tempat_tinggal', '')
+    
+    def go_back(self, instance):
+        app = App.get_running_app()
+        if hasattr(app, 'user_type') and app.user_type == 'admin':
+            self.manager.current = 'admin_dashboard'
+        else:
+            self.manager.current = 'user_dashboard'
+    
+    def update_info(self, instance):
+        wa = self.wa_input.text.strip()
+        rekening = self.rekening_input.text.strip()
+        tgl_lahir = self.tgl_lahir_input.text.strip()
+        tempat_tinggal = self.tempat_tinggal_input.text.strip()
+        
+        if not wa or not rekening or not tgl_lahir or not tempat_tinggal:
+            self.status_label.text = '✗ Semua kolom harus diisi'
+            self.status_label.color = (1, 0.2, 0.2, 1)
+            return
+        
+        self.status_label.text = 'Memperbarui info...'
+        self.status_label.color = (0.2, 0.6, 1, 1)
+        
+        def bg():
+            success, message = self.firebase_manager.update_user_info(self.username, wa, rekening, tgl_lahir, tempat_tinggal)
+            Clock.schedule_once(lambda dt: self.handle_update_result(success, message), 0)
+        
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def handle_update_result(self, success, message):
+        self.status_label.text = f'{"✓" if success else "✗"} {message}'
+        self.status_label.color = (0.2, 0.8, 0.2, 1) if success else (1, 0.2, 0.2, 1)
@@ -0,0 +1,371 @@
+"""
+Daftar semua pengguna.
+"""
+
+import threading
+
+from kivy.app import App
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import StringProperty, ListProperty, BooleanProperty
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.popup import Popup
+from kivy.clock import Clock
+
+from screens.common import apply_emoji_font
+
+
+class UserCardView(RecycleDataViewBehavior, BoxLayout):
+    """Recycled user card, filled from UsersScreen.user_row()"""
+    username = StringProperty('')
+    title_text = StringProperty('')
+    status_color = ListProperty([0.6, 0.6, 0.6, 1])
+    tokens_text = StringProperty('')
+    details_text = StringProperty('')
+    can_delete = BooleanProperty(False)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.screen = None
+        self.orientation = 'vertical'
+        self.padding = 15
+        self.spacing = 8
+        
+        header = BoxLayout(size_hint_y=0.3, spacing=10)
+        
+        username_label = Label(
+            font_size='16sp', 
+            bold=True, 
+            halign='left', 
+            size_hint_x=0.7
+        )
+        username_label.bind(size=username_label.setter('text_size'))
+        header.add_widget(username_label)
+        
+        tokens_label = Label(
+            font_size='14sp', 
+            color=(0.2, 0.6, 1, 1), 
+            size_hint_x=0.3, 
+            halign='right'
+        )
+        tokens_label.bind(size=tokens_label.setter('text_size'))
+        apply_emoji_font(tokens_label)
+        header.add_widget(tokens_label)
+        
+        self.add_widget(header)
+        
+        self.details = BoxLayout(size_hint_y=0.4, spacing=10, orientation='horizontal')
+        
+        details_label = Label(
+            font_size='12sp', 
+            color=(0.7, 0.7, 0.7, 1), 
+            halign='left'
+        )
+        details_label.bind(size=details_label.setter('text_size'))
+        self.details.add_widget(details_label)
+        
+        info_btn = Button(
+            text='Lihat Info', 
+            font_size='12sp', 
+            bold=True, 
+            background_color=(0.2, 0.6, 1, 1), 
+            size_hint_x=0.3
+        )
+        info_btn.bind(on_press=lambda instance: self.screen.show_user_info(self.screen.users[self.username]))
+        self.details.add_widget(info_btn)
+        
+        self.delete_btn = Button(
+            text='Hapus', 
+            font_size='12sp', 
+            bold=True, 
+            background_color=(1, 0.2, 0.2, 1), 
+            size_hint_x=0.3
+        )
+        self.delete_btn.bind(on_press=lambda instance: self.screen.confirm_delete_user(self.username))
+        
+        self.add_widget(self.details)
+        self.add_widget(BoxLayout(size_hint_y=None, height=2))
+        
+        self.bind(
+            title_text=username_label.setter('text'),
+            status_color=username_label.setter('color'),
+            tokens_text=tokens_label.setter('text'),
+            details_text=details_label.setter('text'),
+            can_delete=self.update_delete_button
+        )
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.screen = rv.screen
+        return super().refresh_view_attrs(rv, index, data)
+    
+    def update_delete_button(self, instance, can_delete):
+        if can_delete and self.delete_btn.parent is None:
+            self.details.add_widget(self.delete_btn)
+        elif not can_delete and self.delete_btn.parent is not None:
+            self.details.remove_widget(self.delete_btn)
+
+
+class UsersScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.firebase_manager = None
+        self.users = {}
+        self.user_rows = {}
+        self.user_order = []
+        self.filter_mode = 'all'
+        self.sort_mode = 'status'
+        self.build_ui()
+    
+    def set_firebase(self, firebase_manager):
+        self.firebase_manager = firebase_manager
+    
+    def build_ui(self):
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        header = BoxLayout(size_hint_y=0.12)
+        back_btn = Button(
+            text='Kembali', 
+            size_hint_x=0.3, 
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        back_btn.bind(on_press=self.go_back)
+        header.add_widget(back_btn)
+        
+        header.add_widget(Label(
+            text='SEMUA PENGGUNA', 
+            font_size='20sp', 
+            bold=True
+        ))
+        
+        layout.add_widget(header)
+        
+        self.stats_label = Label(
+            text='Memuat pengguna...', 
+            font_size='14sp', 
+            color=(0.2, 0.8, 0.2, 1), 
+            size_hint_y=0.08
+        )
+        layout.add_widget(self.stats_label)
+        
+        refresh_btn = Button(
+            text='Refresh', 
+            font_size='16sp', 
+            background_color=(0.2, 0.6, 1, 1), 
+            size_hint_y=0.1,
+            # font_name='EmojiFont'
+        )
+        refresh_btn.bind(on_press=lambda x: self.load_users())
+        layout.add_widget(refresh_btn)
+        
+        # Search, filter and sort work on the loaded data, not on widgets
+        tools = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        self.search_input = TextInput(
+            hint_text='Cari pengguna',
+            multiline=False,
+            font_size='14sp'
+        )
+        self.search_input.bind(text=lambda instance, text: self.apply_view())
+        tools.add_widget(self.search_input)
+        
+        filter_btn = Button(text='Semua', font_size='12sp', size_hint_x=0.3, background_color=(0.6, 0.6, 0.6, 1))
+        filter_btn.bind(on_press=self.cycle_filter)
+        tools.add_widget(filter_btn)
+        
+        sort_btn = Button(text='Urut: Status', font_size='12sp', size_hint_x=0.35, background_color=(0.6, 0.6, 0.6, 1))
+        sort_btn.bind(on_press=self.cycle_sort)
+        tools.add_widget(sort_btn)
+        layout.add_widget(tools)
+        
+        self.empty_label = Label(
+            text='Tidak ada pengguna ditemukan', 
+            size_hint_y=None, 
+            height=0,
+            opacity=0
+        )
+        layout.add_widget(self.empty_label)
+        
+        self.users_rv = RecycleView(size_hint_y=0.6)
+        self.users_rv.screen = self
+        self.users_layout = RecycleBoxLayout(
+            orientation='vertical', 
+            size_hint_y=None, 
+            spacing=15, 
+            padding=10,
+            default_size=(None, 130),
+            default_size_hint=(1, None)
+        )
+        self.users_layout.bind(minimum_height=self.users_layout.setter('height'))
+        self.users_rv.add_widget(self.users_layout)
+        self.users_rv.viewclass = UserCardView
+        layout.add_widget(self.users_rv)
+        
+        self.add_widget(layout)
+    
+    def on_enter(self):
+        self.load_users()
+    
+    def go_back(self, instance):
+        app = App.get_running_app()
+        if hasattr(app, 'user_type') and app.user_type == 'admin':
+            self.manager.current = 'admin_dashboard'
+        else:
+            self.manager.current = 'user_dashboard'
+    
+    def load_users(self):
+        if not self.firebase_manager:
+            return
+        
+        def load_in_background():
+            users = self.firebase_manager.get_all_users()
+            Clock.schedule_once(lambda dt: self.update_users_ui(users), 0)
+        
+        threading.Thread(target=load_in_background, daemon=True).start()
+    
+    def update_users_ui(self, users):
+        """Merge the loaded users into the data layer, keyed by username"""
+        loaded = {user['username']: user for user in users or []}
+        changed = set()
+        for username in list(self.users):
+            if username not in loaded:
+                del self.users[username]
+                self.user_rows.pop(username, None)
+                changed.add(username)
+        for username, user in loaded.items():
+            if self.users.get(username) != user:
+                self.users[username] = user
+                self.user_rows[username] = self.user_row(user)
+                changed.add(username)
+        
+        if users:
+            total_users = len(users)
+            online_users = len([u for u in users if u.get('is_online', False)])
+            total_tokens = sum(u.get('token_count', 0) for u in users)
+            self.stats_label.text = f'{total_users} pengguna | {online_users} online | {total_tokens:,} total token'
+        else:
+            self.stats_label.text = 'Tidak ada pengguna ditemukan'
+        apply_emoji_font(self.stats_label)
+        
+        if changed:
+            self.apply_view(changed)
+    
+    def user_row(self, user):
+        """RecycleView data for one UserCardView"""
+        is_online = user.get('is_online', False)
+        return {
+            'username': user['username'],
+            'title_text': f"{user['username']} ({'ONLINE' if is_online else 'OFFLINE'})",
+            'status_color': (0.2, 0.8, 0.2, 1) if is_online else (0.6, 0.6, 0.6, 1),
+            'tokens_text': f"🪙 {user.get('token_count', 0):,}",
+            'details_text': f"Rp {user.get('total_value', 0):,} | Bancet: {user.get('banned_count', 0)} | Bergabung: {user.get('created', '')[:10]}",
+            'can_delete': getattr(App.get_running_app(), 'user_type', None) == 'admin'
+        }
+    
+    def apply_view(self, changed=None):
+        """Filter and sort the cached rows; only changed rows are rebound"""
+        query = self.search_input.text.strip().lower()
+        users = [
+            user for user in self.users.values()
+            if (self.filter_mode == 'all' or user.get('is_online', False) == (self.filter_mode == 'online'))
+            and (not query or query in user['username'].lower())
+        ]
+        if self.sort_mode == 'tokens':
+            users.sort(key=lambda u: -u.get('token_count', 0))
+        elif self.sort_mode == 'name':
+            users.sort(key=lambda u: u['username'].lower())
+        else:
+            users.sort(key=lambda u: (not u.get('is_online', False), -u.get('token_count', 0)))
+        order = [user['username'] for user in users]
+        
+        if changed is not None and order == self.user_order:
+            # Same rows in the same order: replace just the changed entries
+            for index, username in enumerate(order):
+                if username in changed:
+                    self.users_rv.data[index] = self.user_rows[username]
+        else:
+            self.users_rv.data = [self.user_rows[username] for username in order]
+        self.user_order = order
+        
+        self.empty_label.height = 0 if order else 50
+        self.empty_label.opacity = 0 if order else 1
+    
+    def cycle_filter(self, instance):
+        modes = ['all', 'online', 'offline']
+        self.filter_mode = modes[(modes.index(self.filter_mode) + 1) % len(modes)]
+        instance.text = {'all': 'Semua', 'online': 'Online', 'offline': 'Offline'}[self.filter_mode]
+        self.apply_view()
+    
+    def cycle_sort(self, instance):
+        modes = ['status', 'tokens', 'name']
+        self.sort_mode = modes[(modes.index(self.sort_mode) + 1) % len(modes)]
+        instance.text = {'status': 'Urut: Status', 'tokens': 'Urut: Token', 'name': 'Urut: Nama'}[self.sort_mode]
+        self.apply_view()
+    
+    def show_user_info(self, user):
+        info_text = (
+            f"Info {user['username']}:\n\n"
+            f"Nomor WA: {user.get('wa', 'Belum diisi')}\n"
+            f"Nomor Rekening: {user.get('rekening', 'Belum diisi')}\n"
+            f"Tanggal Lahir: {user.get('tgl_lahir', 'Belum diisi')}\n"
+            f"Tempat Tinggal: {user.get('tempat_tinggal', 'Belum diisi')}\n\n"
+            f"Token Bancet: {user.get('banned_count', 0):,}\n"
+            f"Total Token: {user.get('token_count', 0):,}\n"
+            f"Total Penghasilan: Rp {user.get('total_value', 0):,}"
+        )
+        Popup(
+            title=f'Info {user["username"]}', 
+            content=Label(text=info_text), 
+            size_hint=(0.8, 0.6)
+        ).open()
+    
+    def confirm_delete_user(self, username):
+        content = BoxLayout(orientation='vertical', spacing=10)
+        content.add_widget(Label(
+            text=f'Yakin hapus {username}?\nIni tidak dapat dibatalkan!'
+        ))
+        button_layout = BoxLayout(spacing=10, size_hint_y=0.3)
+        confirm_btn = Button(text='YA, HAPUS', background_color=(1, 0.2, 0.2, 1))
+        cancel_btn = Button(text='BATAL', background_color=(0.6, 0.6, 0.6, 1))
+        button_layout.add_widget(cancel_btn)
+        button_layout.add_widget(confirm_btn)
+        content.add_widget(button_layout)
+        
+        popup = Popup(
+            title='Konfirmasi Hapus User', 
+            content=content, 
+            size_hint=(0.8, 0.6)
+        )
+        
+        def confirm(instance):
+            popup.dismiss()
+            self.delete_user(username)
+        
+        def cancel(instance):
+            popup.dismiss()
+        
+        confirm_btn.bind(on_press=confirm)
+        cancel_btn.bind(on_press=cancel)
+        popup.open()
+    
+    def delete_user(self, username):
+        if not self.firebase_manager:
+            return
+        
+        def bg():
+            success, message = self.firebase_manager.delete_user(username, App.get_running_app().current_user)
+            Clock.schedule_once(lambda dt: self.handle_delete_result(success, message), 0)
+        
+        threading.Thread(target=bg, daemon=True).start()
+    
+    def handle_delete_result(self, success, message):
+        if success:
+            self.load_users()
+        Popup(
+            title='Hasil Hapus', 
+            content=Label(text=message), 
+            size_hint=(0.8, 0.3)
+        ).open()
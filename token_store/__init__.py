@@ -0,0 +1,3 @@
+"""
+Penyimpanan token, pengguna dan sesi login.
+"""
@@ -0,0 +1,1061 @@
+"""
+Data token, pengguna, chat dan log aktivitas di Firebase.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from kivy.app import App
+
+from token_store.projection import PROJECTIONS, index_node, project_write, missing_entries
+from token_store.replica import LocalReplica, ReplicaSync, NODE_RULES
+from transport.firebase import FirebaseTransport, FirebaseUnavailable, default_database_url
+from transport.tracing import tracer
+
+
+OFFLINE_MESSAGE = "Tidak ada koneksi ke server. Periksa internet lalu coba lagi."
+
+
+class FirebaseManager(FirebaseTransport):
+    """Firebase database manager using REST API
+    
+    With replica=True reads and writes of the replicated nodes go through a
+    local SQLite replica (see token_store.replica) so screens work offline.
+    """
+    def __init__(self, connect=True, replica=True, database_url=None):
+        # Default settings
+        self.admin_password = self.hash_password('admin2024')
+        self.price_per_token = 1500
+        
+        # Presence management
+        self.presence_thread = None
+        self.presence_running = False
+        self.current_user = None
+        
+        # Offline replica, synced in the background once connecting starts
+        database_url = database_url or default_database_url()
+        self.replica = None
+        self.replica_sync = None
+        if replica:
+            try:
+                self.replica = LocalReplica(self.replica_file(), database_url)
+                self.replica_sync = ReplicaSync(self, self.replica)
+            except Exception as e:
+                print(f"Error opening local replica: {e}")
+                self.replica = None
+        
+        super().__init__(connect, database_url)
+    
+    def replica_file(self):
+        try:
+            return os.path.join(App.get_running_app().user_data_dir, 'replica.db')
+        except:
+            return 'replica.db'
+    
+    def connect(self):
+        super().connect()
+        if self.replica_sync:
+            self.replica_sync.start()
+    
+    def is_usable(self):
+        """True if connected, or if the local replica can serve the app offline"""
+        return bool(self.db) or bool(self.replica and self.replica.has_data())
+    
+    def replicated(self, path):
+        return self.replica is not None and path.strip('/').split('/')[0] in NODE_RULES
+    
+    def get_data(self, path, strict=False):
+        """Read from the replica once its node is synced, else from Firebase"""
+        if self.replica is not None and self.replicated(path):
+            hit = self.replica.covers(path)
+            self.metrics.record_cache(path, hit)
+            if hit:
+                return self.replica.get(path)
+        return super().get_data(path, strict)
+    
+    def keys(self, path, strict=False):
+        """Child keys from the replica once its node is synced, else a shallow read"""
+        if self.replica is not None and self.replicated(path):
+            hit = self.replica.covers(path)
+            self.metrics.record_cache(path, hit)
+            if hit:
+                return self.replica.keys(path)
+        return super().keys(path, strict)
+    
+    def exists(self, path, strict=False):
+        if self.replica is not None and self.replicated(path):
+            hit = self.replica.covers(path)
+            self.metrics.record_cache(path, hit)
+            if hit:
+                return self.replica.exists(path)
+        return super().exists(path, strict)
+    
+    def set_data(self, path, data):
+        if not self.replicated(path):
+            saved = super().set_data(path, data)
+        else:
+            self.replica.set(path, data)
+            self.replica_sync.kick()
+            saved = True
+        if saved:
+            self.mirror(path, data)
+        return saved
+    
+    def push_data(self, path, data):
+        if not self.replicated(path):
+            key = super().push_data(path, data)
+        else:
+            key = self.replica.push(path, data)
+            self.replica_sync.kick()
+        if key:
+            self.mirror(f"{path.strip('/')}/{key}", data)
+        return key
+    
+    def update_data(self, path, data):
+        if not self.replicated(path):
+            saved = super().update_data(path, data)
+        else:
+            self.replica.update(path, data)
+            self.replica_sync.kick()
+            saved = True
+        if saved:
+            self.mirror(path, data, merge=True)
+        return saved
+    
+    def increment_data(self, path, increments, base=None):
+        """Add deltas to counter fields at path (negative to subtract)
+        
+        With the replica the deltas are queued as increments. Without it the
+        new values are computed from base (the record as just read) or a
+        fresh read. Counters never drop below 0. Use update_data to set a
+        counter to a given value.
+        """
+        if not self.replicated(path):
+            if base is None:
+                base = super().get_data(path) or {}
+            data = {field: max(0, (base.get(field) or 0) + delta) for field, delta in increments.items()}
+            saved = super().update_data(path, data)
+        else:
+            self.replica.increment(path, increments)
+            self.replica_sync.kick()
+            saved = True
+        if saved:
+            write = project_write(path, increments, merge=True)
+            if write is not None:
+                self.increment_data(write[0], write[1], base)
+        return saved
+    
+    def delete_data(self, path):
+        if not self.replicated(path):
+            deleted = super().delete_data(path)
+        else:
+            self.replica.delete(path)
+            self.replica_sync.kick()
+            deleted = True
+        if deleted:
+            self.mirror(path, None)
+        return deleted
+    
+    def mirror(self, path, data, merge=False):
+        """Copy the hot fields of a tokens/users write into its index node"""
+        write = project_write(path, data, merge)
+        if write is None:
+            return
+        index_path, projected = write
+        if projected is None:
+            self.delete_data(index_path)
+        elif merge:
+            self.update_data(index_path, projected)
+        else:
+            self.set_data(index_path, projected)
+    
+    def scope_replica(self, username):
+        """Replicate every token and user for the admin (None), else only username's own records"""
+        if self.replica_sync is not None:
+            self.replica_sync.set_scope(username)
+    
+    def get_index(self, node):
+        """Hot fields of every record of tokens or users, without the rest"""
+        return self.get_data(index_node(node)) or {}
+    
+    def check_firebase_data(self):
+        """Add index entries for records written without one (older app versions)"""
+        try:
+            for node in PROJECTIONS:
+                index = index_node(node)
+                index_keys = set(self.keys(index, strict=True))
+                if set(self.keys(node, strict=True)) == index_keys:
+                    continue
+                updates = missing_entries(node, self.get_data(node, strict=True), index_keys)
+                if updates and self.update_data(index, updates):
+                    print(f"Rebuilt {len(updates)} {index} entries")
+        except Exception as e:
+            print(f"Error rebuilding indexes: {e}")
+    
+    def notify_user_token_banned(self, username, banned_count, lost_value):
+        try:
+            # Send direct notification via chat
+            notification_msg = {
+                "user": "Sistem",
+                "message": f"PEMBERITAHUAN UNTUK {username.upper()}:\n\n{banned_count} token Anda telah di-ban karena rusak/bermasalah!\n\nPenghasilan dikurangi: Rp {lost_value:,}\n\nSilakan periksa kualitas token sebelum mengirim. Hubungi admin jika ada pertanyaan.",
+                "timestamp": datetime.now().isoformat(),
+                "type": "system"
+            }
+            self.push_data("chat_messages", notification_msg)
+            
+            # Log notification
+            self.log_activity("sistem", 'user_notified', f'Notifikasi ban token dikirim ke {username}')
+            
+        except Exception as e:
+            print(f"Error sending ban notification: {e}")
+
+    def hash_password(self, password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def is_valid_token(self, token):
+        if not token or not isinstance(token, str):
+            return False
+        
+        if len(token.strip()) < 50:
+            return False
+        
+        pattern = r'^u[a-f0-9]{32}:[a-zA-Z0-9+/]+={0,2}\.\.[a-zA-Z0-9+/]+=*$'
+        
+        if not re.match(pattern, token.strip()):
+            return False
+        
+        parts = token.strip().split(':')
+        if len(parts) != 2:
+            return False
+        
+        if len(parts[0]) != 33 or not parts[0].startswith('u'):
+            return False
+        
+        if not all(c in '0123456789abcdef' for c in parts[0][1:]):
+            return False
+        
+        if '..' not in parts[1]:
+            return False
+        
+        return True
+
+    def init_firebase_data(self):
+        """Initialize Firebase with default data
+        
+        Raises on network errors so the seed marker is only written on success.
+        """
+        try:
+            # Check if settings exist
+            if not self.exists("settings", strict=True):
+                default_settings = {
+                    "admin_password": self.admin_password,
+                    "price_per_token": self.price_per_token,
+                    "created": datetime.now().isoformat()
+                }
+                if not self.set_data("settings", default_settings):
+                    raise Exception("default settings not saved")
+                print("Default settings created in Firebase")
+                
+            # Create welcome message in chat if not exists
+            if not self.exists("chat_messages", strict=True):
+                welcome_message = {
+                    "user": "Sistem",
+                    "message": "Selamat datang di Grup Chat Token Manager!",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                if not self.push_data("chat_messages", welcome_message):
+                    raise Exception("welcome message not saved")
+                print("Welcome chat message created")
+                
+        except Exception as e:
+            print(f"Error initializing Firebase data: {e}")
+            raise
+
+    def set_online(self, username):
+        """Set user online status"""
+        try:
+            self.current_user = username
+            self.update_data(f"users/{username}", {
+                "online": True,
+                "last_seen": datetime.now().isoformat()
+            })
+            
+            # Start presence heartbeat
+            self.start_presence_heartbeat(username)
+            
+            # Send online notification to chat
+            online_msg = {
+                "user": "Sistem",
+                "message": f"{username} sedang online!",
+                "timestamp": datetime.now().isoformat(),
+                "type": "system"
+            }
+            self.push_data("chat_messages", online_msg)
+            
+            print(f"User {username} set online")
+        except Exception as e:
+            print(f"Error setting online status: {e}")
+
+    def set_offline(self, username):
+        """Set user offline status"""
+        try:
+            self.presence_running = False
+            if self.presence_thread:
+                self.presence_thread.join(timeout=1)
+            
+            self.update_data(f"users/{username}", {
+                "online": False,
+                "last_seen": datetime.now().isoformat()
+            })
+            
+            # Send offline notification to chat
+            offline_msg = {
+                "user": "Sistem",
+                "message": f"{username} sedang offline!",
+                "timestamp": datetime.now().isoformat(),
+                "type": "system"
+            }
+            self.push_data("chat_messages", offline_msg)
+            
+            print(f"User {username} set offline")
+        except Exception as e:
+            print(f"Error setting offline status: {e}")
+
+    def start_presence_heartbeat(self, username):
+        """Start heartbeat to maintain online presence"""
+        self.presence_running = True
+        
+        def heartbeat():
+            while self.presence_running:
+                try:
+                    self.update_data(f"users/{username}", {"last_seen": datetime.now().isoformat()})
+                    time.sleep(30)  # Update every 30 seconds
+                except:
+                    break
+        
+        self.presence_thread = threading.Thread(target=heartbeat, daemon=True)
+        self.presence_thread.start()
+
+    @tracer.traced()
+    def get_online_users(self):
+        """Get list of online users"""
+        try:
+            all_users = self.get_index("users")
+            if not all_users:
+                return []
+            
+            online_users = []
+            current_time = datetime.now()
+            
+            for username, user_data in all_users.items():
+                if user_data.get("online", False):
+                    last_seen = user_data.get("last_seen", "")
+                    if last_seen:
+                        try:
+                            last_seen_time = datetime.fromisoformat(last_seen)
+                            # Consider online if last seen within 2 minutes
+                            if (current_time - last_seen_time).seconds < 120:
+                                online_users.append(username)
+                        except:
+                            pass
+            
+            return online_users
+        except Exception as e:
+            print(f"Error getting online users: {e}")
+            return []
+
+    @tracer.traced()
+    def login(self, username, password, user_type):
+        try:
+            if user_type == 'admin':
+                settings = self.get_data("settings", strict=True)
+                if settings and settings.get("admin_password") == self.hash_password(password):
+                    self.scope_replica(None)
+                    self.set_online('admin')
+                    self.log_activity('admin', 'login', 'Admin berhasil masuk')
+                    return True, "Login admin berhasil"
+                else:
+                    return False, "Password admin salah"
+            else:
+                user_data = self.get_data(f"users/{username}", strict=True)
+                if not user_data:
+                    return False, "Username belum terdaftar. Hubungi admin untuk mendaftarkan akun Anda."
+                
+                stored_password = user_data.get("password", "")
+                if stored_password and stored_password != self.hash_password(password):
+                    return False, "Password salah"
+                
+                self.scope_replica(username)
+                self.update_data(f"users/{username}", {"last_login": datetime.now().isoformat()})
+                self.set_online(username)
+                self.log_activity(username, 'login', 'User berhasil masuk')
+                
+                # Check if user info is complete
+                wa = user_data.get("wa", "")
+                rekening = user_data.get("rekening", "")
+                tgl_lahir = user_data.get("tgl_lahir", "")
+                tempat_tinggal = user_data.get("tempat_tinggal", "")
+                
+                if not wa or not rekening or not tgl_lahir or not tempat_tinggal:
+                    return True, "Login berhasil - info required"
+                
+                return True, "Login user berhasil"
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Login error: {e}")
+            return False, f"Error login: {str(e)}"
+
+    @tracer.traced()
+    def logout(self, username):
+        """Logout user"""
+        try:
+            self.set_offline(username)
+        except Exception as e:
+            print(f"Logout error: {e}")
+
+    def log_activity(self, user, action, details=""):
+        """Log user activity"""
+        try:
+            activity_data = {
+                "user": user,
+                "action": action,
+                "details": details,
+                "timestamp": datetime.now().isoformat()
+            }
+            self.push_data("activity_logs", activity_data)
+            print(f"Activity logged: {user} - {action}")
+        except Exception as e:
+            print(f"Error logging activity: {e}")
+
+    @tracer.traced()
+    def add_user(self, username, added_by, password=""):
+        """Add user (admin only)"""
+        try:
+            # Check if user already exists
+            if self.exists(f"users/{username}", strict=True):
+                return False, "User sudah ada"
+            
+            new_user_data = {
+                "created": datetime.now().isoformat(),
+                "token_count": 0,
+                "total_value": 0,
+                "last_login": "",
+                "online": False,
+                "last_seen": "",
+                "role": "user",
+                "added_by": added_by,
+                "password": self.hash_password(password) if password else ""
+            }
+            
+            # Add to Firebase
+            if self.set_data(f"users/{username}", new_user_data):
+                self.log_activity(added_by, 'user_added', f'Menambahkan user: {username}')
+                
+                # Send notification to chat
+                chat_msg = {
+                    "user": "Sistem",
+                    "message": f"User baru {username} telah ditambahkan oleh admin!",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                self.push_data("chat_messages", chat_msg)
+                
+                print(f"User {username} added successfully")
+                return True, "User berhasil ditambahkan"
+            else:
+                return False, "Gagal menambahkan user ke database"
+            
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error adding user: {e}")
+            return False, f"Error menambahkan user: {str(e)}"
+
+    @tracer.traced()
+    def update_user_password(self, username, new_password):
+        """Update user password"""
+        try:
+            if not self.exists(f"users/{username}", strict=True):
+                return False, "User tidak ditemukan"
+            
+            hashed_password = self.hash_password(new_password)
+            success = self.update_data(f"users/{username}", {"password": hashed_password})
+            
+            if success:
+                self.log_activity(username, 'password_changed', 'Password berhasil diubah')
+                return True, "Password berhasil diubah"
+            else:
+                return False, "Gagal mengubah password"
+                
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error updating password: {e}")
+            return False, f"Error mengubah password: {str(e)}"
+
+    @tracer.traced()
+    def reset_user_data(self, admin_user):
+        """Reset all user earnings and token counts (admin only)"""
+        try:
+            all_users = self.get_data("users", strict=True)
+            if not all_users:
+                return False, "Tidak ada user yang ditemukan"
+            
+            reset_count = 0
+            for username, user_data in all_users.items():
+                if user_data.get("role") == "user":
+                    # Reset only earnings and token count, keep other data
+                    self.update_data(f"users/{username}", {
+                        "token_count": 0,
+                        "total_value": 0
+                    })
+                    reset_count += 1
+            
+            # Log activity
+            self.log_activity(admin_user, 'data_reset', f'Reset data {reset_count} user')
+            
+            # Send notification to chat
+            chat_msg = {
+                "user": "Sistem",
+                "message": f"Admin telah mereset data penghasilan semua user!",
+                "timestamp": datetime.now().isoformat(),
+                "type": "system"
+            }
+            self.push_data("chat_messages", chat_msg)
+            
+            return True, f"Berhasil mereset data {reset_count} user"
+            
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error resetting user data: {e}")
+            return False, f"Error reset data: {str(e)}"
+
+    @tracer.traced()
+    def check_token_owner(self, token_to_check):
+        """Check who owns a specific token (admin only)"""
+        try:
+            all_tokens = self.get_data("tokens", strict=True)
+            if not all_tokens:
+                return None, "Tidak ada token yang ditemukan"
+            
+            for token_id, token_data in all_tokens.items():
+                if token_data.get("token") == token_to_check:
+                    owner = token_data.get("user", "Unknown")
+                    status = token_data.get("status", "unknown")
+                    timestamp = token_data.get("timestamp", "")
+                    price = token_data.get("price", 0)
+                    
+                    # Format timestamp
+                    try:
+                        dt = datetime.fromisoformat(timestamp)
+                        formatted_time = dt.strftime('%d/%m/%Y %H:%M')
+                    except:
+                        formatted_time = "Waktu tidak diketahui"
+                    
+                    result = {
+                        'owner': owner,
+                        'status': status,
+                        'timestamp': formatted_time,
+                        'price': price,
+                        'token_id': token_id
+                    }
+                    
+                    return result, "Token ditemukan"
+            
+            return None, "Token tidak ditemukan dalam database"
+            
+        except FirebaseUnavailable:
+            return None, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error checking token owner: {e}")
+            return None, f"Error cek token: {str(e)}"
+
+    @tracer.traced()
+    def add_token(self, token, username, added_by):
+        """Add token to Firebase (only registered users)"""
+        try:
+            print(f"Attempting to add token for {username} by {added_by}")
+            
+            # Check if user is registered
+            user_data = self.get_data(f"users/{username}", strict=True)
+            if not user_data:
+                return False, "User belum terdaftar. Hubungi admin untuk mendaftarkan akun Anda."
+            
+            if not self.is_valid_token(token):
+                print("Token validation failed")
+                return False, "Format token tidak valid"
+            
+            # Check for duplicates
+            all_tokens = self.get_data("tokens", strict=True)
+            if all_tokens:
+                for token_id, token_data in all_tokens.items():
+                    if token_data.get("token") == token:
+                        print("Duplicate token found")
+                        return False, "Token sudah ada"
+            
+            # Get current price
+            settings = self.get_data("settings")
+            current_price = settings.get("price_per_token", 1500) if settings else 1500
+            
+            # Add token
+            token_data = {
+                "token": token,
+                "user": username,
+                "timestamp": datetime.now().isoformat(),
+                "price": int(current_price),
+                "status": "available",
+                "added_by": added_by
+            }
+            
+            # Push to Firebase
+            token_id = self.push_data("tokens", token_data)
+            if token_id:
+                print(f"Token added to Firebase with ID: {token_id}")
+                
+                # Update user stats
+                self.increment_data(f"users/{username}", {
+                    "token_count": 1,
+                    "total_value": int(current_price)
+                }, base=user_data)
+                print(f"Updated user stats for: {username}")
+                
+                self.log_activity(added_by, 'token_added', f'Menambahkan token untuk {username}')
+                
+                # Send notification to chat
+                chat_msg = {
+                    "user": "Sistem",
+                    "message": f"{username} menambahkan token baru! (+Rp {current_price:,})",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                self.push_data("chat_messages", chat_msg)
+                
+                print(f"Token added successfully for {username}")
+                return True, "Token berhasil ditambahkan"
+            else:
+                return False, "Gagal menambahkan token ke database"
+                
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error adding token: {e}")
+            return False, f"Error menambahkan token: {str(e)}"
+
+    @tracer.traced()
+    def add_bulk_tokens(self, tokens_text, username, added_by):
+        """Add multiple tokens"""
+        try:
+            tokens = [t.strip() for t in tokens_text.split('\n') if t.strip()]
+            
+            success_count = 0
+            duplicate_count = 0
+            invalid_count = 0
+            
+            for token in tokens:
+                success, message = self.add_token(token, username, added_by)
+                if message == OFFLINE_MESSAGE:
+                    # The rest would fail the same way
+                    return False, OFFLINE_MESSAGE, {}
+                if success:
+                    success_count += 1
+                else:
+                    if "sudah ada" in message:
+                        duplicate_count += 1
+                    elif "tidak valid" in message:
+                        invalid_count += 1
+            
+            # Send bulk add notification to chat
+            if success_count > 0:
+                chat_msg = {
+                    "user": "Sistem",
+                    "message": f"{username} menambahkan {success_count} token sekaligus!",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                self.push_data("chat_messages", chat_msg)
+            
+            return True, f'Berhasil menambahkan {success_count}/{len(tokens)} token', {
+                'success': success_count,
+                'duplicates': duplicate_count,
+                'invalid': invalid_count,
+                'total': len(tokens)
+            }
+            
+        except Exception as e:
+            return False, f"Error menambahkan token massal: {str(e)}", {}
+
+    @tracer.traced()
+    def get_available_tokens_count(self):
+        """Get count of available tokens"""
+        try:
+            all_tokens = self.get_index("tokens")
+            if not all_tokens:
+                return 0
+            
+            available_count = 0
+            for token_data in all_tokens.values():
+                if token_data.get("status") == "available":
+                    available_count += 1
+            
+            return available_count
+        except Exception as e:
+            print(f"Error getting available tokens count: {e}")
+            return 0
+
+    @tracer.traced()
+    def take_tokens(self, count, taken_by):
+        """Take tokens from available pool"""
+        try:
+            # Get all available tokens
+            all_tokens = self.get_data("tokens")
+            if not all_tokens:
+                return None
+            
+            available_tokens = []
+            for token_id, token_data in all_tokens.items():
+                if token_data.get("status") == "available":
+                    available_tokens.append((token_id, token_data))
+            
+            # Sort by timestamp to get oldest first
+            available_tokens.sort(key=lambda x: x[1].get("timestamp", ""))
+            
+            if len(available_tokens) < count:
+                return None
+            
+            taken_tokens = []
+            for i in range(count):
+                token_id, token_data = available_tokens[i]
+                
+                # Mark as taken
+                self.update_data(f"tokens/{token_id}", {
+                    "status": "taken",
+                    "taken_by": taken_by,
+                    "taken_timestamp": datetime.now().isoformat()
+                })
+                
+                taken_tokens.append(token_data["token"])
+            self.log_activity(taken_by, 'tokens_taken', f'Mengambil {len(taken_tokens)} token')
+            
+            # Send notification to chat
+            chat_msg = {
+                "user": "Sistem",
+                "message": f"Admin mengambil {len(taken_tokens)} token!",
+                "timestamp": datetime.now().isoformat(),
+                "type": "system"
+            }
+            self.push_data("chat_messages", chat_msg)
+            
+            return {
+                'success': True,
+                'tokens': taken_tokens,
+                'count': len(taken_tokens)
+            }
+            
+        except Exception as e:
+            print(f"Error taking tokens: {e}")
+            return None
+
+    @tracer.traced()
+    def get_all_stats(self):
+        """Get overall statistics"""
+        try:
+            # Status and price of every token, without the token strings
+            all_tokens = self.get_index("tokens")
+            total_tokens = len(all_tokens) if all_tokens else 0
+            
+            # Count by status
+            available_tokens = 0
+            taken_tokens = 0
+            total_value = 0
+            
+            if all_tokens:
+                for token_data in all_tokens.values():
+                    if token_data.get("status") == "available":
+                        available_tokens += 1
+                    elif token_data.get("status") == "taken":
+                        taken_tokens += 1
+                    total_value += token_data.get("price", 0)
+            
+            # Get user count
+            total_users = len(self.keys("users"))
+            
+            # Get online users count
+            online_users = len(self.get_online_users())
+            
+            # Get current price
+            settings = self.get_data("settings")
+            current_price = settings.get('price_per_token', 1500) if settings else 1500
+            
+            return {
+                'total_tokens': total_tokens,
+                'available_tokens': available_tokens,
+                'taken_tokens': taken_tokens,
+                'total_value': total_value,
+                'total_users': total_users,
+                'online_users': online_users,
+                'price_per_token': current_price
+            }
+            
+        except Exception as e:
+            print(f"Error getting stats: {e}")
+            return {
+                'total_tokens': 0,
+                'available_tokens': 0,
+                'taken_tokens': 0,
+                'total_value': 0,
+                'total_users': 0,
+                'online_users': 0,
+                'price_per_token': 1500
+            }
+
+    @tracer.traced()
+    def get_user_stats(self, username):
+        """Get specific user stats"""
+        try:
+            user_data = self.get_data(f"users/{username}")
+            if user_data:
+                return user_data
+            return {}
+        except Exception as e:
+            print(f"Error getting user stats: {e}")
+            return {}
+
+    @tracer.traced()
+    def get_all_users(self):
+        try:
+            users_data = self.get_data("users")
+            if not users_data:
+                return []
+            
+            users = []
+            current_time = datetime.now()
+            
+            for username, user_info in users_data.items():
+                # Skip admin dari list user
+                if username == 'admin':
+                    continue
+                
+                user_info['username'] = username
+                
+                last_seen = user_info.get("last_seen", "")
+                is_online = False
+                if last_seen:
+                    try:
+                        last_seen_time = datetime.fromisoformat(last_seen)
+                        if (current_time - last_seen_time).seconds < 120:
+                            is_online = True
+                    except:
+                        pass
+                
+                user_info['is_online'] = is_online
+                users.append(user_info)
+            
+            # Callers sort for their own view (UsersScreen.apply_view, recent users)
+            return users
+            
+        except Exception as e:
+            print(f"Error getting users: {e}")
+            return []
+
+    @tracer.traced()
+    def send_chat_message(self, username, message):
+        """Send message to group chat"""
+        try:
+            chat_data = {
+                "user": username,
+                "message": message,
+                "timestamp": datetime.now().isoformat(),
+                "type": "user"
+            }
+            result = self.push_data("chat_messages", chat_data)
+            if result:
+                print(f"Chat message sent by {username}")
+                return True
+            return False
+        except Exception as e:
+            print(f"Error sending chat message: {e}")
+            return False
+
+    @tracer.traced()
+    def get_chat_messages(self, limit=50):
+        """Last `limit` chat messages, oldest first; None if they could not be read"""
+        try:
+            if self.replicated("chat_messages") and self.replica.covers("chat_messages"):
+                all_messages = self.get_data("chat_messages")
+            else:
+                # Only the newest push keys, not the whole chat history
+                all_messages = self.request('GET', "chat_messages",
+                                            params={'orderBy': '"$key"', 'limitToLast': limit})
+            if not all_messages:
+                return []
+            
+            # Keep the push key so the chat view can tell new messages apart
+            message_list = [dict(message, key=key) for key, message in all_messages.items()]
+            message_list.sort(key=lambda x: x.get('timestamp', ''))
+            
+            # Return last N messages
+            return message_list[-limit:] if len(message_list) > limit else message_list
+            
+        except Exception as e:
+            print(f"Error getting chat messages: {e}")
+            return None
+
+    @tracer.traced()
+    def get_activity_logs(self, limit=50):
+        """Get activity logs"""
+        try:
+            all_logs = self.get_data("activity_logs")
+            if not all_logs:
+                return []
+            
+            log_list = list(all_logs.values())
+            log_list.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+            return log_list[:limit] if len(log_list) > limit else log_list
+            
+        except Exception as e:
+            print(f"Error getting activity logs: {e}")
+            return []
+
+    @tracer.traced()
+    def update_settings(self, settings):
+        """Update settings (admin only)"""
+        try:
+            if 'price_per_token' in settings:
+                new_price = int(settings['price_per_token'])
+                self.update_data("settings", {"price_per_token": new_price})
+                
+                # Send notification to chat
+                chat_msg = {
+                    "user": "Sistem",
+                    "message": f"Harga token diubah menjadi Rp {new_price:,} oleh admin! 💲",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                self.push_data("chat_messages", chat_msg)
+                
+            if 'admin_password' in settings:
+                hashed_password = self.hash_password(settings['admin_password'])
+                self.update_data("settings", {"admin_password": hashed_password})
+            
+            return True, "Pengaturan berhasil diperbarui"
+        except Exception as e:
+            return False, f"Error memperbarui pengaturan: {str(e)}"
+
+    @tracer.traced()
+    def ban_tokens(self, tokens_text, banned_by):
+        try:
+            tokens_to_ban = [t.strip() for t in tokens_text.split('\n') if t.strip()]
+            
+            success_count = 0
+            not_found_count = 0
+            banned_users = {}  # Track users yang tokennya di-ban
+            
+            all_tokens = self.get_data("tokens", strict=True)
+            if not all_tokens:
+                return False, "Tidak ada token dalam database", {}
+            
+            for token_to_ban in tokens_to_ban:
+                token_found = False
+                
+                for token_id, token_data in all_tokens.items():
+                    if token_data.get("token") == token_to_ban:
+                        token_found = True
+                        owner = token_data.get("user", "Unknown")
+                        token_price = token_data.get("price", 0)
+                        
+                        # Update token status menjadi banned
+                        self.update_data(f"tokens/{token_id}", {
+                            "status": "banned",
+                            "banned_by": banned_by,
+                            "banned_timestamp": datetime.now().isoformat()
+                        })
+                        
+                        # Update user stats - kurangi penghasilan dan token count
+                        user_data = self.get_data(f"users/{owner}")
+                        if user_data:
+                            self.increment_data(f"users/{owner}", {
+                                "token_count": -1,
+                                "total_value": -token_price,
+                                "banned_count": 1
+                            }, base=user_data)
+                            
+                            # Track banned users untuk notifikasi
+                            if owner not in banned_users:
+                                banned_users[owner] = {'count': 0, 'value': 0}
+                            banned_users[owner]['count'] += 1
+                            banned_users[owner]['value'] += token_price
+                        
+                        success_count += 1
+                        
+                        # Log activity
+                        self.log_activity(banned_by, 'token_banned', f'Ban token milik {owner}')
+                        break
+                
+                if not token_found:
+                    not_found_count += 1
+            
+            # Send notifications to chat
+            if success_count > 0:
+                # General notification
+                general_msg = {
+                    "user": "Sistem",
+                    "message": f"Admin memban {success_count} token rusak! ⚠️",
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "system"
+                }
+                self.push_data("chat_messages", general_msg)
+                
+                # Individual notifications for each affected user
+                for username, ban_info in banned_users.items():
+                    user_msg = {
+                        "user": "Sistem",
+                        "message": f"⚠️ {username}: {ban_info['count']} token Anda di-ban karena rusak! Penghasilan dikurangi Rp {ban_info['value']:,}",
+                        "timestamp": datetime.now().isoformat(),
+                        "type": "system"
+                    }
+                    self.push_data("chat_messages", user_msg)
+            
+            return True, f'Proses ban token selesai', {
+                'success': success_count,
+                'not_found': not_found_count,
+                'total': len(tokens_to_ban),
+                'affected_users': len(banned_users)
+            }
+            
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE, {}
+        except Exception as e:
+            print(f"Error banning tokens: {e}")
+            return False, f"Error ban token: {str(e)}", {}
+
+    @tracer.traced()
+    def update_user_info(self, username, wa, rekening, tgl_lahir, tempat_tinggal):
+        try:
+            if not self.exists(f"users/{username}", strict=True):
+                return False, "User tidak ditemukan"
+            
+            success = self.update_data(f"users/{username}", {
+                "wa": wa,
+                "rekening": rekening,
+                "tgl_lahir": tgl_lahir,
+                "tempat_tinggal": tempat_tinggal
+            })
+            
+            if success:
+                self.log_activity(username, 'info_updated', 'User memperbarui info pribadi')
+                return True, "Info berhasil disimpan"
+            else:
+                return False, "Gagal menyimpan info"
+                
+        except FirebaseUnavailable:
+            return False, OFFLINE_MESSAGE
+        except Exception as e:
+            print(f"Error updating user info: {e}")
+            return False, f"Error update info: {str(e)}"
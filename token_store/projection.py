@@ -0,0 +1,58 @@
+"""
+Node proyeksi ringkas untuk tokens dan users.
+
+Daftar dan hitungan (statistik admin, jumlah token tersedia, user online)
+hanya butuh beberapa field. Setiap tulisan ke tokens/<id> atau users/<nama>
+juga ditulis ke token_index/<id> atau user_index/<nama> dengan field itu
+saja, jadi pembacaan tersebut tidak mengunduh string token atau data
+pribadi pengguna.
+"""
+
+from token_store.replica import split_path
+
+# Source node -> (index node, hot fields copied into it)
+PROJECTIONS = {
+    'tokens': ('token_index', ('status', 'price', 'user')),
+    'users': ('user_index', ('role', 'online', 'last_seen', 'token_count', 'total_value', 'banned_count')),
+}
+
+
+def index_node(node):
+    return PROJECTIONS[node][0]
+
+
+def project_record(node, record):
+    """Hot fields of one record, or None if it has none"""
+    fields = PROJECTIONS[node][1]
+    if not isinstance(record, dict):
+        return None
+    projected = {field: record[field] for field in fields if record.get(field) is not None}
+    return projected or None
+
+
+def project_write(path, data, merge=False):
+    """(index path, data) mirroring a write of data at path, or None
+
+    merge=True is for PATCH: only the hot fields present in data are
+    copied. Whole-node writes are not mirrored.
+    """
+    node, key, rest = split_path(path)
+    if node not in PROJECTIONS or key is None:
+        return None
+    index, fields = PROJECTIONS[node]
+    if rest:
+        if rest[0] not in fields:
+            return None
+        return '/'.join([index, key] + rest), data
+    if merge:
+        projected = {field: value for field, value in (data or {}).items() if field in fields}
+        return (f"{index}/{key}", projected) if projected else None
+    return f"{index}/{key}", project_record(node, data)
+
+
+def missing_entries(node, records, index_keys):
+    """Index updates (key -> projection, or None to drop) for records the index lacks"""
+    records = records or {}
+    updates = {key: project_record(node, record) for key, record in records.items() if key not in index_keys}
+    updates.update({key: None for key in index_keys if key not in records})
+    return updates
@@ -0,0 +1,692 @@
+"""
+Replika lokal (SQLite) dari node Firebase yang dipakai aplikasi.
+
+Bacaan dilayani dari replika setelah node pertama kali disinkronkan. Tulisan
+langsung diterapkan ke replika lalu masuk outbox yang tahan restart; outbox
+dikirim ulang ke Firebase oleh ReplicaSync saat online. Aturan konflik per node:
+
+    chat_messages, activity_logs  append - key push dibuat di perangkat, dikirim
+                                  dengan PUT sehingga aman diulang
+    tokens                        status - available < taken < banned; status di
+                                  server yang lebih tinggi menang
+    users, settings               merge - field biasa last-writer-wins, record baru
+                                  tidak menimpa record yang sudah ada di server,
+                                  penambahan counter dikirim sebagai selisih
+
+Setiap tulisan ke record tokens, users dan indeksnya diberi updated_at
+(timestamp server). Tarikan berkala hanya meminta record dengan updated_at
+sejak tarikan terakhir (orderBy="updated_at"&startAt=...); seluruh node
+hanya diunduh sekali, pada tarikan pertama. Record yang dihapus langsung di
+server (aplikasi sendiri tidak menghapus token atau user) baru hilang dari
+replika saat replika dibangun ulang. Tambahkan ".indexOn": ["updated_at"]
+untuk node itu di rules database; tanpa indeks server menolak query dan
+node tersebut diunduh utuh setiap putaran.
+
+Replikasi tokens, users dan indeksnya mengikuti peran yang login: admin
+mendapat semua record, user biasa hanya users/<nama> dan user_index/<nama>
+miliknya. Bacaan lain dari node itu (statistik, daftar online) langsung ke
+server. Sebelum ada yang login node tersebut tidak ditarik.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from transport.firebase import FirebaseHTTPError
+
+APPEND = 'append'
+STATUS = 'status'
+MERGE = 'merge'
+
+NODE_RULES = {
+    'chat_messages': APPEND,
+    'activity_logs': APPEND,
+    'tokens': STATUS,
+    'users': MERGE,
+    'token_index': STATUS,
+    'user_index': MERGE,
+    'settings': MERGE,
+}
+# Nodes kept as a single record instead of one record per child
+SINGLE_RECORD_NODES = ('settings',)
+TOKEN_STATUS_RANK = {'available': 0, 'taken': 1, 'banned': 2}
+# Append-only nodes: records fetched on first sync and kept locally
+APPEND_WINDOW = 500
+# Record field set to the server time on every write, for delta pulls
+STAMP_FIELD = 'updated_at'
+SERVER_TIMESTAMP = {'.sv': 'timestamp'}
+# Nodes replicated by role: whole for admins, only the user's own record otherwise
+SCOPED_NODES = ('tokens', 'users', 'token_index', 'user_index')
+OWN_RECORD_NODES = ('users', 'user_index')
+# Scope meta value for an admin, who replicates every record
+ALL_RECORDS = '*'
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    node TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (node, key)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT,
+    increments TEXT,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def push_key(now_ms=None):
+    """Chronologically sortable key in the format Firebase push() uses"""
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    stamp = []
+    for _ in range(8):
+        stamp.append(PUSH_CHARS[now_ms % 64])
+        now_ms //= 64
+    suffix = ''.join(random.choice(PUSH_CHARS) for _ in range(12))
+    return ''.join(reversed(stamp)) + suffix
+
+
+def split_path(path):
+    """Split 'node/key/rest...' into (node, key, rest); key is None for a whole node"""
+    parts = [p for p in path.strip('/').split('/') if p]
+    node = parts[0] if parts else ''
+    if node in SINGLE_RECORD_NODES:
+        return node, '', parts[1:]
+    key = parts[1] if len(parts) > 1 else None
+    return node, key, parts[2:]
+
+
+def stamped(node):
+    """True if writes to node's records carry STAMP_FIELD"""
+    return NODE_RULES.get(node) in (STATUS, MERGE) and node not in SINGLE_RECORD_NODES
+
+
+def dig(value, rest):
+    for part in rest:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def place(value, rest, data):
+    """Return value with data stored at the nested path rest (None deletes)"""
+    if not rest:
+        return data
+    value = dict(value) if isinstance(value, dict) else {}
+    child = place(value.get(rest[0]), rest[1:], data)
+    if child is None:
+        value.pop(rest[0], None)
+    else:
+        value[rest[0]] = child
+    return value or None
+
+
+class LocalReplica:
+    """SQLite copy of the replicated Firebase nodes plus the outbox of pending writes"""
+    def __init__(self, db_file, database_url):
+        self.db_file = db_file
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # Outbox row being sent; later writes must not be merged into it
+        self.sending = None
+        self.conn.executescript(SCHEMA)
+        # A replica belongs to one database; start over if the URL changed
+        if self.get_meta('database_url') != database_url:
+            with self.lock, self.conn:
+                self.conn.execute('DELETE FROM records')
+                self.conn.execute('DELETE FROM outbox')
+                self.conn.execute('DELETE FROM meta')
+                self._set_meta('database_url', database_url)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # Meta
+
+    def get_meta(self, name, default=None):
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)', (name, value))
+
+    def set_meta(self, name, value):
+        with self.lock, self.conn:
+            self._set_meta(name, value)
+
+    def is_synced(self, node):
+        return self.get_meta(f'synced:{node}') is not None
+
+    def has_data(self):
+        """True once any node has been pulled from the server"""
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM meta WHERE name LIKE 'synced:%' LIMIT 1").fetchone()
+        return row is not None
+
+    def covers(self, path):
+        """True if reads of path can be served locally"""
+        node, key, _ = split_path(path)
+        if node not in NODE_RULES:
+            return False
+        if node in SCOPED_NODES:
+            scope = self.get_meta('scope')
+            if scope != ALL_RECORDS:
+                # Only the user's own record is here, never the whole node
+                return node in OWN_RECORD_NODES and key is not None and key == scope and self.is_synced(node)
+        return self.is_synced(node)
+
+    def set_scope(self, owner):
+        """Replicate every record (owner=None) or only owner's own records
+
+        Records of the other scope are dropped, except those with pending
+        writes. Returns True if the scope changed.
+        """
+        scope = owner or ALL_RECORDS
+        with self.lock, self.conn:
+            if self.get_meta('scope') == scope:
+                return False
+            for node in SCOPED_NODES:
+                pending = self._pending_keys(node)
+                for (key,) in self.conn.execute('SELECT key FROM records WHERE node = ?', (node,)).fetchall():
+                    if key not in pending:
+                        self._store(node, key, None)
+                self.conn.execute('DELETE FROM meta WHERE name IN (?, ?)', (f'synced:{node}', f'stamp:{node}'))
+            self._set_meta('scope', scope)
+        return True
+
+    # Records
+
+    def _load(self, node, key):
+        row = self.conn.execute('SELECT value FROM records WHERE node = ? AND key = ?', (node, key)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _store(self, node, key, value):
+        if value is None:
+            self.conn.execute('DELETE FROM records WHERE node = ? AND key = ?', (node, key))
+        else:
+            self.conn.execute('INSERT OR REPLACE INTO records (node, key, value) VALUES (?, ?, ?)',
+                              (node, key, json.dumps(value)))
+
+    def _node(self, node):
+        rows = self.conn.execute('SELECT key, value FROM records WHERE node = ? ORDER BY key', (node,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, path):
+        """Value at path, shaped like the REST response (None if missing)"""
+        node, key, rest = split_path(path)
+        with self.lock:
+            if key is None:
+                return self._node(node) or None
+            return dig(self._load(node, key), rest)
+
+    def keys(self, path):
+        """Child keys at path, like a shallow REST read"""
+        node, key, rest = split_path(path)
+        with self.lock:
+            if key is None:
+                return [row[0] for row in self.conn.execute(
+                    'SELECT key FROM records WHERE node = ? ORDER BY key', (node,))]
+            value = dig(self._load(node, key), rest)
+        return list(value) if isinstance(value, dict) else []
+
+    def exists(self, path):
+        node, key, rest = split_path(path)
+        with self.lock:
+            if key is None:
+                return self.conn.execute('SELECT 1 FROM records WHERE node = ? LIMIT 1', (node,)).fetchone() is not None
+            return dig(self._load(node, key), rest) is not None
+
+    def _put(self, node, key, rest, data):
+        if key is None:
+            self.conn.execute('DELETE FROM records WHERE node = ?', (node,))
+            for child, value in (data or {}).items():
+                self._store(node, child, value)
+            return
+        self._store(node, key, place(self._load(node, key), rest, data))
+
+    def set(self, path, data):
+        """Replace the value at path locally and queue a PUT"""
+        node, key, rest = split_path(path)
+        with self.lock, self.conn:
+            self._put(node, key, rest, data)
+            self._enqueue('put', path, data)
+
+    def update(self, path, data):
+        """Merge fields into the value at path locally and queue a PATCH"""
+        node, key, rest = split_path(path)
+        with self.lock, self.conn:
+            if key is None:
+                for child, value in data.items():
+                    self._store(node, child, value)
+                self._enqueue('patch', path, data)
+                return
+            record = self._load(node, key)
+            current = dig(record, rest)
+            current = dict(current) if isinstance(current, dict) else {}
+            current.update(data)
+            self._store(node, key, place(record, rest, current))
+            self._enqueue('patch', path, data)
+
+    def increment(self, path, increments):
+        """Add deltas to numeric fields of the record at path and queue them
+
+        The deltas are applied to the server's values when sent, so counters
+        changed on several devices add up. Returns the new local values.
+        """
+        node, key, rest = split_path(path)
+        with self.lock, self.conn:
+            record = self._load(node, key)
+            current = dig(record, rest)
+            current = dict(current) if isinstance(current, dict) else {}
+            values = {field: max(0, (current.get(field) or 0) + delta) for field, delta in increments.items()}
+            current.update(values)
+            self._store(node, key, place(record, rest, current))
+            self._enqueue('patch', path, {}, increments)
+        return values
+
+    def push(self, path, data):
+        """Store data under a new push key locally and queue it; returns the key"""
+        key = push_key()
+        self.set(f"{path.strip('/')}/{key}", data)
+        return key
+
+    def delete(self, path):
+        node, key, rest = split_path(path)
+        with self.lock, self.conn:
+            self._put(node, key, rest, None)
+            self._enqueue('delete', path, None)
+
+    # Remote changes
+
+    def apply_remote(self, path, value):
+        """Store a value fetched from the server without queueing it"""
+        node, key, rest = split_path(path)
+        with self.lock, self.conn:
+            self._put(node, key, rest, value)
+
+    def replace_node(self, node, remote, scope=None):
+        """Mirror a fully fetched node, keeping records with pending writes
+
+        With scope, nothing is stored if the scope changed since the fetch.
+        Returns True if anything changed locally.
+        """
+        remote = remote or {}
+        with self.lock, self.conn:
+            if scope is not None and self.get_meta('scope') != scope:
+                return False
+            pending = self._pending_keys(node)
+            if node in SINGLE_RECORD_NODES:
+                remote = {'': remote} if remote else {}
+            local = {key: value for key, value in self.conn.execute(
+                'SELECT key, value FROM records WHERE node = ?', (node,))}
+            changed = False
+            for key, value in remote.items():
+                if key in pending:
+                    continue
+                encoded = json.dumps(value)
+                if local.get(key) != encoded:
+                    self._store(node, key, value)
+                    changed = True
+            for key in local:
+                if key not in remote and key not in pending:
+                    self._store(node, key, None)
+                    changed = True
+            self._set_meta(f'synced:{node}', datetime.now().isoformat())
+        return changed
+
+    def merge_changes(self, node, remote, stamp=None, scope=None):
+        """Store records changed on the server, keeping records with pending writes
+
+        Unlike replace_node nothing is removed; stamp is saved as the node's
+        new delta pull mark. With scope, nothing is stored if the scope
+        changed since the fetch. Returns True if anything changed locally.
+        """
+        with self.lock, self.conn:
+            if scope is not None and self.get_meta('scope') != scope:
+                return False
+            pending = self._pending_keys(node)
+            changed = False
+            for key, value in (remote or {}).items():
+                if key in pending:
+                    continue
+                if self._load(node, key) != value:
+                    self._store(node, key, value)
+                    changed = True
+            if stamp is not None:
+                self._set_meta(f'stamp:{node}', str(stamp))
+        return changed
+
+    def merge_records(self, node, remote, cursor=None, keep=APPEND_WINDOW):
+        """Add newly fetched append-only records; returns how many were new"""
+        with self.lock, self.conn:
+            added = 0
+            for key, value in (remote or {}).items():
+                if self.conn.execute('SELECT 1 FROM records WHERE node = ? AND key = ?', (node, key)).fetchone():
+                    continue
+                self._store(node, key, value)
+                added += 1
+            if cursor:
+                self._set_meta(f'cursor:{node}', cursor)
+            # Keep only the newest records of append-only nodes
+            self.conn.execute(
+                'DELETE FROM records WHERE node = ? AND key NOT IN '
+                '(SELECT key FROM records WHERE node = ? ORDER BY key DESC LIMIT ?)',
+                (node, node, keep)
+            )
+            self._set_meta(f'synced:{node}', datetime.now().isoformat())
+        return added
+
+    # Outbox
+
+    def _enqueue(self, op, path, data, increments=None):
+        path = path.strip('/')
+        if op == 'patch':
+            # Coalesce with the newest pending write to the same path (presence heartbeats)
+            row = self.conn.execute(
+                'SELECT id, op, data, increments FROM outbox WHERE path = ? ORDER BY id DESC LIMIT 1', (path,)
+            ).fetchone()
+            if row and row[1] == 'patch' and row[0] != self.sending:
+                merged = json.loads(row[2] or '{}')
+                totals = json.loads(row[3] or '{}')
+                for field, value in data.items():
+                    # A value set explicitly replaces earlier deltas
+                    totals.pop(field, None)
+                    merged[field] = value
+                for field, delta in (increments or {}).items():
+                    if field in merged:
+                        merged[field] = max(0, (merged[field] or 0) + delta)
+                    else:
+                        totals[field] = totals.get(field, 0) + delta
+                self.conn.execute('UPDATE outbox SET data = ?, increments = ? WHERE id = ?',
+                                  (json.dumps(merged), json.dumps(totals) if totals else None, row[0]))
+                return
+        self.conn.execute(
+            'INSERT INTO outbox (op, path, data, increments, created) VALUES (?, ?, ?, ?, ?)',
+            (op, path, json.dumps(data), json.dumps(increments) if increments else None, datetime.now().isoformat())
+        )
+
+    def _pending_keys(self, node):
+        keys = set()
+        for (path,) in self.conn.execute('SELECT path FROM outbox'):
+            path_node, key, _ = split_path(path)
+            if path_node == node and key is not None:
+                keys.add(key)
+        return keys
+
+    def next_pending(self):
+        """Oldest queued write as (id, op, path, data, increments), or None
+
+        The row is marked as being sent until done() or the next call, so a
+        write queued meanwhile gets a row of its own instead of being merged
+        into it and deleted unsent.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT id, op, path, data, increments FROM outbox ORDER BY id LIMIT 1'
+            ).fetchone()
+            self.sending = row[0] if row else None
+        if row is None:
+            return None
+        row_id, op, path, data, increments = row
+        return row_id, op, path, json.loads(data) if data else None, json.loads(increments) if increments else {}
+
+    def pending_count(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def done(self, row_id):
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM outbox WHERE id = ?', (row_id,))
+            if self.sending == row_id:
+                self.sending = None
+
+
+class ReplicaSync:
+    """Background thread that replays the outbox and pulls remote changes
+
+    Append-only nodes are polled by key (only records after the last one
+    seen), record nodes by updated_at after one full download; settings
+    is fetched whole. tokens, users and their indexes follow set_scope().
+    bind(callback) calls callback(node) from the sync thread when a node
+    changed locally because of the server.
+    """
+    def __init__(self, transport, replica, interval=15):
+        self.transport = transport
+        self.replica = replica
+        self.interval = interval
+        self.online = False
+        self.last_sync = None
+        self.conflicts = 0
+        self.running = False
+        self.thread = None
+        self.wake = threading.Event()
+        # One flush at a time, whichever thread calls sync_once
+        self.lock = threading.Lock()
+        # Nodes whose delta query the server rejected (no index)
+        self.unindexed = set()
+        self._listeners = []
+
+    def bind(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unbind(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, node):
+        for callback in list(self._listeners):
+            try:
+                callback(node)
+            except Exception as e:
+                print(f"Error in replica listener: {e}")
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+
+    def kick(self):
+        """Sync now instead of waiting for the next interval"""
+        self.wake.set()
+
+    def _run(self):
+        while self.running:
+            self.sync_once()
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def sync_once(self):
+        """Flush the outbox then pull; returns False if the server was unreachable"""
+        try:
+            with self.lock:
+                self.flush()
+                changed = self.pull()
+        except Exception as e:
+            if self.online:
+                print(f"Replica sync offline: {e}")
+            self.online = False
+            return False
+        self.online = True
+        self.last_sync = datetime.now()
+        for node in changed:
+            self._notify(node)
+        return True
+
+    def flush(self):
+        while True:
+            row = self.replica.next_pending()
+            if row is None:
+                return
+            row_id, op, path, data, increments = row
+            try:
+                self.replay(op, path, data, increments)
+            except FirebaseHTTPError as e:
+                # Rejected by the server (rules, bad path): retrying will not help
+                if 400 <= e.status < 500 and e.status != 429:
+                    print(f"Dropping queued {op} {path}: {e}")
+                else:
+                    raise
+            self.replica.done(row_id)
+
+    def conflict(self, path, remote, reason):
+        self.conflicts += 1
+        print(f"Sync conflict at {path}: {reason}, keeping server value")
+        self.replica.apply_remote(path, remote)
+
+    def send(self, method, path, data):
+        """PUT or PATCH data, setting STAMP_FIELD on every record it touches"""
+        node, key, rest = split_path(path)
+        if not stamped(node):
+            return self.transport.request(method, path, data)
+        if key is None:
+            # Whole-node writes replace each child record
+            data = {child: dict(value, **{STAMP_FIELD: SERVER_TIMESTAMP}) if isinstance(value, dict) else value
+                    for child, value in (data or {}).items()}
+            return self.transport.request(method, path, data)
+        record = f"{node}/{key}"
+        if rest:
+            # Nested write as a multi-path PATCH of the record
+            inner = '/'.join(rest)
+            if method == 'PUT' or not isinstance(data, dict):
+                fields = {inner: data}
+            else:
+                fields = {f"{inner}/{field}": value for field, value in data.items()}
+            return self.transport.request('PATCH', record, dict(fields, **{STAMP_FIELD: SERVER_TIMESTAMP}))
+        if isinstance(data, dict):
+            data = dict(data, **{STAMP_FIELD: SERVER_TIMESTAMP})
+        return self.transport.request(method, record, data)
+
+    def replay(self, op, path, data, increments):
+        node, key, rest = split_path(path)
+        rule = NODE_RULES.get(node)
+        request = self.transport.request
+
+        if op == 'delete':
+            request('DELETE', path)
+            return
+
+        if op == 'put':
+            if rule == MERGE and key is not None and not rest:
+                remote = request('GET', path)
+                if remote is not None:
+                    self.conflict(path, remote, 'record already exists')
+                    return
+            self.send('PUT', path, data)
+            return
+
+        if rule == STATUS and key and not rest and 'status' in data:
+            remote = request('GET', path)
+            if remote is not None:
+                remote_rank = TOKEN_STATUS_RANK.get(remote.get('status'), 0)
+                if remote_rank > TOKEN_STATUS_RANK.get(data['status'], 0):
+                    self.conflict(path, remote, f"status is already {remote.get('status')}")
+                    return
+
+        if increments:
+            remote = request('GET', path) or {}
+            data = dict(data)
+            for field, delta in increments.items():
+                data[field] = max(0, (remote.get(field) or 0) + delta)
+
+        if data:
+            self.send('PATCH', path, data)
+
+    def pull(self):
+        """Fetch remote changes for every replicated node; returns the changed nodes"""
+        changed = []
+        for node, rule in NODE_RULES.items():
+            if rule == APPEND:
+                cursor = self.replica.get_meta(f'cursor:{node}')
+                if cursor:
+                    params = {'orderBy': '"$key"', 'startAt': json.dumps(cursor)}
+                else:
+                    params = {'orderBy': '"$key"', 'limitToLast': APPEND_WINDOW}
+                remote = self.transport.request('GET', node, params=params) or {}
+                remote.pop(cursor, None)
+                new_cursor = max(remote) if remote else cursor
+                if self.replica.merge_records(node, remote, new_cursor):
+                    changed.append(node)
+            elif stamped(node):
+                if self.pull_stamped(node):
+                    changed.append(node)
+            else:
+                remote = self.transport.request('GET', node)
+                if self.replica.replace_node(node, remote):
+                    changed.append(node)
+        return changed
+
+    def set_scope(self, owner):
+        """Replicate tokens and users for an admin (owner=None) or one user"""
+        if self.replica.set_scope(owner):
+            self.kick()
+
+    def pull_stamped(self, node):
+        """Pull a record node as far as the current scope allows"""
+        scope = self.replica.get_meta('scope')
+        if node not in SCOPED_NODES or scope == ALL_RECORDS:
+            return self.pull_changes(node, scope)
+        if scope and node in OWN_RECORD_NODES:
+            remote = self.transport.request('GET', f"{node}/{scope}")
+            return self.replica.replace_node(node, {scope: remote} if remote is not None else {}, scope)
+        # Nobody logged in yet, or not replicated for this user
+        return False
+
+    def pull_changes(self, node, scope=None):
+        """Fetch records stamped since the last pull (the whole node the first time)
+
+        Returns True if anything changed locally.
+        """
+        since = self.replica.get_meta(f'stamp:{node}')
+        if since is not None and node not in self.unindexed:
+            # Records at exactly since were seen already (a bulk write shares
+            # one stamp, so an inclusive query would fetch it every round)
+            params = {'orderBy': json.dumps(STAMP_FIELD), 'startAt': int(since) + 1}
+            try:
+                remote = self.transport.request('GET', node, params=params) or {}
+            except FirebaseHTTPError as e:
+                # No ".indexOn": ["updated_at"] in the rules for this node
+                print(f"Delta pull of {node} rejected, downloading it whole: {e}")
+                self.unindexed.add(node)
+            else:
+                return self.replica.merge_changes(node, remote, newest_stamp(remote, since), scope)
+
+        remote = self.transport.request('GET', node)
+        changed = self.replica.replace_node(node, remote, scope)
+        stamp = newest_stamp(remote, since)
+        if stamp is not None and (scope is None or self.replica.get_meta('scope') == scope):
+            self.replica.set_meta(f'stamp:{node}', stamp)
+        return changed
+
+
+def newest_stamp(records, since=None):
+    """Highest STAMP_FIELD among records, or since if none is higher (as text)"""
+    newest = int(since) if since is not None else None
+    for record in (records or {}).values():
+        stamp = record.get(STAMP_FIELD) if isinstance(record, dict) else None
+        if isinstance(stamp, int) and not isinstance(stamp, bool) and (newest is None or stamp > newest):
+            newest = stamp
+    return None if newest is None else str(newest)
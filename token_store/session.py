@@ -0,0 +1,60 @@
+"""
+Sesi login yang disimpan di perangkat.
+"""
+
+import json
+from datetime import datetime
+import os
+
+from kivy.app import App
+
+
+class SessionManager:
+    """Manage login session persistence"""
+    def __init__(self):
+        try:
+            self.session_file = os.path.join(App.get_running_app().user_data_dir, 'user_session.json')
+        except:
+            self.session_file = 'user_session.json'
+    
+    def save_session(self, username, user_type):
+        """Save login session"""
+        try:
+            session_data = {
+                'username': username,
+                'user_type': user_type,
+                'login_time': datetime.now().isoformat(),
+                'auto_login': True
+            }
+            with open(self.session_file, 'w') as f:
+                json.dump(session_data, f)
+            return True
+        except Exception as e:
+            print(f"Error saving session: {e}")
+            return False
+    
+    def load_session(self):
+        """Load saved session"""
+        try:
+            if os.path.exists(self.session_file):
+                with open(self.session_file, 'r') as f:
+                    session_data = json.load(f)
+                
+                # Check if session is valid (within 7 days)
+                login_time = datetime.fromisoformat(session_data['login_time'])
+                if (datetime.now() - login_time).days < 7:
+                    return session_data
+            return None
+        except Exception as e:
+            print(f"Error loading session: {e}")
+            return None
+    
+    def clear_session(self):
+        """Clear saved session"""
+        try:
+            if os.path.exists(self.session_file):
+                os.remove(self.session_file)
+            return True
+        except Exception as e:
+            print(f"Error clearing session: {e}")
+            return False
@@ -0,0 +1,3 @@
+"""
+Akses jaringan ke Firebase.
+"""
@@ -0,0 +1,474 @@
+"""
+Server tiruan Firebase Realtime Database untuk tes dan benchmark.
+
+FakeRTDB menyimpan pohon JSON di memori dan meniru REST API RTDB: GET, PUT,
+POST, PATCH dan DELETE pada path '<path>.json', parameter shallow, orderBy
+($key, $value atau path child), startAt/endAt/equalTo, limitToFirst/
+limitToLast, ETag (X-Firebase-ETag dan if-match), server value
+({".sv": "timestamp"} dan {".sv": {"increment": n}}), respons gzip
+(Accept-Encoding: gzip) serta event-stream (Accept: text/event-stream)
+untuk event put/patch.
+
+FakeRTDBServer menjalankannya di localhost dalam thread latar:
+
+    with FakeRTDBServer({'settings': {'price_per_token': 1500}}) as server:
+        manager = FirebaseManager(database_url=server.url)
+
+Hanya memakai pustaka standar, jadi bisa dipakai tanpa kivy atau requests.
+Dari command line: python -m transport.fake_rtdb --port 9000 --data seed.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+KEEP_ALIVE_SECONDS = 30
+# Smaller bodies are sent uncompressed, like the real server
+GZIP_MIN_BYTES = 256
+
+
+class RTDBError(Exception):
+    """Request the real server would reject"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def split(path):
+    return [unquote(p) for p in path.strip('/').split('/') if p]
+
+
+def clean(value):
+    """Drop nulls and empty objects the way RTDB does; None if nothing is left"""
+    if isinstance(value, dict):
+        result = {}
+        for key, child in value.items():
+            child = clean(child)
+            if child is not None:
+                result[str(key)] = child
+        return result or None
+    if isinstance(value, list):
+        return clean({str(i): child for i, child in enumerate(value)})
+    return value
+
+
+def order_key(value):
+    """RTDB sort order: null < false < true < numbers < strings < objects"""
+    if value is None:
+        return (0, 0)
+    if value is False:
+        return (1, 0)
+    if value is True:
+        return (2, 0)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    return (5, 0)
+
+
+def query_value(params, name):
+    """JSON-decoded query parameter; bad JSON is a 400 like the real server"""
+    try:
+        return json.loads(params[name])
+    except ValueError:
+        raise RTDBError(400, f"{name} must be a valid JSON value")
+
+
+class FakeRTDB:
+    """In-memory RTDB tree with the REST semantics the app relies on"""
+    def __init__(self, data=None):
+        self.root = clean(data)
+        self.lock = threading.RLock()
+        self.streams = []
+        self.requests = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._last_push_ms = 0
+        self._push_counter = 0
+
+    def traffic(self):
+        """Requests per method and request/response body bytes since the last reset"""
+        with self.lock:
+            return {'requests': dict(self.requests), 'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out}
+
+    def reset_traffic(self):
+        with self.lock:
+            self.requests = {}
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    # Tree access
+
+    def get(self, path):
+        with self.lock:
+            node = self.root
+            for part in split(path):
+                if not isinstance(node, dict):
+                    return None
+                node = node.get(part)
+            return json.loads(json.dumps(node))
+
+    def _set(self, parts, value):
+        if not parts:
+            self.root = value
+            return
+        self.root = self._set_in(self.root, parts, value)
+
+    def _set_in(self, node, parts, value):
+        node = dict(node) if isinstance(node, dict) else {}
+        if len(parts) == 1:
+            child = value
+        else:
+            child = self._set_in(node.get(parts[0]), parts[1:], value)
+        if child is None:
+            node.pop(parts[0], None)
+        else:
+            node[parts[0]] = child
+        return node or None
+
+    def push_key(self):
+        """Chronological push key, strictly increasing within this server"""
+        now_ms = int(time.time() * 1000)
+        if now_ms == self._last_push_ms:
+            self._push_counter += 1
+        else:
+            self._last_push_ms = now_ms
+            self._push_counter = 0
+        stamp = ''
+        for _ in range(8):
+            stamp = PUSH_CHARS[now_ms % 64] + stamp
+            now_ms //= 64
+        counter = self._push_counter
+        suffix = ''
+        for _ in range(12):
+            suffix = PUSH_CHARS[counter % 64] + suffix
+            counter //= 64
+        return stamp + suffix
+
+    def etag(self, path):
+        body = json.dumps(self.get(path), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+    def resolve_server_values(self, path, value):
+        """Replace {".sv": ...} placeholders with their server-side values"""
+        if isinstance(value, dict):
+            if '.sv' in value:
+                sv = value['.sv']
+                if sv == 'timestamp':
+                    return int(time.time() * 1000)
+                if isinstance(sv, dict) and 'increment' in sv:
+                    current = self.get(path)
+                    current = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+                    return current + sv['increment']
+                raise RTDBError(400, f"Invalid server value: {sv}")
+            return {key: self.resolve_server_values(f"{path}/{key}", child) for key, child in value.items()}
+        return value
+
+    # Queries
+
+    def query(self, value, params):
+        """Apply orderBy/startAt/endAt/equalTo/limitTo* to a node"""
+        order_by = params.get('orderBy')
+        if order_by is None:
+            if any(name in params for name in ('startAt', 'endAt', 'equalTo', 'limitToFirst', 'limitToLast')):
+                raise RTDBError(400, 'orderBy must be defined when other query parameters are defined')
+            return value
+        order_by = query_value(params, 'orderBy')
+        if not isinstance(value, dict):
+            return value
+
+        if order_by == '$key':
+            def sort_value(key, child):
+                return key
+            def compare(bound):
+                return str(bound)
+            items = sorted(value.items(), key=lambda kv: kv[0])
+        else:
+            child_path = split(order_by) if order_by != '$value' else []
+
+            def sort_value(key, child):
+                for part in child_path:
+                    child = child.get(part) if isinstance(child, dict) else None
+                return order_key(child)
+
+            compare = order_key
+            items = sorted(value.items(), key=lambda kv: (sort_value(*kv), kv[0]))
+
+        for name, keep in (('startAt', lambda v, b: v >= b), ('endAt', lambda v, b: v <= b),
+                           ('equalTo', lambda v, b: v == b)):
+            if name in params:
+                bound = compare(query_value(params, name))
+                items = [kv for kv in items if keep(sort_value(*kv), bound)]
+
+        if 'limitToFirst' in params:
+            items = items[:int(params['limitToFirst'])]
+        if 'limitToLast' in params:
+            count = int(params['limitToLast'])
+            items = items[-count:] if count else []
+        return dict(items)
+
+    # REST entry point
+
+    def handle(self, method, path, params, body=None, headers=None):
+        """Run one request; returns (status, headers, json body)"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        with self.lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            extra = {}
+
+            if method == 'GET':
+                value = self.get(path)
+                if params.get('shallow') == 'true':
+                    if any(name in params for name in ('orderBy', 'limitToFirst', 'limitToLast')):
+                        raise RTDBError(400, 'Mixing shallow with other query parameters is not allowed')
+                    if isinstance(value, dict):
+                        value = {key: True for key in value}
+                else:
+                    value = self.query(value, params)
+                if headers.get('x-firebase-etag') == 'true':
+                    extra['ETag'] = self.etag(path)
+                return 200, extra, value
+
+            if 'if-match' in headers and headers['if-match'] != self.etag(path):
+                return 412, {'ETag': self.etag(path)}, self.get(path)
+
+            parts = split(path)
+            if method == 'PUT':
+                value = clean(self.resolve_server_values(path, body))
+                self._set(parts, value)
+                self.notify('put', path, value)
+                return 200, extra, value
+
+            if method == 'POST':
+                key = self.push_key()
+                child_path = '/'.join(parts + [key])
+                value = clean(self.resolve_server_values(child_path, body))
+                self._set(parts + [key], value)
+                self.notify('put', child_path, value)
+                return 200, extra, {'name': key}
+
+            if method == 'PATCH':
+                if not isinstance(body, dict):
+                    raise RTDBError(400, 'Invalid data; couldn\'t parse JSON object. Are you sending a JSON object with valid key names?')
+                resolved = {}
+                for key, value in body.items():
+                    child_parts = parts + split(key)
+                    value = clean(self.resolve_server_values('/'.join(child_parts), value))
+                    self._set(child_parts, value)
+                    resolved[key] = value
+                self.notify('patch', path, resolved)
+                return 200, extra, resolved
+
+            if method == 'DELETE':
+                self._set(parts, None)
+                self.notify('put', path, None)
+                return 200, extra, None
+
+        raise RTDBError(405, f"Method {method} not supported")
+
+    # Event streams
+
+    def listen(self, path):
+        """Register a stream; returns a queue of (event, data) tuples"""
+        events = queue.Queue()
+        with self.lock:
+            events.put(('put', {'path': '/', 'data': self.get(path)}))
+            self.streams.append((split(path), events))
+        return events
+
+    def unlisten(self, events):
+        with self.lock:
+            self.streams = [(p, q) for p, q in self.streams if q is not events]
+
+    def notify(self, event, path, data):
+        parts = split(path)
+        for stream_parts, events in self.streams:
+            if parts[:len(stream_parts)] == stream_parts:
+                relative = '/' + '/'.join(parts[len(stream_parts):])
+                events.put((event, {'path': relative, 'data': data}))
+            elif stream_parts[:len(parts)] == parts:
+                # Written above the stream: send the stream root's new value
+                events.put(('put', {'path': '/', 'data': self.get('/'.join(stream_parts))}))
+
+    def close_streams(self):
+        with self.lock:
+            for _, events in self.streams:
+                events.put(None)
+            self.streams = []
+
+
+class FakeRTDBHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def parse(self):
+        url = urlsplit(self.path)
+        path = url.path
+        if not path.endswith('.json'):
+            raise RTDBError(404, 'Not Found')
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return path[:-len('.json')], params
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        with self.server.db.lock:
+            self.server.db.bytes_in += len(raw)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise RTDBError(400, 'Invalid data; couldn\'t parse JSON object, array, or value.')
+
+    def respond(self, status, body, headers=None):
+        payload = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        compress = len(payload) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            payload = gzip.compress(payload, compresslevel=6)
+        with self.server.db.lock:
+            self.server.db.bytes_out += len(payload)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def dispatch(self, method):
+        server = self.server
+        try:
+            # Read the body first so a rejected request leaves the connection usable
+            body = self.read_body() if method in ('PUT', 'POST', 'PATCH') else None
+            path, params = self.parse()
+            if server.latency:
+                time.sleep(server.latency)
+            if method == 'GET' and 'text/event-stream' in self.headers.get('Accept', ''):
+                self.stream(path)
+                return
+            status, headers, result = server.db.handle(method, path, params, body, dict(self.headers))
+            if params.get('print') == 'silent' and status == 200:
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.respond(status, result, headers)
+        except RTDBError as e:
+            self.respond(e.status, {'error': str(e)})
+
+    def stream(self, path):
+        db = self.server.db
+        events = db.listen(path)
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        try:
+            while True:
+                try:
+                    item = events.get(timeout=KEEP_ALIVE_SECONDS)
+                except queue.Empty:
+                    item = ('keep-alive', None)
+                if item is None:
+                    break
+                event, data = item
+                self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            db.unlisten(events)
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_PUT(self):
+        self.dispatch('PUT')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+
+class FakeRTDBServer:
+    """FakeRTDB served over HTTP on localhost from a background thread
+
+    latency adds a fixed delay (seconds) to every request to imitate a
+    mobile network round trip.
+    """
+    def __init__(self, data=None, host='127.0.0.1', port=0, latency=0.0):
+        self.db = FakeRTDB(data)
+        self.httpd = ThreadingHTTPServer((host, port), FakeRTDBHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.db = self.db
+        self.httpd.latency = latency
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.db.close_streams()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Firebase RTDB server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--data', help='JSON file with the initial tree')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    args = parser.parse_args()
+
+    data = None
+    if args.data:
+        with open(args.data, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    server = FakeRTDBServer(data, args.host, args.port, args.latency)
+    print(f"Fake RTDB di {server.url}  (FIREBASE_DATABASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Metrik request Firebase di memori.
+
+Setiap request transport dicatat per template path (users/{key}/online,
+bukan nama user sebenarnya) dan metode: jumlah per status, histogram latensi,
+byte terkirim dan diterima, jumlah retry, serta hit/miss replika lokal.
+Snapshot bisa ditampilkan di layar metrik admin atau diekspor ke JSON untuk
+melihat operasi mana yang paling banyak memakan waktu jaringan di lapangan.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Nodes whose children are keyed by id; the child segment becomes {key}
+KEYED_NODES = {
+    'users', 'tokens', 'chat_messages', 'activity_logs', 'kasir',
+    'receipts', 'stock_moves', 'expenses', 'days', 'token_index', 'user_index',
+}
+
+RECENT_REQUESTS = 200
+
+
+def path_template(path):
+    """users/budi/online -> users/{key}/online"""
+    segments = [s for s in str(path or '').strip('/').split('/') if s]
+    template = []
+    for index, segment in enumerate(segments):
+        if index and segments[index - 1] in KEYED_NODES and template[-1] != '{key}':
+            template.append('{key}')
+        else:
+            template.append(segment)
+    return '/'.join(template) or '/'
+
+
+class Histogram:
+    """Counts per fixed bucket plus count, sum, min and max"""
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(self.bounds[index]) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'min': round(self.min, 3) if self.min is not None else None,
+            'max': round(self.max, 3) if self.max is not None else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': {('+inf' if index == len(self.bounds) else str(self.bounds[index])): count
+                        for index, count in enumerate(self.counts) if count},
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by name and labels"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.recent = deque(maxlen=RECENT_REQUESTS)
+            self.started = time.time()
+
+    def _key(self, name, labels):
+        return (name,) + tuple(sorted((labels or {}).items()))
+
+    def increment(self, name, labels=None, value=1):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_request(self, method, path, status, seconds, bytes_sent=0, bytes_received=0, retries=0,
+                       bytes_decoded=None):
+        """Record one transport call; status is the HTTP code or the error name
+
+        bytes_received is the size on the wire, bytes_decoded the response
+        body after gzip decoding (defaults to bytes_received).
+        """
+        template = path_template(path)
+        labels = {'method': method, 'path': template}
+        latency_ms = seconds * 1000
+        self.increment('requests', dict(labels, status=str(status)))
+        self.increment('bytes_sent', labels, bytes_sent)
+        self.increment('bytes_received', labels, bytes_received)
+        self.increment('bytes_decoded', labels, bytes_received if bytes_decoded is None else bytes_decoded)
+        if retries:
+            self.increment('retries', labels, retries)
+        self.observe('latency_ms', latency_ms, labels)
+        with self.lock:
+            self.recent.append({
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'method': method, 'path': template, 'status': status,
+                'latency_ms': round(latency_ms, 1), 'bytes_sent': bytes_sent,
+                'bytes_received': bytes_received, 'bytes_decoded': bytes_decoded, 'retries': retries,
+            })
+
+    def record_cache(self, path, hit):
+        """Record whether a read was served by the local replica"""
+        self.increment('cache', {'path': path_template(path), 'result': 'hit' if hit else 'miss'})
+
+    def snapshot(self):
+        """Plain dict of everything recorded since the last reset"""
+        with self.lock:
+            counters = [dict(key[1:], name=key[0], value=value) for key, value in self.counters.items()]
+            histograms = [dict(key[1:], name=key[0], **histogram.snapshot())
+                          for key, histogram in self.histograms.items()]
+            recent = list(self.recent)
+            started = self.started
+        return {
+            'started': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+            'taken': datetime.now().isoformat(timespec='seconds'),
+            'counters': sorted(counters, key=lambda c: (c['name'], c.get('path', ''), c.get('method', ''))),
+            'histograms': sorted(histograms, key=lambda h: -h['sum']),
+            'recent': recent,
+        }
+
+    def summary(self):
+        """Per path and method: calls, errors, network time, bytes and cache hits
+
+        bytes counts what went over the wire; gzip_saved is how much
+        smaller the responses were than their decoded bodies.
+        """
+        snapshot = self.snapshot()
+        rows = {}
+        for histogram in snapshot['histograms']:
+            if histogram['name'] != 'latency_ms':
+                continue
+            row = rows.setdefault((histogram['path'], histogram['method']), {
+                'path': histogram['path'], 'method': histogram['method'], 'calls': 0, 'errors': 0,
+                'total_ms': 0.0, 'p90_ms': 0.0, 'bytes': 0, 'gzip_saved': 0, 'retries': 0, 'cache_hits': 0, 'cache_misses': 0,
+            })
+            row['calls'] = histogram['count']
+            row['total_ms'] = histogram['sum']
+            row['p90_ms'] = histogram['p90']
+        cache = {}
+        for counter in snapshot['counters']:
+            key = (counter.get('path'), counter.get('method'))
+            if counter['name'] == 'cache':
+                field = 'cache_hits' if counter['result'] == 'hit' else 'cache_misses'
+                cache.setdefault(counter['path'], {})[field] = counter['value']
+            elif key in rows:
+                row = rows[key]
+                if counter['name'] == 'requests' and counter['status'] != '200':
+                    row['errors'] += counter['value']
+                elif counter['name'] in ('bytes_sent', 'bytes_received'):
+                    row['bytes'] += counter['value']
+                    if counter['name'] == 'bytes_received':
+                        row['gzip_saved'] -= counter['value']
+                elif counter['name'] == 'bytes_decoded':
+                    row['gzip_saved'] += counter['value']
+                elif counter['name'] == 'retries':
+                    row['retries'] += counter['value']
+        for path, fields in cache.items():
+            row = rows.get((path, 'GET'))
+            if row is None:
+                row = rows[(path, 'GET')] = {
+                    'path': path, 'method': 'GET', 'calls': 0, 'errors': 0, 'total_ms': 0.0,
+                    'p90_ms': 0.0, 'bytes': 0, 'gzip_saved': 0, 'retries': 0, 'cache_hits': 0, 'cache_misses': 0,
+                }
+            row.update(fields)
+        return sorted(rows.values(), key=lambda r: -r['total_ms'])
+
+    def export_json(self, filename):
+        """Write a snapshot atomically and return the filename"""
+        folder = os.path.dirname(filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        tmp_name = f"{filename}.tmp"
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, filename)
+        return filename
+
+
+# Shared by every transport in the app
+metrics = MetricsRegistry()
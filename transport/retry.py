@@ -0,0 +1,134 @@
+"""
+Retry dengan backoff dan circuit breaker untuk request Firebase.
+
+Gangguan sementara (koneksi putus, timeout, 5xx, 429) diulang beberapa kali
+dengan jeda eksponensial acak, hanya untuk metode yang aman diulang. Setelah
+beberapa kegagalan berturut-turut circuit breaker terbuka: request langsung
+gagal sebagai offline tanpa menunggu timeout, dan sesudah reset_timeout satu
+request percobaan boleh lewat untuk mengecek apakah server sudah bisa
+dijangkau lagi.
+"""
+
+import random
+import threading
+import time
+
+# PATCH only writes the given values, so repeating it gives the same result;
+# POST creates a new key every time and is never retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'PUT', 'PATCH', 'DELETE'})
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class RetryPolicy:
+    """Bounded attempts with full-jitter exponential backoff
+
+    deadline is a little above the read timeout so a request that already
+    timed out once is not retried into a second long wait.
+    """
+    def __init__(self, attempts=3, base_delay=0.3, max_delay=3.0, deadline=12.0, rng=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        """Sleep before attempt + 1, between 0 and base_delay * 2^(attempt - 1)"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def next_delay(self, method, attempt, elapsed):
+        """Seconds to wait before retrying, or None to give up"""
+        if method not in IDEMPOTENT_METHODS or attempt >= self.attempts:
+            return None
+        delay = self.delay(attempt)
+        if elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold failures in a row -> half-open probe
+
+    bind(callback) calls callback(state) whenever the state changes.
+    """
+    def __init__(self, failure_threshold=3, reset_timeout=20.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._listeners = []
+
+    def bind(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def _set_state(self, state):
+        """Call with the lock held; returns True if listeners should be told"""
+        changed = state != self.state
+        self.state = state
+        return changed
+
+    def _notify(self, state):
+        for callback in list(self._listeners):
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"Error in circuit breaker listener: {e}")
+
+    def allow(self):
+        """True if a request may go out now"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                changed = self._set_state(HALF_OPEN)
+                self.probing = True
+            elif self.state == HALF_OPEN and not self.probing:
+                changed = False
+                self.probing = True
+            else:
+                return False
+        if changed:
+            self._notify(HALF_OPEN)
+        return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            changed = self._set_state(CLOSED)
+        if changed:
+            self._notify(CLOSED)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state != HALF_OPEN and self.failures < self.failure_threshold:
+                return
+            self.opened_at = self.clock()
+            changed = self._set_state(OPEN)
+        if changed:
+            self._notify(OPEN)
+
+    def retry_in(self):
+        """Seconds until the next probe is allowed (0 unless open)"""
+        with self.lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def reset(self):
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            changed = self._set_state(CLOSED)
+        if changed:
+            self._notify(CLOSED)
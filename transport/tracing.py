@@ -0,0 +1,218 @@
+"""
+Tracing ringan dari aksi UI sampai request HTTP.
+
+Setiap aksi pengguna (misalnya tombol Ban atau Ambil Token) membuka trace
+baru dengan trace id sendiri. Di dalamnya dicatat span bertingkat: handler
+layar, task di thread latar (lewat tracer.wrap), panggilan FirebaseManager
+dan setiap request HTTP. Span di luar aksi tidak dicatat, jadi sinkronisasi
+latar tidak memenuhi file.
+
+Span ditulis ke file berputar (trace.json, trace.1.json, ...) dalam format
+Chrome trace event, bisa dibuka di chrome://tracing atau ui.perfetto.dev.
+Tracer baru aktif setelah configure() dipanggil dengan folder tujuan.
+"""
+
+import contextlib
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+
+TRACE_FILE = 'trace.json'
+MAX_BYTES = 1024 * 1024
+BACKUPS = 3
+
+
+def now_us():
+    return int(time.perf_counter() * 1000000)
+
+
+class Tracer:
+    """Nested spans per thread, carried across threads with wrap()"""
+    def __init__(self):
+        self.folder = None
+        self.max_bytes = MAX_BYTES
+        self.backups = BACKUPS
+        self.pid = os.getpid()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.thread_names = {}
+        self.named_threads = set()
+        self.ids = itertools.count(1)
+
+    def configure(self, folder, max_bytes=MAX_BYTES, backups=BACKUPS):
+        """Start recording into folder/trace.json"""
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    @property
+    def enabled(self):
+        return self.folder is not None
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def current(self):
+        """(trace_id, span_id) of the innermost open span, or None"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def _open(self, trace_id, parent_id, name, category, args):
+        span_id = next(self.ids)
+        event_args = dict(args, trace_id=trace_id, span_id=span_id, parent_id=parent_id)
+        stack = self._stack()
+        stack.append((trace_id, span_id))
+        started = now_us()
+        try:
+            yield event_args
+        except BaseException as e:
+            event_args['error'] = type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            self._record({
+                'name': name, 'cat': category, 'ph': 'X', 'ts': started, 'dur': now_us() - started,
+                'pid': self.pid, 'tid': threading.get_ident(), 'args': event_args,
+            }, flush=not stack)
+
+    @contextlib.contextmanager
+    def action(self, name, **args):
+        """Root span of a new trace for one user action"""
+        if not self.enabled:
+            yield None
+            return
+        with self._open(uuid.uuid4().hex[:16], None, name, 'ui', args) as span:
+            yield span
+
+    @contextlib.contextmanager
+    def span(self, name, category='app', **args):
+        """Child span of the current trace; does nothing outside an action
+
+        Yields the span's args dict (extra fields can be added before it
+        closes) or None when nothing is recorded.
+        """
+        parent = self.current() if self.enabled else None
+        if parent is None:
+            yield None
+            return
+        with self._open(parent[0], parent[1], name, category, args) as span:
+            yield span
+
+    def traced_action(self, name):
+        """Decorator: run the function as the root span of a new trace"""
+        def decorate(function):
+            @functools.wraps(function)
+            def run(*args, **kwargs):
+                with self.action(name):
+                    return function(*args, **kwargs)
+            return run
+        return decorate
+
+    def traced(self, name=None, category='firebase'):
+        """Decorator: run the function in a child span when inside a trace"""
+        def decorate(function):
+            span_name = name or function.__name__
+
+            @functools.wraps(function)
+            def run(*args, **kwargs):
+                with self.span(span_name, category):
+                    return function(*args, **kwargs)
+            return run
+        return decorate
+
+    def wrap(self, function, name=None, category='task'):
+        """Carry the current trace into a thread or Clock callback
+
+        Returns function unchanged when there is no trace to carry.
+        """
+        parent = self.current() if self.enabled else None
+        if parent is None:
+            return function
+        span_name = name or getattr(function, '__name__', 'task')
+        flow_id = next(self.ids)
+        self._record({
+            'name': span_name, 'cat': category, 'ph': 's', 'id': flow_id, 'ts': now_us(),
+            'pid': self.pid, 'tid': threading.get_ident(),
+        })
+
+        @functools.wraps(function)
+        def run(*args, **kwargs):
+            saved = self.local.__dict__.get('stack')
+            self.local.stack = [parent]
+            try:
+                self._record({
+                    'name': span_name, 'cat': category, 'ph': 'f', 'bp': 'e', 'id': flow_id,
+                    'ts': now_us(), 'pid': self.pid, 'tid': threading.get_ident(),
+                })
+                with self._open(parent[0], parent[1], span_name, category, {}):
+                    return function(*args, **kwargs)
+            finally:
+                self.local.stack = saved if saved is not None else []
+                self.flush()
+        return run
+
+    def _record(self, event, flush=False):
+        with self.lock:
+            self.thread_names.setdefault(event['tid'], threading.current_thread().name)
+            self.buffer.append(event)
+        if flush:
+            self.flush()
+
+    def trace_file(self, index=0):
+        name = TRACE_FILE if not index else TRACE_FILE.replace('.json', f'.{index}.json')
+        return os.path.join(self.folder, name)
+
+    def rotate(self):
+        for index in range(self.backups, 0, -1):
+            source = self.trace_file(index - 1)
+            if os.path.exists(source):
+                os.replace(source, self.trace_file(index))
+
+    def flush(self):
+        """Append buffered events to the trace file
+
+        The file is a JSON array without its closing bracket, which the
+        Chrome trace viewer accepts; it rotates once it passes max_bytes.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            events, self.buffer = self.buffer, []
+            if not events:
+                return
+            try:
+                if not os.path.exists(self.folder):
+                    os.makedirs(self.folder)
+                filename = self.trace_file()
+                if os.path.exists(filename) and os.path.getsize(filename) > self.max_bytes:
+                    self.rotate()
+                new_file = not os.path.exists(filename)
+                if new_file:
+                    # Thread names are written again at the top of every file
+                    self.named_threads = set()
+                names = []
+                for tid in {event['tid'] for event in events} - self.named_threads:
+                    self.named_threads.add(tid)
+                    names.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                                  'args': {'name': self.thread_names.get(tid, str(tid))}})
+                with open(filename, 'a', encoding='utf-8') as f:
+                    if new_file:
+                        f.write('[\n')
+                    for event in names + events:
+                        f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+                        f.write(',\n')
+            except Exception as e:
+                print(f"Error writing trace: {e}")
+
+
+# Shared by screens, token_store and transport
+tracer = Tracer()